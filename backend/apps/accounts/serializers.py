@@ -4,12 +4,13 @@ Serializers for accounts app
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from apps.core.fieldsets import DynamicFieldsMixin
 from apps.core.serializers import SalonSerializer
 
 User = get_user_model()
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer pour le modèle User"""
     
     salon_name = serializers.CharField(source='salon.name', read_only=True)
@@ -24,6 +25,10 @@ class UserSerializer(serializers.ModelSerializer):
             'is_superuser', 'date_joined'
         ]
         read_only_fields = ['id', 'date_joined', 'salon', 'is_superuser']
+        # salon_details reste renvoyé par défaut ; ?expand= (vide) l'omet
+        expandable_fields = ['salon_details']
+        default_expand = ['salon']
+        field_sources = {'full_name': ('first_name', 'last_name')}
     
     def get_full_name(self, obj):
         return obj.get_full_name()
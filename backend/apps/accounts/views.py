@@ -15,6 +15,7 @@ from .serializers import (
     ChangePasswordSerializer
 )
 from apps.core.permissions import IsSalonAdmin
+from apps.core.mixins import SparseFieldsMixin
 
 User = get_user_model()
 
@@ -60,7 +61,7 @@ class CurrentUserView(generics.RetrieveAPIView):
         return self.request.user
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     CRUD pour les utilisateurs.
     Filtré automatiquement par salon.
@@ -1,5 +1,8 @@
-from django.contrib import admin
-from .models import Appointment
+from django.conf import settings
+from django.contrib import admin, messages
+from apps.core import sharding
+from .models import Appointment, AppointmentStatusChange
+from .services import AppointmentService
 
 
 @admin.register(Appointment)
@@ -16,6 +19,7 @@ class AppointmentAdmin(admin.ModelAdmin):
     ]
     readonly_fields = ['created_at', 'updated_at']
     date_hierarchy = 'date'
+    actions = ['mark_completed', 'mark_no_show', 'mark_cancelled']
     
     fieldsets = (
         ('Rendez-vous', {
@@ -43,3 +47,60 @@ class AppointmentAdmin(admin.ModelAdmin):
     def get_service_name(self, obj):
         return obj.service.name
     get_service_name.short_description = 'Service'
+    
+    def _transition(self, request, queryset, status):
+        """
+        Changement groupé, salon par salon et par lots de APPOINTMENT_BULK_MAX
+        (voir AppointmentService.bulk_transition)
+        """
+        by_salon = {}
+        for salon_id, appointment_id in queryset.values_list('salon_id', 'id'):
+            by_salon.setdefault(salon_id, []).append(appointment_id)
+        
+        size = settings.APPOINTMENT_BULK_MAX
+        updated = skipped = 0
+        for salon_id, ids in by_salon.items():
+            with sharding.use_shard(sharding.db_for_salon(salon_id)):
+                for start in range(0, len(ids), size):
+                    changed, ignored = AppointmentService.bulk_transition(
+                        salon_id, ids[start:start + size], status
+                    )
+                    updated += len(changed)
+                    skipped += len(ignored)
+        
+        self.message_user(request, f"{updated} rendez-vous mis à jour")
+        if skipped:
+            self.message_user(
+                request,
+                f"{skipped} rendez-vous ignoré(s) : transition non autorisée",
+                level=messages.WARNING
+            )
+    
+    @admin.action(description='Marquer comme terminés')
+    def mark_completed(self, request, queryset):
+        self._transition(request, queryset, 'COMPLETED')
+    
+    @admin.action(description='Marquer comme absences')
+    def mark_no_show(self, request, queryset):
+        self._transition(request, queryset, 'NO_SHOW')
+    
+    @admin.action(description='Annuler (client prévenu)')
+    def mark_cancelled(self, request, queryset):
+        self._transition(request, queryset, 'CANCELLED')
+
+
+@admin.register(AppointmentStatusChange)
+class AppointmentStatusChangeAdmin(admin.ModelAdmin):
+    """Journal en ajout seul : consultation uniquement"""
+    list_display = ['appointment_id', 'from_status', 'to_status', 'actor_id', 'salon', 'created_at']
+    list_filter = ['to_status', 'salon']
+    search_fields = ['appointment_id']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
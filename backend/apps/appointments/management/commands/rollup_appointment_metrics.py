@@ -0,0 +1,58 @@
+"""
+Recalcule les indicateurs journaliers des rendez-vous (conversion, absences)
+Usage: python manage.py rollup_appointment_metrics [--salon 1] [--start 2026-01-01] [--end 2026-03-31]
+Sans bornes, toute la période couverte par les rendez-vous du salon est
+recalculée, jour par jour par lots ; la tâche appointments.rollup_metrics
+entretient ensuite les jours modifiés.
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.appointments.models import Appointment
+from apps.appointments.services import FunnelService
+from apps.core import sharding
+from apps.core.models import Salon
+
+DAYS_PER_BATCH = 31
+
+
+class Command(BaseCommand):
+    help = "Recalcule les indicateurs journaliers des rendez-vous"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--salon', type=int, help='Salon concerné (tous par défaut)')
+        parser.add_argument('--start', type=date.fromisoformat, help='Premier jour (AAAA-MM-JJ)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Dernier jour (AAAA-MM-JJ)')
+
+    def handle(self, *args, **options):
+        salons = Salon.objects.order_by('pk')
+        if options['salon']:
+            salons = salons.filter(pk=options['salon'])
+            if not salons.exists():
+                raise CommandError(f"Salon {options['salon']} introuvable")
+
+        for salon in salons:
+            sharding.activate(salon)
+            days = (
+                Appointment.objects.filter(salon=salon)
+                .filter(**self._range(options))
+                .order_by('date')
+                .values_list('date', flat=True)
+                .distinct()
+            )
+            days = list(days)
+            rows = 0
+            for index in range(0, len(days), DAYS_PER_BATCH):
+                rows += FunnelService.rollup(salon.pk, days[index:index + DAYS_PER_BATCH])
+            self.stdout.write(f"{salon.name} : {len(days)} jour(s), {rows} ligne(s)")
+
+        self.stdout.write(self.style.SUCCESS("Indicateurs recalculés"))
+
+    def _range(self, options):
+        bounds = {}
+        if options['start']:
+            bounds['date__gte'] = options['start']
+        if options['end']:
+            bounds['date__lte'] = options['end']
+        return bounds
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["PENDING", "CONFIRMED", "IN_PROGRESS"])
+                ),
+                fields=["salon", "employee", "date"],
+                include=("time", "duration"),
+                name="appt_active_employee_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["PENDING", "CONFIRMED", "IN_PROGRESS"])
+                ),
+                fields=["salon", "date"],
+                include=("employee", "time", "duration"),
+                name="appt_active_salon_date_idx",
+            ),
+        ),
+    ]
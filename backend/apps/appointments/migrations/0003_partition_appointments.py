@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:06
+
+from django.db import migrations
+
+from apps.core.partitioning import convert_to_partitioned, convert_to_regular
+
+
+def partition_appointments(apps, schema_editor):
+    convert_to_partitioned(schema_editor, apps.get_model("appointments", "Appointment"))
+
+
+def unpartition_appointments(apps, schema_editor):
+    convert_to_regular(schema_editor, apps.get_model("appointments", "Appointment"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0002_active_partial_indexes"),
+        ("payments", "0002_partition_prerequisites"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_appointments, unpartition_appointments),
+    ]
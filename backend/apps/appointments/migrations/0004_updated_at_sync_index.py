@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0003_partition_appointments"),
+        ("clients", "0001_initial"),
+        ("core", "0002_salon_shard"),
+        ("employees", "0001_initial"),
+        ("services", "0003_service_target"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                fields=["salon", "updated_at", "id"],
+                name="appointment_salon_i_6ad632_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0004_updated_at_sync_index"),
+        ("clients", "0002_updated_at_sync_index"),
+        ("core", "0002_salon_shard"),
+        ("employees", "0002_updated_at_sync_index"),
+        ("services", "0004_updated_at_sync_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="appointment",
+            index=models.Index(
+                condition=models.Q(
+                    ("status__in", ["PENDING", "CONFIRMED", "IN_PROGRESS"])
+                ),
+                fields=["date", "time"],
+                name="appt_active_date_time_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,170 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0005_active_date_time_index"),
+        ("core", "0002_salon_shard"),
+        ("services", "0004_updated_at_sync_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AppointmentDailyStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                ("date", models.DateField(verbose_name="Date")),
+                (
+                    "booked",
+                    models.PositiveIntegerField(default=0, verbose_name="Réservés"),
+                ),
+                (
+                    "confirmed",
+                    models.PositiveIntegerField(default=0, verbose_name="Confirmés"),
+                ),
+                (
+                    "confirmed_quickly",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Confirmés rapidement"
+                    ),
+                ),
+                (
+                    "completed",
+                    models.PositiveIntegerField(default=0, verbose_name="Terminés"),
+                ),
+                (
+                    "no_show",
+                    models.PositiveIntegerField(default=0, verbose_name="Absences"),
+                ),
+                (
+                    "cancelled",
+                    models.PositiveIntegerField(default=0, verbose_name="Annulés"),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+                (
+                    "service",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_stats",
+                        to="services.service",
+                        verbose_name="Service",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Indicateurs journaliers",
+                "verbose_name_plural": "Indicateurs journaliers",
+                "db_table": "appointment_daily_stats",
+                "ordering": ["date"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("salon", "date", "service"),
+                        name="appt_daily_stats_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="AppointmentStatusChange",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                ("appointment_id", models.BigIntegerField(verbose_name="Rendez-vous")),
+                (
+                    "from_status",
+                    models.CharField(
+                        blank=True, max_length=20, verbose_name="Ancien statut"
+                    ),
+                ),
+                (
+                    "to_status",
+                    models.CharField(max_length=20, verbose_name="Nouveau statut"),
+                ),
+                (
+                    "actor_id",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="Auteur"
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Changement de statut",
+                "verbose_name_plural": "Changements de statut",
+                "db_table": "appointment_status_changes",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["salon", "created_at"],
+                        name="appointment_salon_i_c77cb7_idx",
+                    ),
+                    models.Index(
+                        fields=["appointment_id", "created_at"],
+                        name="appointment_appoint_287c9e_idx",
+                    ),
+                    models.Index(
+                        fields=["created_at"], name="appointment_created_8d2e17_idx"
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -1,11 +1,31 @@
 """
 Models for Appointments app
 """
-from django.db import models
+from django.db import models, router, transaction
+from apps.core.audit import current_actor_id
 from apps.core.models import TenantAwareModel
 from apps.core.managers import TenantManager
 
 
+# Statuts qui occupent un créneau (utilisés par les requêtes de disponibilité)
+ACTIVE_STATUSES = ['PENDING', 'CONFIRMED', 'IN_PROGRESS']
+
+# Transitions de statut autorisées (statut actuel -> statuts possibles)
+STATUS_TRANSITIONS = {
+    'PENDING': ['CONFIRMED', 'IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW'],
+    'CONFIRMED': ['IN_PROGRESS', 'COMPLETED', 'CANCELLED', 'NO_SHOW'],
+    'IN_PROGRESS': ['COMPLETED', 'CANCELLED'],
+    'COMPLETED': [],
+    'CANCELLED': [],
+    'NO_SHOW': [],
+}
+
+
+def transition_sources(status):
+    """Statuts depuis lesquels un rendez-vous peut passer à `status`"""
+    return [source for source, targets in STATUS_TRANSITIONS.items() if status in targets]
+
+
 class Appointment(TenantAwareModel):
     """
     Rendez-vous dans un salon.
@@ -21,6 +41,8 @@ class Appointment(TenantAwareModel):
         ('NO_SHOW', 'Absence'),
     ]
     
+    ACTIVE_STATUSES = ACTIVE_STATUSES
+    
     # Relations
     client = models.ForeignKey(
         'clients.Client',
@@ -83,6 +105,29 @@ class Appointment(TenantAwareModel):
             models.Index(fields=['salon', 'date', 'status']),
             models.Index(fields=['salon', 'employee', 'date']),
             models.Index(fields=['salon', 'client']),
+            # Index partiels limités aux rendez-vous actifs : l'historique
+            # (terminés, annulés, absences) n'y entre pas. Les colonnes
+            # INCLUDE permettent des Index Only Scan pour la disponibilité.
+            models.Index(
+                fields=['salon', 'employee', 'date'],
+                include=['time', 'duration'],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='appt_active_employee_idx',
+            ),
+            models.Index(
+                fields=['salon', 'date'],
+                include=['employee', 'time', 'duration'],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='appt_active_salon_date_idx',
+            ),
+            # Flux de modifications (apps.sync) : parcours par updated_at
+            models.Index(fields=['salon', 'updated_at', 'id']),
+            # Rappels (apps.reminders) : tranche date/heure, tous salons
+            models.Index(
+                fields=['date', 'time'],
+                condition=models.Q(status__in=ACTIVE_STATUSES),
+                name='appt_active_date_time_idx',
+            ),
         ]
     
     def __str__(self):
@@ -92,16 +137,123 @@ class Appointment(TenantAwareModel):
         """
         Validation : 
         - Client, Employee et Service doivent appartenir au même salon
+          (comparaison des identifiants : aucun salon n'est chargé)
         """
-        if self.client.salon != self.salon:
+        if self.client.salon_id != self.salon_id:
             raise ValueError("Le client doit appartenir au même salon")
-        if self.employee.salon != self.salon:
+        if self.employee.salon_id != self.salon_id:
             raise ValueError("L'employé doit appartenir au même salon")
-        if self.service.salon != self.salon:
+        if self.service.salon_id != self.salon_id:
             raise ValueError("Le service doit appartenir au même salon")
         
         # Définir la durée du service si non spécifiée
         if not self.duration:
             self.duration = self.service.duration
         
-        super().save(*args, **kwargs)
+        # Journal des statuts, dans la même transaction que l'écriture
+        previous_status = '' if self._state.adding else getattr(self, '_loaded_status', None)
+        update_fields = kwargs.get('update_fields')
+        changed = (
+            previous_status is not None
+            and previous_status != self.status
+            and (update_fields is None or 'status' in update_fields)
+        )
+        if changed:
+            using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+            with transaction.atomic(using=using):
+                super().save(*args, **kwargs)
+                record_transitions(self.salon_id, [(self.pk, previous_status, self.status)], using)
+        else:
+            super().save(*args, **kwargs)
+        if update_fields is None or 'status' in update_fields:
+            self._loaded_status = self.status
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Mémorise le statut lu, pour détecter les transitions à l'enregistrement"""
+        instance = super().from_db(db, field_names, values)
+        # None si le statut n'a pas été chargé (.only / .defer) : transition inconnue
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+
+class AppointmentStatusChange(TenantAwareModel):
+    """
+    Journal des changements de statut (ajout seul), écrit dans la
+    transaction de chaque transition. from_status vide : création.
+    """
+    # Pas de clé étrangère : la table appointments est partitionnée
+    appointment_id = models.BigIntegerField('Rendez-vous')
+    from_status = models.CharField('Ancien statut', max_length=20, blank=True)
+    to_status = models.CharField('Nouveau statut', max_length=20)
+    actor_id = models.BigIntegerField('Auteur', null=True, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'appointment_status_changes'
+        verbose_name = 'Changement de statut'
+        verbose_name_plural = 'Changements de statut'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['salon', 'created_at']),
+            models.Index(fields=['appointment_id', 'created_at']),
+            # Recalcul périodique des indicateurs (tous salons)
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.appointment_id} : {self.from_status or '-'} -> {self.to_status}"
+
+
+def record_transitions(salon_id, transitions, using=None):
+    """
+    Ajoute au journal des transitions [(rendez-vous, ancien, nouveau), ...]
+    (une insertion), avec l'auteur de la requête en cours.
+    """
+    actor_id = current_actor_id()
+    AppointmentStatusChange.objects.using(using).bulk_create([
+        AppointmentStatusChange(
+            salon_id=salon_id,
+            appointment_id=appointment_id,
+            from_status=from_status,
+            to_status=to_status,
+            actor_id=actor_id
+        )
+        for appointment_id, from_status, to_status in transitions
+    ])
+
+
+class AppointmentDailyStats(TenantAwareModel):
+    """
+    Indicateurs précalculés par jour de rendez-vous et par service
+    (conversion, confirmation rapide, absences), recalculés à partir du
+    journal des statuts (voir FunnelService).
+    """
+    date = models.DateField('Date')
+    service = models.ForeignKey(
+        'services.Service',
+        on_delete=models.CASCADE,
+        related_name='daily_stats',
+        verbose_name='Service'
+    )
+    booked = models.PositiveIntegerField('Réservés', default=0)
+    confirmed = models.PositiveIntegerField('Confirmés', default=0)
+    confirmed_quickly = models.PositiveIntegerField('Confirmés rapidement', default=0)
+    completed = models.PositiveIntegerField('Terminés', default=0)
+    no_show = models.PositiveIntegerField('Absences', default=0)
+    cancelled = models.PositiveIntegerField('Annulés', default=0)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'appointment_daily_stats'
+        verbose_name = 'Indicateurs journaliers'
+        verbose_name_plural = 'Indicateurs journaliers'
+        ordering = ['date']
+        constraints = [
+            models.UniqueConstraint(fields=['salon', 'date', 'service'], name='appt_daily_stats_unique'),
+        ]
+    
+    def __str__(self):
+        return f"{self.date} - {self.service_id}"
@@ -0,0 +1,56 @@
+"""
+Requêtes critiques de l'app Appointments
+Vérifiées par la commande check_query_plans
+"""
+from apps.core.query_plans import register_hot_query, run_viewset_queryset
+from .services import AppointmentService
+from .views import AppointmentViewSet
+
+
+register_hot_query(
+    'appointments.check_availability',
+    lambda ctx: AppointmentService.check_availability(
+        ctx['salon'], ctx['employee'], ctx['date'], '10:00', 30
+    ),
+    indexes=['appt_active_employee_idx'],
+    index_only=True,
+)
+
+register_hot_query(
+    'appointments.available_slots',
+    lambda ctx: AppointmentService.get_available_slots(
+        ctx['salon'], ctx['employee'], ctx['date']
+    ),
+    indexes=['appt_active_employee_idx'],
+    index_only=True,
+)
+
+
+def _list_appointments(params):
+    return lambda ctx: run_viewset_queryset(AppointmentViewSet, ctx, params(ctx))
+
+
+register_hot_query(
+    'appointments.list',
+    _list_appointments(lambda ctx: {}),
+)
+
+register_hot_query(
+    'appointments.list_by_status',
+    _list_appointments(lambda ctx: {'status': 'pending'}),
+)
+
+register_hot_query(
+    'appointments.list_by_date',
+    _list_appointments(lambda ctx: {'date': ctx['date'].isoformat()}),
+)
+
+register_hot_query(
+    'appointments.list_by_employee',
+    _list_appointments(lambda ctx: {'employee': ctx['employee'].id}),
+)
+
+register_hot_query(
+    'appointments.list_by_client',
+    _list_appointments(lambda ctx: {'client': ctx['client'].id}),
+)
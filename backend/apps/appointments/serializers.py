@@ -2,11 +2,17 @@
 Serializers for Appointments app
 """
 from rest_framework import serializers
+from django.conf import settings
 from django.utils import timezone
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.core.projections import ValuesSerializer, Column, SideLoad, as_datetime, as_decimal, as_iso, display, full_name
+from apps.clients.serializers import ClientSerializer
+from apps.employees.serializers import EmployeeSerializer
+from apps.services.serializers import ServiceSerializer
 from .models import Appointment
 
 
-class AppointmentSerializer(serializers.ModelSerializer):
+class AppointmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les rendez-vous"""
     
     # Relations en lecture seule
@@ -21,6 +27,11 @@ class AppointmentSerializer(serializers.ModelSerializer):
     )
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     
+    # Objets complets, sur demande (?expand=client,employee,service)
+    client_details = ClientSerializer(source='client', read_only=True)
+    employee_details = EmployeeSerializer(source='employee', read_only=True)
+    service_details = ServiceSerializer(source='service', read_only=True)
+    
     class Meta:
         model = Appointment
         fields = [
@@ -28,9 +39,56 @@ class AppointmentSerializer(serializers.ModelSerializer):
             'service', 'service_name', 'service_price',
             'date', 'time', 'duration', 'status', 'status_display',
             'notes', 'payment_method',
-            'created_at', 'updated_at'
+            'created_at', 'updated_at',
+            'client_details', 'employee_details', 'service_details'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['client_details', 'employee_details', 'service_details']
+        field_sources = {
+            'client_name': ('client.first_name', 'client.last_name'),
+            'employee_name': ('employee.user.first_name', 'employee.user.last_name'),
+        }
+
+
+class AppointmentValuesSerializer(ValuesSerializer):
+    """Équivalent values() d'AppointmentSerializer pour les listes"""
+    
+    columns = (
+        Column('id'),
+        Column('client'),
+        Column('client_name', 'client__first_name', 'client__last_name', format=full_name),
+        Column('employee'),
+        Column(
+            'employee_name', 'employee__user__first_name', 'employee__user__last_name',
+            format=full_name
+        ),
+        Column('service'),
+        Column('service_name', 'service__name'),
+        Column('service_price', 'service__price', format=as_decimal(2, 10)),
+        Column('date', format=as_iso),
+        Column('time', format=as_iso),
+        Column('duration'),
+        Column('status'),
+        Column('status_display', 'status', format=display(Appointment.STATUS_CHOICES)),
+        Column('notes'),
+        Column('payment_method'),
+        Column('created_at', format=as_datetime),
+        Column('updated_at', format=as_datetime),
+    )
+    sideloads = (
+        SideLoad(
+            'clients', 'client', ClientSerializer, ['id', 'full_name', 'phone'],
+            replaces=('client_name',)
+        ),
+        SideLoad(
+            'employees', 'employee', EmployeeSerializer, ['id', 'full_name'],
+            replaces=('employee_name',)
+        ),
+        SideLoad(
+            'services', 'service', ServiceSerializer, ['id', 'name', 'price', 'duration'],
+            replaces=('service_name', 'service_price')
+        ),
+    )
 
 
 class AppointmentCreateSerializer(serializers.ModelSerializer):
@@ -86,6 +144,20 @@ class AppointmentCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class AppointmentBulkStatusSerializer(serializers.Serializer):
+    """Changement de statut groupé (fermeture du salon...)"""
+    
+    ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False)
+    status = serializers.ChoiceField(choices=Appointment.STATUS_CHOICES)
+    
+    def validate_ids(self, value):
+        if len(value) > settings.APPOINTMENT_BULK_MAX:
+            raise serializers.ValidationError(
+                f"{settings.APPOINTMENT_BULK_MAX} rendez-vous au plus par requête"
+            )
+        return value
+
+
 class AppointmentUpdateStatusSerializer(serializers.Serializer):
     """Serializer pour la mise à jour du statut"""
     
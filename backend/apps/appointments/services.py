@@ -1,10 +1,25 @@
 """
 Business logic for Appointments app
 """
+from django.conf import settings
 from django.db import transaction
-from django.db.models import Count, Q
+from django.db.models import Count, F, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
 from datetime import datetime, timedelta, time as dt_time
-from .models import Appointment
+from apps.core import sharding
+from apps.core.sharding import tenant_atomic
+from .models import Appointment, ACTIVE_STATUSES, record_transitions, transition_sources
+
+
+# Horaires de travail par défaut (à adapter selon le planning)
+OPENING_TIME = dt_time(8, 0)
+CLOSING_TIME = dt_time(18, 0)
+SLOT_INTERVAL = 30  # Créneaux de 30 minutes
+
+
+def _minutes(value):
+    return value.hour * 60 + value.minute
 
 
 class AppointmentService:
@@ -18,7 +33,9 @@ class AppointmentService:
         - Les rendez-vous existants
         - Le planning de travail de l'employé
         """
-        # Conversion de time en objet time si nécessaire
+        # Conversion de date/time en objets date/time si nécessaire
+        if isinstance(date, str):
+            date = datetime.strptime(date, '%Y-%m-%d').date()
         if isinstance(time, str):
             time = datetime.strptime(time, '%H:%M').time()
         
@@ -32,7 +49,7 @@ class AppointmentService:
             salon=salon,
             employee=employee,
             date=date,
-            status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']
+            status__in=ACTIVE_STATUSES
         ).filter(
             Q(time__lt=end_time, time__gte=time) |
             Q(time__lte=time)  # RDV qui commence avant et peut se chevaucher
@@ -54,37 +71,48 @@ class AppointmentService:
         Returns:
             Liste des créneaux disponibles (format HH:MM)
         """
-        # Horaires de travail par défaut (à adapter selon le planning)
-        opening_time = dt_time(8, 0)
-        closing_time = dt_time(18, 0)
-        slot_interval = 30  # Créneaux de 30 minutes
-        
-        # Récupération des rendez-vous existants
-        existing_appointments = Appointment.objects.filter(
+        # Une seule requête : les rendez-vous actifs de la journée
+        busy = Appointment.objects.filter(
             salon=salon,
             employee=employee,
             date=date,
-            status__in=['PENDING', 'CONFIRMED', 'IN_PROGRESS']
+            status__in=ACTIVE_STATUSES
         ).values_list('time', 'duration')
         
-        # Génération des créneaux possibles
-        available_slots = []
-        current_time = opening_time
+        return [
+            slot.strftime('%H:%M')
+            for slot in AppointmentService.free_slots(busy, service_duration)
+        ]
+    
+    @staticmethod
+    def free_slots(busy, service_duration=SLOT_INTERVAL, not_before=None):
+        """
+        Créneaux libres d'une journée, calculés sans requête à partir des
+        rendez-vous actifs déjà chargés.
         
-        while current_time < closing_time:
-            is_available = AppointmentService.check_availability(
-                salon, employee, date, current_time, service_duration
-            )
-            
-            if is_available:
-                available_slots.append(current_time.strftime('%H:%M'))
-            
-            # Incrément du créneau
-            current_datetime = datetime.combine(date, current_time)
-            current_datetime += timedelta(minutes=slot_interval)
-            current_time = current_datetime.time()
+        Args:
+            busy: [(heure de début, durée en minutes), ...]
+            service_duration: Durée du service en minutes
+            not_before: heure minimale (ex. heure courante pour aujourd'hui)
         
-        return available_slots
+        Returns:
+            Liste des heures de début (time) des créneaux libres
+        """
+        intervals = [(_minutes(start), _minutes(start) + duration) for start, duration in busy]
+        start = _minutes(OPENING_TIME)
+        end = _minutes(CLOSING_TIME)
+        if not_before is not None:
+            # Premier créneau de la grille qui ne commence pas avant not_before
+            earliest = _minutes(not_before) + (1 if not_before.second or not_before.microsecond else 0)
+            if earliest > start:
+                start += -(-(earliest - start) // SLOT_INTERVAL) * SLOT_INTERVAL
+        
+        slots = []
+        for slot in range(start, end - service_duration + 1, SLOT_INTERVAL):
+            slot_end = slot + service_duration
+            if all(slot_end <= busy_start or busy_end <= slot for busy_start, busy_end in intervals):
+                slots.append(dt_time(slot // 60, slot % 60))
+        return slots
     
     @staticmethod
     def get_dashboard_stats(salon, date=None):
@@ -111,14 +139,274 @@ class AppointmentService:
     def cancel_appointment(appointment, reason=''):
         """
         Annule un rendez-vous.
-        Peut inclure une logique de notification.
+        Le client est prévenu en tâche de fond (apps.jobs).
         """
-        with transaction.atomic():
+        from apps.jobs.services import enqueue
+        from apps.webhooks.services import publish_status_change
+        
+        previous_status = appointment.status
+        with tenant_atomic(appointment.salon_id):
             appointment.status = 'CANCELLED'
             if reason:
                 appointment.notes = f"{appointment.notes}\nAnnulation: {reason}".strip()
             appointment.save()
+            publish_status_change(appointment, previous_status)
+            # Notification envoyée par le worker, après le commit
+            enqueue(
+                'appointments.notify_cancellation',
+                salon=appointment.salon_id,
+                appointment_id=appointment.pk
+            )
         
-        # TODO: Envoyer une notification au client
+        return appointment
+    
+    @staticmethod
+    def change_status(appointment, status, notes=None):
+        """
+        Change le statut d'un rendez-vous, avec les transitions autorisées
+        de bulk_transition (STATUS_TRANSITIONS) ; le statut actuel est relu
+        sous verrou. Une annulation passe par cancel_appointment (avis au
+        client). Retourne le rendez-vous à jour.
+        
+        Raises:
+            ValidationError: transition non autorisée
+        """
+        from apps.webhooks.services import publish_status_change
+        
+        with tenant_atomic(appointment.salon_id):
+            appointment = Appointment.objects.select_for_update().get(
+                salon_id=appointment.salon_id, pk=appointment.pk
+            )
+            previous_status = appointment.status
+            if status != previous_status and previous_status not in transition_sources(status):
+                raise ValidationError({
+                    'status': f"Transition {previous_status} -> {status} non autorisée"
+                })
+            if notes is not None:
+                appointment.notes = notes
+            if status == 'CANCELLED' and previous_status != 'CANCELLED':
+                return AppointmentService.cancel_appointment(appointment)
+            
+            appointment.status = status
+            appointment.save()
+            publish_status_change(appointment, previous_status)
         
         return appointment
+    
+    @staticmethod
+    def bulk_transition(salon, ids, status):
+        """
+        Passe plusieurs rendez-vous au statut demandé, en deux requêtes :
+        verrou des lignes (SELECT ... FOR UPDATE), puis un seul
+        UPDATE ... WHERE id IN (...) AND status IN (statuts sources).
+        Les rendez-vous introuvables ou dont le statut ne permet pas la
+        transition (STATUS_TRANSITIONS) sont écartés.
+        
+        L'UPDATE n'émet pas de signaux : updated_at, journal des statuts,
+        agrégats clients, tableau de bord, un événement groupé pour les
+        écrans, webhooks (une insertion) et avis d'annulation sont traités ici.
+        
+        Returns:
+            (rendez-vous modifiés, [{'id', 'reason'}, ...] écartés)
+        """
+        from apps.clients.services import ClientStatsService
+        from apps.dashboard.services import invalidate
+        from apps.jobs.services import enqueue
+        from apps.realtime import events
+        from apps.webhooks.services import appointment_payload, publish_many
+        
+        salon_id = getattr(salon, 'pk', salon)
+        using = sharding.db_for_salon(salon_id)
+        sources = transition_sources(status)
+        ids = list(dict.fromkeys(ids))
+        
+        with tenant_atomic(salon_id):
+            locked = {
+                appointment.pk: appointment
+                for appointment in Appointment.objects.select_for_update().filter(
+                    salon_id=salon_id, pk__in=ids
+                )
+            }
+            changed, skipped = [], []
+            for appointment_id in ids:
+                appointment = locked.get(appointment_id)
+                if appointment is None:
+                    skipped.append({'id': appointment_id, 'reason': 'Rendez-vous introuvable'})
+                elif appointment.status not in sources:
+                    skipped.append({
+                        'id': appointment_id,
+                        'reason': f"Transition {appointment.status} -> {status} non autorisée"
+                    })
+                else:
+                    changed.append(appointment)
+            if not changed:
+                return [], skipped
+            
+            now = timezone.now()
+            Appointment.objects.filter(
+                salon_id=salon_id,
+                pk__in=[appointment.pk for appointment in changed],
+                status__in=sources
+            ).update(status=status, updated_at=now)
+            record_transitions(
+                salon_id,
+                [(appointment.pk, appointment.status, status) for appointment in changed],
+                using
+            )
+            
+            payloads = []
+            for appointment in changed:
+                payload = appointment_payload(appointment)
+                payload.update(status=status, previous_status=appointment.status)
+                payloads.append(payload)
+                appointment.status = status
+                appointment.updated_at = now
+            
+            publish_many(salon_id, 'appointment.status_changed', payloads, using)
+            ClientStatsService.schedule({appointment.client_id for appointment in changed}, using)
+            if status == 'CANCELLED':
+                for appointment in changed:
+                    enqueue(
+                        'appointments.notify_cancellation',
+                        salon=salon_id,
+                        appointment_id=appointment.pk
+                    )
+            
+            event = events.build_bulk_event('appointment', salon_id, changed, now, status=status)
+            transaction.on_commit(lambda: invalidate(salon_id), using=using)
+            transaction.on_commit(lambda: events.publish(event, using), using=using)
+        
+        return changed, skipped
+
+
+class FunnelService:
+    """
+    Indicateurs de conversion et d'absence, précalculés par jour de
+    rendez-vous et par service (AppointmentDailyStats) à partir des
+    rendez-vous et du journal des statuts.
+    """
+    
+    COUNTERS = ('booked', 'confirmed', 'confirmed_quickly', 'completed', 'no_show', 'cancelled')
+    
+    @staticmethod
+    def rollup(salon_id, dates):
+        """
+        Recalcule les indicateurs d'un salon pour les jours donnés : une
+        requête groupée (date, service), l'heure de la première confirmation
+        venant du journal, puis remplacement des lignes existantes.
+        
+        Returns:
+            nombre de lignes (jour, service) écrites
+        """
+        from .models import AppointmentDailyStats, AppointmentStatusChange
+        
+        dates = sorted(set(dates))
+        if not dates:
+            return 0
+        using = sharding.db_for_salon(salon_id)
+        quick = timedelta(minutes=settings.METRICS_CONFIRMATION_MINUTES)
+        first_confirmation = AppointmentStatusChange.objects.using(using).filter(
+            salon_id=salon_id, appointment_id=OuterRef('pk'), to_status='CONFIRMED'
+        ).order_by('created_at').values('created_at')[:1]
+        
+        rows = (
+            Appointment.objects.using(using)
+            .filter(salon_id=salon_id, date__in=dates)
+            .annotate(confirmed_at=Subquery(first_confirmation))
+            .order_by()
+            .values('date', 'service_id')
+            .annotate(
+                booked=Count('pk'),
+                confirmed=Count('pk', filter=Q(confirmed_at__isnull=False)),
+                confirmed_quickly=Count('pk', filter=Q(confirmed_at__lte=F('created_at') + quick)),
+                completed=Count('pk', filter=Q(status='COMPLETED')),
+                no_show=Count('pk', filter=Q(status='NO_SHOW')),
+                cancelled=Count('pk', filter=Q(status='CANCELLED')),
+            )
+        )
+        stats = [AppointmentDailyStats(salon_id=salon_id, **row) for row in rows]
+        
+        with transaction.atomic(using=using):
+            AppointmentDailyStats.objects.using(using).filter(salon_id=salon_id, date__in=dates).delete()
+            AppointmentDailyStats.objects.using(using).bulk_create(stats)
+        return len(stats)
+    
+    @staticmethod
+    def rollup_recent(since):
+        """
+        Recalcule, sur chaque shard, les jours dont un rendez-vous a changé
+        de statut depuis `since` (index sur created_at du journal).
+        
+        Returns:
+            nombre de (salon, jour) recalculés
+        """
+        from .models import AppointmentStatusChange
+        
+        count = 0
+        for alias in sharding.tenant_shards():
+            changed = AppointmentStatusChange.objects.using(alias).filter(
+                created_at__gte=since
+            ).values('appointment_id')
+            touched = {}
+            for salon_id, date in (
+                Appointment.objects.using(alias)
+                .filter(pk__in=changed)
+                .order_by()
+                .values_list('salon_id', 'date')
+                .distinct()
+            ):
+                touched.setdefault(salon_id, set()).add(date)
+            for salon_id, dates in touched.items():
+                with sharding.use_shard(alias):
+                    FunnelService.rollup(salon_id, dates)
+                count += len(dates)
+        return count
+    
+    @staticmethod
+    def summary(salon, start, end):
+        """
+        Totaux et taux d'une période, globalement et par service, lus dans
+        les indicateurs précalculés (aucun parcours des rendez-vous).
+        """
+        from .models import AppointmentDailyStats
+        
+        rows = (
+            AppointmentDailyStats.objects.filter(salon=salon, date__range=[start, end])
+            .order_by()
+            .values('service_id', 'service__name')
+            .annotate(**{name: Sum(name) for name in FunnelService.COUNTERS})
+            .order_by('service__name')
+        )
+        totals = dict.fromkeys(FunnelService.COUNTERS, 0)
+        by_service = []
+        for row in rows:
+            counters = {name: row[name] or 0 for name in FunnelService.COUNTERS}
+            for name, value in counters.items():
+                totals[name] += value
+            by_service.append({
+                'service_id': row['service_id'],
+                'service_name': row['service__name'],
+                **counters,
+                **FunnelService.rates(counters)
+            })
+        return {
+            'period': {'start': start, 'end': end},
+            'totals': {**totals, **FunnelService.rates(totals)},
+            'by_service': by_service,
+        }
+    
+    @staticmethod
+    def rates(counters):
+        """Taux (en %) calculés sur les rendez-vous réservés"""
+        booked = counters['booked']
+        
+        def rate(value):
+            return round(100 * value / booked, 1) if booked else 0.0
+        
+        return {
+            'conversion_rate': rate(counters['completed']),
+            'confirmation_rate': rate(counters['confirmed']),
+            'quick_confirmation_rate': rate(counters['confirmed_quickly']),
+            'no_show_rate': rate(counters['no_show']),
+            'cancellation_rate': rate(counters['cancelled']),
+        }
@@ -0,0 +1,30 @@
+"""
+Tasks for Appointments app
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.jobs.registry import task
+
+
+@task('appointments.notify_cancellation')
+def notify_cancellation(appointment_id):
+    """Prévient le client de l'annulation de son rendez-vous (canaux des rappels)"""
+    from apps.reminders.services import CANCELLATION, ReminderService
+    
+    ReminderService.notify(appointment_id, CANCELLATION)
+
+
+@task('appointments.rollup_metrics', every=timedelta(minutes=settings.METRICS_ROLLUP_MINUTES))
+def rollup_metrics():
+    """
+    Recalcule les indicateurs des jours dont un rendez-vous a changé de
+    statut depuis le dernier passage (fenêtre doublée : un passage en retard
+    ne perd rien, le recalcul étant idempotent)
+    """
+    from .services import FunnelService
+    
+    since = timezone.now() - 2 * timedelta(minutes=settings.METRICS_ROLLUP_MINUTES)
+    FunnelService.rollup_recent(since)
@@ -0,0 +1,82 @@
+"""Changements de statut : mêmes règles (STATUS_TRANSITIONS) en masse et à l'unité"""
+import pytest
+from rest_framework.exceptions import ValidationError
+
+from apps.appointments.models import STATUS_TRANSITIONS, Appointment, AppointmentStatusChange
+from apps.appointments.services import AppointmentService
+from apps.jobs.models import Job
+
+
+TRANSITIONS = [(source, target) for source in STATUS_TRANSITIONS for target in dict(Appointment.STATUS_CHOICES)]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('source, target', TRANSITIONS)
+def test_bulk_transition_follows_state_machine(make_appointment, salon, source, target):
+    appointment = make_appointment(status=source)
+
+    changed, skipped = AppointmentService.bulk_transition(salon, [appointment.pk], target)
+
+    appointment.refresh_from_db()
+    if target in STATUS_TRANSITIONS[source]:
+        assert [item.pk for item in changed] == [appointment.pk]
+        assert skipped == []
+        assert appointment.status == target
+    else:
+        assert changed == []
+        assert skipped == [{'id': appointment.pk, 'reason': f"Transition {source} -> {target} non autorisée"}]
+        assert appointment.status == source
+
+
+@pytest.mark.django_db
+def test_bulk_transition_mixed_batch(make_appointment, salon):
+    pending = make_appointment()
+    confirmed = make_appointment(status='CONFIRMED')
+    completed = make_appointment(status='COMPLETED')
+
+    changed, skipped = AppointmentService.bulk_transition(
+        salon, [pending.pk, confirmed.pk, completed.pk, pending.pk, 0], 'CANCELLED'
+    )
+
+    assert sorted(item.pk for item in changed) == sorted([pending.pk, confirmed.pk])
+    assert [item['id'] for item in skipped] == [completed.pk, 0]
+    assert set(
+        AppointmentStatusChange.objects.filter(to_status='CANCELLED').values_list('appointment_id', 'from_status')
+    ) == {(pending.pk, 'PENDING'), (confirmed.pk, 'CONFIRMED')}
+    assert Job.objects.filter(name='appointments.notify_cancellation').count() == 2
+
+
+@pytest.mark.django_db
+def test_bulk_transition_other_salon(make_appointment):
+    from apps.core.models import Salon
+    other = Salon.objects.create(name='Autre', address='-', phone='-', email='autre@example.com')
+    appointment = make_appointment()
+
+    changed, skipped = AppointmentService.bulk_transition(other, [appointment.pk], 'CONFIRMED')
+
+    assert changed == []
+    assert skipped == [{'id': appointment.pk, 'reason': 'Rendez-vous introuvable'}]
+
+
+@pytest.mark.django_db
+def test_change_status_refuses_forbidden_transition(make_appointment):
+    appointment = make_appointment(status='COMPLETED')
+
+    with pytest.raises(ValidationError):
+        AppointmentService.change_status(appointment, 'PENDING')
+
+    appointment.refresh_from_db()
+    assert appointment.status == 'COMPLETED'
+
+
+@pytest.mark.django_db
+def test_change_status_cancellation_notifies_client(make_appointment):
+    appointment = make_appointment(status='CONFIRMED')
+
+    appointment = AppointmentService.change_status(appointment, 'CANCELLED', notes='Indisponible')
+
+    assert appointment.status == 'CANCELLED'
+    assert appointment.notes == 'Indisponible'
+    assert Job.objects.filter(
+        name='appointments.notify_cancellation', kwargs__appointment_id=appointment.pk
+    ).exists()
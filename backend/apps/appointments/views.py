@@ -6,21 +6,27 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.db.models import Q
+from django.utils.dateparse import parse_date
 from datetime import datetime, timedelta
 
 from .models import Appointment
 from .serializers import (
     AppointmentSerializer,
     AppointmentCreateSerializer,
-    AppointmentUpdateStatusSerializer
+    AppointmentValuesSerializer,
+    AppointmentUpdateStatusSerializer,
+    AppointmentBulkStatusSerializer
 )
-from .services import AppointmentService
+from .services import AppointmentService, FunnelService
 from apps.core.permissions import IsSalonEmployee
+from apps.core.mixins import ReplicaReadMixin, SparseFieldsMixin, ValuesListMixin
 
 
-class AppointmentViewSet(viewsets.ModelViewSet):
+class AppointmentViewSet(ReplicaReadMixin, ValuesListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet pour la gestion des rendez-vous"""
     permission_classes = [IsAuthenticated, IsSalonEmployee]
+    replica_actions = ('list', 'funnel')
+    values_serializer_class = AppointmentValuesSerializer
     
     def get_queryset(self):
         """Filtre par salon avec options de filtrage"""
@@ -74,14 +80,17 @@ class AppointmentViewSet(viewsets.ModelViewSet):
         """Rendez-vous du jour"""
         today = datetime.now().date()
         appointments = self.get_queryset().filter(date=today)
-        serializer = self.get_serializer(appointments, many=True)
         
-        return Response({
+        data = {
             'success': True,
             'date': today,
             'count': appointments.count(),
-            'appointments': serializer.data
-        })
+        }
+        if self.normalize_requested():
+            data['appointments'], data['included'] = self.normalized_data(appointments)
+        else:
+            data['appointments'] = self.get_serializer(appointments, many=True).data
+        return Response(data)
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
@@ -93,26 +102,62 @@ class AppointmentViewSet(viewsets.ModelViewSet):
             date__range=[today, end_date],
             status__in=['PENDING', 'CONFIRMED']
         )
-        serializer = self.get_serializer(appointments, many=True)
         
-        return Response({
+        data = {
             'success': True,
             'period': f"{today} - {end_date}",
             'count': appointments.count(),
-            'appointments': serializer.data
+        }
+        if self.normalize_requested():
+            data['appointments'], data['included'] = self.normalized_data(appointments)
+        else:
+            data['appointments'] = self.get_serializer(appointments, many=True).data
+        return Response(data)
+    
+    @action(detail=False, methods=['get'])
+    def funnel(self, request):
+        """
+        Conversion et absences d'une période (?start=AAAA-MM-JJ&end=AAAA-MM-JJ,
+        30 derniers jours par défaut), lues dans les indicateurs précalculés
+        """
+        if request.salon is None:
+            return Response({
+                'error': 'Aucun salon associé à cet utilisateur'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        end = datetime.now().date()
+        start = end - timedelta(days=29)
+        try:
+            if 'start' in request.query_params:
+                start = parse_date(request.query_params['start'])
+            if 'end' in request.query_params:
+                end = parse_date(request.query_params['end'])
+        except ValueError:
+            start = end = None
+        if start is None or end is None or start > end:
+            return Response({
+                'error': 'Période invalide (format attendu : AAAA-MM-JJ)'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            **FunnelService.summary(request.salon, start, end)
         })
     
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
-        """Met à jour le statut d'un rendez-vous"""
-        appointment = self.get_object()
+        """
+        Met à jour le statut d'un rendez-vous (transitions autorisées
+        uniquement, comme bulk_status ; CANCELLED prévient le client)
+        """
         serializer = AppointmentUpdateStatusSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        appointment.status = serializer.validated_data['status']
-        if 'notes' in serializer.validated_data:
-            appointment.notes = serializer.validated_data['notes']
-        appointment.save()
+        appointment = AppointmentService.change_status(
+            self.get_object(),
+            serializer.validated_data['status'],
+            notes=serializer.validated_data.get('notes')
+        )
         
         return Response({
             'success': True,
@@ -120,6 +165,63 @@ class AppointmentViewSet(viewsets.ModelViewSet):
             'appointment': AppointmentSerializer(appointment).data
         })
     
+    @action(detail=False, methods=['post'])
+    def bulk_status(self, request):
+        """
+        Change le statut de plusieurs rendez-vous (ex. COMPLETED / NO_SHOW
+        à la fermeture). Seules les transitions autorisées sont appliquées ;
+        les autres rendez-vous sont renvoyés dans `skipped`.
+        Corps : {"ids": [1, 2, ...], "status": "COMPLETED"}
+        """
+        serializer = AppointmentBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        changed, skipped = AppointmentService.bulk_transition(
+            request.salon,
+            serializer.validated_data['ids'],
+            serializer.validated_data['status']
+        )
+        
+        return Response({
+            'success': True,
+            'message': f"{len(changed)} rendez-vous mis à jour",
+            'updated': [appointment.pk for appointment in changed],
+            'skipped': skipped
+        })
+    
+    @action(detail=True, methods=['post'])
+    def checkout(self, request, pk=None):
+        """
+        Encaisse le rendez-vous et le clôture une fois soldé, en une
+        transaction (verrou du rendez-vous : un double envoi est refusé).
+        Corps : payment_method, amount (défaut : reste dû), transaction_id, notes.
+        En-tête Idempotency-Key optionnel.
+        """
+        from apps.payments.serializers import (
+            CheckoutPaymentSerializer, CheckoutResultSerializer, CheckoutSerializer
+        )
+        from apps.payments.services import PaymentService
+        from apps.payments.views import idempotent_response
+        
+        try:
+            appointment_id = int(pk)
+        except ValueError:
+            return Response({'error': 'Rendez-vous introuvable'}, status=status.HTTP_404_NOT_FOUND)
+        
+        serializer = CheckoutSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        def handler():
+            result = PaymentService.checkout(request.salon, appointment_id, **serializer.validated_data)
+            return (status.HTTP_201_CREATED if result['created'] else status.HTTP_200_OK), {
+                'success': True,
+                'message': 'Paiement enregistré' if result['created'] else 'Transaction déjà enregistrée',
+                'payment': CheckoutPaymentSerializer(result['payment']).data,
+                'appointment': CheckoutResultSerializer(result).data,
+            }
+        
+        return idempotent_response(request, f'appointments.checkout:{appointment_id}', handler)
+    
     @action(detail=False, methods=['post'])
     def check_availability(self, request):
         """Vérifie la disponibilité pour un créneau"""
@@ -0,0 +1,4 @@
+"""
+Archive app - Historique froid des rendez-vous et paiements
+"""
+default_app_config = 'apps.archive.apps.ArchiveConfig'
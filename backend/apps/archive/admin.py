@@ -0,0 +1,30 @@
+from django.contrib import admin
+from .models import ArchivedAppointment, ArchivedPayment
+
+
+@admin.register(ArchivedAppointment)
+class ArchivedAppointmentAdmin(admin.ModelAdmin):
+    list_display = ['id', 'client', 'employee', 'service', 'date', 'time', 'status', 'salon', 'archived_at']
+    list_filter = ['status', 'salon']
+    search_fields = ['client__first_name', 'client__last_name', 'service__name']
+    date_hierarchy = 'date'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedPayment)
+class ArchivedPaymentAdmin(admin.ModelAdmin):
+    list_display = ['id', 'client', 'amount', 'payment_method', 'status', 'payment_date', 'salon', 'archived_at']
+    list_filter = ['status', 'payment_method', 'salon']
+    search_fields = ['client__first_name', 'client__last_name', 'transaction_id']
+    date_hierarchy = 'payment_date'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,48 @@
+"""
+Archive les rendez-vous terminés/annulés/absents anciens et leurs paiements
+Usage: python manage.py archive_history [--days 365] [--batch-size 500] [--pause 0.2]
+Chaque shard est traité à tour de rôle.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core import sharding
+from apps.core.models import Salon
+from apps.archive.services import ArchiveService
+
+
+class Command(BaseCommand):
+    help = "Déplace l'historique ancien vers les tables d'archive, par lots courts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Âge minimal (jours), défaut : ARCHIVE_AFTER_DAYS')
+        parser.add_argument('--batch-size', type=int, help='Taille des lots, défaut : ARCHIVE_BATCH_SIZE')
+        parser.add_argument('--pause', type=float, default=0.0, help='Pause entre deux lots (secondes)')
+        parser.add_argument('--max-batches', type=int, help='Nombre maximal de lots pour cette exécution')
+        parser.add_argument('--salon', type=int, help='Limiter à un salon')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        salon = Salon.objects.get(id=options['salon']) if options['salon'] else None
+        shards = [sharding.db_for_salon(salon)] if salon else sharding.tenant_shards()
+
+        for alias in shards:
+            with sharding.use_shard(alias):
+                self._archive_shard(alias, salon, options)
+
+    def _archive_shard(self, alias, salon, options):
+        if options['dry_run']:
+            count = ArchiveService.archivable_appointments(options['days'], salon).count()
+            self.stdout.write(f"[{alias}] {count} rendez-vous archivables")
+            return
+
+        totals = ArchiveService.archive(
+            older_than_days=options['days'],
+            salon=salon,
+            batch_size=options['batch_size'],
+            pause=options['pause'],
+            max_batches=options['max_batches'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"[{alias}] {totals['appointments']} rendez-vous et {totals['payments']} paiements "
+            f"archivés en {totals['batches']} lot(s)"
+        ))
@@ -0,0 +1,232 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("clients", "0001_initial"),
+        ("core", "0001_initial"),
+        ("employees", "0001_initial"),
+        ("services", "0003_service_target"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedAppointment",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID d'origine"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Date de création")),
+                (
+                    "updated_at",
+                    models.DateTimeField(verbose_name="Dernière modification"),
+                ),
+                ("date", models.DateField(verbose_name="Date du rendez-vous")),
+                ("time", models.TimeField(verbose_name="Heure du rendez-vous")),
+                (
+                    "duration",
+                    models.PositiveIntegerField(verbose_name="Durée (minutes)"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "En attente"),
+                            ("CONFIRMED", "Confirmé"),
+                            ("IN_PROGRESS", "En cours"),
+                            ("COMPLETED", "Terminé"),
+                            ("CANCELLED", "Annulé"),
+                            ("NO_SHOW", "Absence"),
+                        ],
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                ("notes", models.TextField(blank=True, verbose_name="Notes")),
+                (
+                    "payment_method",
+                    models.CharField(
+                        blank=True, max_length=50, verbose_name="Mode de paiement"
+                    ),
+                ),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date d'archivage"
+                    ),
+                ),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_appointments",
+                        to="clients.client",
+                        verbose_name="Client",
+                    ),
+                ),
+                (
+                    "employee",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_appointments",
+                        to="employees.employee",
+                        verbose_name="Employé",
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+                (
+                    "service",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_appointments",
+                        to="services.service",
+                        verbose_name="Service",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rendez-vous archivé",
+                "verbose_name_plural": "Rendez-vous archivés",
+                "db_table": "archived_appointments",
+                "ordering": ["-date", "-time"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedPayment",
+            fields=[
+                (
+                    "id",
+                    models.BigIntegerField(
+                        primary_key=True, serialize=False, verbose_name="ID d'origine"
+                    ),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Date de création")),
+                (
+                    "updated_at",
+                    models.DateTimeField(verbose_name="Dernière modification"),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2, max_digits=10, verbose_name="Montant"
+                    ),
+                ),
+                (
+                    "payment_method",
+                    models.CharField(
+                        choices=[
+                            ("CASH", "Espèces"),
+                            ("MOBILE_MONEY", "Mobile Money"),
+                            ("BANK_CARD", "Carte bancaire"),
+                            ("BANK_TRANSFER", "Virement bancaire"),
+                            ("OTHER", "Autre"),
+                        ],
+                        max_length=20,
+                        verbose_name="Méthode de paiement",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "En attente"),
+                            ("COMPLETED", "Complété"),
+                            ("FAILED", "Échoué"),
+                            ("REFUNDED", "Remboursé"),
+                        ],
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                ("payment_date", models.DateTimeField(verbose_name="Date de paiement")),
+                (
+                    "transaction_id",
+                    models.CharField(
+                        blank=True, max_length=100, verbose_name="ID Transaction"
+                    ),
+                ),
+                ("notes", models.TextField(blank=True, verbose_name="Notes")),
+                (
+                    "archived_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date d'archivage"
+                    ),
+                ),
+                (
+                    "appointment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payments",
+                        to="archive.archivedappointment",
+                        verbose_name="Rendez-vous",
+                    ),
+                ),
+                (
+                    "client",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_payments",
+                        to="clients.client",
+                        verbose_name="Client",
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Paiement archivé",
+                "verbose_name_plural": "Paiements archivés",
+                "db_table": "archived_payments",
+                "ordering": ["-payment_date"],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="archivedappointment",
+            index=models.Index(
+                fields=["salon", "client", "date"],
+                name="archived_ap_salon_i_2f1ff1_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedappointment",
+            index=models.Index(
+                fields=["salon", "date"], name="archived_ap_salon_i_537d7a_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedpayment",
+            index=models.Index(
+                fields=["salon", "payment_date"], name="archived_pa_salon_i_17fedb_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedpayment",
+            index=models.Index(
+                fields=["salon", "client"], name="archived_pa_salon_i_e16d34_idx"
+            ),
+        ),
+    ]
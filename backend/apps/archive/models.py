@@ -0,0 +1,115 @@
+"""
+Models for Archive app
+Tables froides recevant les rendez-vous terminés/annulés/absents anciens
+et leurs paiements. Les identifiants d'origine sont conservés.
+"""
+from django.db import models
+from apps.core.models import TenantAwareModel
+from apps.core.managers import TenantManager
+from apps.appointments.models import Appointment
+from apps.payments.models import Payment
+
+
+class ArchivedAppointment(TenantAwareModel):
+    """
+    Rendez-vous archivé.
+    Mêmes champs que Appointment : AppointmentSerializer peut le sérialiser.
+    """
+    
+    STATUS_CHOICES = Appointment.STATUS_CHOICES
+    
+    # Identifiant et dates d'origine (pas d'auto_now lors de l'archivage)
+    id = models.BigIntegerField('ID d\'origine', primary_key=True)
+    created_at = models.DateTimeField('Date de création')
+    updated_at = models.DateTimeField('Dernière modification')
+    
+    client = models.ForeignKey(
+        'clients.Client',
+        on_delete=models.CASCADE,
+        related_name='archived_appointments',
+        verbose_name='Client'
+    )
+    employee = models.ForeignKey(
+        'employees.Employee',
+        on_delete=models.CASCADE,
+        related_name='archived_appointments',
+        verbose_name='Employé'
+    )
+    service = models.ForeignKey(
+        'services.Service',
+        on_delete=models.CASCADE,
+        related_name='archived_appointments',
+        verbose_name='Service'
+    )
+    
+    date = models.DateField('Date du rendez-vous')
+    time = models.TimeField('Heure du rendez-vous')
+    duration = models.PositiveIntegerField('Durée (minutes)')
+    status = models.CharField('Statut', max_length=20, choices=STATUS_CHOICES)
+    notes = models.TextField('Notes', blank=True)
+    payment_method = models.CharField('Mode de paiement', max_length=50, blank=True)
+    
+    archived_at = models.DateTimeField('Date d\'archivage', auto_now_add=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'archived_appointments'
+        verbose_name = 'Rendez-vous archivé'
+        verbose_name_plural = 'Rendez-vous archivés'
+        ordering = ['-date', '-time']
+        indexes = [
+            models.Index(fields=['salon', 'client', 'date']),
+            models.Index(fields=['salon', 'date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.client.get_full_name()} - {self.service.name} - {self.date} {self.time}"
+
+
+class ArchivedPayment(TenantAwareModel):
+    """Paiement archivé avec son rendez-vous"""
+    
+    PAYMENT_METHOD_CHOICES = Payment.PAYMENT_METHOD_CHOICES
+    STATUS_CHOICES = Payment.STATUS_CHOICES
+    
+    id = models.BigIntegerField('ID d\'origine', primary_key=True)
+    created_at = models.DateTimeField('Date de création')
+    updated_at = models.DateTimeField('Dernière modification')
+    
+    appointment = models.ForeignKey(
+        ArchivedAppointment,
+        on_delete=models.CASCADE,
+        related_name='payments',
+        verbose_name='Rendez-vous'
+    )
+    client = models.ForeignKey(
+        'clients.Client',
+        on_delete=models.CASCADE,
+        related_name='archived_payments',
+        verbose_name='Client'
+    )
+    
+    amount = models.DecimalField('Montant', max_digits=10, decimal_places=2)
+    payment_method = models.CharField('Méthode de paiement', max_length=20, choices=PAYMENT_METHOD_CHOICES)
+    status = models.CharField('Statut', max_length=20, choices=STATUS_CHOICES)
+    payment_date = models.DateTimeField('Date de paiement')
+    transaction_id = models.CharField('ID Transaction', max_length=100, blank=True)
+    notes = models.TextField('Notes', blank=True)
+    
+    archived_at = models.DateTimeField('Date d\'archivage', auto_now_add=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'archived_payments'
+        verbose_name = 'Paiement archivé'
+        verbose_name_plural = 'Paiements archivés'
+        ordering = ['-payment_date']
+        indexes = [
+            models.Index(fields=['salon', 'payment_date']),
+            models.Index(fields=['salon', 'client']),
+        ]
+    
+    def __str__(self):
+        return f"{self.client.get_full_name()} - {self.amount} - {self.get_payment_method_display()}"
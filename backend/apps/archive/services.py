@@ -0,0 +1,102 @@
+"""
+Business logic for Archive app
+Déplacement par lots de l'historique ancien vers les tables d'archive.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router, transaction
+from django.utils import timezone
+
+from apps.appointments.models import Appointment
+from apps.payments.models import Payment
+from .models import ArchivedAppointment, ArchivedPayment
+
+
+# Statuts définitifs : ces rendez-vous ne seront plus modifiés
+ARCHIVABLE_STATUSES = ['COMPLETED', 'CANCELLED', 'NO_SHOW']
+
+APPOINTMENT_FIELDS = [
+    'id', 'salon_id', 'created_at', 'updated_at', 'client_id', 'employee_id',
+    'service_id', 'date', 'time', 'duration', 'status', 'notes', 'payment_method',
+]
+
+PAYMENT_FIELDS = [
+    'id', 'salon_id', 'created_at', 'updated_at', 'appointment_id', 'client_id',
+    'amount', 'payment_method', 'status', 'payment_date', 'transaction_id', 'notes',
+]
+
+
+class ArchiveService:
+    """Service centralisant l'archivage de l'historique"""
+
+    @staticmethod
+    def archivable_appointments(older_than_days=None, salon=None):
+        """Rendez-vous terminés/annulés/absents plus anciens que l'âge configuré"""
+        if older_than_days is None:
+            older_than_days = settings.ARCHIVE_AFTER_DAYS
+        cutoff = timezone.localdate() - timedelta(days=older_than_days)
+
+        queryset = Appointment.objects.filter(
+            date__lt=cutoff,
+            status__in=ARCHIVABLE_STATUSES
+        )
+        if salon is not None:
+            queryset = queryset.filter(salon=salon)
+        return queryset
+
+    @staticmethod
+    def archive_batch(older_than_days=None, salon=None, batch_size=None):
+        """
+        Archive un lot de rendez-vous et leurs paiements dans une transaction courte.
+        Les lignes déjà verrouillées par une requête en cours sont ignorées
+        (SKIP LOCKED) : l'archivage ne bloque jamais le parcours de réservation.
+        Retourne (nombre de rendez-vous, nombre de paiements) archivés.
+        """
+        batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+
+        with transaction.atomic(using=router.db_for_write(Appointment)):
+            ids = list(
+                ArchiveService.archivable_appointments(older_than_days, salon)
+                .order_by('date', 'id')
+                .select_for_update(skip_locked=True)
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                return 0, 0
+
+            appointments = Appointment.objects.filter(id__in=ids).values(*APPOINTMENT_FIELDS)
+            payments = Payment.objects.filter(appointment_id__in=ids).values(*PAYMENT_FIELDS)
+
+            ArchivedAppointment.objects.bulk_create(
+                [ArchivedAppointment(**row) for row in appointments],
+                ignore_conflicts=True
+            )
+            archived_payments = ArchivedPayment.objects.bulk_create(
+                [ArchivedPayment(**row) for row in payments],
+                ignore_conflicts=True
+            )
+
+            Payment.objects.filter(appointment_id__in=ids).delete()
+            Appointment.objects.filter(id__in=ids).delete()
+
+        return len(ids), len(archived_payments)
+
+    @staticmethod
+    def archive(older_than_days=None, salon=None, batch_size=None, pause=0.0, max_batches=None):
+        """
+        Archive l'historique par lots successifs jusqu'à épuisement.
+        pause (secondes) laisse respirer la base entre deux lots.
+        """
+        totals = {'appointments': 0, 'payments': 0, 'batches': 0}
+        while max_batches is None or totals['batches'] < max_batches:
+            appointments, payments = ArchiveService.archive_batch(older_than_days, salon, batch_size)
+            if not appointments:
+                break
+            totals['appointments'] += appointments
+            totals['payments'] += payments
+            totals['batches'] += 1
+            if pause:
+                time.sleep(pause)
+        return totals
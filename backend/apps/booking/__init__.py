@@ -0,0 +1,4 @@
+"""
+Booking app - Réservation en ligne publique (vues asynchrones, ASGI)
+"""
+default_app_config = 'apps.booking.apps.BookingConfig'
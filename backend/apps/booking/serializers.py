@@ -0,0 +1,60 @@
+"""
+Serializers for Booking app
+"""
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.core.projections import Column, ValuesSerializer, full_name
+from apps.employees.models import Employee
+
+
+# Colonnes de ServiceValuesSerializer exposées sur le site public
+PUBLIC_SERVICE_FIELDS = [
+    'id', 'name', 'description', 'category', 'category_name',
+    'price', 'duration', 'duration_display', 'target', 'target_display', 'image',
+]
+
+
+def specialties_list(specialties):
+    """Employee.get_specialties_list()"""
+    return [s.strip() for s in specialties.split(',')] if specialties else []
+
+
+class PublicEmployeeValuesSerializer(ValuesSerializer):
+    """Coiffeurs réservables, sans les coordonnées internes"""
+    
+    columns = (
+        Column('id'),
+        Column('full_name', 'user__first_name', 'user__last_name', format=full_name),
+        Column('specialties_list', 'specialties', format=specialties_list),
+        Column('bio'),
+        Column('photo'),
+    )
+    
+    def format_photo(self, name):
+        """URL absolue de la photo, comme ImageField de DRF"""
+        if not name:
+            return None
+        url = Employee._meta.get_field('photo').storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
+class BookingSerializer(serializers.Serializer):
+    """Demande de rendez-vous d'un visiteur anonyme"""
+    
+    service = serializers.IntegerField()
+    employee = serializers.IntegerField()
+    date = serializers.DateField()
+    time = serializers.TimeField()
+    
+    first_name = serializers.CharField(max_length=100)
+    last_name = serializers.CharField(max_length=100)
+    phone = serializers.CharField(max_length=20)
+    email = serializers.EmailField(required=False, allow_null=True)
+    notes = serializers.CharField(required=False, allow_blank=True)
+    
+    def validate_date(self, value):
+        if value < timezone.localdate():
+            raise serializers.ValidationError("La date ne peut pas être dans le passé")
+        return value
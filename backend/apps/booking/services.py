@@ -0,0 +1,183 @@
+"""
+Business logic for Booking app
+Lectures en ORM asynchrone (afirst, itération async) : une requête en attente
+de la base ne bloque pas le processus, qui sert les autres visiteurs.
+L'écriture du rendez-vous reste synchrone (transaction sur le shard du salon),
+exécutée dans un thread via sync_to_async.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.utils import timezone
+
+from apps.appointments.models import ACTIVE_STATUSES, Appointment
+from apps.appointments.services import AppointmentService
+from apps.clients.models import Client
+from apps.core.models import Salon
+from apps.core.sharding import tenant_atomic
+from apps.employees.models import Employee
+from apps.services.models import Service
+from apps.services.serializers import ServiceValuesSerializer
+from .serializers import PUBLIC_SERVICE_FIELDS, PublicEmployeeValuesSerializer
+
+
+# Rôles proposés à la réservation (les réceptionnistes ne coiffent pas)
+BOOKABLE_ROLES = ['ADMIN', 'COIFFEUR']
+
+
+def _bookable_employees(salon):
+    return Employee.objects.filter(
+        salon=salon,
+        is_available=True,
+        user__is_active=True,
+        user__role__in=BOOKABLE_ROLES
+    )
+
+
+def _published_services(salon):
+    return Service.objects.filter(salon=salon, is_active=True, is_published=True)
+
+
+def _not_before(date):
+    """Aujourd'hui : pas de créneau déjà commencé"""
+    now = timezone.localtime()
+    return now.time() if date == now.date() else None
+
+
+class BookingService:
+    """Service de la réservation en ligne (coroutines)"""
+    
+    @staticmethod
+    async def get_salon(salon_id):
+        return await Salon.objects.filter(pk=salon_id, is_active=True).afirst()
+    
+    @staticmethod
+    async def get_service(salon, service_id):
+        return await _published_services(salon).filter(pk=service_id).afirst()
+    
+    @staticmethod
+    async def catalogue(salon, context=None):
+        """Services publiés, triés par catégorie"""
+        serializer = ServiceValuesSerializer(context=context, fields=PUBLIC_SERVICE_FIELDS)
+        rows = ServiceValuesSerializer.project(
+            _published_services(salon).order_by('category__name', 'name'),
+            PUBLIC_SERVICE_FIELDS
+        )
+        return [serializer.to_representation(row) async for row in rows]
+    
+    @staticmethod
+    async def employees(salon, context=None):
+        """Coiffeurs réservables"""
+        serializer = PublicEmployeeValuesSerializer(context=context)
+        rows = PublicEmployeeValuesSerializer.project(_bookable_employees(salon))
+        return [serializer.to_representation(row) async for row in rows]
+    
+    @staticmethod
+    async def _employee_names(employees):
+        rows = employees.values_list('pk', 'user__first_name', 'user__last_name')
+        return {pk: f"{first_name} {last_name}" async for pk, first_name, last_name in rows}
+    
+    @staticmethod
+    async def _busy_by_employee(salon, date, employees):
+        """{employee_id: [(heure, durée), ...]} en une requête pour tous les employés"""
+        busy = {}
+        rows = Appointment.objects.filter(
+            salon=salon,
+            date=date,
+            employee__in=employees.values('pk'),
+            status__in=ACTIVE_STATUSES
+        ).values_list('employee_id', 'time', 'duration')
+        async for employee_id, time, duration in rows:
+            busy.setdefault(employee_id, []).append((time, duration))
+        return busy
+    
+    @staticmethod
+    async def availability(salon, date, service, employee_id=None):
+        """
+        Créneaux libres de chaque coiffeur pour un service donné.
+        Les coiffeurs et leurs rendez-vous du jour sont lus par deux requêtes
+        lancées ensemble, quel que soit le nombre de coiffeurs ; les créneaux
+        sont ensuite calculés en mémoire (AppointmentService.free_slots).
+        """
+        employees = _bookable_employees(salon)
+        if employee_id is not None:
+            employees = employees.filter(pk=employee_id)
+        
+        names, busy = await asyncio.gather(
+            BookingService._employee_names(employees),
+            BookingService._busy_by_employee(salon, date, employees)
+        )
+        not_before = _not_before(date)
+        return [
+            {
+                'employee': employee_id,
+                'employee_name': employee_name,
+                'slots': [
+                    slot.strftime('%H:%M')
+                    for slot in AppointmentService.free_slots(
+                        busy.get(employee_id, []), service.duration, not_before
+                    )
+                ],
+            }
+            for employee_id, employee_name in names.items()
+        ]
+    
+    @staticmethod
+    async def book(salon, data):
+        """
+        Réserve un créneau. Renvoie (rendez-vous, None) ou (None, message).
+        """
+        service = await BookingService.get_service(salon, data['service'])
+        if service is None:
+            return None, "Service indisponible à la réservation"
+        employee = await _bookable_employees(salon).filter(pk=data['employee']).afirst()
+        if employee is None:
+            return None, "Coiffeur indisponible à la réservation"
+        
+        appointment = await sync_to_async(BookingService._create)(salon, service, employee, data)
+        if appointment is None:
+            return None, "Ce créneau n'est pas disponible pour cet employé"
+        return appointment, None
+    
+    @staticmethod
+    def _create(salon, service, employee, data):
+        """
+        Création synchrone dans une transaction. Le verrou sur la ligne de
+        l'employé sérialise les réservations concurrentes du même coiffeur.
+        """
+        with tenant_atomic(salon):
+            list(Employee.objects.select_for_update().filter(pk=employee.pk).values_list('pk'))
+            
+            busy = Appointment.objects.filter(
+                salon=salon,
+                employee=employee,
+                date=data['date'],
+                status__in=ACTIVE_STATUSES
+            ).values_list('time', 'duration')
+            slots = AppointmentService.free_slots(
+                busy, service.duration, _not_before(data['date'])
+            )
+            if data['time'].replace(second=0, microsecond=0) not in slots:
+                return None
+            
+            # Client retrouvé par son téléphone, créé sinon
+            client = Client.objects.filter(salon=salon, phone=data['phone']).first()
+            if client is None:
+                client = Client.objects.create(
+                    salon=salon,
+                    first_name=data['first_name'],
+                    last_name=data['last_name'],
+                    phone=data['phone'],
+                    email=data.get('email')
+                )
+            
+            return Appointment.objects.create(
+                salon=salon,
+                client=client,
+                employee=employee,
+                service=service,
+                date=data['date'],
+                time=data['time'],
+                duration=service.duration,
+                notes=data.get('notes', '')
+            )
@@ -0,0 +1,14 @@
+"""
+URLs for Booking app (réservation publique)
+"""
+from django.urls import path
+
+from . import views
+
+
+urlpatterns = [
+    path('salons/<int:salon_id>/services/', views.catalogue, name='booking-services'),
+    path('salons/<int:salon_id>/employees/', views.employees, name='booking-employees'),
+    path('salons/<int:salon_id>/availability/', views.availability, name='booking-availability'),
+    path('salons/<int:salon_id>/appointments/', views.book, name='booking-create'),
+]
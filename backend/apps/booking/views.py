@@ -0,0 +1,137 @@
+"""
+Views for Booking app
+Vues asynchrones du parcours de réservation public (visiteurs anonymes) :
+servies par le point d'entrée ASGI (config.asgi), un seul processus traite
+de nombreuses requêtes en attente de la base. Elles restent utilisables
+sous WSGI, exécutées de façon synchrone.
+"""
+import json
+
+from django.http import JsonResponse
+from django.utils.dateparse import parse_date
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+from rest_framework import status
+
+from apps.core import sharding
+from .serializers import BookingSerializer
+from .services import BookingService
+
+
+def _error(message, status_code):
+    return JsonResponse({'error': message}, status=status_code)
+
+
+async def _salon_or_404(salon_id):
+    """Salon actif ; ses données sont lues sur son shard"""
+    salon = await BookingService.get_salon(salon_id)
+    if salon is not None:
+        sharding.activate(salon)
+    return salon
+
+
+@require_GET
+async def catalogue(request, salon_id):
+    """
+    Services publiés du salon.
+    GET /api/v1/public/salons/<id>/services/
+    """
+    salon = await _salon_or_404(salon_id)
+    if salon is None:
+        return _error('Salon introuvable', status.HTTP_404_NOT_FOUND)
+    
+    return JsonResponse({
+        'success': True,
+        'services': await BookingService.catalogue(salon, {'request': request})
+    })
+
+
+@require_GET
+async def employees(request, salon_id):
+    """
+    Coiffeurs réservables du salon.
+    GET /api/v1/public/salons/<id>/employees/
+    """
+    salon = await _salon_or_404(salon_id)
+    if salon is None:
+        return _error('Salon introuvable', status.HTTP_404_NOT_FOUND)
+    
+    return JsonResponse({
+        'success': True,
+        'employees': await BookingService.employees(salon, {'request': request})
+    })
+
+
+@require_GET
+async def availability(request, salon_id):
+    """
+    Créneaux libres par coiffeur pour un service et une date.
+    GET /api/v1/public/salons/<id>/availability/?service=<id>&date=AAAA-MM-JJ[&employee=<id>]
+    """
+    salon = await _salon_or_404(salon_id)
+    if salon is None:
+        return _error('Salon introuvable', status.HTTP_404_NOT_FOUND)
+    
+    try:
+        date = parse_date(request.GET.get('date', ''))
+    except ValueError:
+        date = None
+    if date is None:
+        return _error('Date invalide (format attendu : AAAA-MM-JJ)', status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        service_id = int(request.GET['service'])
+        employee_id = int(request.GET['employee']) if 'employee' in request.GET else None
+    except (KeyError, ValueError):
+        return _error('Paramètres service/employee invalides', status.HTTP_400_BAD_REQUEST)
+    
+    service = await BookingService.get_service(salon, service_id)
+    if service is None:
+        return _error('Service indisponible à la réservation', status.HTTP_404_NOT_FOUND)
+    
+    return JsonResponse({
+        'success': True,
+        'date': date.isoformat(),
+        'service': service.pk,
+        'duration': service.duration,
+        'employees': await BookingService.availability(salon, date, service, employee_id)
+    })
+
+
+@csrf_exempt
+@require_POST
+async def book(request, salon_id):
+    """
+    Prise de rendez-vous par un visiteur.
+    POST /api/v1/public/salons/<id>/appointments/
+    """
+    salon = await _salon_or_404(salon_id)
+    if salon is None:
+        return _error('Salon introuvable', status.HTTP_404_NOT_FOUND)
+    
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return _error('Corps JSON invalide', status.HTTP_400_BAD_REQUEST)
+    
+    serializer = BookingSerializer(data=payload)
+    if not serializer.is_valid():
+        return JsonResponse({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+    
+    appointment, error = await BookingService.book(salon, serializer.validated_data)
+    if appointment is None:
+        return _error(error, status.HTTP_409_CONFLICT)
+    
+    return JsonResponse({
+        'success': True,
+        'message': 'Rendez-vous enregistré',
+        'appointment': {
+            'id': appointment.pk,
+            'date': appointment.date.isoformat(),
+            'time': appointment.time.strftime('%H:%M'),
+            'duration': appointment.duration,
+            'status': appointment.status,
+            'service': appointment.service_id,
+            'employee': appointment.employee_id,
+        }
+    }, status=status.HTTP_201_CREATED)
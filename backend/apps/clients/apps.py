@@ -5,3 +5,13 @@ class ClientsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.clients'
     verbose_name = 'Clients'
+    
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .services import refresh_on_write
+        
+        # Agrégats par client : recalcul des clients touchés après le commit
+        for sender in ('appointments.Appointment', 'payments.Payment'):
+            post_save.connect(refresh_on_write, sender=sender)
+            post_delete.connect(refresh_on_write, sender=sender)
+        post_save.connect(refresh_on_write, sender='clients.Client')
@@ -0,0 +1,35 @@
+"""
+Recalcule entièrement les agrégats des clients (visites, dépenses, dernière visite)
+Usage: python manage.py rebuild_client_stats [--salon 1] [--batch-size 500]
+À lancer après un import ou une correction directe en base ; en
+fonctionnement normal, les agrégats sont tenus à jour à chaque écriture.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.clients.services import ClientStatsService
+from apps.core import sharding
+from apps.core.models import Salon
+
+
+class Command(BaseCommand):
+    help = "Recalcule les agrégats de tous les clients"
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--salon', type=int, help='Salon concerné (tous par défaut)')
+        parser.add_argument('--batch-size', type=int, default=ClientStatsService.BATCH_SIZE)
+    
+    def handle(self, *args, **options):
+        salons = Salon.objects.order_by('pk')
+        if options['salon']:
+            salons = salons.filter(pk=options['salon'])
+            if not salons.exists():
+                raise CommandError(f"Salon {options['salon']} introuvable")
+        
+        total = 0
+        for salon in salons:
+            sharding.activate(salon)
+            count = ClientStatsService.rebuild(salon, options['batch_size'])
+            self.stdout.write(f"{salon.name} : {count} client(s)")
+            total += count
+        
+        self.stdout.write(self.style.SUCCESS(f"Agrégats recalculés pour {total} client(s)"))
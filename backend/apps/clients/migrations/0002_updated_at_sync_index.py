@@ -0,0 +1,21 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("clients", "0001_initial"),
+        ("core", "0002_salon_shard"),
+        ("employees", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="client",
+            index=models.Index(
+                fields=["salon", "updated_at", "id"], name="clients_salon_i_847126_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,255 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:25
+
+import datetime
+from decimal import Decimal
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def compute_stats(apps, schema_editor):
+    """Agrégats initiaux : requêtes groupées par client sur chaque table"""
+    # Base migrée (migrate --database shardN), pas celle du routeur
+    alias = schema_editor.connection.alias
+    Client = apps.get_model("clients", "Client")
+    ClientStats = apps.get_model("clients", "ClientStats")
+    Appointment = apps.get_model("appointments", "Appointment")
+    ArchivedAppointment = apps.get_model("archive", "ArchivedAppointment")
+    Payment = apps.get_model("payments", "Payment")
+    ArchivedPayment = apps.get_model("archive", "ArchivedPayment")
+    today = datetime.date.today()
+    active = ["PENDING", "CONFIRMED", "IN_PROGRESS"]
+
+    stats = {}
+
+    def entry(client_id):
+        return stats.setdefault(
+            client_id,
+            {
+                "visits": 0,
+                "completed_visits": 0,
+                "total_spent": Decimal("0"),
+                "last_visit": None,
+                "next_visit": None,
+                "favourite": (0, None, None),
+            },
+        )
+
+    for model in (Appointment, ArchivedAppointment):
+        rows = (
+            model.objects.using(alias)
+            .order_by()
+            .values("client_id")
+            .annotate(
+                visits=models.Count("id", filter=~models.Q(status="CANCELLED")),
+                completed=models.Count("id", filter=models.Q(status="COMPLETED")),
+                last=models.Max("date", filter=models.Q(status="COMPLETED")),
+            )
+        )
+        for row in rows.iterator():
+            item = entry(row["client_id"])
+            item["visits"] += row["visits"]
+            item["completed_visits"] += row["completed"]
+            if row["last"] and (
+                item["last_visit"] is None or row["last"] > item["last_visit"]
+            ):
+                item["last_visit"] = row["last"]
+
+    upcoming = (
+        Appointment.objects.using(alias)
+        .filter(status__in=active, date__gte=today)
+        .order_by()
+        .values("client_id")
+        .annotate(first=models.Min("date"))
+    )
+    for row in upcoming.iterator():
+        entry(row["client_id"])["next_visit"] = row["first"]
+
+    favourites = (
+        Appointment.objects.using(alias)
+        .exclude(status="CANCELLED")
+        .order_by()
+        .values("client_id", "service_id")
+        .annotate(total=models.Count("id"), latest=models.Max("date"))
+    )
+    for row in favourites.iterator():
+        item = entry(row["client_id"])
+        candidate = (row["total"], row["latest"], row["service_id"])
+        if candidate[:2] > item["favourite"][:2]:
+            item["favourite"] = candidate
+
+    for model in (Payment, ArchivedPayment):
+        rows = (
+            model.objects.using(alias)
+            .filter(status="COMPLETED")
+            .order_by()
+            .values("client_id")
+            .annotate(total=models.Sum("amount"))
+        )
+        for row in rows.iterator():
+            entry(row["client_id"])["total_spent"] += row["total"] or 0
+
+    empty = {
+        "visits": 0,
+        "completed_visits": 0,
+        "total_spent": Decimal("0"),
+        "last_visit": None,
+        "next_visit": None,
+        "favourite": (0, None, None),
+    }
+    batch = []
+    for client_id, salon_id in (
+        Client.objects.using(alias)
+        .order_by("id")
+        .values_list("id", "salon_id")
+        .iterator()
+    ):
+        item = stats.get(client_id, empty)
+        total, _, service_id = item["favourite"]
+        batch.append(
+            ClientStats(
+                salon_id=salon_id,
+                client_id=client_id,
+                visits=item["visits"],
+                completed_visits=item["completed_visits"],
+                total_spent=item["total_spent"],
+                last_visit=item["last_visit"],
+                next_visit=item["next_visit"],
+                favourite_service_id=service_id,
+                favourite_service_count=total,
+            )
+        )
+        if len(batch) >= 1000:
+            ClientStats.objects.using(alias).bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    ClientStats.objects.using(alias).bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0006_status_history"),
+        ("archive", "0001_initial"),
+        ("clients", "0002_updated_at_sync_index"),
+        ("core", "0002_salon_shard"),
+        ("payments", "0005_payment_ingestion"),
+        ("services", "0004_updated_at_sync_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ClientStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                (
+                    "visits",
+                    models.PositiveIntegerField(default=0, verbose_name="Rendez-vous"),
+                ),
+                (
+                    "completed_visits",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Rendez-vous terminés"
+                    ),
+                ),
+                (
+                    "total_spent",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        max_digits=12,
+                        verbose_name="Total dépensé",
+                    ),
+                ),
+                (
+                    "last_visit",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Dernière visite"
+                    ),
+                ),
+                (
+                    "next_visit",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Prochain rendez-vous"
+                    ),
+                ),
+                (
+                    "favourite_service_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Réservations du service préféré"
+                    ),
+                ),
+                (
+                    "client",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="clients.client",
+                        verbose_name="Client",
+                    ),
+                ),
+                (
+                    "favourite_service",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="services.service",
+                        verbose_name="Service préféré",
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Statistiques client",
+                "verbose_name_plural": "Statistiques clients",
+                "db_table": "client_stats",
+                "indexes": [
+                    models.Index(
+                        fields=["salon", "total_spent"],
+                        name="client_stat_salon_i_050c32_idx",
+                    ),
+                    models.Index(
+                        fields=["salon", "visits"],
+                        name="client_stat_salon_i_209d6c_idx",
+                    ),
+                    models.Index(
+                        fields=["salon", "last_visit"],
+                        name="client_stat_salon_i_3e2a05_idx",
+                    ),
+                    models.Index(
+                        fields=["next_visit"], name="client_stat_next_vi_347253_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(compute_stats, migrations.RunPython.noop),
+    ]
@@ -41,6 +41,8 @@ class Client(TenantAwareModel):
         indexes = [
             models.Index(fields=['salon', 'phone']),
             models.Index(fields=['salon', 'last_name']),
+            # Flux de modifications (apps.sync) : parcours par updated_at
+            models.Index(fields=['salon', 'updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -49,3 +51,52 @@ class Client(TenantAwareModel):
     def get_full_name(self):
         """Retourne le nom complet"""
         return f"{self.first_name} {self.last_name}"
+
+
+class ClientStats(TenantAwareModel):
+    """
+    Agrégats d'un client, tenus à jour à chaque écriture d'un de ses
+    rendez-vous ou paiements (voir ClientStatsService). Table séparée :
+    leur mise à jour ne touche pas clients.updated_at (flux apps.sync).
+    """
+    client = models.OneToOneField(
+        Client,
+        on_delete=models.CASCADE,
+        related_name='stats',
+        verbose_name='Client'
+    )
+    # Rendez-vous hors annulations, archives comprises
+    visits = models.PositiveIntegerField('Rendez-vous', default=0)
+    completed_visits = models.PositiveIntegerField('Rendez-vous terminés', default=0)
+    # Somme des paiements COMPLETED, archives comprises
+    total_spent = models.DecimalField('Total dépensé', max_digits=12, decimal_places=2, default=0)
+    last_visit = models.DateField('Dernière visite', null=True, blank=True)
+    next_visit = models.DateField('Prochain rendez-vous', null=True, blank=True)
+    # Service le plus réservé (hors annulations), sur l'historique non archivé
+    favourite_service = models.ForeignKey(
+        'services.Service',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Service préféré'
+    )
+    favourite_service_count = models.PositiveIntegerField('Réservations du service préféré', default=0)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'client_stats'
+        verbose_name = 'Statistiques client'
+        verbose_name_plural = 'Statistiques clients'
+        indexes = [
+            # Tris et filtres de la liste des clients
+            models.Index(fields=['salon', 'total_spent']),
+            models.Index(fields=['salon', 'visits']),
+            models.Index(fields=['salon', 'last_visit']),
+            # Rafraîchissement quotidien des prochains rendez-vous passés
+            models.Index(fields=['next_visit']),
+        ]
+    
+    def __str__(self):
+        return f"Statistiques {self.client_id}"
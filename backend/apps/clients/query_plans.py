@@ -0,0 +1,17 @@
+"""
+Requêtes critiques de l'app Clients
+Vérifiées par la commande check_query_plans
+"""
+from apps.core.query_plans import register_hot_query
+from .services import ClientService
+
+
+# icontains (UPPER(col) LIKE '%...%') n'est servi par aucun index B-tree :
+# le parcours des clients du salon est accepté, mais son coût reste borné
+# bien en dessous d'un Seq Scan de toute la table (~760 sur la référence).
+register_hot_query(
+    'clients.search',
+    lambda ctx: list(ClientService.search_clients(ctx['salon'], 'Nom1')[:20]),
+    seq_scan_tables=['clients'],
+    max_cost=500,
+)
@@ -2,10 +2,12 @@
 Serializers for Clients app
 """
 from rest_framework import serializers
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.core.projections import ValuesSerializer, Column, as_datetime, as_decimal, as_iso, full_name
 from .models import Client
 
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les clients"""
     
     full_name = serializers.SerializerMethodField()
@@ -14,19 +16,66 @@ class ClientSerializer(serializers.ModelSerializer):
         read_only=True
     )
     
+    # Agrégats (ClientStats), triables et filtrables dans la liste
+    visits = serializers.IntegerField(source='stats.visits', read_only=True)
+    completed_visits = serializers.IntegerField(source='stats.completed_visits', read_only=True)
+    total_spent = serializers.DecimalField(
+        source='stats.total_spent', max_digits=12, decimal_places=2, read_only=True
+    )
+    last_visit = serializers.DateField(source='stats.last_visit', read_only=True)
+    next_visit = serializers.DateField(source='stats.next_visit', read_only=True)
+    favourite_service = serializers.IntegerField(source='stats.favourite_service_id', read_only=True)
+    
     class Meta:
         model = Client
         fields = [
             'id', 'first_name', 'last_name', 'full_name', 'phone', 'email',
             'preferred_employee', 'preferred_employee_name', 'notes',
-            'is_active', 'created_at', 'updated_at'
+            'is_active', 'visits', 'completed_visits', 'total_spent',
+            'last_visit', 'next_visit', 'favourite_service',
+            'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        field_sources = {
+            'full_name': ('first_name', 'last_name'),
+            'preferred_employee_name': (
+                'preferred_employee.user.first_name', 'preferred_employee.user.last_name'
+            ),
+        }
     
     def get_full_name(self, obj):
         return obj.get_full_name()
 
 
+class ClientValuesSerializer(ValuesSerializer):
+    """Équivalent values() de ClientSerializer pour les listes"""
+    
+    columns = (
+        Column('id'),
+        Column('first_name'),
+        Column('last_name'),
+        Column('full_name', 'first_name', 'last_name', format=full_name),
+        Column('phone'),
+        Column('email'),
+        Column('preferred_employee'),
+        Column(
+            'preferred_employee_name',
+            'preferred_employee__user__first_name', 'preferred_employee__user__last_name',
+            format=full_name, omit_if_null=True
+        ),
+        Column('notes'),
+        Column('is_active'),
+        Column('visits', 'stats__visits'),
+        Column('completed_visits', 'stats__completed_visits'),
+        Column('total_spent', 'stats__total_spent', format=as_decimal(2, 12)),
+        Column('last_visit', 'stats__last_visit', format=as_iso),
+        Column('next_visit', 'stats__next_visit', format=as_iso),
+        Column('favourite_service', 'stats__favourite_service'),
+        Column('created_at', format=as_datetime),
+        Column('updated_at', format=as_datetime),
+    )
+
+
 class ClientCreateSerializer(serializers.ModelSerializer):
     """Serializer pour la création de clients"""
     
@@ -2,9 +2,15 @@
 Business logic for Clients app
 RÈGLE DRY : Toute la logique métier est centralisée ici
 """
-from django.db import transaction
-from django.db.models import Count, Sum
-from .models import Client
+from decimal import Decimal
+
+from django.db import connections, transaction
+from django.db.models import Count, DecimalField, IntegerField, Max, Min, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from apps.core import sharding
+from apps.core.sharding import tenant_atomic
+from .models import Client, ClientStats
 
 
 class ClientService:
@@ -19,7 +25,7 @@ class ClientService:
         Crée un client pour un salon.
         Gère les validations métier.
         """
-        with transaction.atomic():
+        with tenant_atomic(salon):
             client = Client.objects.create(
                 salon=salon,
                 first_name=data['first_name'],
@@ -32,55 +38,62 @@ class ClientService:
             return client
     
     @staticmethod
-    def get_client_history(client):
+    def get_client_history(client, include_archived=False):
         """
         Récupère l'historique des rendez-vous d'un client.
-        Retourne une QuerySet ordonnée.
+        Retourne une QuerySet ordonnée, ou une liste fusionnant les
+        rendez-vous actifs et archivés si include_archived=True.
         """
         from apps.appointments.models import Appointment
         
-        return Appointment.objects.filter(
+        history = Appointment.objects.filter(
+            salon=client.salon,
+            client=client
+        ).select_related(
+            'service', 'employee'
+        ).order_by('-date', '-time')
+        
+        if not include_archived:
+            return history
+        
+        from apps.archive.models import ArchivedAppointment
+        
+        archived = ArchivedAppointment.objects.filter(
             salon=client.salon,
             client=client
         ).select_related(
             'service', 'employee'
         ).order_by('-date', '-time')
+        
+        # Les archives sont toujours plus anciennes : concaténation ordonnée
+        return list(history) + list(archived)
     
     @staticmethod
     def get_client_stats(client):
         """
-        Calcule les statistiques d'un client.
-        - Nombre total de rendez-vous
-        - Montant total dépensé
-        - Service le plus utilisé
+        Statistiques d'un client, lues dans ses agrégats (une requête) :
+        - Nombre de rendez-vous (hors annulations) et de visites terminées
+        - Montant réellement payé (paiements COMPLETED)
+        - Dernière visite, prochain rendez-vous, service le plus réservé
+        Les agrégats couvrent l'historique archivé.
         """
-        from apps.appointments.models import Appointment
-        from django.db.models import Count, Sum
-        
-        appointments = Appointment.objects.filter(
-            salon=client.salon,
-            client=client
+        stats = (
+            ClientStats.objects.filter(client=client)
+            .select_related('favourite_service')
+            .first()
         )
-        
-        total_appointments = appointments.count()
-        
-        # Montant total (si paiement lié)
-        total_spent = appointments.aggregate(
-            total=Sum('service__price')
-        )['total'] or 0
-        
-        # Service le plus utilisé
-        most_used_service = appointments.values(
-            'service__name'
-        ).annotate(
-            count=Count('id')
-        ).order_by('-count').first()
+        if stats is None:
+            # Agrégats pas encore calculés (client créé à l'instant)
+            stats = next(iter(ClientStatsService.refresh([client.pk])), None)
         
         return {
-            'total_appointments': total_appointments,
-            'total_spent': float(total_spent),
-            'most_used_service': most_used_service['service__name'] if most_used_service else None,
-            'most_used_service_count': most_used_service['count'] if most_used_service else 0
+            'total_appointments': stats.visits if stats else 0,
+            'completed_appointments': stats.completed_visits if stats else 0,
+            'total_spent': float(stats.total_spent) if stats else 0.0,
+            'last_visit': stats.last_visit if stats else None,
+            'next_visit': stats.next_visit if stats else None,
+            'most_used_service': stats.favourite_service.name if stats and stats.favourite_service else None,
+            'most_used_service_count': stats.favourite_service_count if stats else 0
         }
     
     @staticmethod
@@ -98,3 +111,165 @@ class ClientService:
             Q(last_name__icontains=query) |
             Q(phone__icontains=query)
         )
+
+
+def _count(queryset):
+    """Sous-requête : nombre de lignes par client (0 si aucune)"""
+    counts = queryset.order_by().values('client').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def _aggregate(queryset, function, output_field=None):
+    """Sous-requête : agrégat par client (NULL si aucune ligne)"""
+    rows = queryset.order_by().values('client').annotate(value=function).values('value')
+    return Subquery(rows, output_field=output_field)
+
+
+def refresh_on_write(sender, instance, using=None, **kwargs):
+    """Handler post_save/post_delete (rendez-vous, paiements, clients)"""
+    client_id = instance.pk if sender is Client else instance.client_id
+    if sender is Client and not kwargs.get('created'):
+        return
+    ClientStatsService.schedule([client_id], using)
+
+
+class ClientStatsService:
+    """
+    Agrégats par client (ClientStats), tenus à jour de façon incrémentale :
+    chaque écriture d'un rendez-vous ou d'un paiement marque son client, et
+    seuls les clients marqués sont recalculés, en deux requêtes par lot
+    (un SELECT d'agrégats corrélés, un upsert), après le commit.
+    """
+    
+    BATCH_SIZE = 500
+    
+    @staticmethod
+    def schedule(client_ids, using=None):
+        """
+        Marque des clients à recalculer au commit de la transaction en cours
+        (immédiatement hors transaction). Les marques d'une transaction sont
+        regroupées : un lot d'écritures (archivage, changement groupé) donne
+        un seul recalcul. Une marque laissée par une transaction annulée est
+        recalculée au commit suivant, sans autre effet (calcul idempotent).
+        """
+        using = using or sharding.db_for_salon()
+        connection = connections[using]
+        pending = getattr(connection, 'client_stats_pending', None)
+        if pending is None:
+            pending = connection.client_stats_pending = set()
+        pending.update(client_ids)
+        transaction.on_commit(lambda: ClientStatsService.flush(using), using=using)
+    
+    @staticmethod
+    def flush(using):
+        """Recalcule les clients marqués sur une base (appelé au commit)"""
+        pending = getattr(connections[using], 'client_stats_pending', None)
+        if not pending:
+            return
+        client_ids = list(pending)
+        pending.clear()
+        for start in range(0, len(client_ids), ClientStatsService.BATCH_SIZE):
+            ClientStatsService.refresh(client_ids[start:start + ClientStatsService.BATCH_SIZE], using)
+    
+    @staticmethod
+    def refresh(client_ids, using=None):
+        """
+        Recalcule les agrégats de clients : un SELECT sur les clients avec
+        sous-requêtes corrélées (index (salon, client) des rendez-vous et
+        paiements), puis un upsert. Les clients supprimés sont ignorés.
+        Retourne les ClientStats écrits.
+        """
+        from apps.appointments.models import Appointment, ACTIVE_STATUSES
+        from apps.archive.models import ArchivedAppointment, ArchivedPayment
+        from apps.payments.models import Payment
+        
+        if not client_ids:
+            return []
+        using = using or sharding.db_for_salon()
+        today = timezone.localdate()
+        money = DecimalField(max_digits=12, decimal_places=2)
+        zero = Value(Decimal('0'), output_field=money)
+        
+        appointments = Appointment.objects.using(using).filter(client=OuterRef('pk'))
+        archived = ArchivedAppointment.objects.using(using).filter(client=OuterRef('pk'))
+        paid = Payment.objects.using(using).filter(client=OuterRef('pk'), status='COMPLETED')
+        archived_paid = ArchivedPayment.objects.using(using).filter(client=OuterRef('pk'), status='COMPLETED')
+        favourite = (
+            appointments.exclude(status='CANCELLED')
+            .order_by().values('service')
+            .annotate(total=Count('pk'), latest=Max('date'))
+            .order_by('-total', '-latest')
+        )
+        
+        rows = (
+            Client.objects.using(using)
+            .filter(pk__in=client_ids)
+            .order_by()
+            .annotate(
+                visits=_count(appointments.exclude(status='CANCELLED'))
+                + _count(archived.exclude(status='CANCELLED')),
+                completed_visits=_count(appointments.filter(status='COMPLETED'))
+                + _count(archived.filter(status='COMPLETED')),
+                total_spent=Coalesce(_aggregate(paid, Sum('amount'), money), zero)
+                + Coalesce(_aggregate(archived_paid, Sum('amount'), money), zero),
+                # Les archives sont toujours plus anciennes que la table active
+                last_visit=Coalesce(
+                    _aggregate(appointments.filter(status='COMPLETED'), Max('date')),
+                    _aggregate(archived.filter(status='COMPLETED'), Max('date')),
+                ),
+                next_visit=_aggregate(
+                    appointments.filter(status__in=ACTIVE_STATUSES, date__gte=today), Min('date')
+                ),
+                favourite_service_id=Subquery(favourite.values('service')[:1]),
+                favourite_service_count=Coalesce(Subquery(favourite.values('total')[:1]), Value(0)),
+            )
+            .values(
+                'pk', 'salon_id', 'visits', 'completed_visits', 'total_spent',
+                'last_visit', 'next_visit', 'favourite_service_id', 'favourite_service_count'
+            )
+        )
+        stats = [ClientStats(client_id=row.pop('pk'), **row) for row in rows]
+        if not stats:
+            return []
+        
+        ClientStats.objects.using(using).bulk_create(
+            stats,
+            update_conflicts=True,
+            unique_fields=['client'],
+            update_fields=[
+                'visits', 'completed_visits', 'total_spent', 'last_visit', 'next_visit',
+                'favourite_service', 'favourite_service_count', 'updated_at'
+            ]
+        )
+        return stats
+    
+    @staticmethod
+    def rebuild(salon, batch_size=None):
+        """Recalcul complet des agrégats d'un salon, par lots de clients"""
+        batch_size = batch_size or ClientStatsService.BATCH_SIZE
+        using = sharding.db_for_salon(salon)
+        client_ids = list(
+            Client.objects.using(using).filter(salon=salon).order_by('pk').values_list('pk', flat=True)
+        )
+        for start in range(0, len(client_ids), batch_size):
+            ClientStatsService.refresh(client_ids[start:start + batch_size], using)
+        return len(client_ids)
+    
+    @staticmethod
+    def refresh_past_visits():
+        """
+        Recalcule les clients dont le prochain rendez-vous est passé (aucune
+        écriture ne le signale), sur chaque shard.
+        """
+        today = timezone.localdate()
+        count = 0
+        for alias in sharding.tenant_shards():
+            client_ids = list(
+                ClientStats.objects.using(alias)
+                .filter(next_visit__lt=today)
+                .values_list('client_id', flat=True)
+            )
+            for start in range(0, len(client_ids), ClientStatsService.BATCH_SIZE):
+                ClientStatsService.refresh(client_ids[start:start + ClientStatsService.BATCH_SIZE], alias)
+            count += len(client_ids)
+        return count
@@ -0,0 +1,13 @@
+"""
+Tasks for Clients app
+"""
+from datetime import timedelta
+
+from apps.jobs.registry import task
+from .services import ClientStatsService
+
+
+@task('clients.refresh_past_visits', every=timedelta(days=1))
+def refresh_past_visits():
+    """Met à jour les clients dont le prochain rendez-vous est désormais passé"""
+    ClientStatsService.refresh_past_visits()
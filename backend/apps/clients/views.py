@@ -4,21 +4,48 @@ Views for Clients app
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Q, Count
+from django.db.models import F, Q, Count
+from django.utils.dateparse import parse_date
+from decimal import Decimal, InvalidOperation
 
 from .models import Client
-from .serializers import ClientSerializer, ClientCreateSerializer
+from .serializers import ClientSerializer, ClientCreateSerializer, ClientValuesSerializer
 from .services import ClientService
 from apps.core.permissions import IsSalonEmployee, IsSalonOwner
+from apps.core.mixins import ReplicaReadMixin, SparseFieldsMixin, ValuesListMixin
 
 
-class ClientViewSet(viewsets.ModelViewSet):
+# Tris de la liste (?ordering=-total_spent) : paramètre -> champ
+ORDERING_FIELDS = {
+    'last_name': 'last_name',
+    'created_at': 'created_at',
+    'visits': 'stats__visits',
+    'completed_visits': 'stats__completed_visits',
+    'total_spent': 'stats__total_spent',
+    'last_visit': 'stats__last_visit',
+    'next_visit': 'stats__next_visit',
+}
+
+# Filtres sur les agrégats : paramètre -> (lookup, conversion)
+STATS_FILTERS = {
+    'min_visits': ('stats__visits__gte', int),
+    'min_spent': ('stats__total_spent__gte', Decimal),
+    'last_visit_before': ('stats__last_visit__lt', parse_date),
+    'last_visit_after': ('stats__last_visit__gte', parse_date),
+    'favourite_service': ('stats__favourite_service', int),
+}
+
+
+class ClientViewSet(ReplicaReadMixin, ValuesListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des clients.
     Toutes les opérations sont filtrées par salon automatiquement.
     """
     permission_classes = [IsAuthenticated, IsSalonEmployee]
+    replica_actions = ('list', 'history', 'stats')
+    values_serializer_class = ClientValuesSerializer
     
     def get_queryset(self):
         """Filtre automatiquement par salon"""
@@ -48,7 +75,33 @@ class ClientViewSet(viewsets.ModelViewSet):
                 Q(phone__icontains=search)
             )
         
-        return queryset.select_related('preferred_employee', 'salon')
+        # Agrégats (visites, dépenses, dernière visite...)
+        for param, (lookup, convert) in STATS_FILTERS.items():
+            value = self.request.query_params.get(param)
+            if value is None:
+                continue
+            try:
+                value = convert(value)
+            except (ValueError, InvalidOperation):
+                value = None
+            if value is None:
+                raise ValidationError({param: 'Valeur invalide'})
+            queryset = queryset.filter(**{lookup: value})
+        
+        has_upcoming = self.request.query_params.get('has_upcoming', None)
+        if has_upcoming is not None:
+            queryset = queryset.filter(stats__next_visit__isnull=has_upcoming.lower() != 'true')
+        
+        # Tri
+        ordering = self.request.query_params.get('ordering', None)
+        if ordering:
+            field = ORDERING_FIELDS.get(ordering.lstrip('-'))
+            if field is None:
+                raise ValidationError({'ordering': f"Tri possible sur : {', '.join(ORDERING_FIELDS)}"})
+            expression = F(field).desc(nulls_last=True) if ordering.startswith('-') else F(field).asc(nulls_last=True)
+            queryset = queryset.order_by(expression, 'pk')
+        
+        return queryset.select_related('preferred_employee', 'salon', 'stats')
     
     def get_serializer_class(self):
         """Utilise des serializers différents selon l'action"""
@@ -64,7 +117,8 @@ class ClientViewSet(viewsets.ModelViewSet):
     def history(self, request, pk=None):
         """Récupère l'historique des rendez-vous d'un client"""
         client = self.get_object()
-        history = ClientService.get_client_history(client)
+        include_archived = request.query_params.get('include_archived', 'false').lower() == 'true'
+        history = ClientService.get_client_history(client, include_archived=include_archived)
         
         from apps.appointments.serializers import AppointmentSerializer
         serializer = AppointmentSerializer(history, many=True)
@@ -77,7 +131,7 @@ class ClientViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def stats(self, request, pk=None):
-        """Statistiques d'un client"""
+        """Statistiques d'un client (agrégats, historique archivé compris)"""
         client = self.get_object()
         stats = ClientService.get_client_stats(client)
         
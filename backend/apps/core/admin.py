@@ -4,10 +4,10 @@ from .models import Salon
 
 @admin.register(Salon)
 class SalonAdmin(admin.ModelAdmin):
-    list_display = ['name', 'phone', 'email', 'is_active', 'created_at']
-    list_filter = ['is_active', 'created_at']
+    list_display = ['name', 'phone', 'email', 'shard', 'is_active', 'created_at']
+    list_filter = ['is_active', 'shard', 'created_at']
     search_fields = ['name', 'email', 'phone']
-    readonly_fields = ['created_at']
+    readonly_fields = ['shard', 'created_at']
     
     fieldsets = (
         ('Informations de base', {
@@ -20,6 +20,6 @@ class SalonAdmin(admin.ModelAdmin):
             'fields': ('logo', 'primary_color')
         }),
         ('Statut', {
-            'fields': ('is_active', 'created_at')
+            'fields': ('is_active', 'shard', 'created_at')
         }),
     )
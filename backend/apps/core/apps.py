@@ -5,3 +5,11 @@ class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.core'
     verbose_name = 'Core (Multi-tenant)'
+    
+    def ready(self):
+        from django.db.models.signals import post_save
+        from apps.core import sharding
+        
+        # Copie des tables annuaire sur le shard de chaque salon
+        post_save.connect(sharding.mirror_on_save, sender='core.Salon')
+        post_save.connect(sharding.mirror_on_save, sender='accounts.User')
@@ -0,0 +1,19 @@
+"""
+Auteur des écritures de la requête en cours
+Renseigné avec le salon actif (TenantMiddleware, TenantJWTAuthentication) ;
+None pour les visiteurs anonymes et les tâches de fond.
+"""
+from contextvars import ContextVar
+
+
+_current_actor = ContextVar('current_actor', default=None)
+
+
+def set_actor(user):
+    """Déclare l'utilisateur à l'origine des écritures (ou None)"""
+    authenticated = user is not None and getattr(user, 'is_authenticated', False)
+    _current_actor.set(user.pk if authenticated else None)
+
+
+def current_actor_id():
+    return _current_actor.get()
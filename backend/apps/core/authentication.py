@@ -0,0 +1,27 @@
+"""
+Authentification JWT tenant-aware
+Complète le TenantMiddleware pour les requêtes authentifiées par token
+"""
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from apps.core import audit, sharding
+
+
+class TenantJWTAuthentication(JWTAuthentication):
+    """
+    Authentification JWT qui injecte le salon de l'utilisateur dans la requête.
+    
+    Le TenantMiddleware s'exécute avant l'authentification DRF : pour une
+    requête portant un token JWT, il ne voit qu'un utilisateur anonyme et
+    positionne request.salon = None. Cette classe corrige request.salon
+    (et le shard actif) dès que le token est validé.
+    """
+    
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            user, _ = result
+            request._request.salon = getattr(user, 'salon', None)
+            sharding.activate(request._request.salon)
+            audit.set_actor(user)
+        return result
@@ -0,0 +1,149 @@
+"""
+Requêtes groupées (POST /api/v1/batch/)
+Les sous-requêtes sont exécutées dans le processus, sans repasser par les
+middlewares ni par l'authentification JWT : l'utilisateur et le salon de la
+requête englobante sont réutilisés. Les lectures consécutives partent en
+parallèle ; une écriture attend les sous-requêtes précédentes et s'exécute
+seule, dans l'ordre de la liste. Les vues asynchrones et les flux
+(événements SSE...) ne sont pas exécutables ici : 400 pour la sous-requête.
+"""
+import contextvars
+import io
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework.permissions import SAFE_METHODS
+
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = '/api/v1/'
+BATCH_PATH = '/api/v1/batch/'
+
+# Méta propres à la requête englobante, jamais recopiés
+SKIPPED_META = {
+    'CONTENT_LENGTH', 'CONTENT_TYPE', 'HTTP_AUTHORIZATION',
+    'PATH_INFO', 'QUERY_STRING', 'REQUEST_METHOD', 'wsgi.input',
+}
+
+
+def build_request(parent, method, path, body=None):
+    """HttpRequest interne, déjà authentifiée, pour une sous-requête"""
+    url = urlsplit(path)
+    request = HttpRequest()
+    request.META = {key: value for key, value in parent.META.items() if key not in SKIPPED_META}
+    request.META.update(REQUEST_METHOD=method, PATH_INFO=url.path, QUERY_STRING=url.query)
+    request.method = method
+    request.path = request.path_info = url.path
+    request.GET = QueryDict(url.query)
+
+    content = b'' if body is None else json.dumps(body).encode()
+    request._body = content
+    request._stream = io.BytesIO(content)
+    request._read_started = False
+    if content:
+        request.META['CONTENT_TYPE'] = 'application/json'
+        request.META['CONTENT_LENGTH'] = str(len(content))
+
+    request.user = parent.user
+    request.salon = getattr(parent, 'salon', None)
+    # Lu par rest_framework.request.Request : pas de nouvelle authentification
+    request._force_auth_user = parent.user
+    request._force_auth_token = parent.auth
+    return request
+
+
+def _error(item, status_code, message):
+    return {'id': item['id'], 'status': status_code, 'body': {'error': message}}
+
+
+def execute(parent, item):
+    """Exécute une sous-requête, renvoie {id, status, body}"""
+    url = urlsplit(item['path'])
+    if not url.path.startswith(API_PREFIX) or url.path.startswith(BATCH_PATH):
+        return _error(item, 400, "Chemin non autorisé dans une requête groupée")
+    try:
+        match = resolve(url.path)
+    except Resolver404:
+        return _error(item, 404, "Ressource introuvable")
+    if iscoroutinefunction(match.func):
+        return _error(item, 400, "Vue asynchrone non disponible dans une requête groupée")
+
+    request = build_request(parent, item['method'], item['path'], item.get('body'))
+    try:
+        response = match.func(request, *match.args, **match.kwargs)
+        if response.streaming:
+            response.close()
+            return _error(item, 400, "Réponse en flux non disponible dans une requête groupée")
+        body = _body(response)
+    except Exception:
+        logger.exception("Échec de la sous-requête %s %s", item['method'], item['path'])
+        return _error(item, 500, "Erreur interne")
+    return {'id': item['id'], 'status': response.status_code, 'body': body}
+
+
+def _body(response):
+    """Corps d'une sous-réponse : data DRF, sinon contenu rendu (JSON ou texte)"""
+    body = getattr(response, 'data', None)
+    if body is not None:
+        return body
+    # Response DRF sans données (204 d'un DELETE...) : rendu avant lecture
+    if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+        response.render()
+    if not response.content:
+        return None
+    try:
+        return json.loads(response.content)
+    except ValueError:
+        return response.content.decode(response.charset or 'utf-8', 'replace')
+
+
+def _execute_in_thread(context, parent, item):
+    try:
+        return context.run(execute, parent, item)
+    finally:
+        # Connexions ouvertes par le thread du pool
+        connections.close_all()
+
+
+def run(parent, items):
+    """
+    Exécute les sous-requêtes et renvoie leurs réponses dans l'ordre reçu.
+    Le contexte (shard du salon, réplique) est recopié dans chaque thread.
+    """
+    responses = [None] * len(items)
+    reads = []
+
+    def flush_reads():
+        if len(reads) == 1:
+            responses[reads[0]] = execute(parent, items[reads[0]])
+        elif reads:
+            workers = min(len(reads), settings.BATCH_MAX_WORKERS)
+            # Contextes copiés depuis le thread de la requête
+            contexts = [contextvars.copy_context() for _ in reads]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = pool.map(
+                    _execute_in_thread,
+                    contexts,
+                    [parent] * len(reads),
+                    [items[index] for index in reads]
+                )
+                for index, result in zip(reads, results):
+                    responses[index] = result
+        reads.clear()
+
+    for index, item in enumerate(items):
+        if item['method'] in SAFE_METHODS:
+            reads.append(index)
+            continue
+        flush_reads()
+        responses[index] = execute(parent, item)
+    flush_reads()
+    return responses
@@ -2,10 +2,47 @@
 Custom exception handler
 Centralise la gestion des erreurs API
 """
+from rest_framework import status
+from rest_framework.exceptions import APIException
 from rest_framework.views import exception_handler
 from rest_framework.response import Response
 
 
+class SalonMigrationInProgress(APIException):
+    """Écriture refusée pendant le gel d'un salon en cours de migration de shard"""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Maintenance du salon en cours, réessayez dans quelques secondes.'
+    default_code = 'salon_migration_in_progress'
+
+
+class FullSyncRequired(APIException):
+    """Filigrane de synchronisation antérieur à la rétention des suppressions"""
+    status_code = status.HTTP_410_GONE
+    default_detail = 'Filigrane trop ancien : une synchronisation complète est nécessaire.'
+    default_code = 'full_sync_required'
+
+
+class IdempotencyKeyMismatch(APIException):
+    """Clé d'idempotence déjà utilisée pour une requête différente"""
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "Clé d'idempotence déjà utilisée avec une requête différente."
+    default_code = 'idempotency_key_mismatch'
+
+
+class CheckoutConflict(APIException):
+    """Encaissement refusé par l'état du rendez-vous (annulé, déjà réglé...)"""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Ce rendez-vous ne peut pas être encaissé."
+    default_code = 'checkout_conflict'
+
+
+class TransactionConflict(APIException):
+    """Numéro de transaction déjà enregistré pour un autre paiement"""
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Ce numéro de transaction est déjà enregistré."
+    default_code = 'transaction_conflict'
+
+
 def custom_exception_handler(exc, context):
     """
     Gestionnaire d'exceptions personnalisé pour l'API.
@@ -0,0 +1,173 @@
+"""
+Champs à la demande : ?fields= et ?expand=
+- ?fields=id,date,client_name : seuls ces champs sont renvoyés
+- ?expand=client : ajoute l'objet lié complet (client_details), pour les
+  champs déclarés dans Meta.expandable_fields ; ?expand= (vide) retire
+  aussi les expansions par défaut (Meta.default_expand)
+
+Côté vue, SparseFieldsMixin (apps.core.mixins) traduit les champs retenus en select_related()
+et only() : les colonnes et jointures inutiles ne sont pas lues en SQL.
+"""
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+DISPLAY_METHOD_RE = re.compile(r'^get_(?P<field>\w+)_display$')
+
+
+def parse_param(request, name):
+    """
+    Liste d'un paramètre séparé par des virgules, None s'il est absent.
+    Accepte une Request DRF ou un HttpRequest Django (contexte construit à la main).
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    value = getattr(request, 'query_params', request.GET).get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+class DynamicFieldsMixin:
+    """
+    Mixin de ModelSerializer : applique ?fields= et ?expand= de la requête
+    au serializer racine (jamais aux serializers imbriqués).
+
+    Meta (optionnel) :
+    - expandable_fields : champs imbriqués renvoyés seulement si demandés
+    - default_expand : expansions actives quand ?expand est absent
+    - field_sources : colonnes réellement lues par un champ calculé
+      (SerializerMethodField, méthode du modèle), pour only()/select_related
+
+    fields=[...] à la construction impose la liste des champs, quelle que
+    soit la requête.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        self._forced_fields = fields
+        super().__init__(*args, **kwargs)
+
+    def _is_root(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self._forced_fields is not None:
+            return {name: fields[name] for name in self._forced_fields}
+        if not self._is_root():
+            return fields
+
+        request = self.context.get('request')
+        requested = parse_param(request, 'fields')
+        explicit_expand = parse_param(request, 'expand')
+        expand = explicit_expand
+        if expand is None:
+            expand = getattr(self.Meta, 'default_expand', ())
+        expand = set(expand)
+
+        expanded = set()
+        for name in getattr(self.Meta, 'expandable_fields', ()):
+            field = fields.get(name)
+            if field is None:
+                continue
+            if name in expand or field.source in expand:
+                expanded.add(name)
+            else:
+                fields.pop(name)
+
+        if requested is not None:
+            keep = set(requested) | (expanded if explicit_expand else set())
+            for name in list(fields):
+                if name not in keep:
+                    fields.pop(name)
+        return fields
+
+
+# ---------------------------------------------------------------------------
+# Traduction en select_related / only
+# ---------------------------------------------------------------------------
+
+def _concrete_names(model):
+    return [field.name for field in model._meta.concrete_fields]
+
+
+def _collect(serializer, model, prefix, only, related):
+    """
+    Ajoute à only/related les colonnes et jointures nécessaires aux champs
+    du serializer. Retourne False si une source est impossible à résoudre
+    (relation inverse, source='*'...) : il faut alors renoncer à only().
+    """
+    sources = getattr(getattr(serializer, 'Meta', None), 'field_sources', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if name in sources:
+            paths = [source.split('.') for source in sources[name]]
+        elif isinstance(field, serializers.SerializerMethodField):
+            # Colonnes inconnues : tout le modèle
+            only.update(prefix + column for column in _concrete_names(model))
+            continue
+        elif field.source == '*':
+            return False
+        else:
+            paths = [field.source_attrs]
+
+        for attrs in paths:
+            if not _resolve(field, attrs, model, prefix, only, related):
+                return False
+    return True
+
+
+def _resolve(field, attrs, model, prefix, only, related):
+    current, path = model, prefix
+    for index, attr in enumerate(attrs):
+        last = index == len(attrs) - 1
+        try:
+            model_field = current._meta.get_field(attr)
+        except FieldDoesNotExist:
+            match = DISPLAY_METHOD_RE.match(attr)
+            if match and match.group('field') in _concrete_names(current):
+                only.add(path + match.group('field'))
+            else:
+                # Méthode ou propriété du modèle : toutes ses colonnes
+                only.update(path + column for column in _concrete_names(current))
+            return True
+
+        if not model_field.concrete or model_field.many_to_many:
+            return False
+        if not model_field.is_relation:
+            only.add(path + attr)
+            return True
+
+        only.add(path + attr)
+        if last and not isinstance(field, serializers.BaseSerializer):
+            # Clé primaire seule (PrimaryKeyRelatedField)
+            return True
+        related.add(path + attr)
+        current, path = model_field.related_model, f'{path}{attr}__'
+
+    # Serializer imbriqué sur la relation
+    return _collect(field, current, path, only, related)
+
+
+def optimize_queryset(queryset, serializer):
+    """
+    Restreint la requête aux colonnes et jointures utilisées par le
+    serializer (après application de ?fields/?expand).
+    """
+    only, related = set(), set()
+    if not _collect(serializer, queryset.model, '', only, related):
+        return queryset
+    queryset = queryset.select_related(None)
+    if related:
+        # select_related() sans argument suivrait toutes les clés étrangères
+        queryset = queryset.select_related(*sorted(related))
+    return queryset.only(*sorted(only))
+
@@ -0,0 +1,85 @@
+"""
+Compare le renderer/parser JSON standard de DRF et FastJSONRenderer/FastJSONParser
+sur de grandes listes de rendez-vous et de paiements.
+Usage: python manage.py benchmark_json [--rows 2000] [--repeat 20]
+
+Nécessite des données : python manage.py seed_benchmark_data
+"""
+import io
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.appointments.models import Appointment
+from apps.appointments.serializers import AppointmentSerializer
+from apps.core import sharding
+from apps.core.parsers import FastJSONParser
+from apps.core.renderers import FastJSONRenderer, orjson
+from apps.payments.models import Payment
+from apps.payments.serializers import PaymentSerializer
+
+
+def _best_of(repeat, fn):
+    """Meilleur temps (ms) sur repeat exécutions"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+class Command(BaseCommand):
+    help = "Mesure le gain du renderer/parser JSON rapide sur les listes volumineuses"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Lignes par liste')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--shard', default=sharding.DEFAULT_SHARD, help='Shard lu')
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson absent : FastJSONRenderer utilise json (stdlib)"))
+
+        rows = options['rows']
+        with sharding.use_shard(options['shard']):
+            payloads = {
+                'AppointmentSerializer': AppointmentSerializer(
+                    Appointment.objects.select_related('client', 'employee__user', 'service')[:rows],
+                    many=True
+                ).data,
+                'PaymentSerializer': PaymentSerializer(
+                    Payment.objects.select_related('client', 'appointment__service')[:rows],
+                    many=True
+                ).data,
+            }
+
+        for name, data in payloads.items():
+            if not data:
+                raise CommandError("Aucune donnée : lancer d'abord seed_benchmark_data")
+
+            reference = JSONRenderer().render(data)
+            fast = FastJSONRenderer().render(data)
+            if fast != reference:
+                raise CommandError(f"{name} : sortie différente du renderer standard")
+
+            timings = {
+                'render': (
+                    _best_of(options['repeat'], lambda: JSONRenderer().render(data)),
+                    _best_of(options['repeat'], lambda: FastJSONRenderer().render(data)),
+                ),
+                'parse': (
+                    _best_of(options['repeat'], lambda: JSONParser().parse(io.BytesIO(reference))),
+                    _best_of(options['repeat'], lambda: FastJSONParser().parse(io.BytesIO(reference))),
+                ),
+            }
+
+            self.stdout.write(f"{name} : {len(data)} lignes, {len(reference) / 1024:.0f} Ko")
+            for step, (standard, optimized) in timings.items():
+                self.stdout.write(
+                    f"  {step:<7} standard {standard:8.2f} ms   rapide {optimized:8.2f} ms   "
+                    f"x{standard / optimized:.1f}"
+                )
@@ -0,0 +1,101 @@
+"""
+Compare les ModelSerializer de lecture et leurs équivalents values()
+(ValuesSerializer) sur les listes : vérifie que le JSON produit est
+identique octet pour octet et mesure le temps requête + sérialisation.
+Usage: python manage.py benchmark_serializers [--rows 2000] [--repeat 5]
+
+Nécessite des données : python manage.py seed_benchmark_data
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from apps.appointments.models import Appointment
+from apps.appointments.serializers import AppointmentSerializer, AppointmentValuesSerializer
+from apps.clients.models import Client
+from apps.clients.serializers import ClientSerializer, ClientValuesSerializer
+from apps.core import sharding
+from apps.payments.models import Payment
+from apps.payments.serializers import PaymentSerializer, PaymentValuesSerializer
+from apps.services.models import Service
+from apps.services.serializers import ServiceSerializer, ServiceValuesSerializer
+
+
+# (nom, queryset des vues, serializer de lecture, équivalent values())
+CASES = [
+    (
+        'appointments',
+        lambda: Appointment.objects.select_related('client', 'employee', 'employee__user', 'service', 'salon'),
+        AppointmentSerializer,
+        AppointmentValuesSerializer,
+    ),
+    (
+        'payments',
+        lambda: Payment.objects.select_related('client', 'appointment', 'appointment__service', 'salon'),
+        PaymentSerializer,
+        PaymentValuesSerializer,
+    ),
+    (
+        'clients',
+        lambda: Client.objects.select_related('preferred_employee', 'salon'),
+        ClientSerializer,
+        ClientValuesSerializer,
+    ),
+    (
+        'services',
+        lambda: Service.objects.select_related('category', 'salon'),
+        ServiceSerializer,
+        ServiceValuesSerializer,
+    ),
+]
+
+
+def _best_of(repeat, fn):
+    """Meilleur temps (ms) sur repeat exécutions, et le dernier résultat"""
+    best = result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+class Command(BaseCommand):
+    help = "Vérifie et mesure les ValuesSerializer face aux ModelSerializer"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=2000, help='Lignes par liste')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--shard', default=sharding.DEFAULT_SHARD, help='Shard lu')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        context = {'request': APIRequestFactory().get('/', SERVER_NAME='localhost')}
+        renderer = JSONRenderer()
+
+        with sharding.use_shard(options['shard']):
+            for name, base_queryset, model_serializer, values_serializer in CASES:
+                # Départage par pk : l'ordre des ex aequo doit être le même des deux côtés
+                def queryset():
+                    qs = base_queryset()
+                    return qs.order_by(*qs.model._meta.ordering, 'pk')
+
+                model_ms, model_json = _best_of(options['repeat'], lambda: renderer.render(
+                    model_serializer(queryset()[:rows], many=True, context=context).data
+                ))
+                values_ms, values_json = _best_of(options['repeat'], lambda: renderer.render(
+                    values_serializer(values_serializer.project(queryset())[:rows], context=context).data
+                ))
+
+                if model_json == b'[]':
+                    raise CommandError("Aucune donnée : lancer d'abord seed_benchmark_data")
+                if values_json != model_json:
+                    raise CommandError(f"{name} : JSON différent du serializer de lecture")
+
+                self.stdout.write(
+                    f"{name:<13} {model_serializer.__name__:<22} {model_ms:8.1f} ms   "
+                    f"values() {values_ms:8.1f} ms   x{model_ms / values_ms:.1f}   (sortie identique)"
+                )
@@ -0,0 +1,111 @@
+"""
+Vérifie via EXPLAIN les plans d'exécution des requêtes critiques
+Usage:
+    python manage.py seed_benchmark_data
+    python manage.py check_query_plans [--salon ID] [--only NOM] [--update-snapshots]
+"""
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.models import Salon
+from apps.core.query_plans import get_hot_queries, check_index_usage, check_plan
+from .seed_benchmark_data import BENCHMARK_PREFIX
+
+
+class Command(BaseCommand):
+    help = "Vérifie les plans d'exécution des requêtes critiques (PostgreSQL)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--salon', type=int, help='Salon utilisé comme contexte')
+        parser.add_argument('--only', action='append', default=[], help='Limiter à une requête nommée')
+        parser.add_argument(
+            '--snapshot-dir',
+            default=str(Path(settings.BASE_DIR) / 'plan_snapshots'),
+            help='Dossier des snapshots de plans versionnés',
+        )
+        parser.add_argument(
+            '--update-snapshots',
+            action='store_true',
+            help='Réécrit les snapshots au lieu de les comparer',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError("Cette commande nécessite PostgreSQL (EXPLAIN FORMAT JSON)")
+
+        snapshot_dir = Path(options['snapshot_dir'])
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+
+        context = self.build_context(options['salon'])
+        hot_queries = get_hot_queries()
+        if options['only']:
+            hot_queries = {name: q for name, q in hot_queries.items() if name in options['only']}
+
+        failures = 0
+        for name, hot_query in hot_queries.items():
+            problems, snapshot = self.analyse(hot_query, context)
+
+            snapshot_path = snapshot_dir / f"{name}.json"
+            if options['update_snapshots']:
+                snapshot_path.write_text(json.dumps(snapshot, indent=2, ensure_ascii=False) + '\n')
+            elif not snapshot_path.exists():
+                problems.append(f"aucun snapshot ({snapshot_path.name}) : lancer avec --update-snapshots")
+            elif json.loads(snapshot_path.read_text())['plans'] != snapshot['plans']:
+                problems.append("la forme du plan diffère du snapshot (relancer avec --update-snapshots "
+                                "après revue puis comparer avec git diff)")
+
+            if problems:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"✗ {name} (coût {snapshot['max_cost']:.0f})"))
+                for problem in dict.fromkeys(problems):
+                    self.stdout.write(f"    {problem}")
+            else:
+                self.stdout.write(self.style.SUCCESS(f"✓ {name} (coût {snapshot['max_cost']:.0f})"))
+
+        if failures:
+            raise CommandError(f"{failures} requête(s) critique(s) en régression")
+
+    def analyse(self, hot_query, context):
+        """Analyse tous les SQL distincts émis par une requête critique"""
+        problems = []
+        shapes = []
+        max_cost = 0
+        for sql in dict.fromkeys(hot_query.capture_sql(context)):
+            problems.extend(check_index_usage(hot_query, sql))
+            shape, cost, plan_problems = check_plan(hot_query, sql)
+            problems.extend(plan_problems)
+            max_cost = max(max_cost, cost)
+            if shape not in shapes:
+                shapes.append(shape)
+        snapshot = {
+            'name': hot_query.name,
+            'max_cost': max_cost,
+            'cost_limit': hot_query.max_cost,
+            'plans': shapes,
+        }
+        return problems, snapshot
+
+    def build_context(self, salon_id):
+        """Objets de référence passés aux requêtes critiques"""
+        salons = Salon.objects.filter(employee_set__isnull=False, client_set__isnull=False)
+        if salon_id:
+            salons = salons.filter(id=salon_id)
+        elif salons.filter(name__startswith=BENCHMARK_PREFIX).exists():
+            salons = salons.filter(name__startswith=BENCHMARK_PREFIX)
+        salon = salons.first()
+        if salon is None:
+            raise CommandError("Aucun salon avec employés et clients : lancer seed_benchmark_data")
+
+        employee = salon.employee_set.select_related('user').first()
+        return {
+            'salon': salon,
+            'user': salon.users.filter(role='ADMIN').first() or employee.user,
+            'employee': employee,
+            'client': salon.client_set.first(),
+            'date': timezone.localdate(),
+        }
@@ -0,0 +1,81 @@
+"""
+Maintenance des partitions mensuelles (appointments, payments)
+Usage:
+    python manage.py manage_partitions --ahead 3
+    python manage.py manage_partitions --retain-months 24 [--drop] [--dry-run]
+
+À planifier quotidiennement (cron) pour que les partitions des mois à venir
+existent toujours avant les premières réservations. Chaque shard
+PostgreSQL est traité.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from apps.core import partitioning, sharding
+
+
+class Command(BaseCommand):
+    help = "Crée les partitions futures et détache/supprime les anciennes"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ahead', type=int, default=3, help='Nombre de mois futurs à pré-créer')
+        parser.add_argument(
+            '--retain-months',
+            type=int,
+            help='Détache les partitions plus anciennes que ce nombre de mois',
+        )
+        parser.add_argument(
+            '--drop',
+            action='store_true',
+            help='Supprime les partitions expirées au lieu de les archiver (archive_<nom>)',
+        )
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        aliases = [
+            alias for alias in sharding.tenant_shards()
+            if connections[alias].vendor == 'postgresql'
+        ]
+        if not aliases:
+            raise CommandError("Le partitionnement nécessite PostgreSQL")
+
+        for alias in aliases:
+            if len(aliases) > 1:
+                self.stdout.write(f"== {alias}")
+            self._manage(alias, options)
+
+    def _manage(self, alias, options):
+        conn = connections[alias]
+        tables = [t for t in partitioning.PARTITIONED_TABLES if partitioning.is_partitioned(t, conn)]
+        if not tables:
+            raise CommandError(f"Aucune table partitionnée sur {alias} : appliquer les migrations")
+
+        if options['dry_run']:
+            for table in tables:
+                months = list(partitioning.list_partitions(table, conn))
+                self.stdout.write(f"{table} : {len(months)} partitions ({months[0]} → {months[-1]})")
+        else:
+            with transaction.atomic(using=alias):
+                created = partitioning.ensure_partitions(options['ahead'], conn)
+            for name in created:
+                self.stdout.write(self.style.SUCCESS(f"Partition créée : {name}"))
+
+        if options['retain_months'] is not None:
+            for table, name in partitioning.expired_partitions(options['retain_months'], conn):
+                if options['dry_run']:
+                    self.stdout.write(f"À détacher : {name}")
+                    continue
+                with transaction.atomic(using=alias):
+                    archive = partitioning.detach_partition(table, name, drop=options['drop'], using=conn)
+                if archive:
+                    self.stdout.write(f"Partition {name} détachée → {archive}")
+                else:
+                    self.stdout.write(f"Partition {name} supprimée")
+
+        for table in tables:
+            orphans = partitioning.default_partition_rows(table, conn)
+            if orphans:
+                self.stdout.write(self.style.WARNING(
+                    f"{orphans} ligne(s) dans {table}_default : créer les partitions "
+                    "correspondantes après les avoir déplacées"
+                ))
@@ -0,0 +1,47 @@
+"""
+État et préparation des shards tenant
+Usage:
+    python manage.py manage_shards                     # répartition des salons
+    python manage.py manage_shards --init-sequences    # ids distincts entre shards
+    python manage.py manage_shards --mirror            # recopie l'annuaire
+
+Chaque shard reçoit le schéma complet : python manage.py migrate --database <alias>
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from apps.core import sharding
+from apps.core.models import Salon
+
+
+class Command(BaseCommand):
+    help = "Affiche la répartition des salons et prépare les shards"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--init-sequences',
+            action='store_true',
+            help='Espace les séquences d\'id de chaque shard (PostgreSQL)',
+        )
+        parser.add_argument(
+            '--mirror',
+            action='store_true',
+            help='Recopie salons et utilisateurs sur leur shard',
+        )
+
+    def handle(self, *args, **options):
+        if options['init_sequences']:
+            for alias in sharding.tenant_shards():
+                tables = sharding.align_sequences(alias)
+                self.stdout.write(f"{alias} : {len(tables)} séquence(s) alignée(s)")
+
+        salons = Salon.objects.using(sharding.DEFAULT_SHARD)
+        if options['mirror']:
+            for salon in salons.exclude(shard=sharding.DEFAULT_SHARD):
+                sharding.mirror_directory(salon, salon.shard)
+
+        load = dict(salons.order_by().values_list('shard').annotate(total=Count('id')))
+        for alias in sharding.tenant_shards():
+            self.stdout.write(f"{alias} : {load.pop(alias, 0)} salon(s)")
+        for alias, total in load.items():
+            self.stdout.write(self.style.WARNING(f"{alias} (non configuré) : {total} salon(s)"))
@@ -0,0 +1,54 @@
+"""
+Migration en ligne d'un salon vers un autre shard
+Usage:
+    python manage.py move_salon <salon_id> <shard> [--batch-size 500] [--keep-source]
+
+Le salon reste utilisable pendant la copie ; ses écritures ne sont gelées
+(réponse 503) que pendant la passe finale, quelques secondes.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import sharding
+from apps.core.models import Salon
+
+
+class Command(BaseCommand):
+    help = "Déplace les données d'un salon vers un autre shard sans interruption"
+
+    def add_arguments(self, parser):
+        parser.add_argument('salon_id', type=int)
+        parser.add_argument('shard', help='Alias de base cible (voir TENANT_SHARDS)')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--max-passes', type=int, default=5, help='Passes de rattrapage avant le gel')
+        parser.add_argument(
+            '--freeze-grace',
+            type=float,
+            default=2.0,
+            help='Attente (s) après le gel pour laisser finir les transactions en cours',
+        )
+        parser.add_argument(
+            '--keep-source',
+            action='store_true',
+            help='Conserve les données sur le shard source après la bascule',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            salon = Salon.objects.using(sharding.DEFAULT_SHARD).get(pk=options['salon_id'])
+        except Salon.DoesNotExist:
+            raise CommandError(f"Salon {options['salon_id']} introuvable")
+
+        try:
+            sharding.move_salon(
+                salon,
+                options['shard'],
+                batch_size=options['batch_size'],
+                max_passes=options['max_passes'],
+                freeze_grace=options['freeze_grace'],
+                keep_source=options['keep_source'],
+                log=self.stdout.write,
+            )
+        except sharding.ShardingError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(f"{salon} est maintenant sur {options['shard']}"))
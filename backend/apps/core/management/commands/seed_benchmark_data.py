@@ -0,0 +1,151 @@
+"""
+Génère un jeu de données volumineux pour l'analyse des plans d'exécution
+Usage: python manage.py seed_benchmark_data --salons 50 --appointments 2000
+"""
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.utils import timezone
+
+from apps.accounts.models import User
+from apps.appointments.models import Appointment
+from apps.clients.models import Client
+from apps.clients.services import ClientStatsService
+from apps.core import sharding
+from apps.core.models import Salon
+from apps.employees.models import Employee
+from apps.payments.models import Payment
+from apps.services.models import Service
+
+BENCHMARK_PREFIX = 'Benchmark'
+BATCH_SIZE = 5000
+
+
+class Command(BaseCommand):
+    help = "Crée des salons de référence volumineux (préfixe 'Benchmark')"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--salons', type=int, default=20)
+        parser.add_argument('--employees', type=int, default=8, help='Par salon')
+        parser.add_argument('--services', type=int, default=15, help='Par salon')
+        parser.add_argument('--clients', type=int, default=1000, help='Par salon')
+        parser.add_argument('--appointments', type=int, default=5000, help='Par salon')
+        parser.add_argument('--days', type=int, default=730, help="Profondeur d'historique")
+        parser.add_argument('--flush', action='store_true', help='Supprime les salons Benchmark existants')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+
+        benchmark_salons = Salon.objects.filter(name__startswith=BENCHMARK_PREFIX)
+        if options['flush']:
+            for salon in benchmark_salons.exclude(shard=sharding.DEFAULT_SHARD):
+                sharding.delete_salon_rows(salon.pk, salon.shard)
+            deleted, _ = benchmark_salons.delete()
+            self.stdout.write(f"{deleted} objets Benchmark supprimés")
+
+        offset = benchmark_salons.count()
+        for index in range(offset, offset + options['salons']):
+            salon = self.create_salon(index, options)
+            # Les données du salon vont sur son shard
+            with sharding.use_shard(salon.shard), transaction.atomic(using=salon.shard):
+                sharding.mirror_directory(salon, salon.shard)
+                self.seed_salon(salon, index, options)
+                # bulk_create sans signaux : agrégats clients calculés ici
+                ClientStatsService.rebuild(salon)
+            self.stdout.write(f"Salon {BENCHMARK_PREFIX} {index} créé ({salon.shard})")
+
+        for alias in sharding.tenant_shards():
+            connection = connections[alias]
+            if connection.vendor != 'postgresql':
+                continue
+            with connection.cursor() as cursor:
+                for table in ('salons', 'users', 'employees', 'services', 'clients', 'client_stats', 'appointments', 'payments'):
+                    cursor.execute(f'ANALYZE {table}')
+
+        self.stdout.write(self.style.SUCCESS('Jeu de données de référence prêt'))
+
+    def create_salon(self, index, options):
+        """Salon et utilisateurs (annuaire, base default)"""
+        with transaction.atomic():
+            salon = Salon.objects.create(
+                name=f"{BENCHMARK_PREFIX} {index}",
+                address='Libreville',
+                phone=f"+2410{index:07d}",
+                email=f"benchmark{index}@saascoiffure.ga",
+            )
+            User.objects.bulk_create([
+                User(
+                    email=f"benchmark{index}-{n}@saascoiffure.ga",
+                    first_name=f"Employé{n}",
+                    last_name=f"Salon{index}",
+                    salon=salon,
+                    role='ADMIN' if n == 0 else 'COIFFEUR',
+                    password='!',
+                )
+                for n in range(options['employees'])
+            ])
+        return salon
+
+    def seed_salon(self, salon, index, options):
+        users = salon.users.using(sharding.DEFAULT_SHARD).order_by('id')
+        employees = Employee.objects.bulk_create([
+            Employee(salon=salon, user=user) for user in users
+        ])
+        services = Service.objects.bulk_create([
+            Service(
+                salon=salon,
+                name=f"Prestation {n}",
+                price=Decimal(random.randrange(5000, 60000, 500)),
+                duration=random.choice([30, 45, 60, 90, 120]),
+                is_published=True,
+            )
+            for n in range(options['services'])
+        ])
+        clients = Client.objects.bulk_create([
+            Client(
+                salon=salon,
+                first_name=f"Prénom{n}",
+                last_name=f"Nom{n % 400}",
+                phone=f"+2416{index:03d}{n:05d}",
+            )
+            for n in range(options['clients'])
+        ], batch_size=BATCH_SIZE)
+
+        today = timezone.localdate()
+        appointments = []
+        for _ in range(options['appointments']):
+            day = today + timedelta(days=random.randint(-options['days'], 30))
+            service = random.choice(services)
+            if day < today:
+                status = random.choices(['COMPLETED', 'CANCELLED', 'NO_SHOW'], [75, 15, 10])[0]
+            else:
+                status = random.choices(['PENDING', 'CONFIRMED', 'CANCELLED'], [60, 35, 5])[0]
+            appointments.append(Appointment(
+                salon=salon,
+                client=random.choice(clients),
+                employee=random.choice(employees),
+                service=service,
+                date=day,
+                time=time(random.randint(8, 17), random.choice([0, 30])),
+                duration=service.duration,
+                status=status,
+            ))
+        appointments = Appointment.objects.bulk_create(appointments, batch_size=BATCH_SIZE)
+
+        Payment.objects.bulk_create([
+            Payment(
+                salon=salon,
+                appointment=appointment,
+                client=appointment.client,
+                amount=appointment.service.price,
+                payment_method=random.choice(['CASH', 'MOBILE_MONEY', 'BANK_CARD']),
+                status='COMPLETED',
+                payment_date=timezone.make_aware(datetime.combine(appointment.date, appointment.time)),
+            )
+            for appointment in appointments
+            if appointment.status == 'COMPLETED'
+        ], batch_size=BATCH_SIZE)
@@ -4,6 +4,8 @@ Injecte automatiquement le salon actif dans chaque requête
 """
 from django.utils.deprecation import MiddlewareMixin
 
+from apps.core import audit, sharding
+
 
 class TenantMiddleware(MiddlewareMixin):
     """
@@ -27,4 +29,12 @@ class TenantMiddleware(MiddlewareMixin):
             # Aucun salon pour les utilisateurs non authentifiés
             request.salon = None
         
+        # Shard du salon pour le routage des requêtes ORM
+        sharding.activate(request.salon)
+        audit.set_actor(getattr(request, 'user', None))
         return None
+    
+    def process_response(self, request, response):
+        sharding.deactivate()
+        audit.set_actor(None)
+        return response
@@ -0,0 +1,25 @@
+# Generated by Django 6.0.2 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="salon",
+            name="shard",
+            field=models.CharField(
+                blank=True,
+                default="default",
+                editable=False,
+                max_length=50,
+                verbose_name="Shard",
+            ),
+            preserve_default=False,
+        ),
+    ]
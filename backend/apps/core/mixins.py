@@ -0,0 +1,122 @@
+"""
+Mixins de ViewSets partagés
+"""
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from apps.core import routers
+from apps.core.fieldsets import optimize_queryset, parse_param
+
+
+class ReplicaReadMixin:
+    """
+    Envoie les actions de lecture déclarées dans replica_actions vers la
+    réplique (si configurée) et active la fenêtre sticky-primary après
+    chaque écriture réussie de l'utilisateur (lecture de ses propres écritures).
+    """
+    replica_actions = ()
+    
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = None
+        user_id = request.user.pk if request.user.is_authenticated else None
+        if (
+            request.method in SAFE_METHODS and
+            self.action in self.replica_actions and
+            routers.replica_allowed(user_id)
+        ):
+            self._replica_token = routers._read_alias.set(routers.replica_alias())
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            routers._read_alias.reset(token)
+            self._replica_token = None
+        
+        if (
+            request.method not in SAFE_METHODS and
+            response.status_code < 400 and
+            request.user.is_authenticated
+        ):
+            routers.mark_primary_sticky(request.user.pk)
+        
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class SparseFieldsMixin:
+    """
+    Quand ?fields ou ?expand est fourni, réduit le queryset aux colonnes et
+    jointures du serializer de lecture (voir apps.core.fieldsets).
+    """
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = self.request.query_params
+        if self.request.method in SAFE_METHODS and ('fields' in params or 'expand' in params):
+            queryset = optimize_queryset(queryset, self.get_serializer())
+        return queryset
+
+
+class ValuesListMixin:
+    """
+    Sert l'action list via values_serializer_class (voir apps.core.projections) :
+    une seule requête values(), sans instancier de modèles ni de champs DRF.
+    La sortie est identique à celle du serializer de lecture.
+    None (ou VALUES_LIST_SERIALIZERS=False) revient au ModelSerializer, tout
+    comme ?expand= (objets imbriqués). ?fields= restreint les colonnes lues.
+    
+    ?normalize=true (si le serializer déclare des sideloads) : lignes avec les
+    ids des objets liés et un dictionnaire 'included' commun.
+    """
+    values_serializer_class = None
+    
+    def normalize_requested(self):
+        return (
+            self.values_serializer_class is not None and
+            bool(self.values_serializer_class.sideloads) and
+            self.request.query_params.get('normalize', 'false').lower() == 'true'
+        )
+    
+    def normalized_data(self, queryset):
+        """(lignes, included) pour un queryset ou une page de lignes projetées"""
+        serializer_class = self.values_serializer_class.normalized()
+        fields = parse_param(self.request, 'fields')
+        context = self.get_serializer_context()
+        if hasattr(queryset, 'query'):
+            queryset = serializer_class.project(queryset, fields)
+        rows = serializer_class(queryset, context=context, fields=fields).data
+        return rows, serializer_class.included(rows, context)
+    
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.values_serializer_class
+        normalize = self.normalize_requested()
+        if not normalize and (
+            serializer_class is None or
+            not settings.VALUES_LIST_SERIALIZERS or
+            'expand' in request.query_params
+        ):
+            return super().list(request, *args, **kwargs)
+        
+        fields = parse_param(request, 'fields')
+        if normalize:
+            serializer_class = serializer_class.normalized()
+        queryset = serializer_class.project(
+            self.filter_queryset(self.get_queryset()), fields
+        )
+        
+        page = self.paginate_queryset(queryset)
+        if normalize:
+            rows, included = self.normalized_data(queryset if page is None else page)
+            if page is None:
+                return Response({'results': rows, 'included': included})
+            response = self.get_paginated_response(rows)
+            response.data['included'] = included
+            return response
+        
+        context = self.get_serializer_context()
+        if page is not None:
+            return self.get_paginated_response(
+                serializer_class(page, context=context, fields=fields).data
+            )
+        return Response(serializer_class(queryset, context=context, fields=fields).data)
@@ -28,6 +28,9 @@ class Salon(models.Model):
     created_at = models.DateTimeField('Date de création', auto_now_add=True)
     updated_at = models.DateTimeField('Dernière modification', auto_now=True)
     
+    # Base hébergeant les données du salon (voir apps.core.sharding)
+    shard = models.CharField('Shard', max_length=50, blank=True, editable=False)
+    
     class Meta:
         db_table = 'salons'
         verbose_name = 'Salon'
@@ -36,6 +39,13 @@ class Salon(models.Model):
     
     def __str__(self):
         return self.name
+    
+    def save(self, *args, **kwargs):
+        """Affecte un shard aux nouveaux salons"""
+        if not self.shard:
+            from apps.core.sharding import pick_shard
+            self.shard = pick_shard()
+        super().save(*args, **kwargs)
 
 
 class TenantAwareModel(models.Model):
@@ -0,0 +1,26 @@
+"""
+Parser JSON rapide
+Utilise orjson si le paquet est installé, sinon le JSONParser de DRF.
+"""
+from rest_framework import parsers
+from rest_framework.exceptions import ParseError
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(parsers.JSONParser):
+    """JSONParser basé sur orjson (NaN et Infinity sont refusés, comme en mode strict)"""
+    renderer_class = FastJSONRenderer
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        
+        encoding = parsers.get_encoding(parser_context or {})
+        content = stream.read()
+        try:
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding)
+            return orjson.loads(content)
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
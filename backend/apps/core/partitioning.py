@@ -0,0 +1,238 @@
+"""
+Partitionnement mensuel PostgreSQL des tables volumineuses
+Les tables appointments (par date) et payments (par payment_date) sont
+partitionnées par plage mensuelle. Les requêtes filtrées sur une période
+récente ne lisent ainsi qu'une ou deux partitions.
+
+Conventions :
+- partition mensuelle : <table>_pYYYYMM
+- partition par défaut : <table>_default (doit rester vide)
+- clé primaire : (id, colonne de partition) ; Django continue d'utiliser id
+"""
+import re
+from datetime import date, datetime, time
+
+from django.db import connection
+from django.utils import timezone
+
+
+# Table -> colonne de partitionnement
+PARTITIONED_TABLES = {
+    'appointments': 'date',
+    'payments': 'payment_date',
+}
+
+PARTITION_NAME_RE = re.compile(r'^(?P<table>\w+)_p(?P<year>\d{4})(?P<month>\d{2})$')
+
+
+def month_start(value):
+    """Premier jour du mois d'une date"""
+    return date(value.year, value.month, 1)
+
+
+def add_months(value, months):
+    """Décale le premier jour d'un mois de n mois"""
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month.year:04d}{month.month:02d}"
+
+
+def _bound_literal(table, month):
+    """Borne de partition : date pour appointments, minuit local pour payments"""
+    if table == 'appointments':
+        return f"'{month.isoformat()}'"
+    bound = timezone.make_aware(datetime.combine(month, time.min), timezone.get_default_timezone())
+    return f"'{bound.isoformat()}'"
+
+
+def is_partitioned(table, using=None):
+    """Vrai si la table est une table partitionnée PostgreSQL"""
+    conn = using or connection
+    if conn.vendor != 'postgresql':
+        return False
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND c.relnamespace = 'public'::regnamespace",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table, using=None):
+    """Retourne {mois: nom de partition} des partitions mensuelles attachées"""
+    conn = using or connection
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits i "
+            "JOIN pg_class parent ON parent.oid = i.inhparent "
+            "JOIN pg_class child ON child.oid = i.inhrelid "
+            "WHERE parent.relname = %s",
+            [table],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match and match.group('table') == table:
+            partitions[date(int(match.group('year')), int(match.group('month')), 1)] = name
+    return dict(sorted(partitions.items()))
+
+
+def create_partition(table, month, using=None):
+    """Crée la partition mensuelle d'une table si elle n'existe pas"""
+    conn = using or connection
+    month = month_start(month)
+    name = partition_name(table, month)
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+            f'FOR VALUES FROM ({_bound_literal(table, month)}) '
+            f'TO ({_bound_literal(table, add_months(month, 1))})'
+        )
+    return name
+
+
+def detach_partition(table, name, drop=False, using=None):
+    """
+    Détache une partition (les données restent dans une table autonome
+    renommée archive_<nom>) ou la supprime si drop=True.
+    """
+    conn = using or connection
+    with conn.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"')
+        if drop:
+            cursor.execute(f'DROP TABLE "{name}"')
+            return None
+        archive_name = f"archive_{name}"
+        cursor.execute(f'ALTER TABLE "{name}" RENAME TO "{archive_name}"')
+    return archive_name
+
+
+def default_partition_rows(table, using=None):
+    """Nombre de lignes tombées dans la partition par défaut"""
+    conn = using or connection
+    with conn.cursor() as cursor:
+        cursor.execute(f'SELECT count(*) FROM "{table}_default"')
+        return cursor.fetchone()[0]
+
+
+def convert_to_partitioned(schema_editor, model, months_ahead=3):
+    """
+    Remplace la table d'un modèle par une table partitionnée par mois.
+    Utilisé par les migrations ; sans effet hors PostgreSQL.
+    
+    Les données sont copiées, l'identité id reprend après le max existant,
+    puis les index (nommés et de clés étrangères) et contraintes FK du
+    modèle sont recréés sur la table parente.
+    """
+    conn = schema_editor.connection
+    if conn.vendor != 'postgresql':
+        return
+    
+    table = model._meta.db_table
+    column = PARTITIONED_TABLES[table]
+    legacy = f"{table}_unpartitioned"
+    
+    with conn.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{legacy}"')
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{legacy}" INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS INCLUDING IDENTITY) PARTITION BY RANGE ("{column}")'
+        )
+        cursor.execute(f'SELECT min("{column}"), max("{column}") FROM "{legacy}"')
+        first, last = cursor.fetchone()
+    
+    today = timezone.localdate()
+    first = month_start(timezone.localtime(first).date() if isinstance(first, datetime) else first or today)
+    last = month_start(timezone.localtime(last).date() if isinstance(last, datetime) else last or today)
+    month = min(first, month_start(today))
+    end = add_months(max(last, month_start(today)), months_ahead)
+    while month <= end:
+        create_partition(table, month, using=conn)
+        month = add_months(month, 1)
+    
+    with conn.cursor() as cursor:
+        cursor.execute(f'CREATE TABLE "{table}_default" PARTITION OF "{table}" DEFAULT')
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{legacy}"')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+            f'COALESCE((SELECT max(id) FROM "{table}"), 0) + 1, false)'
+        )
+        cursor.execute(f'DROP TABLE "{legacy}"')
+        cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY ("id", "{column}")')
+    
+    _create_model_indexes(schema_editor, model)
+
+
+def convert_to_regular(schema_editor, model):
+    """
+    Inverse de convert_to_partitioned (retour arrière des migrations) :
+    les lignes de toutes les partitions sont recopiées dans une table
+    ordinaire, clé primaire id, index et contraintes FK du modèle recréés.
+    """
+    conn = schema_editor.connection
+    if conn.vendor != 'postgresql':
+        return
+    
+    table = model._meta.db_table
+    partitioned = f"{table}_partitioned"
+    
+    with conn.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{table}" RENAME TO "{partitioned}"')
+        cursor.execute(
+            f'CREATE TABLE "{table}" (LIKE "{partitioned}" INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS INCLUDING IDENTITY)'
+        )
+        cursor.execute(f'INSERT INTO "{table}" SELECT * FROM "{partitioned}"')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+            f'COALESCE((SELECT max(id) FROM "{table}"), 0) + 1, false)'
+        )
+        # Supprime aussi les partitions
+        cursor.execute(f'DROP TABLE "{partitioned}"')
+        cursor.execute(f'ALTER TABLE "{table}" ADD PRIMARY KEY ("id")')
+    
+    _create_model_indexes(schema_editor, model)
+
+
+def _create_model_indexes(schema_editor, model):
+    """Index (nommés et de clés étrangères) et contraintes FK du modèle"""
+    for field in model._meta.local_fields:
+        if field.is_relation and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+        if field.db_index and not field.primary_key and not field.unique:
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[field]))
+    for index in model._meta.indexes:
+        schema_editor.execute(index.create_sql(model, schema_editor))
+
+
+def ensure_partitions(months_ahead=3, using=None):
+    """Crée les partitions du mois courant et des n mois suivants"""
+    created = []
+    start = month_start(timezone.localdate())
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(table, using):
+            continue
+        existing = list_partitions(table, using)
+        for offset in range(months_ahead + 1):
+            month = add_months(start, offset)
+            if month not in existing:
+                created.append(create_partition(table, month, using))
+    return created
+
+
+def expired_partitions(retain_months, using=None):
+    """Partitions entièrement antérieures à la fenêtre de rétention"""
+    cutoff = add_months(month_start(timezone.localdate()), -retain_months)
+    expired = []
+    for table in PARTITIONED_TABLES:
+        if not is_partitioned(table, using):
+            continue
+        for month, name in list_partitions(table, using).items():
+            if month < cutoff:
+                expired.append((table, name))
+    return expired
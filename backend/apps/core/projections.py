@@ -0,0 +1,210 @@
+"""
+Sérialiseurs de lecture à partir de queryset.values()
+Pour les listes volumineuses, ils évitent l'instanciation des modèles et le
+to_representation champ par champ des ModelSerializer. La sortie reproduit
+exactement celle du serializer de lecture correspondant (mêmes clés, même
+ordre, mêmes formats).
+
+Usage :
+    class ClientValuesSerializer(ValuesSerializer):
+        columns = (
+            Column('id'),
+            Column('full_name', 'first_name', 'last_name', format=full_name),
+            Column('created_at', format=as_datetime),
+        )
+
+Réponse normalisée (?normalize=true) : les sideloads déclarés remplacent les
+colonnes dénormalisées (noms, prix...) par l'id de l'objet, renvoyé une seule
+fois dans 'included' (un in_bulk par type).
+"""
+from decimal import Decimal, getcontext
+
+from django.utils import timezone
+
+
+# ---------------------------------------------------------------------------
+# Formateurs (mêmes formats que les champs DRF)
+# ---------------------------------------------------------------------------
+
+def as_iso(value):
+    """DateField / TimeField"""
+    return value.isoformat()
+
+
+def as_datetime(value):
+    """DateTimeField : fuseau courant, suffixe Z pour UTC"""
+    value = value.astimezone(timezone.get_current_timezone()).isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def as_decimal(decimal_places, max_digits=None):
+    """DecimalField (COERCE_DECIMAL_TO_STRING)"""
+    exponent = Decimal('.1') ** decimal_places
+    context = getcontext().copy()
+    if max_digits is not None:
+        context.prec = max_digits
+
+    def format_decimal(value):
+        return '{:f}'.format(value.quantize(exponent, context=context))
+    return format_decimal
+
+
+def display(choices):
+    """get_FOO_display() à partir d'une table de libellés précalculée"""
+    labels = {key: str(label) for key, label in choices}
+
+    def format_display(value):
+        return labels.get(value, value)
+    return format_display
+
+
+def full_name(first_name, last_name):
+    """get_full_name() des clients et utilisateurs"""
+    return f"{first_name} {last_name}"
+
+
+# ---------------------------------------------------------------------------
+# Sérialiseur
+# ---------------------------------------------------------------------------
+
+class Column:
+    """
+    Colonne de sortie.
+    - lookups : champs values() lus (défaut : le nom de la colonne)
+    - format : fonction appliquée aux valeurs lues ; à défaut, la méthode
+      format_<nom> du sérialiseur si elle existe
+    - omit_if_null : colonne absente de la sortie quand la relation
+      traversée est nulle (comportement DRF pour source='relation.champ')
+    """
+
+    def __init__(self, name, *lookups, format=None, omit_if_null=False):
+        self.name = name
+        self.lookups = lookups or (name,)
+        self.format = format
+        self.omit_if_null = omit_if_null
+
+
+class SideLoad:
+    """
+    Relation renvoyée à part, dans included[key], en réponse normalisée.
+    - column : colonne d'id des lignes (ajoutée si absente, lue via lookup)
+    - serializer_class / fields : représentation des objets référencés
+      (serializer avec DynamicFieldsMixin)
+    - replaces : colonnes dénormalisées retirées des lignes
+    """
+
+    def __init__(self, key, column, serializer_class, fields, replaces=(), lookup=None):
+        self.key = key
+        self.column = column
+        self.lookup = lookup or column
+        self.serializer_class = serializer_class
+        self.fields = fields
+        self.replaces = replaces
+
+    def load(self, ids, context=None):
+        """{id: objet sérialisé}, en une requête"""
+        from apps.core.fieldsets import optimize_queryset
+
+        model = self.serializer_class.Meta.model
+        serializer = self.serializer_class(fields=self.fields, context=context)
+        objects = optimize_queryset(
+            model._default_manager.order_by(), serializer
+        ).in_bulk(list(ids))
+        data = self.serializer_class(
+            list(objects.values()), many=True, fields=self.fields, context=context
+        ).data
+        return {item['id']: item for item in data}
+
+
+class ValuesSerializer:
+    """
+    Sérialiseur en lecture seule de lignes values().
+    Accepte un QuerySet (projeté automatiquement) ou une liste de lignes déjà
+    projetées (page de pagination).
+    fields restreint la sortie, et donc les colonnes lues, à ces colonnes.
+    """
+    columns = ()
+    sideloads = ()
+
+    def __init__(self, instance=None, many=True, context=None, fields=None):
+        self.instance = instance
+        self.context = context or {}
+        self.fields = fields
+        self._plan = [
+            (
+                column.name,
+                column.lookups,
+                column.format or getattr(self, f'format_{column.name}', None),
+                column.omit_if_null,
+            )
+            for column in self.selected_columns(fields)
+        ]
+
+    @classmethod
+    def selected_columns(cls, fields=None):
+        if fields is None:
+            return cls.columns
+        fields = set(fields)
+        return [column for column in cls.columns if column.name in fields]
+
+    @classmethod
+    def lookups(cls, fields=None):
+        """Champs à demander à values(), sans doublons"""
+        return list(dict.fromkeys(
+            lookup for column in cls.selected_columns(fields) for lookup in column.lookups
+        ))
+
+    @classmethod
+    def project(cls, queryset, fields=None):
+        # values() ne joint que les relations des colonnes retenues
+        return queryset.values(*cls.lookups(fields) or ['pk'])
+
+    @classmethod
+    def normalized(cls):
+        """Variante des lignes pour la réponse normalisée (ids à la place des noms)"""
+        if '_normalized' not in cls.__dict__:
+            replaced = {name for sideload in cls.sideloads for name in sideload.replaces}
+            names = {column.name for column in cls.columns}
+            columns = tuple(
+                column for column in cls.columns if column.name not in replaced
+            ) + tuple(
+                Column(sideload.column, sideload.lookup)
+                for sideload in cls.sideloads if sideload.column not in names
+            )
+            cls._normalized = type(f'Normalized{cls.__name__}', (cls,), {'columns': columns})
+        return cls._normalized
+
+    @classmethod
+    def included(cls, rows, context=None):
+        """Objets référencés par les lignes, par type puis par id"""
+        included = {}
+        for sideload in cls.sideloads:
+            ids = {row.get(sideload.column) for row in rows} - {None}
+            included[sideload.key] = sideload.load(ids, context) if ids else {}
+        return included
+
+    def to_representation(self, row):
+        data = {}
+        for name, lookups, format_value, omit_if_null in self._plan:
+            if len(lookups) == 1:
+                value = row[lookups[0]]
+                if value is None:
+                    if not omit_if_null:
+                        data[name] = None
+                    continue
+                data[name] = format_value(value) if format_value else value
+            else:
+                values = [row[lookup] for lookup in lookups]
+                if omit_if_null and values[0] is None:
+                    continue
+                data[name] = format_value(*values)
+        return data
+
+    @property
+    def data(self):
+        rows = self.instance
+        if hasattr(rows, 'values') and hasattr(rows, 'query'):
+            rows = self.project(rows, self.fields)
+        return [self.to_representation(row) for row in rows]
@@ -0,0 +1,208 @@
+"""
+Analyse des plans d'exécution PostgreSQL des requêtes critiques
+Chaque app déclare ses requêtes "chaudes" dans un module query_plans.py ;
+la commande check_query_plans les exécute, capture leur SQL et vérifie
+via EXPLAIN :
+- qu'elles utilisent les index attendus,
+- qu'elles ne font pas de Seq Scan sur les grosses tables,
+- que leur coût estimé reste borné,
+- que la forme du plan n'a pas changé par rapport au snapshot versionné.
+"""
+import json
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils.module_loading import autodiscover_modules
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+
+# Tables qui grossissent avec l'activité : un Seq Scan y est une régression
+LARGE_TABLES = {'appointments', 'payments', 'clients'}
+
+# Coût estimé maximal par défaut d'une requête critique
+DEFAULT_MAX_COST = 5000
+
+# Attributs d'un noeud de plan conservés dans les snapshots
+SNAPSHOT_KEYS = ('Node Type', 'Relation Name', 'Index Name', 'Join Type', 'Strategy')
+
+
+class HotQuery:
+    """
+    Requête critique nommée.
+    
+    - run : callable(context) qui déclenche la requête via le code métier
+    - indexes : index dont l'utilisation est exigée
+    - index_only : exige un Index Only Scan (index couvrant)
+    - max_cost : coût total estimé maximal sur le jeu de données de référence
+    - seq_scan_tables : grosses tables où un Seq Scan est accepté (requête
+      qu'aucun index B-tree ne peut servir) ; max_cost borne alors la requête
+    """
+    
+    def __init__(self, name, run, indexes=(), index_only=False, max_cost=DEFAULT_MAX_COST,
+                 seq_scan_tables=()):
+        self.name = name
+        self.run = run
+        self.indexes = list(indexes)
+        self.index_only = index_only
+        self.max_cost = max_cost
+        self.seq_scan_tables = set(seq_scan_tables)
+    
+    def capture_sql(self, context):
+        """Exécute la requête et retourne les SQL émis"""
+        with CaptureQueriesContext(connection) as captured:
+            self.run(context)
+        return [query['sql'] for query in captured.captured_queries]
+
+
+_registry = {}
+
+
+def register_hot_query(name, run, **kwargs):
+    """Enregistre une requête critique"""
+    _registry[name] = HotQuery(name, run, **kwargs)
+    return _registry[name]
+
+
+def get_hot_queries():
+    """Retourne les requêtes critiques de toutes les apps installées"""
+    autodiscover_modules('query_plans')
+    return dict(sorted(_registry.items()))
+
+
+def run_viewset_queryset(viewset_class, context, params=None, action='list'):
+    """
+    Évalue get_queryset() d'un ViewSet comme le ferait une page de liste.
+    Utilisé pour déclarer des requêtes critiques construites par les vues.
+    """
+    request = Request(APIRequestFactory().get('/', params or {}))
+    request.user = context['user']
+    request._request.salon = context['salon']
+    
+    viewset = viewset_class()
+    viewset.setup(request._request)
+    viewset.request = request
+    viewset.action = action
+    viewset.format_kwarg = None
+    return list(viewset.get_queryset()[:settings.REST_FRAMEWORK['PAGE_SIZE']])
+
+
+def explain(sql, force_index=False):
+    """
+    Retourne le plan JSON (noeud racine) d'une requête SQL.
+    force_index désactive seq scan et bitmap scan pour vérifier qu'un index
+    est utilisable même sur une petite base de développement.
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            if force_index:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('SET LOCAL enable_bitmapscan = off')
+            cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+            result = cursor.fetchone()[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    return result[0]['Plan']
+
+
+def iter_nodes(plan):
+    """Parcourt récursivement les noeuds d'un plan"""
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from iter_nodes(child)
+
+
+def partition_root(relation):
+    """
+    Table ou index déclaré sur la table partitionnée dont dérive une partition
+    (appointments_p202610 -> appointments, appointments_p202610_..._idx ->
+    appt_active_employee_idx) ; le nom est retourné tel quel hors partitionnement.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_partition_root(%s::regclass)::text', [relation])
+        root = cursor.fetchone()[0]
+    return root or relation
+
+
+def is_empty(table):
+    """Vrai si une table (partition d'un mois à venir) ne contient aucune ligne"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT NOT EXISTS (SELECT 1 FROM {connection.ops.quote_name(table)})')
+        return cursor.fetchone()[0]
+
+
+def index_scans(plan):
+    """Liste des (type de noeud, nom d'index) utilisés par un plan"""
+    return [
+        (node['Node Type'], partition_root(node['Index Name']))
+        for node in iter_nodes(plan)
+        if 'Index Name' in node
+    ]
+
+
+def check_index_usage(hot_query, sql):
+    """
+    Vérifie qu'un SQL utilise les index attendus.
+    Retourne la liste des problèmes détectés (vide si conforme).
+    """
+    scans = index_scans(explain(sql, force_index=True))
+    used = {index_name: node_type for node_type, index_name in scans}
+    problems = []
+    for index_name in hot_query.indexes:
+        if index_name not in used:
+            problems.append(f"index {index_name} non utilisé (plan : {scans or 'aucun index'})")
+        elif hot_query.index_only and used[index_name] != 'Index Only Scan':
+            problems.append(f"{index_name} utilisé en {used[index_name]} au lieu d'Index Only Scan")
+    return problems
+
+
+def plan_shape(plan):
+    """
+    Forme normalisée d'un plan (sans coûts ni estimations de lignes).
+    Partitions et index de partition sont ramenés à la table partitionnée,
+    et les branches identiques d'un Append fusionnées : la forme ne change
+    pas à chaque création de partition mensuelle. L'index retenu pour
+    chaque partition dépend de l'échantillon d'ANALYZE : il n'est pas gardé
+    sous un Append (check_index_usage et les tests contrôlent les index).
+    """
+    shape = {key: plan[key] for key in SNAPSHOT_KEYS if key in plan}
+    for key in ('Relation Name', 'Index Name'):
+        if key in shape:
+            shape[key] = partition_root(shape[key])
+    children = [plan_shape(child) for child in plan.get('Plans', [])]
+    if plan['Node Type'] in ('Append', 'Merge Append'):
+        children = [_without_index_names(child) for child in children]
+        children = [child for i, child in enumerate(children) if child not in children[:i]]
+    if children:
+        shape['Plans'] = children
+    return shape
+
+
+def _without_index_names(shape):
+    shape = {key: value for key, value in shape.items() if key != 'Index Name'}
+    if 'Plans' in shape:
+        shape['Plans'] = [_without_index_names(child) for child in shape['Plans']]
+    return shape
+
+
+def check_plan(hot_query, sql):
+    """
+    Analyse le plan réel (sans forcer les index) d'un SQL.
+    Retourne (forme du plan, coût total, problèmes détectés).
+    """
+    plan = explain(sql)
+    problems = []
+    for node in iter_nodes(plan):
+        if node['Node Type'] != 'Seq Scan':
+            continue
+        relation = partition_root(node['Relation Name'])
+        if relation not in LARGE_TABLES or relation in hot_query.seq_scan_tables:
+            continue
+        # Partition vide (mois à venir) : le Seq Scan n'y lit rien
+        if node['Relation Name'] != relation and is_empty(node['Relation Name']):
+            continue
+        problems.append(f"Seq Scan sur {relation}")
+    if plan['Total Cost'] > hot_query.max_cost:
+        problems.append(f"coût estimé {plan['Total Cost']:.0f} > {hot_query.max_cost}")
+    return plan_shape(plan), plan['Total Cost'], problems
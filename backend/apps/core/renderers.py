@@ -0,0 +1,55 @@
+"""
+Renderer JSON rapide
+Utilise orjson (sérialisation en C) si le paquet est installé, sinon le
+JSONRenderer standard de DRF. La sortie est identique octet pour octet à
+celle du renderer standard, sauf pour les flottants (float) :
+- exposant sans signe + ni zéro initial : 1e16 au lieu de 1e+16,
+  1.5e-7 au lieu de 1.5e-07 (même valeur une fois relue) ;
+- NaN et Infinity deviennent null, là où le renderer standard lève une
+  erreur (allow_nan=False).
+Les DecimalField des serializers, rendus en chaînes, ne sont pas concernés.
+"""
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+
+# date, time et datetime passent par l'encodeur DRF pour garder son format
+# (millisecondes, suffixe Z). Decimal, timedelta, QuerySet... aussi.
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    if orjson else 0
+)
+
+_drf_encoder = encoders.JSONEncoder()
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """
+    JSONRenderer basé sur orjson.
+    Retombe sur json (stdlib) pour l'indentation demandée par le client
+    (Accept: application/json; indent=4), hors orjson ou hors mode compact.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if orjson is None or indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        try:
+            ret = orjson.dumps(data, default=_drf_encoder.default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            # Types exotiques (entiers > 64 bits...) : encodeur standard
+            return super().render(data, accepted_media_type, renderer_context)
+        
+        # Même échappement que DRF pour rester un sous-ensemble strict de JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
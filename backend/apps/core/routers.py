@@ -0,0 +1,129 @@
+"""
+Routage des lectures vers la réplique
+Par défaut tout passe par la base primaire. Les vues marquées (voir
+ReplicaReadMixin) lisent sur la réplique, sauf pendant la fenêtre
+"sticky" qui suit une écriture de l'utilisateur ou si la réplique est
+trop en retard.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from apps.core import sharding
+from apps.core.exceptions import SalonMigrationInProgress
+
+
+_read_alias = ContextVar('read_alias', default=None)
+
+STICKY_CACHE_KEY = 'replica:sticky:{user_id}'
+LAG_CACHE_KEY = 'replica:lag'
+LAG_CHECK_INTERVAL = 5
+
+
+def replica_alias():
+    """Alias de la réplique configurée, ou None"""
+    alias = getattr(settings, 'REPLICA_DATABASE_ALIAS', 'replica')
+    return alias if alias in settings.DATABASES else None
+
+
+def mark_primary_sticky(user_id):
+    """Force les lectures de l'utilisateur sur la primaire après une écriture"""
+    cache.set(
+        STICKY_CACHE_KEY.format(user_id=user_id),
+        time.time(),
+        timeout=settings.REPLICA_STICKY_SECONDS
+    )
+
+
+def is_primary_sticky(user_id):
+    return cache.get(STICKY_CACHE_KEY.format(user_id=user_id)) is not None
+
+
+def replica_lag_seconds(alias):
+    """
+    Retard de réplication mesuré sur la réplique (mis en cache quelques secondes).
+    0 si la base n'est pas une réplique PostgreSQL en récupération.
+    """
+    lag = cache.get(LAG_CACHE_KEY)
+    if lag is not None:
+        return lag
+
+    lag = 0.0
+    connection = connections[alias]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT CASE WHEN pg_is_in_recovery() "
+                "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                "ELSE 0 END"
+            )
+            lag = float(cursor.fetchone()[0])
+    cache.set(LAG_CACHE_KEY, lag, timeout=LAG_CHECK_INTERVAL)
+    return lag
+
+
+def replica_allowed(user_id=None):
+    """Vrai si une lecture peut partir sur la réplique"""
+    alias = replica_alias()
+    if alias is None:
+        return False
+    if user_id is not None and is_primary_sticky(user_id):
+        return False
+    return replica_lag_seconds(alias) <= settings.REPLICA_MAX_LAG_SECONDS
+
+
+@contextmanager
+def use_replica():
+    """Dirige les lectures du bloc vers la réplique"""
+    token = _read_alias.set(replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ShardRouter:
+    """
+    Router Django des modèles tenant : lectures et écritures partent vers le
+    shard du salon. Les salons du shard 'default' sont laissés au
+    ReplicaRouter (placé après dans DATABASE_ROUTERS).
+    """
+
+    def db_for_read(self, model, **hints):
+        if not sharding.is_sharded() or not sharding.is_tenant_model(model):
+            return None
+        alias, _ = sharding.shard_for_instance(hints.get('instance'))
+        return None if alias == sharding.DEFAULT_SHARD else alias
+
+    def db_for_write(self, model, **hints):
+        if not sharding.is_sharded() or not sharding.is_tenant_model(model):
+            return None
+        alias, salon_id = sharding.shard_for_instance(hints.get('instance'))
+        if sharding.is_frozen(salon_id):
+            raise SalonMigrationInProgress()
+        return alias
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Les tables annuaire sont recopiées sur chaque shard
+        return True
+
+
+class ReplicaRouter:
+    """
+    Router Django : écritures toujours sur la primaire, lectures sur la
+    réplique uniquement à l'intérieur d'un bloc use_replica().
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primaire et réplique contiennent les mêmes données
+        return True
@@ -2,10 +2,11 @@
 Serializers for core app (Salon model)
 """
 from rest_framework import serializers
+from .fieldsets import DynamicFieldsMixin
 from .models import Salon
 
 
-class SalonSerializer(serializers.ModelSerializer):
+class SalonSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer complet pour le modèle Salon"""
     
     class Meta:
@@ -17,3 +18,39 @@ class SalonSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class BatchItemSerializer(serializers.Serializer):
+    """Sous-requête d'une requête groupée"""
+    
+    METHOD_CHOICES = ['GET', 'POST', 'PUT', 'PATCH', 'DELETE']
+    
+    id = serializers.CharField(required=False, max_length=100)
+    method = serializers.ChoiceField(choices=METHOD_CHOICES, default='GET')
+    path = serializers.CharField(max_length=500)
+    body = serializers.JSONField(required=False)
+    
+    def validate_method(self, value):
+        return value.upper()
+    
+    def validate(self, data):
+        # Identifiant par défaut : le chemin appelé
+        data.setdefault('id', data['path'])
+        return data
+
+
+class BatchSerializer(serializers.Serializer):
+    """Requête groupée : liste ordonnée de sous-requêtes"""
+    
+    requests = BatchItemSerializer(many=True)
+    
+    def validate_requests(self, value):
+        from django.conf import settings
+        
+        if not value:
+            raise serializers.ValidationError("Au moins une sous-requête est requise")
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"Au plus {settings.BATCH_MAX_REQUESTS} sous-requêtes par requête groupée"
+            )
+        return value
@@ -0,0 +1,461 @@
+"""
+Sharding par salon (tenant)
+Chaque salon est rattaché à un alias de base (Salon.shard). Toutes les
+requêtes sur un modèle TenantAwareModel partent vers le shard du salon
+actif ; les tables annuaire (salons, users) restent sur 'default', qui
+fait foi, et sont recopiées sur les shards pour les clés étrangères.
+
+- activate(salon) : salon courant de la requête (middleware, JWT)
+- use_shard(alias) : force un shard (commandes, fan-out)
+- tenant_atomic(salon) : transaction sur le shard du salon
+- fan_out(fn) : exécute fn(alias) sur tous les shards en parallèle
+- move_salon(salon, cible) : migration en ligne d'un salon vers un autre shard
+"""
+import heapq
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import islice
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+
+DEFAULT_SHARD = 'default'
+
+SHARD_CACHE_KEY = 'shard:salon:{salon_id}'
+FROZEN_CACHE_KEY = 'shard:frozen:{salon_id}'
+# Durée maximale du gel des écritures si la migration s'interrompt
+FREEZE_TIMEOUT = 300
+
+_current_salon = ContextVar('current_salon', default=None)
+_forced_shard = ContextVar('forced_shard', default=None)
+
+
+class ShardingError(Exception):
+    """Erreur de configuration ou de migration entre shards"""
+
+
+def tenant_shards():
+    """Alias de base hébergeant des salons ('default' en premier)"""
+    return list(settings.TENANT_SHARDS)
+
+
+def is_sharded():
+    return len(settings.TENANT_SHARDS) > 1
+
+
+def is_tenant_model(model):
+    from apps.core.models import TenantAwareModel
+    return issubclass(model, TenantAwareModel)
+
+
+# ---------------------------------------------------------------------------
+# Carte des shards
+# ---------------------------------------------------------------------------
+
+def pick_shard():
+    """
+    Shard d'un nouveau salon : NEW_SALON_SHARD s'il est défini, sinon le
+    shard hébergeant le moins de salons.
+    """
+    from apps.core.models import Salon
+
+    shards = tenant_shards()
+    if settings.NEW_SALON_SHARD:
+        if settings.NEW_SALON_SHARD not in shards:
+            raise ShardingError(f"Shard inconnu : {settings.NEW_SALON_SHARD}")
+        return settings.NEW_SALON_SHARD
+    if len(shards) == 1:
+        return shards[0]
+
+    load = dict(
+        Salon.objects.using(DEFAULT_SHARD)
+        .order_by()
+        .values_list('shard')
+        .annotate(total=Count('id'))
+    )
+    return min(shards, key=lambda alias: load.get(alias, 0))
+
+
+def shard_for_salon(salon_id):
+    """Alias du shard d'un salon (mis en cache)"""
+    if salon_id is None or not is_sharded():
+        return DEFAULT_SHARD
+
+    key = SHARD_CACHE_KEY.format(salon_id=salon_id)
+    alias = cache.get(key)
+    if alias is None:
+        from apps.core.models import Salon
+
+        alias = (
+            Salon.objects.using(DEFAULT_SHARD)
+            .filter(pk=salon_id)
+            .values_list('shard', flat=True)
+            .first()
+        ) or DEFAULT_SHARD
+        cache.set(key, alias, timeout=settings.SHARD_MAP_CACHE_SECONDS)
+    return alias
+
+
+def db_for_salon(salon=None):
+    """Alias du shard d'un salon (instance ou id), ou du salon actif"""
+    salon_id = getattr(salon, 'pk', salon)
+    if salon_id is None:
+        salon_id = _current_salon.get()
+    return shard_for_salon(salon_id)
+
+
+def tenant_atomic(salon=None):
+    """transaction.atomic() sur le shard du salon (ou du salon actif)"""
+    return transaction.atomic(using=db_for_salon(salon))
+
+
+# ---------------------------------------------------------------------------
+# Contexte courant
+# ---------------------------------------------------------------------------
+
+def activate(salon):
+    """Déclare le salon de la requête en cours"""
+    _current_salon.set(getattr(salon, 'pk', salon))
+
+
+def deactivate():
+    _current_salon.set(None)
+
+
+def current_salon_id():
+    return _current_salon.get()
+
+
+@contextmanager
+def use_shard(alias):
+    """Dirige toutes les requêtes tenant du bloc vers un shard donné"""
+    token = _forced_shard.set(alias)
+    try:
+        yield
+    finally:
+        _forced_shard.reset(token)
+
+
+def shard_for_instance(instance=None):
+    """Shard à utiliser pour un modèle tenant, d'après le contexte ou l'instance"""
+    forced = _forced_shard.get()
+    if forced:
+        return forced, None
+
+    salon_id = None
+    if instance is not None:
+        from apps.core.models import Salon
+        salon_id = instance.pk if isinstance(instance, Salon) else getattr(instance, 'salon_id', None)
+    if salon_id is None:
+        salon_id = _current_salon.get()
+    return shard_for_salon(salon_id), salon_id
+
+
+def is_frozen(salon_id):
+    """Vrai si les écritures du salon sont suspendues (migration en cours)"""
+    return salon_id is not None and cache.get(FROZEN_CACHE_KEY.format(salon_id=salon_id)) is not None
+
+
+# ---------------------------------------------------------------------------
+# Annuaire (salons, users) recopié sur les shards
+# ---------------------------------------------------------------------------
+
+def _mirror_row(instance, alias):
+    model = type(instance)
+    values = {
+        field.attname: getattr(instance, field.attname)
+        for field in model._meta.concrete_fields
+        if not field.primary_key
+    }
+    model._base_manager.using(alias).update_or_create(pk=instance.pk, defaults=values)
+
+
+def mirror_directory(salon, alias):
+    """Recopie le salon et ses utilisateurs sur un shard"""
+    if alias == DEFAULT_SHARD:
+        return
+    _mirror_row(salon, alias)
+    for user in salon.users.using(DEFAULT_SHARD).all():
+        _mirror_row(user, alias)
+
+
+def mirror_on_save(sender, instance, using, raw=False, **kwargs):
+    """
+    Signal post_save des tables annuaire : maintient la copie du shard.
+    Les écritures faites directement sur un shard (la copie elle-même)
+    sont ignorées.
+    """
+    if raw or using != DEFAULT_SHARD or not is_sharded():
+        return
+    from apps.core.models import Salon
+
+    salon_id = instance.pk if isinstance(instance, Salon) else instance.salon_id
+    if salon_id is None:
+        return
+    alias = shard_for_salon(salon_id)
+    if alias != DEFAULT_SHARD:
+        _mirror_row(instance, alias)
+
+
+# ---------------------------------------------------------------------------
+# Requêtes multi-shards
+# ---------------------------------------------------------------------------
+
+def _run_on_shard(fn, alias, close=True):
+    try:
+        with use_shard(alias):
+            return fn(alias)
+    finally:
+        if close:
+            # Connexions ouvertes par le thread du pool
+            connections.close_all()
+
+
+def fan_out(fn, aliases=None, max_workers=None):
+    """
+    Exécute fn(alias) sur chaque shard en parallèle.
+    Retourne {alias: résultat}.
+    """
+    aliases = list(aliases or tenant_shards())
+    if len(aliases) == 1:
+        return {aliases[0]: _run_on_shard(fn, aliases[0], close=False)}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(aliases)) as pool:
+        results = pool.map(lambda alias: _run_on_shard(fn, alias), aliases)
+        return dict(zip(aliases, results))
+
+
+def fan_out_list(fn, key=None, reverse=False, limit=None, aliases=None):
+    """
+    Fusionne les listes renvoyées par chaque shard.
+    Si key est fourni, chaque liste doit être triée selon key : la fusion
+    conserve l'ordre global (tri-fusion) et s'arrête à limit éléments.
+    """
+    results = fan_out(lambda alias: list(fn(alias)), aliases).values()
+    if key is None:
+        merged = (row for rows in results for row in rows)
+    else:
+        merged = heapq.merge(*results, key=key, reverse=reverse)
+    return list(islice(merged, limit))
+
+
+# ---------------------------------------------------------------------------
+# Migration d'un salon entre shards
+# ---------------------------------------------------------------------------
+
+def tenant_models():
+    """Modèles tenant triés pour que les tables référencées soient copiées d'abord"""
+    models = [model for model in apps.get_models() if is_tenant_model(model)]
+    ordered = []
+
+    def visit(model, path=()):
+        if model in ordered or model in path:
+            return
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if field.is_relation and related is not model and related in models:
+                visit(related, path + (model,))
+        ordered.append(model)
+
+    for model in models:
+        visit(model)
+    return ordered
+
+
+def _insert_rows(model, rows, using):
+    """
+    INSERT des lignes telles quelles. bulk_create appliquerait auto_now et
+    auto_now_add (pre_save) : created_at/updated_at de la source sont écrits
+    explicitement, sans modifier les champs du modèle partagés entre threads.
+    """
+    connection = connections[using]
+    fields = model._meta.concrete_fields
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)),
+    )
+    params = [
+        [field.get_db_prep_save(getattr(row, field.attname), connection) for field in fields]
+        for row in rows
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, params)
+
+
+def copy_rows(model, salon_id, source, target, since=None, batch_size=500):
+    """
+    Copie (insertion ou mise à jour) les lignes d'un salon d'un shard à
+    l'autre, par lots ordonnés sur la clé primaire. Avec since, seules les
+    lignes modifiées depuis cette date sont reprises.
+    """
+    queryset = model._base_manager.using(source).filter(salon_id=salon_id).order_by('pk')
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    update_fields = [field.name for field in model._meta.concrete_fields if not field.primary_key]
+    target_rows = model._base_manager.using(target)
+
+    copied = 0
+    last_pk = None
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(batch[:batch_size])
+        if not rows:
+            break
+        last_pk = rows[-1].pk
+        ids = [row.pk for row in rows]
+
+        if target_rows.filter(pk__in=ids).exclude(salon_id=salon_id).exists():
+            raise ShardingError(
+                f"Collision d'identifiants sur {target} ({model._meta.db_table}) : "
+                "aligner les séquences avec manage_shards --init-sequences"
+            )
+        existing = set(target_rows.filter(pk__in=ids).values_list('pk', flat=True))
+        created = [row for row in rows if row.pk not in existing]
+        if created:
+            _insert_rows(model, created, target)
+        # bulk_update n'appelle pas pre_save : les dates de la source sont gardées
+        updated = [row for row in rows if row.pk in existing]
+        if updated:
+            target_rows.bulk_update(updated, update_fields)
+        copied += len(rows)
+    return copied
+
+
+def prune_rows(model, salon_id, source, target):
+    """Supprime de la cible les lignes supprimées entre-temps sur la source"""
+    source_ids = set(
+        model._base_manager.using(source).filter(salon_id=salon_id).values_list('pk', flat=True)
+    )
+    stale = (
+        model._base_manager.using(target)
+        .filter(salon_id=salon_id)
+        .exclude(pk__in=source_ids)
+    )
+    # Sans signaux : la suppression a déjà été publiée et tracée sur la source
+    return stale._raw_delete(target)
+
+
+def sync_salon(salon_id, source, target, since=None, batch_size=500):
+    """Copie toutes les tables tenant d'un salon ; retourne le nombre de lignes"""
+    return sum(
+        copy_rows(model, salon_id, source, target, since, batch_size)
+        for model in tenant_models()
+    )
+
+
+def delete_salon_rows(salon_id, alias, batch_size=500):
+    """
+    Supprime les données tenant d'un salon d'un shard (ordre inverse des
+    dépendances). DELETE direct, sans signaux : les lignes ont été déplacées,
+    pas supprimées (ni événement temps réel, ni trace de suppression, ni
+    recalcul des agrégats).
+    """
+    for model in reversed(tenant_models()):
+        queryset = model._base_manager.using(alias).filter(salon_id=salon_id)
+        while True:
+            ids = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            model._base_manager.using(alias).filter(pk__in=ids)._raw_delete(alias)
+
+
+def move_salon(salon, target, batch_size=500, max_passes=5, catch_up_threshold=100,
+               freeze_grace=2.0, keep_source=False, log=None):
+    """
+    Déplace un salon vers un autre shard sans interruption de service :
+
+    1. copie complète pendant que le salon continue de travailler ;
+    2. passes de rattrapage des lignes modifiées (updated_at) ;
+    3. gel bref des écritures du salon, dernière passe et suppressions ;
+    4. bascule de la carte des shards, dégel ;
+    5. nettoyage de la source (sauf keep_source).
+
+    Le gel et la carte passant par le cache, un cache partagé (Redis) est
+    requis dès que plusieurs processus servent l'API.
+    """
+    from apps.core.models import Salon
+
+    log = log or (lambda message: None)
+    source = shard_for_salon(salon.pk)
+    if target not in tenant_shards():
+        raise ShardingError(f"Shard inconnu : {target}")
+    if target == source:
+        raise ShardingError(f"Le salon est déjà sur {target}")
+
+    mirror_directory(salon, target)
+    frozen_key = FROZEN_CACHE_KEY.format(salon_id=salon.pk)
+
+    try:
+        started = timezone.now()
+        copied = sync_salon(salon.pk, source, target, batch_size=batch_size)
+        log(f"Copie initiale : {copied} ligne(s)")
+
+        for number in range(1, max_passes + 1):
+            since, started = started, timezone.now()
+            copied = sync_salon(salon.pk, source, target, since=since, batch_size=batch_size)
+            log(f"Rattrapage {number} : {copied} ligne(s)")
+            if copied <= catch_up_threshold:
+                break
+
+        cache.set(frozen_key, timezone.now().isoformat(), timeout=FREEZE_TIMEOUT)
+        # Laisse se terminer les transactions en cours avant la dernière passe
+        time.sleep(freeze_grace)
+        copied = sync_salon(salon.pk, source, target, since=started, batch_size=batch_size)
+        pruned = sum(
+            prune_rows(model, salon.pk, source, target)
+            for model in reversed(tenant_models())
+        )
+        log(f"Passe finale (écritures gelées) : {copied} copiée(s), {pruned} supprimée(s)")
+    except Exception:
+        # Le salon reste sur la source : on retire la copie partielle
+        cache.delete(frozen_key)
+        delete_salon_rows(salon.pk, target, batch_size)
+        raise
+
+    try:
+        Salon.objects.using(DEFAULT_SHARD).filter(pk=salon.pk).update(shard=target)
+        cache.delete(SHARD_CACHE_KEY.format(salon_id=salon.pk))
+    finally:
+        cache.delete(frozen_key)
+    log(f"Salon basculé : {source} → {target}")
+
+    if not keep_source:
+        delete_salon_rows(salon.pk, source, batch_size)
+        log(f"Données supprimées de {source}")
+
+
+def align_sequences(alias, stride=None):
+    """
+    PostgreSQL : espace les séquences d'identifiants des tables tenant pour
+    que chaque shard génère des id distincts (id ≡ rang du shard modulo
+    stride). Indispensable avant de déplacer des salons entre shards.
+    """
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return []
+
+    stride = stride or settings.SHARD_ID_STRIDE
+    offset = tenant_shards().index(alias)
+    aligned = []
+    with connection.cursor() as cursor:
+        for model in tenant_models():
+            table = model._meta.db_table
+            cursor.execute("SELECT pg_get_serial_sequence(%s, 'id')", [f'"{table}"'])
+            sequence = cursor.fetchone()[0]
+            if sequence is None:
+                continue
+            cursor.execute(f'SELECT COALESCE(max(id), 0) FROM "{table}"')
+            start = cursor.fetchone()[0] + 1
+            start += (offset - start) % stride
+            cursor.execute(f'ALTER SEQUENCE {sequence} INCREMENT BY {stride} RESTART WITH {start}')
+            aligned.append(table)
+    return aligned
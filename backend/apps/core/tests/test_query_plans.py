@@ -0,0 +1,57 @@
+"""
+Plans réels des requêtes critiques sur le jeu de données de référence.
+check_query_plans vérifie les index attendus en désactivant seq scan et
+bitmap scan (index utilisable) ; ici le planificateur choisit librement,
+après VACUUM ANALYZE : l'index doit être celui qu'il retient.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from apps.core.management.commands.check_query_plans import Command as CheckQueryPlans
+from apps.core.query_plans import check_plan, explain, get_hot_queries, index_scans
+
+
+pytestmark = pytest.mark.skipif(
+    connection.vendor != 'postgresql',
+    reason='EXPLAIN (FORMAT JSON) nécessite PostgreSQL',
+)
+
+HOT_QUERIES = get_hot_queries()
+
+# Tables analysées après le chargement (voir seed_benchmark_data)
+TABLES = ('salons', 'users', 'employees', 'services', 'clients', 'client_stats', 'appointments', 'payments')
+
+
+@pytest.fixture(scope='module')
+def context(django_db_setup, django_db_blocker):
+    """
+    Jeu de données de référence (plan_snapshots/README.md), visibilité à
+    jour. Chargé hors transaction (VACUUM) : les salons Benchmark sont
+    supprimés avant (run interrompu, --reuse-db) et après le module.
+    """
+    with django_db_blocker.unblock():
+        call_command('seed_benchmark_data', salons=20, appointments=5000, flush=True, stdout=StringIO())
+        with connection.cursor() as cursor:
+            for table in TABLES:
+                cursor.execute(f'VACUUM ANALYZE {table}')
+        try:
+            yield CheckQueryPlans().build_context(None)
+        finally:
+            call_command('seed_benchmark_data', salons=0, flush=True, stdout=StringIO())
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_hot_query_plan(context, name):
+    hot_query = HOT_QUERIES[name]
+    for sql in dict.fromkeys(hot_query.capture_sql(context)):
+        used = dict((index, node_type) for node_type, index in index_scans(explain(sql)))
+        for index in hot_query.indexes:
+            assert index in used, f"{name} : {index} non retenu ({used or 'aucun index'})"
+            if hot_query.index_only:
+                assert used[index] == 'Index Only Scan', f"{name} : {index} en {used[index]}"
+        _, _, problems = check_plan(hot_query, sql)
+        assert not problems, f"{name} : {problems}"
@@ -0,0 +1,82 @@
+"""
+Répartition des salons entre shards : ordre de copie, suppression sans
+signaux et déplacement d'un salon (ce dernier nécessite SHARD_DATABASES,
+ex. SHARD_DATABASES=shard1).
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.appointments.models import Appointment
+from apps.clients.models import Client
+from apps.core import sharding
+from apps.core.models import Salon
+from apps.payments.models import Payment
+from apps.sync.models import DeletedRecord
+
+
+@pytest.fixture(autouse=True)
+def shard_map():
+    """Carte des shards en cache vidée : les id de salon reviennent d'un test à l'autre"""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def active_salon(salon):
+    """Salon actif, comme pendant une requête : ses lignes vont sur son shard"""
+    sharding.activate(salon)
+    yield salon
+    sharding.deactivate()
+
+
+def test_tenant_models_referenced_first():
+    models = sharding.tenant_models()
+    assert models.index(Client) < models.index(Appointment) < models.index(Payment)
+
+
+@pytest.mark.django_db(databases='__all__')
+def test_delete_salon_rows_without_signals(active_salon, make_appointment, salon):
+    other = Salon.objects.create(name='Autre', address='-', phone='-', email='autre@example.com')
+    with sharding.use_shard(sharding.db_for_salon(other)):
+        other_client = Client.objects.create(salon=other, first_name='Paul', last_name='Test', phone='+241000002')
+    appointment = make_appointment()
+    Payment.objects.create(
+        salon=salon, appointment=appointment, client=appointment.client,
+        amount=Decimal('10000'), payment_method='CASH', payment_date=timezone.now()
+    )
+
+    alias = sharding.db_for_salon(salon)
+
+    sharding.delete_salon_rows(salon.pk, alias, batch_size=1)
+
+    for model in sharding.tenant_models():
+        assert not model._base_manager.using(alias).filter(salon_id=salon.pk).exists(), model._meta.label
+    # Lignes déplacées, pas supprimées : aucune trace pour la synchronisation
+    assert not DeletedRecord.objects.using(alias).exists()
+    assert Client.objects.using(sharding.db_for_salon(other)).filter(pk=other_client.pk).exists()
+
+
+@pytest.mark.skipif(not settings.SHARD_DATABASES, reason='Nécessite un shard (SHARD_DATABASES)')
+@pytest.mark.django_db(databases='__all__', transaction=True)
+def test_move_salon(active_salon, make_appointment, salon):
+    source = sharding.db_for_salon(salon)
+    target = next(alias for alias in sharding.tenant_shards() if alias != source)
+    appointment = make_appointment()
+    edited = timezone.now() - timedelta(days=3)
+    Appointment.objects.filter(pk=appointment.pk).update(updated_at=edited)
+
+    sharding.move_salon(salon, target, freeze_grace=0)
+
+    assert sharding.db_for_salon(salon) == target
+    moved = Appointment.objects.using(target).get(pk=appointment.pk)
+    assert moved.updated_at == edited
+    assert Client.objects.using(target).filter(salon_id=salon.pk).count() == 1
+    for model in sharding.tenant_models():
+        assert not model._base_manager.using(source).filter(salon_id=salon.pk).exists(), model._meta.label
+    assert not DeletedRecord.objects.using(target).exists()
@@ -1,16 +1,20 @@
 """
 Views for core app - Salon management
 """
+from django.db.models import Count
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from .models import Salon
-from .serializers import SalonSerializer
+from .serializers import BatchSerializer, SalonSerializer
+from apps.core import batch, sharding
 from apps.core.permissions import IsSalonAdmin
+from apps.core.mixins import SparseFieldsMixin
 
 
-class SalonViewSet(viewsets.ModelViewSet):
+class SalonViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des salons.
     Les utilisateurs ne peuvent voir et modifier que leur propre salon.
@@ -73,3 +77,59 @@ class SalonViewSet(viewsets.ModelViewSet):
             'message': 'Informations du salon mises à jour avec succès',
             'salon': serializer.data
         })
+    
+    @action(detail=False, methods=['get'])
+    def shards(self, request):
+        """
+        Vue d'ensemble multi-shards (superusers uniquement).
+        Les compteurs sont calculés en parallèle sur chaque shard.
+        """
+        if not request.user.is_superuser:
+            return Response({
+                'error': 'Réservé aux superutilisateurs'
+            }, status=status.HTTP_403_FORBIDDEN)
+        
+        from apps.appointments.models import Appointment
+        from apps.clients.models import Client
+        
+        def shard_stats(alias):
+            return {
+                'clients': Client.objects.count(),
+                'appointments': Appointment.objects.count(),
+            }
+        
+        salons = dict(
+            Salon.objects.order_by().values_list('shard').annotate(total=Count('id'))
+        )
+        stats = sharding.fan_out(shard_stats)
+        
+        return Response({
+            'success': True,
+            'shards': [
+                {'alias': alias, 'salons': salons.get(alias, 0), **counts}
+                for alias, counts in stats.items()
+            ]
+        })
+
+
+class BatchView(APIView):
+    """
+    Requête groupée : plusieurs appels de l'API en un seul aller-retour.
+    Authentification et résolution du salon une seule fois ; lectures en
+    parallèle (voir apps.core.batch).
+    
+    POST /api/v1/batch/
+    {"requests": [{"id": "today", "method": "GET", "path": "/api/v1/appointments/today/"}]}
+    """
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        
+        responses = batch.run(request, serializer.validated_data['requests'])
+        
+        return Response({
+            'success': True,
+            'responses': responses
+        })
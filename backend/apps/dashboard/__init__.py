@@ -0,0 +1,4 @@
+"""
+Dashboard app - Tableau de bord de la réception (modèle de lecture)
+"""
+default_app_config = 'apps.dashboard.apps.DashboardConfig'
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+
+
+class DashboardConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.dashboard'
+    verbose_name = 'Tableau de bord'
+    
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .services import invalidate_on_write
+        
+        # Toute écriture d'un rendez-vous ou d'un paiement périme l'instantané
+        for sender in ('appointments.Appointment', 'payments.Payment'):
+            post_save.connect(invalidate_on_write, sender=sender)
+            post_delete.connect(invalidate_on_write, sender=sender)
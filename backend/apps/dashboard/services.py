@@ -0,0 +1,190 @@
+"""
+Business logic for Dashboard app
+Instantané du tableau de bord de la réception, par salon et par jour.
+Chaque section est calculée par une requête ensembliste ; l'instantané est
+mis en cache et périmé par toute écriture d'un rendez-vous ou d'un paiement
+du salon (version par salon incluse dans la clé de cache).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.appointments.models import Appointment, ACTIVE_STATUSES
+from apps.appointments.services import AppointmentService
+from apps.employees.models import Employee
+from apps.payments.models import Payment
+from apps.payments.services import PaymentService
+
+
+SNAPSHOT_CACHE_KEY = 'dashboard:{salon_id}:{version}:{date}'
+VERSION_CACHE_KEY = 'dashboard:version:{salon_id}'
+UPCOMING_DAYS = 7
+
+
+def snapshot_version(salon_id):
+    return cache.get_or_set(VERSION_CACHE_KEY.format(salon_id=salon_id), 1, timeout=None)
+
+
+def invalidate(salon_id):
+    """Périme tous les instantanés du salon"""
+    key = VERSION_CACHE_KEY.format(salon_id=salon_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def invalidate_on_write(sender, instance, using=None, **kwargs):
+    """Handler post_save/post_delete : invalidation après le commit"""
+    salon_id = instance.salon_id
+    transaction.on_commit(lambda: invalidate(salon_id), using=using)
+
+
+class DashboardService:
+    """Service centralisant le tableau de bord de la réception"""
+    
+    @staticmethod
+    def snapshot(salon, date=None):
+        """Instantané en cache, recalculé après chaque écriture du salon"""
+        date = date or timezone.localdate()
+        key = SNAPSHOT_CACHE_KEY.format(
+            salon_id=salon.pk,
+            version=snapshot_version(salon.pk),
+            date=date.isoformat()
+        )
+        data = cache.get(key)
+        if data is None:
+            data = DashboardService.build(salon, date)
+            cache.set(key, data, timeout=settings.DASHBOARD_CACHE_SECONDS)
+        return data
+    
+    @staticmethod
+    def build(salon, date):
+        """Calcule l'instantané (4 requêtes)"""
+        schedule = DashboardService.schedule(salon, date)
+        return {
+            'date': date.isoformat(),
+            'generated_at': timezone.now().isoformat(),
+            'employees': schedule,
+            'status_counts': DashboardService.status_counts(schedule),
+            'revenue': DashboardService.revenue(salon, date),
+            'upcoming_load': DashboardService.upcoming_load(salon, date),
+        }
+    
+    @staticmethod
+    def schedule(salon, date):
+        """
+        Rendez-vous du jour groupés par employé, avec le prochain créneau
+        libre de chaque employé disponible.
+        """
+        employees = Employee.objects.filter(salon=salon).values(
+            'id', 'is_available', 'user__first_name', 'user__last_name'
+        )
+        appointments = Appointment.objects.filter(salon=salon, date=date).order_by(
+            'employee_id', 'time'
+        ).values(
+            'id', 'employee_id', 'time', 'duration', 'status',
+            'client_id', 'client__first_name', 'client__last_name',
+            'service_id', 'service__name'
+        )
+        
+        by_employee = {}
+        for row in appointments:
+            by_employee.setdefault(row['employee_id'], []).append(row)
+        
+        now = timezone.localtime()
+        # Aujourd'hui : pas de créneau déjà passé ; jours passés : aucun
+        not_before = now.time() if date == now.date() else None
+        
+        schedule = []
+        for employee in employees:
+            rows = by_employee.get(employee['id'], [])
+            next_free_slot = None
+            if employee['is_available'] and date >= now.date():
+                busy = [
+                    (row['time'], row['duration'])
+                    for row in rows if row['status'] in ACTIVE_STATUSES
+                ]
+                slots = AppointmentService.free_slots(busy, not_before=not_before)
+                next_free_slot = slots[0].strftime('%H:%M') if slots else None
+            
+            schedule.append({
+                'employee': employee['id'],
+                'employee_name': f"{employee['user__first_name']} {employee['user__last_name']}",
+                'next_free_slot': next_free_slot,
+                'appointments': [
+                    {
+                        'id': row['id'],
+                        'time': row['time'].strftime('%H:%M'),
+                        'duration': row['duration'],
+                        'status': row['status'],
+                        'client': row['client_id'],
+                        'client_name': f"{row['client__first_name']} {row['client__last_name']}",
+                        'service': row['service_id'],
+                        'service_name': row['service__name'],
+                    }
+                    for row in rows
+                ],
+            })
+        return schedule
+    
+    @staticmethod
+    def status_counts(schedule):
+        """Nombre de rendez-vous du jour par statut (sans requête)"""
+        counts = {code: 0 for code, _ in Appointment.STATUS_CHOICES}
+        for employee in schedule:
+            for appointment in employee['appointments']:
+                counts[appointment['status']] += 1
+        counts['total'] = sum(counts.values())
+        return counts
+    
+    @staticmethod
+    def revenue(salon, date):
+        """Revenu du jour et du mois, en une seule agrégation"""
+        first_day = date.replace(day=1)
+        last_day = (first_day + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        month_start, month_end = PaymentService.period_bounds(first_day, last_day)
+        day_start, day_end = PaymentService.period_bounds(date, date)
+        
+        totals = Payment.objects.filter(
+            salon=salon,
+            status='COMPLETED',
+            payment_date__gte=month_start,
+            payment_date__lt=month_end
+        ).aggregate(
+            month=Sum('amount'),
+            today=Sum('amount', filter=Q(payment_date__gte=day_start, payment_date__lt=day_end))
+        )
+        return {
+            'today': float(totals['today'] or 0),
+            'month': float(totals['month'] or 0),
+        }
+    
+    @staticmethod
+    def upcoming_load(salon, date):
+        """Charge des 7 prochains jours : nombre de rendez-vous actifs et minutes réservées"""
+        end_date = date + timedelta(days=UPCOMING_DAYS - 1)
+        rows = Appointment.objects.filter(
+            salon=salon,
+            date__range=[date, end_date],
+            status__in=ACTIVE_STATUSES
+        ).values('date').annotate(
+            count=Count('id'),
+            minutes=Sum('duration')
+        ).order_by()
+        by_date = {row['date']: row for row in rows}
+        
+        load = []
+        for offset in range(UPCOMING_DAYS):
+            day = date + timedelta(days=offset)
+            row = by_date.get(day, {})
+            load.append({
+                'date': day.isoformat(),
+                'count': row.get('count', 0),
+                'minutes': row.get('minutes') or 0,
+            })
+        return load
@@ -0,0 +1,47 @@
+"""
+Views for Dashboard app
+"""
+from django.utils.dateparse import parse_date
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.permissions import IsSalonEmployee
+from .services import DashboardService
+
+
+class DashboardView(APIView):
+    """
+    Tableau de bord de la réception en une requête :
+    rendez-vous du jour par employé, compteurs par statut, revenus du jour
+    et du mois, prochain créneau libre par employé, charge des 7 jours.
+    
+    GET /api/v1/dashboard/?date=YYYY-MM-DD (défaut : aujourd'hui)
+    
+    Lu sur la base primaire : l'instantané mis en cache ne doit pas
+    provenir d'une réplique en retard sur l'écriture qui l'a invalidé.
+    """
+    permission_classes = [IsAuthenticated, IsSalonEmployee]
+    
+    def get(self, request):
+        if request.salon is None:
+            return Response({
+                'error': 'Aucun salon associé à cet utilisateur'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        date = None
+        if 'date' in request.query_params:
+            try:
+                date = parse_date(request.query_params['date'])
+            except ValueError:
+                date = None
+            if date is None:
+                return Response({
+                    'error': 'Date invalide (format attendu : AAAA-MM-JJ)'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            'success': True,
+            **DashboardService.snapshot(request.salon, date)
+        })
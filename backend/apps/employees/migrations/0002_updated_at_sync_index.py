@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+        ("employees", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="employee",
+            index=models.Index(
+                fields=["salon", "updated_at", "id"],
+                name="employees_salon_i_06b869_idx",
+            ),
+        ),
+    ]
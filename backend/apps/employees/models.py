@@ -56,6 +56,10 @@ class Employee(TenantAwareModel):
         verbose_name = 'Employé'
         verbose_name_plural = 'Employés'
         ordering = ['user__first_name', 'user__last_name']
+        indexes = [
+            # Flux de modifications (apps.sync) : parcours par updated_at
+            models.Index(fields=['salon', 'updated_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.user.role}"
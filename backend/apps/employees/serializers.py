@@ -3,12 +3,13 @@ Serializers for Employees app
 """
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from apps.core.fieldsets import DynamicFieldsMixin
 from .models import Employee
 
 User = get_user_model()
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les employés"""
     
     # Informations de l'utilisateur
@@ -31,6 +32,10 @@ class EmployeeSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        field_sources = {
+            'full_name': ('user.first_name', 'user.last_name'),
+            'specialties_list': ('specialties',),
+        }
     
     def get_full_name(self, obj):
         return obj.get_full_name()
@@ -60,6 +65,7 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         """Crée un utilisateur ET un profil employé"""
         from django.db import transaction
+        from apps.core.sharding import tenant_atomic
         
         # Extraction des données utilisateur
         user_data = {
@@ -72,7 +78,8 @@ class EmployeeCreateSerializer(serializers.ModelSerializer):
         password = validated_data.pop('password')
         salon = self.context['salon']
         
-        with transaction.atomic():
+        # L'utilisateur reste sur 'default' (annuaire), l'employé va sur le shard du salon
+        with transaction.atomic(), tenant_atomic(salon):
             # Création de l'utilisateur
             user = User.objects.create_user(
                 password=password,
@@ -1,7 +1,7 @@
 """
 Business logic for Employees app
 """
-from django.db import transaction
+from apps.core.sharding import tenant_atomic
 from .models import Employee
 
 
@@ -45,7 +45,7 @@ class EmployeeService:
         Met à jour le planning de travail d'un employé.
         Format attendu: {"lundi": "9:00-18:00", ...}
         """
-        with transaction.atomic():
+        with tenant_atomic(employee.salon_id):
             employee.work_schedule = schedule_data
             employee.save()
         
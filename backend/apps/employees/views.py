@@ -10,9 +10,10 @@ from django.db.models import Q
 from .models import Employee
 from .serializers import EmployeeSerializer, EmployeeCreateSerializer
 from apps.core.permissions import IsSalonAdmin, IsSalonEmployee
+from apps.core.mixins import ReplicaReadMixin, SparseFieldsMixin
 
 
-class EmployeeViewSet(viewsets.ModelViewSet):
+class EmployeeViewSet(ReplicaReadMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet pour la gestion des employés.
     Seuls les admins peuvent créer/modifier/supprimer.
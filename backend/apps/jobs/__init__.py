@@ -0,0 +1,4 @@
+"""
+Jobs app - File de tâches différées en base (sans broker externe)
+"""
+default_app_config = 'apps.jobs.apps.JobsConfig'
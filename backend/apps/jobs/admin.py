@@ -0,0 +1,24 @@
+from django.contrib import admin
+from .models import Job, PeriodicJob
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'salon', 'status', 'attempts', 'run_at', 'finished_at']
+    list_filter = ['status', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['locked_by', 'locked_at', 'finished_at', 'created_at', 'last_error']
+    actions = ['retry']
+    
+    @admin.action(description='Relancer les tâches sélectionnées')
+    def retry(self, request, queryset):
+        from django.utils import timezone
+        
+        queryset.exclude(status='RUNNING').update(
+            status='PENDING', attempts=0, run_at=timezone.now(), finished_at=None
+        )
+
+
+@admin.register(PeriodicJob)
+class PeriodicJobAdmin(admin.ModelAdmin):
+    list_display = ['name', 'next_run_at']
@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class JobsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.jobs'
+    verbose_name = 'Tâches différées'
+    
+    def ready(self):
+        from django.utils.module_loading import autodiscover_modules
+        
+        # Enregistre les tâches déclarées dans apps/<app>/tasks.py
+        autodiscover_modules('tasks')
@@ -0,0 +1,102 @@
+"""
+Worker de la file de tâches
+Usage: python manage.py run_jobs [--workers 4] [--poll 1.0] [--once]
+Plusieurs workers (processus ou machines) peuvent tourner en parallèle :
+chaque tâche n'est prise en charge qu'une fois (SKIP LOCKED).
+"""
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs.services import JobService
+
+
+# Intervalle (s) des tâches de maintenance du worker (battement de cœur des
+# tâches en cours inclus, bien en deçà de JOBS_LOCK_TIMEOUT_SECONDS)
+HOUSEKEEPING_INTERVAL = 30
+
+
+def _run(job):
+    try:
+        return JobService.execute(job)
+    finally:
+        # Connexions ouvertes par le thread du pool
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Exécute les tâches différées (file en base)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, help='Threads d\'exécution, défaut : JOBS_WORKERS')
+        parser.add_argument('--poll', type=float, help='Attente (s) quand la file est vide, défaut : JOBS_POLL_SECONDS')
+        parser.add_argument('--once', action='store_true', help='Vide la file puis s\'arrête')
+
+    def handle(self, *args, **options):
+        workers = options['workers'] or settings.JOBS_WORKERS
+        poll = options['poll'] or settings.JOBS_POLL_SECONDS
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        stopping = threading.Event()
+
+        def stop(signum, frame):
+            self.stdout.write("Arrêt demandé, fin des tâches en cours...")
+            stopping.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f"Worker {worker_id} : {workers} thread(s)")
+        done = failed = 0
+        running = {}
+        next_housekeeping = 0
+
+        def heartbeat():
+            nonlocal next_housekeeping
+            if time.monotonic() < next_housekeeping:
+                return False
+            JobService.heartbeat(worker_id, list(running.values()))
+            next_housekeeping = time.monotonic() + HOUSEKEEPING_INTERVAL
+            return True
+
+        def collect(timeout):
+            nonlocal done, failed
+            finished, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in finished:
+                del running[future]
+                if future.result():
+                    done += 1
+                else:
+                    failed += 1
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while not stopping.is_set():
+                if heartbeat():
+                    JobService.schedule_periodic()
+                    JobService.reclaim_stale()
+
+                if len(running) < workers:
+                    claimed = JobService.claim(worker_id, workers - len(running))
+                    running.update((pool.submit(_run, job), job.pk) for job in claimed)
+
+                if not running:
+                    if options['once']:
+                        break
+                    stopping.wait(poll)
+                    continue
+
+                collect(poll)
+
+            # Tâches en cours menées à terme, toujours signalées vivantes
+            while running:
+                heartbeat()
+                collect(poll)
+
+        connections.close_all()
+        self.stdout.write(self.style.SUCCESS(f"{done} tâche(s) exécutée(s), {failed} échec(s)"))
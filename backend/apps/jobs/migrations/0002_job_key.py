@@ -0,0 +1,29 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="key",
+            field=models.CharField(blank=True, max_length=200, verbose_name="Clé"),
+        ),
+        migrations.AddConstraint(
+            model_name="job",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(
+                    ("status", "PENDING"), models.Q(("key", ""), _negated=True)
+                ),
+                fields=("key",),
+                name="job_unique_pending_key",
+            ),
+        ),
+    ]
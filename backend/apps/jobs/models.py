@@ -0,0 +1,83 @@
+"""
+Models for Jobs app
+"""
+from django.db import models
+from django.utils import timezone
+from apps.core.models import Salon
+
+
+class Job(models.Model):
+    """
+    Tâche différée, exécutée par la commande run_jobs.
+    Table d'infrastructure, hors TenantAwareModel : elle reste sur la base
+    'default' pour qu'un worker draine les tâches de tous les shards.
+    Le salon (facultatif) sert à l'équité entre salons et au routage des
+    requêtes de la tâche vers le shard du salon.
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'En attente'),
+        ('RUNNING', 'En cours'),
+        ('DONE', 'Terminée'),
+        ('FAILED', 'Échouée'),
+    ]
+    
+    name = models.CharField('Tâche', max_length=100)
+    # Clé de regroupement : une seule tâche en attente par clé
+    key = models.CharField('Clé', max_length=200, blank=True)
+    kwargs = models.JSONField('Arguments', default=dict, blank=True)
+    salon = models.ForeignKey(
+        Salon,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='jobs',
+        verbose_name='Salon'
+    )
+    
+    status = models.CharField('Statut', max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    run_at = models.DateTimeField('Exécution prévue', default=timezone.now)
+    attempts = models.PositiveIntegerField('Tentatives', default=0)
+    max_attempts = models.PositiveIntegerField('Tentatives maximales', default=5)
+    last_error = models.TextField('Dernière erreur', blank=True)
+    
+    locked_by = models.CharField('Worker', max_length=100, blank=True)
+    locked_at = models.DateTimeField('Prise en charge', null=True, blank=True)
+    finished_at = models.DateTimeField('Fin', null=True, blank=True)
+    created_at = models.DateTimeField('Date de création', auto_now_add=True)
+    
+    class Meta:
+        db_table = 'jobs'
+        verbose_name = 'Tâche'
+        verbose_name_plural = 'Tâches'
+        ordering = ['run_at', 'id']
+        indexes = [
+            # Prise en charge : tâches en attente arrivées à échéance
+            models.Index(fields=['status', 'run_at']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['key'],
+                condition=models.Q(status='PENDING') & ~models.Q(key=''),
+                name='job_unique_pending_key',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class PeriodicJob(models.Model):
+    """Prochaine échéance d'une tâche périodique (une ligne par tâche)"""
+    
+    name = models.CharField('Tâche', max_length=100, unique=True)
+    next_run_at = models.DateTimeField('Prochaine exécution')
+    
+    class Meta:
+        db_table = 'jobs_periodic'
+        verbose_name = 'Tâche périodique'
+        verbose_name_plural = 'Tâches périodiques'
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
@@ -0,0 +1,37 @@
+"""
+Registre des tâches
+    from apps.jobs.registry import task
+
+    @task('services.optimize_image')
+    def optimize_image(service_id):
+        ...
+
+    @task('sync.prune_tombstones', every=timedelta(days=1))
+    def prune_tombstones():
+        ...
+
+Les modules apps/<app>/tasks.py sont importés au démarrage (JobsConfig.ready).
+"""
+
+
+TASKS = {}
+
+
+class Task:
+    """
+    - max_attempts : tentatives avant l'état FAILED (défaut : JOBS_MAX_ATTEMPTS)
+    - every : timedelta, tâche périodique mise en file par le worker
+    """
+    
+    def __init__(self, name, fn, max_attempts=None, every=None):
+        self.name = name
+        self.fn = fn
+        self.max_attempts = max_attempts
+        self.every = every
+
+
+def task(name, max_attempts=None, every=None):
+    def decorator(fn):
+        TASKS[name] = Task(name, fn, max_attempts, every)
+        return fn
+    return decorator
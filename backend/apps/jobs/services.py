@@ -0,0 +1,238 @@
+"""
+Business logic for Jobs app
+File de tâches en base : prise en charge par SELECT ... FOR UPDATE SKIP LOCKED
+(plusieurs workers, voire plusieurs machines, sans double exécution),
+nouvelles tentatives avec attente exponentielle, tâches planifiées (run_at)
+et périodiques, équité entre salons.
+"""
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core import sharding
+from .models import Job, PeriodicJob
+from .registry import TASKS
+
+
+logger = logging.getLogger(__name__)
+
+JOBS_DB = 'default'
+
+
+def enqueue(name, salon=None, delay=None, run_at=None, key='', **kwargs):
+    """
+    Met une tâche en file : fn(**kwargs) sera exécutée par un worker.
+    Une écriture annulée ne déclenche pas de tâche :
+    - salon sur la base de la file (cas sans shards) : la tâche est insérée
+      dans la transaction en cours, validée ou annulée avec elle ;
+    - salon sur un autre shard : l'insertion attend le commit du shard. Un
+      arrêt du processus entre ce commit et l'insertion perd la tâche (au
+      plus une fois) ; les tâches rattrapées par un balayage périodique
+      (rappels, notifications Mobile Money) ne dépendent pas de cet appel.
+    
+    Args:
+        name: nom enregistré par @task
+        salon: salon concerné (instance ou id), pour l'équité et le shard
+        delay / run_at: exécution différée (timedelta / datetime)
+        key: regroupement ; ignorée si une tâche de même clé est déjà en
+            attente (ex. une livraison par abonnement, quel que soit le
+            nombre d'événements)
+    """
+    if name not in TASKS:
+        raise ValueError(f"Tâche inconnue : {name}")
+    if run_at is None:
+        run_at = timezone.now() + (delay or timedelta())
+    salon_id = getattr(salon, 'pk', salon)
+    
+    def create():
+        Job.objects.using(JOBS_DB).bulk_create([Job(
+            name=name,
+            key=key,
+            kwargs=kwargs,
+            salon_id=salon_id,
+            run_at=run_at,
+            max_attempts=TASKS[name].max_attempts or settings.JOBS_MAX_ATTEMPTS
+        )], ignore_conflicts=bool(key))
+    
+    using = sharding.db_for_salon(salon_id) if salon_id else JOBS_DB
+    if using == JOBS_DB:
+        create()
+    else:
+        transaction.on_commit(create, using=using)
+
+
+def _round_robin(rows, limit):
+    """
+    Ids à prendre en charge, un salon après l'autre : un salon qui met en
+    file des milliers de tâches ne retarde pas les autres salons.
+    """
+    queues = {}
+    for job_id, salon_id in rows:
+        queues.setdefault(salon_id, []).append(job_id)
+    
+    ids = []
+    depth = 0
+    while len(ids) < limit and any(len(queue) > depth for queue in queues.values()):
+        for queue in queues.values():
+            if len(queue) > depth:
+                ids.append(queue[depth])
+                if len(ids) == limit:
+                    break
+        depth += 1
+    return ids
+
+
+def _backoff(attempts):
+    """Attente avant la tentative suivante, exponentielle et bornée, avec gigue"""
+    delay = min(
+        settings.JOBS_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+        settings.JOBS_RETRY_MAX_SECONDS
+    )
+    return timedelta(seconds=delay * random.uniform(1, 1.1))
+
+
+class JobService:
+    """Service du worker de tâches"""
+    
+    @staticmethod
+    def claim(worker_id, limit):
+        """
+        Prend en charge jusqu'à limit tâches arrivées à échéance.
+        Les candidates sont choisies parmi les plus anciennes
+        (JOBS_FAIRNESS_WINDOW) en alternant les salons, puis verrouillées ;
+        celles déjà prises par un autre worker sont ignorées (SKIP LOCKED).
+        """
+        now = timezone.now()
+        rows = Job.objects.using(JOBS_DB).filter(
+            status='PENDING', run_at__lte=now
+        ).order_by('run_at', 'id').values_list('id', 'salon_id')[:settings.JOBS_FAIRNESS_WINDOW]
+        ids = _round_robin(rows, limit)
+        if not ids:
+            return []
+        
+        with transaction.atomic(using=JOBS_DB):
+            jobs = list(
+                Job.objects.using(JOBS_DB).select_for_update(skip_locked=True)
+                .filter(pk__in=ids, status='PENDING')
+            )
+            Job.objects.using(JOBS_DB).filter(pk__in=[job.pk for job in jobs]).update(
+                status='RUNNING',
+                locked_by=worker_id,
+                locked_at=now,
+                attempts=F('attempts') + 1
+            )
+        
+        # Même ordre que ids (alternance des salons)
+        order = {job_id: position for position, job_id in enumerate(ids)}
+        for job in jobs:
+            job.status = 'RUNNING'
+            job.attempts += 1
+        return sorted(jobs, key=lambda job: order[job.pk])
+    
+    @staticmethod
+    def execute(job):
+        """Exécute une tâche prise en charge et enregistre son issue"""
+        task = TASKS.get(job.name)
+        sharding.activate(job.salon_id)
+        try:
+            if task is None:
+                raise LookupError(f"Tâche inconnue : {job.name}")
+            task.fn(**job.kwargs)
+        except Exception:
+            error = traceback.format_exc()
+            retry = job.attempts < job.max_attempts
+            logger.warning(
+                "Échec de la tâche %s #%s (tentative %s/%s)",
+                job.name, job.pk, job.attempts, job.max_attempts
+            )
+            failed = {'status': 'FAILED', 'finished_at': timezone.now()}
+            outcome = {'status': 'PENDING', 'run_at': timezone.now() + _backoff(job.attempts)}
+            jobs = Job.objects.using(JOBS_DB).filter(pk=job.pk)
+            try:
+                jobs.update(last_error=error, locked_by='', locked_at=None, **(outcome if retry else failed))
+            except IntegrityError:
+                # Une tâche de même clé est déjà en attente : elle reprendra le travail
+                jobs.update(last_error=error, locked_by='', locked_at=None, **failed)
+            return False
+        finally:
+            sharding.deactivate()
+        
+        Job.objects.using(JOBS_DB).filter(pk=job.pk).update(
+            status='DONE',
+            finished_at=timezone.now(),
+            last_error='',
+            locked_by='',
+            locked_at=None
+        )
+        return True
+    
+    @staticmethod
+    def schedule_periodic():
+        """Met en file les tâches périodiques arrivées à échéance"""
+        periodic = {name: task for name, task in TASKS.items() if task.every}
+        if not periodic:
+            return 0
+        now = timezone.now()
+        
+        existing = set(PeriodicJob.objects.using(JOBS_DB).values_list('name', flat=True))
+        PeriodicJob.objects.using(JOBS_DB).bulk_create(
+            [PeriodicJob(name=name, next_run_at=now) for name in periodic if name not in existing],
+            ignore_conflicts=True
+        )
+        
+        with transaction.atomic(using=JOBS_DB):
+            due = list(
+                PeriodicJob.objects.using(JOBS_DB).select_for_update(skip_locked=True)
+                .filter(name__in=periodic, next_run_at__lte=now)
+            )
+            for schedule in due:
+                task = periodic[schedule.name]
+                Job.objects.using(JOBS_DB).create(
+                    name=schedule.name,
+                    max_attempts=task.max_attempts or settings.JOBS_MAX_ATTEMPTS
+                )
+                schedule.next_run_at = now + task.every
+                schedule.save(update_fields=['next_run_at'])
+        return len(due)
+    
+    @staticmethod
+    def heartbeat(worker_id, ids):
+        """
+        Signale que les tâches ids sont toujours en cours (locked_at) : une
+        tâche longue n'est pas reprise par reclaim_stale tant que son worker
+        est vivant.
+        """
+        if not ids:
+            return 0
+        return Job.objects.using(JOBS_DB).filter(
+            pk__in=ids, status='RUNNING', locked_by=worker_id
+        ).update(locked_at=timezone.now())
+    
+    @staticmethod
+    def reclaim_stale():
+        """
+        Remet en file les tâches d'un worker arrêté en cours d'exécution
+        (sans battement de cœur depuis JOBS_LOCK_TIMEOUT_SECONDS)
+        """
+        cutoff = timezone.now() - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS)
+        stale = Job.objects.using(JOBS_DB).filter(status='RUNNING', locked_at__lt=cutoff)
+        # Déjà remplacées par une tâche en attente de même clé
+        stale.exclude(key='').filter(
+            key__in=Job.objects.using(JOBS_DB).filter(status='PENDING').values('key')
+        ).update(status='FAILED', finished_at=timezone.now(), locked_by='', locked_at=None)
+        return stale.update(status='PENDING', run_at=timezone.now(), locked_by='', locked_at=None)
+    
+    @staticmethod
+    def prune(older_than_days=None):
+        """Supprime les tâches terminées anciennes (les échecs sont conservés)"""
+        days = settings.JOBS_RETENTION_DAYS if older_than_days is None else older_than_days
+        deleted, _ = Job.objects.using(JOBS_DB).filter(
+            status='DONE', finished_at__lt=timezone.now() - timedelta(days=days)
+        ).delete()
+        return deleted
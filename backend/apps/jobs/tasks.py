@@ -0,0 +1,13 @@
+"""
+Tasks for Jobs app
+"""
+from datetime import timedelta
+
+from .registry import task
+from .services import JobService
+
+
+@task('jobs.prune', every=timedelta(days=1))
+def prune_jobs():
+    """Purge quotidienne des tâches terminées"""
+    JobService.prune()
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Payment
+from .models import MobileMoneyCallback, Payment
 
 
 @admin.register(Payment)
@@ -34,3 +34,17 @@ class PaymentAdmin(admin.ModelAdmin):
     def get_client_name(self, obj):
         return obj.client.get_full_name()
     get_client_name.short_description = 'Client'
+
+
+@admin.register(MobileMoneyCallback)
+class MobileMoneyCallbackAdmin(admin.ModelAdmin):
+    list_display = [
+        'transaction_id', 'operator_status', 'amount', 'reference',
+        'status', 'salon', 'created_at', 'processed_at'
+    ]
+    list_filter = ['status', 'operator_status', 'salon']
+    search_fields = ['transaction_id', 'reference', 'phone']
+    readonly_fields = [
+        'salon', 'transaction_id', 'operator_status', 'amount', 'reference',
+        'phone', 'payload', 'error', 'processed_at', 'created_at', 'updated_at'
+    ]
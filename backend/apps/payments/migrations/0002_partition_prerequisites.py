@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_payment_date(apps, schema_editor):
+    """payment_date devient la clé de partitionnement : plus de valeurs NULL"""
+    Payment = apps.get_model("payments", "Payment")
+    Payment.objects.filter(payment_date__isnull=True).update(payment_date=F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0002_active_partial_indexes"),
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_payment_date, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="payment",
+            name="appointment",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="payments",
+                to="appointments.appointment",
+                verbose_name="Rendez-vous",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="payment",
+            name="payment_date",
+            field=models.DateTimeField(
+                default=django.utils.timezone.now, verbose_name="Date de paiement"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-19 10:07
+
+from django.db import migrations
+
+from apps.core.partitioning import convert_to_partitioned, convert_to_regular
+
+
+def partition_payments(apps, schema_editor):
+    convert_to_partitioned(schema_editor, apps.get_model("payments", "Payment"))
+
+
+def unpartition_payments(apps, schema_editor):
+    convert_to_regular(schema_editor, apps.get_model("payments", "Payment"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("payments", "0002_partition_prerequisites"),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_payments, unpartition_payments),
+    ]
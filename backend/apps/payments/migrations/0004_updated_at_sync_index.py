@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("appointments", "0004_updated_at_sync_index"),
+        ("clients", "0002_updated_at_sync_index"),
+        ("core", "0002_salon_shard"),
+        ("payments", "0003_partition_payments"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                fields=["salon", "updated_at", "id"], name="payments_salon_i_9a15cf_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,282 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def register_transactions(apps, schema_editor):
+    """Numéros de transaction existants : le plus ancien paiement est retenu"""
+    # Base migrée (migrate --database shardN), pas celle du routeur
+    alias = schema_editor.connection.alias
+    Payment = apps.get_model("payments", "Payment")
+    PaymentTransaction = apps.get_model("payments", "PaymentTransaction")
+    rows = (
+        Payment.objects.using(alias)
+        .exclude(transaction_id="")
+        .order_by("id")
+        .values_list("id", "salon_id", "transaction_id")
+    )
+    batch = []
+    for payment_id, salon_id, transaction_id in rows.iterator():
+        batch.append(
+            PaymentTransaction(
+                salon_id=salon_id, transaction_id=transaction_id, payment_id=payment_id
+            )
+        )
+        if len(batch) >= 1000:
+            PaymentTransaction.objects.using(alias).bulk_create(
+                batch, ignore_conflicts=True
+            )
+            batch = []
+    PaymentTransaction.objects.using(alias).bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+        ("payments", "0004_updated_at_sync_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IdempotencyKey",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                ("key", models.CharField(max_length=255, verbose_name="Clé")),
+                (
+                    "fingerprint",
+                    models.CharField(
+                        max_length=64, verbose_name="Empreinte de la requête"
+                    ),
+                ),
+                (
+                    "response_status",
+                    models.PositiveSmallIntegerField(
+                        blank=True, null=True, verbose_name="Statut HTTP"
+                    ),
+                ),
+                (
+                    "response_body",
+                    models.JSONField(blank=True, null=True, verbose_name="Réponse"),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Clé d'idempotence",
+                "verbose_name_plural": "Clés d'idempotence",
+                "db_table": "payment_idempotency_keys",
+                "indexes": [
+                    models.Index(
+                        fields=["created_at"], name="payment_ide_created_abf0b6_idx"
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("salon", "key"), name="payment_idempotency_key_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="MobileMoneyCallback",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                (
+                    "transaction_id",
+                    models.CharField(max_length=100, verbose_name="ID Transaction"),
+                ),
+                (
+                    "operator_status",
+                    models.CharField(max_length=20, verbose_name="Statut opérateur"),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Montant",
+                    ),
+                ),
+                (
+                    "reference",
+                    models.CharField(
+                        blank=True,
+                        help_text="Identifiant du rendez-vous transmis lors de la demande de paiement",
+                        max_length=100,
+                        verbose_name="Référence",
+                    ),
+                ),
+                (
+                    "phone",
+                    models.CharField(
+                        blank=True, max_length=20, verbose_name="Téléphone"
+                    ),
+                ),
+                (
+                    "payload",
+                    models.JSONField(default=dict, verbose_name="Notification"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "À traiter"),
+                            ("PROCESSED", "Traité"),
+                            ("REJECTED", "Rejeté"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Erreur")),
+                (
+                    "processed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Traité le"
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification Mobile Money",
+                "verbose_name_plural": "Notifications Mobile Money",
+                "db_table": "mobile_money_callbacks",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["salon", "status", "id"],
+                        name="mobile_mone_salon_i_272d95_idx",
+                    ),
+                    models.Index(
+                        fields=["processed_at"], name="mobile_mone_process_1e7d34_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("salon", "transaction_id", "operator_status"),
+                        name="mobile_money_callback_unique",
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="PaymentTransaction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                (
+                    "transaction_id",
+                    models.CharField(max_length=100, verbose_name="ID Transaction"),
+                ),
+                (
+                    "payment",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="transaction_records",
+                        to="payments.payment",
+                        verbose_name="Paiement",
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Transaction de paiement",
+                "verbose_name_plural": "Transactions de paiement",
+                "db_table": "payment_transactions",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("salon", "transaction_id"), name="payment_txn_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(register_transactions, migrations.RunPython.noop),
+    ]
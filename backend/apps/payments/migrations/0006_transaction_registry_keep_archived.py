@@ -0,0 +1,53 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def register_archived_transactions(apps, schema_editor):
+    """Numéros des paiements déjà archivés (registre supprimé en cascade)"""
+    alias = schema_editor.connection.alias
+    ArchivedPayment = apps.get_model("archive", "ArchivedPayment")
+    PaymentTransaction = apps.get_model("payments", "PaymentTransaction")
+    rows = (
+        ArchivedPayment.objects.using(alias)
+        .exclude(transaction_id="")
+        .order_by("id")
+        .values_list("id", "salon_id", "transaction_id")
+    )
+    batch = []
+    for payment_id, salon_id, transaction_id in rows.iterator():
+        batch.append(
+            PaymentTransaction(
+                salon_id=salon_id, transaction_id=transaction_id, payment_id=payment_id
+            )
+        )
+        if len(batch) >= 1000:
+            PaymentTransaction.objects.using(alias).bulk_create(
+                batch, ignore_conflicts=True
+            )
+            batch = []
+    PaymentTransaction.objects.using(alias).bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archive", "0001_initial"),
+        ("payments", "0005_payment_ingestion"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="paymenttransaction",
+            name="payment",
+            field=models.ForeignKey(
+                db_constraint=False,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="transaction_records",
+                to="payments.payment",
+                verbose_name="Paiement",
+            ),
+        ),
+        migrations.RunPython(register_archived_transactions, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@
 Models for Payments app
 """
 from django.db import models
+from django.utils import timezone
 from apps.core.models import TenantAwareModel
 from apps.core.managers import TenantManager
 
@@ -28,11 +29,14 @@ class Payment(TenantAwareModel):
     ]
     
     # Lien avec le rendez-vous
+    # Pas de contrainte FK en base : la table appointments est partitionnée
+    # et sa clé primaire est (id, date). La cascade reste gérée par Django.
     appointment = models.ForeignKey(
         'appointments.Appointment',
         on_delete=models.CASCADE,
         related_name='payments',
-        verbose_name='Rendez-vous'
+        verbose_name='Rendez-vous',
+        db_constraint=False
     )
     
     # Client
@@ -66,8 +70,8 @@ class Payment(TenantAwareModel):
         default='PENDING'
     )
     
-    # Dates
-    payment_date = models.DateTimeField('Date de paiement', null=True, blank=True)
+    # Dates (clé de partitionnement mensuel de la table payments)
+    payment_date = models.DateTimeField('Date de paiement', default=timezone.now)
     
     # Informations additionnelles
     transaction_id = models.CharField(
@@ -90,6 +94,8 @@ class Payment(TenantAwareModel):
             models.Index(fields=['salon', 'status']),
             models.Index(fields=['salon', 'payment_date']),
             models.Index(fields=['salon', 'client']),
+            # Flux de modifications (apps.sync) : parcours par updated_at
+            models.Index(fields=['salon', 'updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -99,10 +105,123 @@ class Payment(TenantAwareModel):
         """
         Validation : 
         - Client et Appointment doivent appartenir au même salon
+          (comparaison des identifiants : aucun salon n'est chargé)
         """
-        if self.client.salon != self.salon:
+        if self.client.salon_id != self.salon_id:
             raise ValueError("Le client doit appartenir au même salon")
-        if self.appointment.salon != self.salon:
+        if self.appointment.salon_id != self.salon_id:
             raise ValueError("Le rendez-vous doit appartenir au même salon")
         
         super().save(*args, **kwargs)
+
+
+class PaymentTransaction(TenantAwareModel):
+    """
+    Registre des numéros de transaction (Mobile Money, carte...) : un numéro
+    n'est enregistré qu'une fois par salon. L'index unique ne peut pas être
+    posé sur payments, partitionnée par payment_date (il devrait inclure la
+    clé de partitionnement). Conservé quand le paiement est archivé
+    (DO_NOTHING) : le numéro reste pris, payment_id désigne alors une
+    ligne d'archived_payments.
+    """
+    transaction_id = models.CharField('ID Transaction', max_length=100)
+    payment = models.ForeignKey(
+        Payment,
+        on_delete=models.DO_NOTHING,
+        related_name='transaction_records',
+        verbose_name='Paiement',
+        db_constraint=False
+    )
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'payment_transactions'
+        verbose_name = 'Transaction de paiement'
+        verbose_name_plural = 'Transactions de paiement'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['salon', 'transaction_id'],
+                name='payment_txn_unique'
+            ),
+        ]
+    
+    def __str__(self):
+        return self.transaction_id
+
+
+class IdempotencyKey(TenantAwareModel):
+    """
+    Clé d'idempotence (en-tête Idempotency-Key) d'une création de paiement :
+    la réponse d'origine est conservée et renvoyée aux requêtes rejouées.
+    """
+    key = models.CharField('Clé', max_length=255)
+    fingerprint = models.CharField('Empreinte de la requête', max_length=64)
+    response_status = models.PositiveSmallIntegerField('Statut HTTP', null=True, blank=True)
+    response_body = models.JSONField('Réponse', null=True, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'payment_idempotency_keys'
+        verbose_name = "Clé d'idempotence"
+        verbose_name_plural = "Clés d'idempotence"
+        constraints = [
+            models.UniqueConstraint(fields=['salon', 'key'], name='payment_idempotency_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+    
+    def __str__(self):
+        return self.key
+
+
+class MobileMoneyCallback(TenantAwareModel):
+    """
+    Notification d'un opérateur Mobile Money, reçue telle quelle puis traitée
+    par le worker (apps.jobs). Une même notification (transaction, statut)
+    n'est enregistrée qu'une fois : les renvois de l'opérateur sont ignorés.
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'À traiter'),
+        ('PROCESSED', 'Traité'),
+        ('REJECTED', 'Rejeté'),
+    ]
+    
+    transaction_id = models.CharField('ID Transaction', max_length=100)
+    operator_status = models.CharField('Statut opérateur', max_length=20)
+    amount = models.DecimalField('Montant', max_digits=10, decimal_places=2, null=True, blank=True)
+    reference = models.CharField(
+        'Référence',
+        max_length=100,
+        blank=True,
+        help_text='Identifiant du rendez-vous transmis lors de la demande de paiement'
+    )
+    phone = models.CharField('Téléphone', max_length=20, blank=True)
+    payload = models.JSONField('Notification', default=dict)
+    status = models.CharField('Statut', max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    error = models.TextField('Erreur', blank=True)
+    processed_at = models.DateTimeField('Traité le', null=True, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'mobile_money_callbacks'
+        verbose_name = 'Notification Mobile Money'
+        verbose_name_plural = 'Notifications Mobile Money'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['salon', 'transaction_id', 'operator_status'],
+                name='mobile_money_callback_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['salon', 'status', 'id']),
+            models.Index(fields=['processed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.transaction_id} ({self.operator_status})"
@@ -0,0 +1,28 @@
+"""
+Requêtes critiques de l'app Payments
+Vérifiées par la commande check_query_plans
+"""
+from datetime import timedelta
+
+from apps.core.query_plans import register_hot_query
+from .services import PaymentService
+
+
+register_hot_query(
+    'payments.daily_revenue',
+    lambda ctx: PaymentService.get_daily_revenue(ctx['salon'], ctx['date']),
+)
+
+register_hot_query(
+    'payments.monthly_revenue',
+    lambda ctx: PaymentService.get_monthly_revenue(
+        ctx['salon'], ctx['date'].year, ctx['date'].month
+    ),
+)
+
+register_hot_query(
+    'payments.stats',
+    lambda ctx: PaymentService.get_payment_stats(
+        ctx['salon'], ctx['date'] - timedelta(days=30), ctx['date']
+    ),
+)
@@ -3,10 +3,15 @@ Serializers for Payments app
 """
 from rest_framework import serializers
 from django.utils import timezone
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.core.projections import ValuesSerializer, Column, SideLoad, as_datetime, as_decimal, as_iso, display, full_name
+from apps.clients.serializers import ClientSerializer
+from apps.services.serializers import ServiceSerializer
 from .models import Payment
+from .services import PaymentService
 
 
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les paiements"""
     
     client_name = serializers.CharField(source='client.get_full_name', read_only=True)
@@ -18,6 +23,9 @@ class PaymentSerializer(serializers.ModelSerializer):
     )
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     
+    # Objet complet, sur demande (?expand=client)
+    client_details = ClientSerializer(source='client', read_only=True)
+    
     class Meta:
         model = Payment
         fields = [
@@ -26,9 +34,50 @@ class PaymentSerializer(serializers.ModelSerializer):
             'payment_method', 'payment_method_display',
             'status', 'status_display', 'payment_date',
             'transaction_id', 'notes',
-            'created_at', 'updated_at'
+            'created_at', 'updated_at',
+            'client_details'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        expandable_fields = ['client_details']
+        field_sources = {
+            'client_name': ('client.first_name', 'client.last_name'),
+        }
+
+
+class PaymentValuesSerializer(ValuesSerializer):
+    """Équivalent values() de PaymentSerializer pour les listes"""
+    
+    columns = (
+        Column('id'),
+        Column('appointment'),
+        Column('appointment_date', 'appointment__date', format=as_iso),
+        Column('service_name', 'appointment__service__name'),
+        Column('client'),
+        Column('client_name', 'client__first_name', 'client__last_name', format=full_name),
+        Column('amount', format=as_decimal(2, 10)),
+        Column('payment_method'),
+        Column(
+            'payment_method_display', 'payment_method',
+            format=display(Payment.PAYMENT_METHOD_CHOICES)
+        ),
+        Column('status'),
+        Column('status_display', 'status', format=display(Payment.STATUS_CHOICES)),
+        Column('payment_date', format=as_datetime),
+        Column('transaction_id'),
+        Column('notes'),
+        Column('created_at', format=as_datetime),
+        Column('updated_at', format=as_datetime),
+    )
+    sideloads = (
+        SideLoad(
+            'clients', 'client', ClientSerializer, ['id', 'full_name', 'phone'],
+            replaces=('client_name',)
+        ),
+        SideLoad(
+            'services', 'service', ServiceSerializer, ['id', 'name', 'price', 'duration'],
+            replaces=('service_name',), lookup='appointment__service'
+        ),
+    )
 
 
 class PaymentCreateSerializer(serializers.ModelSerializer):
@@ -48,21 +97,84 @@ class PaymentCreateSerializer(serializers.ModelSerializer):
         return value
     
     def create(self, validated_data):
-        """Crée le paiement et met à jour le statut"""
-        validated_data['salon'] = self.context['request'].salon
+        """
+        Crée le paiement et met à jour le statut.
+        Un rejeu d'un numéro de transaction déjà enregistré renvoie le
+        paiement existant (self.created = False) ; un autre paiement sur le
+        même numéro est refusé (409).
+        """
+        salon = self.context['request'].salon
+        validated_data['salon'] = salon
         validated_data['status'] = 'COMPLETED'
         validated_data['payment_date'] = timezone.now()
         
-        payment = super().create(validated_data)
-        
-        # Met à jour le statut du rendez-vous
-        if payment.appointment.status != 'COMPLETED':
-            payment.appointment.status = 'COMPLETED'
-            payment.appointment.save()
+        def create():
+            payment = super(PaymentCreateSerializer, self).create(validated_data)
+            PaymentService.complete_appointment(payment.appointment)
+            return payment
         
+        payment, self.created = PaymentService.ingest(
+            salon, validated_data.get('transaction_id'), create,
+            amount=validated_data['amount'],
+            appointment_id=validated_data['appointment'].pk,
+            client_id=validated_data['client'].pk
+        )
         return payment
 
 
+class CheckoutSerializer(serializers.Serializer):
+    """Encaissement d'un rendez-vous (montant par défaut : reste dû)"""
+    
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    payment_method = serializers.ChoiceField(choices=Payment.PAYMENT_METHOD_CHOICES, default='CASH')
+    transaction_id = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    
+    def validate_amount(self, value):
+        if value <= 0:
+            raise serializers.ValidationError("Le montant doit être supérieur à 0")
+        return value
+
+
+class CheckoutPaymentSerializer(serializers.ModelSerializer):
+    """Paiement créé par un encaissement (réponse de checkout)"""
+    
+    class Meta:
+        model = Payment
+        fields = ['id', 'amount', 'payment_method', 'status', 'payment_date', 'transaction_id']
+        read_only_fields = fields
+
+
+class CheckoutResultSerializer(serializers.Serializer):
+    """
+    Rendez-vous après encaissement (réponse de checkout). Formats des champs
+    DRF : le corps enregistré pour Idempotency-Key est rejoué à l'identique.
+    """
+    
+    id = serializers.IntegerField(source='appointment.pk')
+    status = serializers.CharField(source='appointment.status')
+    price = serializers.DecimalField(source='appointment.service.price', max_digits=10, decimal_places=2)
+    paid = serializers.DecimalField(max_digits=10, decimal_places=2)
+    remaining = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class MobileMoneyCallbackSerializer(serializers.Serializer):
+    """Notification d'un opérateur Mobile Money"""
+    
+    transaction_id = serializers.CharField(max_length=100)
+    status = serializers.ChoiceField(choices=['SUCCESS', 'FAILED', 'PENDING'])
+    amount = serializers.DecimalField(max_digits=10, decimal_places=2, required=False, allow_null=True)
+    reference = serializers.CharField(max_length=100, required=False, allow_blank=True, default='')
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True, default='')
+    
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and isinstance(data.get('status'), str):
+            data = {**data, 'status': data['status'].upper()}
+        values = super().to_internal_value(data)
+        values['operator_status'] = values.pop('status')
+        return values
+
+
 class PaymentStatsSerializer(serializers.Serializer):
     """Serializer pour les statistiques de paiements"""
     
@@ -1,22 +1,56 @@
 """
 Business logic for Payments app
 """
-from django.db import transaction
-from django.db.models import Sum, Count, Q
-from datetime import datetime
-from .models import Payment
+import hashlib
+import hmac
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import DecimalField, OuterRef, Subquery, Sum, Count, Q, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from datetime import datetime, date as dt_date, time as dt_time, timedelta
+from rest_framework.exceptions import NotFound, ValidationError
+from apps.core import sharding
+from apps.core.exceptions import CheckoutConflict, IdempotencyKeyMismatch, TransactionConflict
+from apps.core.sharding import tenant_atomic
+from .models import IdempotencyKey, MobileMoneyCallback, Payment, PaymentTransaction
 
 
 class PaymentService:
     """Service centralisant la logique métier des paiements"""
     
+    @staticmethod
+    def period_bounds(start_date, end_date):
+        """
+        Bornes [début, fin[ (datetimes aware) couvrant les jours start..end.
+        Un filtre par plage sur payment_date utilise l'index (salon, payment_date)
+        et l'élagage des partitions mensuelles, contrairement à __date / __month.
+        """
+        if isinstance(start_date, str):
+            start_date = parse_date(start_date)
+        if isinstance(end_date, str):
+            end_date = parse_date(end_date)
+        
+        tz = timezone.get_current_timezone()
+        start = timezone.make_aware(datetime.combine(start_date, dt_time.min), tz)
+        end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), dt_time.min), tz)
+        return start, end
+    
     @staticmethod
     def create_payment(salon, appointment, amount, payment_method, **kwargs):
         """
         Crée un paiement pour un rendez-vous.
-        Met à jour automatiquement le statut du rendez-vous.
+        Met à jour automatiquement le statut du rendez-vous. Un numéro de
+        transaction déjà enregistré renvoie le paiement existant (rejeu à
+        l'identique seulement).
         """
-        with transaction.atomic():
+        def create():
             payment = Payment.objects.create(
                 salon=salon,
                 appointment=appointment,
@@ -27,72 +61,284 @@ class PaymentService:
                 payment_date=datetime.now(),
                 **kwargs
             )
+            PaymentService.complete_appointment(appointment)
+            return payment
+        
+        with tenant_atomic(salon):
+            payment, _ = PaymentService.ingest(
+                salon, kwargs.get('transaction_id'), create,
+                amount=amount, appointment_id=appointment.pk, client_id=appointment.client_id
+            )
+        
+        return payment
+    
+    @staticmethod
+    def checkout(salon, appointment_id, payment_method, amount=None, transaction_id='', notes=''):
+        """
+        Encaissement d'un rendez-vous en une transaction, en un nombre fixe
+        de requêtes :
+        1. verrou du rendez-vous (SELECT ... FOR UPDATE) chargé avec son
+           client, son service et le montant déjà payé (sous-requête) ;
+        2. contrôle du montant (reste dû, par défaut le montant encaissé) ;
+        3. INSERT du paiement (et réservation du numéro de transaction) ;
+        4. UPDATE unique du statut quand le rendez-vous est soldé.
+        Un double envoi attend le verrou puis trouve le rendez-vous réglé ;
+        avec un numéro de transaction, le rejeu renvoie le paiement
+        enregistré (created=False).
+        
+        Returns:
+            dict (payment, appointment, paid, remaining, created)
+        """
+        from apps.appointments.models import Appointment, ACTIVE_STATUSES, record_transitions
+        from apps.realtime.events import build_event, publish as publish_event
+        from apps.webhooks.services import publish_status_change
+        
+        using = sharding.db_for_salon(salon)
+        money = DecimalField(max_digits=10, decimal_places=2)
+        paid = Payment.objects.filter(
+            appointment=OuterRef('pk'), status='COMPLETED'
+        ).values('appointment').annotate(total=Sum('amount')).values('total')
+        
+        with tenant_atomic(salon):
+            appointment = (
+                Appointment.objects.select_for_update(of=('self',))
+                .select_related('client', 'service')
+                .annotate(paid=Coalesce(Subquery(paid, output_field=money), Value(Decimal('0')), output_field=money))
+                .filter(salon=salon, pk=appointment_id)
+                .first()
+            )
+            if appointment is None:
+                raise NotFound('Rendez-vous introuvable')
+            
+            replayed = transaction_id and PaymentService.transaction_payment(
+                salon, transaction_id, amount=amount, appointment_id=appointment.pk
+            )
+            if replayed:
+                return {
+                    'payment': replayed,
+                    'appointment': appointment,
+                    'paid': appointment.paid,
+                    'remaining': max(appointment.service.price - appointment.paid, Decimal('0')),
+                    'created': False,
+                }
+            
+            if appointment.status not in ACTIVE_STATUSES + ['COMPLETED']:
+                raise CheckoutConflict(
+                    f"Rendez-vous {appointment.get_status_display().lower()} : encaissement impossible"
+                )
+            
+            remaining = appointment.service.price - appointment.paid
+            if remaining <= 0:
+                raise CheckoutConflict('Rendez-vous déjà réglé')
+            if amount is None:
+                amount = remaining
+            elif amount > remaining:
+                raise ValidationError({'amount': f"Montant supérieur au reste dû ({remaining})"})
+            
+            now = timezone.now()
             
-            # Met à jour le statut du rendez-vous
-            if appointment.status != 'COMPLETED':
+            def create():
+                payment = Payment(
+                    salon=salon,
+                    appointment=appointment,
+                    client=appointment.client,
+                    amount=amount,
+                    payment_method=payment_method,
+                    status='COMPLETED',
+                    payment_date=now,
+                    transaction_id=transaction_id,
+                    notes=notes
+                )
+                payment.save(force_insert=True)
+                return payment
+            
+            payment, created = PaymentService.ingest(
+                salon, transaction_id, create, amount=amount, appointment_id=appointment.pk
+            )
+            if created:
+                appointment.paid += amount
+                remaining -= amount
+            
+            if created and remaining <= 0 and appointment.status != 'COMPLETED':
+                previous_status = appointment.status
+                Appointment.objects.filter(pk=appointment.pk, date=appointment.date).update(
+                    status='COMPLETED', updated_at=now
+                )
+                record_transitions(appointment.salon_id, [(appointment.pk, previous_status, 'COMPLETED')], using)
                 appointment.status = 'COMPLETED'
-                appointment.save()
+                appointment.updated_at = now
+                
+                # UPDATE sans signaux : journal, écrans et webhooks traités ici (le
+                # tableau de bord est déjà périmé par l'insertion du paiement)
+                event = build_event('appointment', appointment, 'updated')
+                transaction.on_commit(lambda: publish_event(event, using), using=using)
+                publish_status_change(appointment, previous_status)
         
+        return {
+            'payment': payment,
+            'appointment': appointment,
+            'paid': appointment.paid,
+            'remaining': max(remaining, Decimal('0')),
+            'created': created,
+        }
+    
+    @staticmethod
+    def complete_appointment(appointment):
+        """Passe le rendez-vous payé en COMPLETED (événement webhook inclus)"""
+        if appointment.status == 'COMPLETED':
+            return
+        
+        from apps.webhooks.services import publish_status_change
+        
+        previous_status = appointment.status
+        appointment.status = 'COMPLETED'
+        appointment.save()
+        publish_status_change(appointment, previous_status)
+    
+    @staticmethod
+    def ingest(salon, transaction_id, create, **expected):
+        """
+        Enregistre un paiement au plus une fois par numéro de transaction.
+        create() crée le paiement ; si un paiement concurrent a réservé le
+        même numéro entre-temps, il est annulé (point de sauvegarde) et le
+        paiement existant est renvoyé.
+        expected (amount, appointment_id, client_id) décrit le paiement
+        envoyé : seul un rejeu à l'identique renvoie le paiement existant,
+        un autre paiement sur le même numéro lève TransactionConflict (409).
+        
+        Returns:
+            (paiement, created)
+        """
+        if not transaction_id:
+            return create(), True
+        
+        records = PaymentTransaction.objects.filter(salon=salon, transaction_id=transaction_id)
+        record = records.first()
+        if record is not None:
+            return PaymentService.registered_payment(record, expected), False
+        
+        try:
+            with tenant_atomic(salon):
+                payment = create()
+                PaymentTransaction.objects.create(
+                    salon_id=payment.salon_id,
+                    transaction_id=transaction_id,
+                    payment=payment
+                )
+        except IntegrityError:
+            record = records.first()
+            if record is None:
+                raise
+            return PaymentService.registered_payment(record, expected), False
+        return payment, True
+    
+    @staticmethod
+    def registered_payment(record, expected=None):
+        """
+        Paiement d'un numéro de transaction enregistré. Un paiement archivé
+        ne peut plus être renvoyé ni modifié, et un paiement différent de
+        expected (valeurs None ignorées) n'est pas un rejeu :
+        TransactionConflict (409) dans les deux cas.
+        """
+        payment = Payment.objects.filter(salon_id=record.salon_id, pk=record.payment_id).first()
+        if payment is None:
+            raise TransactionConflict("Numéro de transaction déjà enregistré (paiement archivé).")
+        
+        mismatched = [
+            field for field, value in (expected or {}).items()
+            if value is not None and getattr(payment, field) != value
+        ]
+        if mismatched:
+            raise TransactionConflict(
+                f"Numéro de transaction déjà enregistré pour un autre paiement ({', '.join(mismatched)})."
+            )
         return payment
     
     @staticmethod
-    def get_payment_stats(salon, start_date, end_date):
+    def transaction_payment(salon, transaction_id, **expected):
+        """Paiement déjà enregistré sous ce numéro de transaction (ou None)"""
+        record = PaymentTransaction.objects.filter(salon=salon, transaction_id=transaction_id).first()
+        if record is None:
+            return None
+        return PaymentService.registered_payment(record, expected)
+    
+    @staticmethod
+    def completed_payments(salon, start_date, end_date, include_archived=False):
         """
-        Calcule les statistiques de paiements pour une période.
+        Paiements complétés d'une période.
+        Retourne la liste des QuerySets à agréger : table active, puis
+        table d'archive si include_archived=True.
         """
-        payments = Payment.objects.filter(
-            salon=salon,
-            payment_date__date__range=[start_date, end_date],
-            status='COMPLETED'
+        start, end = PaymentService.period_bounds(start_date, end_date)
+        filters = {
+            'salon': salon,
+            'payment_date__gte': start,
+            'payment_date__lt': end,
+            'status': 'COMPLETED',
+        }
+        sources = [Payment.objects.filter(**filters)]
+        if include_archived:
+            from apps.archive.models import ArchivedPayment
+            sources.append(ArchivedPayment.objects.filter(**filters))
+        return sources
+    
+    @staticmethod
+    def _sum_amount(sources):
+        return sum(
+            payments.aggregate(total=Sum('amount'))['total'] or 0
+            for payments in sources
         )
+    
+    @staticmethod
+    def get_payment_stats(salon, start_date, end_date, include_archived=False):
+        """
+        Calcule les statistiques de paiements pour une période.
+        """
+        sources = PaymentService.completed_payments(salon, start_date, end_date, include_archived)
         
         # Montant total
-        total = payments.aggregate(total=Sum('amount'))['total'] or 0
+        total = PaymentService._sum_amount(sources)
         
         # Par méthode de paiement
-        by_method = {}
-        for method_code, method_name in Payment.PAYMENT_METHOD_CHOICES:
-            method_total = payments.filter(
-                payment_method=method_code
-            ).aggregate(total=Sum('amount'))['total'] or 0
-            
-            by_method[method_name] = float(method_total)
+        totals_by_method = {}
+        for payments in sources:
+            for row in payments.values('payment_method').annotate(total=Sum('amount')).order_by():
+                totals_by_method[row['payment_method']] = totals_by_method.get(row['payment_method'], 0) + row['total']
+        by_method = {
+            method_name: float(totals_by_method.get(method_code, 0))
+            for method_code, method_name in Payment.PAYMENT_METHOD_CHOICES
+        }
         
         # Par statut
-        by_status = {}
-        for status_code, status_name in Payment.STATUS_CHOICES:
-            status_count = payments.filter(status=status_code).count()
-            by_status[status_name] = status_count
+        counts_by_status = {}
+        for payments in sources:
+            for row in payments.values('status').annotate(count=Count('id')).order_by():
+                counts_by_status[row['status']] = counts_by_status.get(row['status'], 0) + row['count']
+        by_status = {
+            status_name: counts_by_status.get(status_code, 0)
+            for status_code, status_name in Payment.STATUS_CHOICES
+        }
         
         return {
             'total_amount': float(total),
-            'total_count': payments.count(),
+            'total_count': sum(counts_by_status.values()),
             'by_method': by_method,
             'by_status': by_status
         }
     
     @staticmethod
-    def get_daily_revenue(salon, date):
+    def get_daily_revenue(salon, date, include_archived=False):
         """Calcule le revenu d'une journée"""
-        total = Payment.objects.filter(
-            salon=salon,
-            payment_date__date=date,
-            status='COMPLETED'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        return float(total)
+        sources = PaymentService.completed_payments(salon, date, date, include_archived)
+        return float(PaymentService._sum_amount(sources))
     
     @staticmethod
-    def get_monthly_revenue(salon, year, month):
+    def get_monthly_revenue(salon, year, month, include_archived=False):
         """Calcule le revenu d'un mois"""
-        total = Payment.objects.filter(
-            salon=salon,
-            payment_date__year=year,
-            payment_date__month=month,
-            status='COMPLETED'
-        ).aggregate(total=Sum('amount'))['total'] or 0
-        
-        return float(total)
+        first_day = dt_date(year, month, 1)
+        last_day = (first_day + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        sources = PaymentService.completed_payments(salon, first_day, last_day, include_archived)
+        return float(PaymentService._sum_amount(sources))
     
     @staticmethod
     def refund_payment(payment, reason=''):
@@ -100,7 +346,7 @@ class PaymentService:
         Rembourse un paiement.
         Met à jour le statut du paiement et potentiellement du rendez-vous.
         """
-        with transaction.atomic():
+        with tenant_atomic(payment.salon_id):
             payment.status = 'REFUNDED'
             if reason:
                 payment.notes = f"{payment.notes}\nRemboursement: {reason}".strip()
@@ -110,3 +356,230 @@ class PaymentService:
             # À définir selon la logique métier
         
         return payment
+
+
+class IdempotencyService:
+    """Clés d'idempotence des créations de paiement (en-tête Idempotency-Key)"""
+    
+    @staticmethod
+    def fingerprint(data):
+        body = json.dumps(data, sort_keys=True, cls=DjangoJSONEncoder)
+        return hashlib.sha256(body.encode()).hexdigest()
+    
+    @staticmethod
+    def run(salon, key, data, handler):
+        """
+        Exécute handler() une seule fois par clé et par salon.
+        La clé est insérée dans la transaction du paiement : une requête
+        concurrente de même clé attend son commit puis reçoit la réponse
+        enregistrée. Une exception levée par handler() (validation) annule
+        la clé : la requête corrigée peut être rejouée.
+        
+        Args:
+            handler: callable renvoyant (statut HTTP, corps de la réponse)
+        
+        Returns:
+            (statut HTTP, corps, rejouée)
+        """
+        fingerprint = IdempotencyService.fingerprint(data)
+        
+        with tenant_atomic(salon):
+            try:
+                with tenant_atomic(salon):
+                    record = IdempotencyKey.objects.create(
+                        salon=salon, key=key, fingerprint=fingerprint
+                    )
+            except IntegrityError:
+                record = IdempotencyKey.objects.get(salon=salon, key=key)
+                if record.fingerprint != fingerprint:
+                    raise IdempotencyKeyMismatch()
+                return record.response_status, record.response_body, True
+            
+            status_code, body = handler()
+            record.response_status = status_code
+            record.response_body = json.loads(json.dumps(body, cls=DjangoJSONEncoder))
+            record.save(update_fields=['response_status', 'response_body', 'updated_at'])
+        
+        # La copie enregistrée est aussi la première réponse : un rejeu est identique
+        return status_code, record.response_body, False
+    
+    @staticmethod
+    def prune(older_than_hours=None):
+        """Supprime les clés expirées (shard courant)"""
+        hours = settings.PAYMENT_IDEMPOTENCY_TTL_HOURS if older_than_hours is None else older_than_hours
+        deleted, _ = IdempotencyKey.objects.filter(
+            created_at__lt=timezone.now() - timedelta(hours=hours)
+        ).delete()
+        return deleted
+
+
+# Statut opérateur -> statut du paiement
+OPERATOR_STATUSES = {
+    'SUCCESS': 'COMPLETED',
+    'FAILED': 'FAILED',
+    'PENDING': 'PENDING',
+}
+
+
+class CallbackRejected(Exception):
+    """Notification inexploitable (référence inconnue, montant absent...)"""
+
+
+class MobileMoneyService:
+    """
+    Notifications des opérateurs Mobile Money.
+    Réception : vérification de la signature, insertion sans doublon
+    (index unique salon, transaction, statut) et mise en file d'un
+    traitement par salon ; la requête de l'opérateur ne touche ni aux
+    paiements ni aux rendez-vous.
+    Traitement (worker apps.jobs) : par lots, chaque notification crée ou
+    met à jour le paiement de sa transaction.
+    """
+    
+    @staticmethod
+    def verify_signature(body, signature):
+        """En-tête X-Callback-Signature : HMAC-SHA256 (hex) du corps brut"""
+        secret = settings.MOBILE_MONEY_CALLBACK_SECRET
+        expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(expected, signature or '')
+    
+    @staticmethod
+    def receive(salon_id, data, payload):
+        """
+        Enregistre une notification et programme son traitement : deux
+        insertions « ou rien », un renvoi de l'opérateur n'a aucun effet.
+        Requête anonyme (aucun salon actif) : le shard est donné explicitement.
+        """
+        using = sharding.db_for_salon(salon_id)
+        with transaction.atomic(using=using):
+            MobileMoneyCallback.objects.using(using).bulk_create(
+                [MobileMoneyCallback(salon_id=salon_id, payload=payload, **data)],
+                ignore_conflicts=True
+            )
+            MobileMoneyService.schedule(salon_id)
+    
+    @staticmethod
+    def schedule(salon_id):
+        from apps.jobs.services import enqueue
+        
+        # Un traitement en attente par salon : les notifications suivantes le rejoignent
+        enqueue(
+            'payments.process_callbacks',
+            salon=salon_id,
+            key=f'payments.process_callbacks:{salon_id}',
+            salon_id=salon_id
+        )
+    
+    @staticmethod
+    def process(salon_id):
+        """Traite un lot de notifications en attente ; renvoie leur nombre"""
+        batch_size = settings.PAYMENT_CALLBACK_BATCH_SIZE
+        
+        with tenant_atomic(salon_id):
+            callbacks = list(
+                MobileMoneyCallback.objects.select_for_update(skip_locked=True)
+                .filter(salon_id=salon_id, status='PENDING')
+                .order_by('id')[:batch_size]
+            )
+            now = timezone.now()
+            for callback in callbacks:
+                try:
+                    with tenant_atomic(salon_id):
+                        MobileMoneyService.apply(callback)
+                    callback.status = 'PROCESSED'
+                except (CallbackRejected, TransactionConflict) as exc:
+                    callback.status = 'REJECTED'
+                    callback.error = str(exc)
+                callback.processed_at = now
+                callback.updated_at = now
+            MobileMoneyCallback.objects.bulk_update(
+                callbacks, ['status', 'error', 'processed_at', 'updated_at']
+            )
+            
+            if len(callbacks) == batch_size:
+                MobileMoneyService.schedule(salon_id)
+        
+        return len(callbacks)
+    
+    @staticmethod
+    def apply(callback):
+        """
+        Applique une notification :
+        - transaction connue : un paiement PENDING passe au statut notifié
+          (une notification en retard ou rejouée reste sans effet)
+        - sinon : paiement Mobile Money créé pour le rendez-vous référencé
+        """
+        from apps.appointments.models import Appointment
+        
+        payment_status = OPERATOR_STATUSES[callback.operator_status]
+        
+        record = PaymentTransaction.objects.filter(
+            salon_id=callback.salon_id, transaction_id=callback.transaction_id
+        ).first()
+        if record is not None:
+            payment = Payment.objects.filter(salon_id=record.salon_id, pk=record.payment_id).first()
+            # Paiement archivé : notification tardive, sans effet
+            if payment is None:
+                return
+            if callback.amount and payment.amount != callback.amount:
+                raise CallbackRejected('Montant différent du paiement enregistré')
+            if payment.status != 'PENDING' or payment_status == 'PENDING':
+                return
+            payment.status = payment_status
+            payment.save(update_fields=['status', 'updated_at'])
+            if payment_status == 'COMPLETED':
+                PaymentService.complete_appointment(payment.appointment)
+            return
+        
+        appointment = None
+        if callback.reference.isdigit():
+            appointment = Appointment.objects.filter(
+                salon_id=callback.salon_id, pk=int(callback.reference)
+            ).select_related('client').first()
+        if appointment is None:
+            raise CallbackRejected(f"Rendez-vous introuvable (référence '{callback.reference}')")
+        if not callback.amount or callback.amount <= 0:
+            raise CallbackRejected('Montant absent ou invalide')
+        
+        def create():
+            payment = Payment.objects.create(
+                salon_id=callback.salon_id,
+                appointment=appointment,
+                client=appointment.client,
+                amount=callback.amount,
+                payment_method='MOBILE_MONEY',
+                status=payment_status,
+                transaction_id=callback.transaction_id,
+                notes=f"Mobile Money {callback.phone}".strip()
+            )
+            if payment_status == 'COMPLETED':
+                PaymentService.complete_appointment(appointment)
+            return payment
+        
+        PaymentService.ingest(
+            callback.salon_id, callback.transaction_id, create,
+            amount=callback.amount, appointment_id=appointment.pk
+        )
+    
+    @staticmethod
+    def dispatch():
+        """
+        Tâche périodique : reprend les salons dont des notifications
+        attendent (traitement interrompu ou abandonné).
+        """
+        for alias in sharding.tenant_shards():
+            with sharding.use_shard(alias):
+                pending = MobileMoneyCallback.objects.filter(
+                    status='PENDING'
+                ).values_list('salon_id', flat=True).order_by().distinct()
+                for salon_id in pending:
+                    MobileMoneyService.schedule(salon_id)
+    
+    @staticmethod
+    def prune(older_than_days=None):
+        """Supprime les notifications traitées au-delà de la rétention (shard courant)"""
+        days = settings.PAYMENT_CALLBACK_RETENTION_DAYS if older_than_days is None else older_than_days
+        deleted, _ = MobileMoneyCallback.objects.filter(
+            processed_at__lt=timezone.now() - timedelta(days=days)
+        ).exclude(status='PENDING').delete()
+        return deleted
@@ -0,0 +1,28 @@
+"""
+Tasks for Payments app
+"""
+from datetime import timedelta
+
+from apps.core import sharding
+from apps.jobs.registry import task
+from .services import IdempotencyService, MobileMoneyService
+
+
+@task('payments.process_callbacks')
+def process_callbacks(salon_id):
+    MobileMoneyService.process(salon_id)
+
+
+@task('payments.dispatch_callbacks', every=timedelta(minutes=1))
+def dispatch_callbacks():
+    """Reprend les notifications Mobile Money restées en attente"""
+    MobileMoneyService.dispatch()
+
+
+@task('payments.prune', every=timedelta(days=1))
+def prune():
+    """Purge quotidienne des clés d'idempotence et des notifications traitées"""
+    for alias in sharding.tenant_shards():
+        with sharding.use_shard(alias):
+            IdempotencyService.prune()
+            MobileMoneyService.prune()
@@ -0,0 +1,78 @@
+"""Encaissement d'un rendez-vous en un aller-retour (PaymentService.checkout)"""
+from decimal import Decimal
+
+import pytest
+from rest_framework.exceptions import ValidationError
+
+from apps.core.exceptions import CheckoutConflict, TransactionConflict
+from apps.payments.models import Payment
+from apps.payments.services import PaymentService
+
+
+@pytest.mark.django_db
+def test_checkout_settles_appointment(make_appointment, salon):
+    appointment = make_appointment(status='CONFIRMED')
+
+    result = PaymentService.checkout(salon, appointment.pk, 'CASH')
+
+    appointment.refresh_from_db()
+    assert result['created']
+    assert result['payment'].amount == Decimal('10000.00')
+    assert result['remaining'] == Decimal('0')
+    assert appointment.status == 'COMPLETED'
+
+
+@pytest.mark.django_db
+def test_checkout_partial_payments(make_appointment, salon):
+    appointment = make_appointment(status='CONFIRMED')
+
+    first = PaymentService.checkout(salon, appointment.pk, 'CASH', amount=Decimal('4000'))
+    appointment.refresh_from_db()
+    assert first['remaining'] == Decimal('6000.00')
+    assert appointment.status == 'CONFIRMED'
+
+    with pytest.raises(ValidationError):
+        PaymentService.checkout(salon, appointment.pk, 'CASH', amount=Decimal('7000'))
+
+    second = PaymentService.checkout(salon, appointment.pk, 'CASH')
+    appointment.refresh_from_db()
+    assert second['payment'].amount == Decimal('6000.00')
+    assert appointment.status == 'COMPLETED'
+
+    with pytest.raises(CheckoutConflict):
+        PaymentService.checkout(salon, appointment.pk, 'CASH')
+
+
+@pytest.mark.django_db
+def test_checkout_replay_returns_registered_payment(make_appointment, salon):
+    appointment = make_appointment(status='CONFIRMED')
+    first = PaymentService.checkout(salon, appointment.pk, 'MOBILE_MONEY', transaction_id='MM-001')
+
+    replay = PaymentService.checkout(salon, appointment.pk, 'MOBILE_MONEY', transaction_id='MM-001')
+
+    assert not replay['created']
+    assert replay['payment'].pk == first['payment'].pk
+    assert replay['remaining'] == Decimal('0')
+    assert Payment.objects.filter(appointment=appointment).count() == 1
+
+
+@pytest.mark.django_db
+def test_checkout_replay_with_other_amount_conflicts(make_appointment, salon):
+    appointment = make_appointment(status='CONFIRMED')
+    PaymentService.checkout(salon, appointment.pk, 'MOBILE_MONEY', amount=Decimal('4000'), transaction_id='MM-002')
+
+    with pytest.raises(TransactionConflict):
+        PaymentService.checkout(salon, appointment.pk, 'MOBILE_MONEY', amount=Decimal('5000'), transaction_id='MM-002')
+
+    assert Payment.objects.filter(appointment=appointment).count() == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('status', ['CANCELLED', 'NO_SHOW'])
+def test_checkout_refuses_closed_appointment(make_appointment, salon, status):
+    appointment = make_appointment(status=status)
+
+    with pytest.raises(CheckoutConflict):
+        PaymentService.checkout(salon, appointment.pk, 'CASH')
+
+    assert not Payment.objects.filter(appointment=appointment).exists()
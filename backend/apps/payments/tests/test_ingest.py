@@ -0,0 +1,88 @@
+"""Paiements enregistrés au plus une fois par numéro de transaction"""
+import datetime
+from decimal import Decimal
+
+import pytest
+
+from apps.core.exceptions import TransactionConflict
+from apps.payments.models import Payment, PaymentTransaction
+from apps.payments.services import PaymentService
+
+
+@pytest.mark.django_db
+def test_create_payment_registers_transaction(make_appointment, salon):
+    appointment = make_appointment()
+
+    payment = PaymentService.create_payment(salon, appointment, Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1')
+
+    assert PaymentTransaction.objects.get(salon=salon, transaction_id='TX-1').payment_id == payment.pk
+
+
+@pytest.mark.django_db
+def test_exact_replay_returns_existing_payment(make_appointment, salon):
+    appointment = make_appointment()
+    payment = PaymentService.create_payment(salon, appointment, Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1')
+
+    replay = PaymentService.create_payment(salon, appointment, Decimal('10000.00'), 'MOBILE_MONEY', transaction_id='TX-1')
+
+    assert replay.pk == payment.pk
+    assert Payment.objects.filter(salon=salon).count() == 1
+
+
+@pytest.mark.django_db
+def test_same_transaction_other_amount_conflicts(make_appointment, salon):
+    appointment = make_appointment()
+    PaymentService.create_payment(salon, appointment, Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1')
+
+    with pytest.raises(TransactionConflict):
+        PaymentService.create_payment(salon, appointment, Decimal('9000'), 'MOBILE_MONEY', transaction_id='TX-1')
+
+    assert Payment.objects.filter(salon=salon).count() == 1
+
+
+@pytest.mark.django_db
+def test_same_transaction_other_appointment_conflicts(make_appointment, salon):
+    from apps.clients.models import Client
+    other_client = Client.objects.create(salon=salon, first_name='Paul', last_name='Test', phone='+241000002')
+    PaymentService.create_payment(salon, make_appointment(), Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1')
+
+    with pytest.raises(TransactionConflict):
+        PaymentService.create_payment(
+            salon, make_appointment(client=other_client), Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1'
+        )
+
+    assert Payment.objects.filter(salon=salon).count() == 1
+
+
+@pytest.mark.django_db
+def test_ingest_without_transaction_id_always_creates(make_appointment, salon):
+    appointment = make_appointment()
+
+    PaymentService.create_payment(salon, appointment, Decimal('5000'), 'CASH')
+    PaymentService.create_payment(salon, appointment, Decimal('5000'), 'CASH')
+
+    assert Payment.objects.filter(salon=salon).count() == 2
+    assert not PaymentTransaction.objects.filter(salon=salon).exists()
+
+
+@pytest.mark.django_db
+def test_transaction_ids_are_per_salon(make_appointment, salon):
+    from apps.core.models import Salon
+    PaymentService.create_payment(salon, make_appointment(), Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1')
+    other = Salon.objects.create(name='Autre', address='-', phone='-', email='autre@example.com')
+
+    assert PaymentService.transaction_payment(other, 'TX-1') is None
+
+
+@pytest.mark.django_db
+def test_archived_payment_keeps_transaction(make_appointment, salon):
+    from apps.archive.services import ArchiveService
+    appointment = make_appointment(date=datetime.date.today() - datetime.timedelta(days=30))
+    PaymentService.create_payment(salon, appointment, Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1')
+
+    ArchiveService.archive_batch(older_than_days=0, salon=salon)
+
+    assert not Payment.objects.filter(salon=salon).exists()
+    assert PaymentTransaction.objects.filter(salon=salon, transaction_id='TX-1').exists()
+    with pytest.raises(TransactionConflict):
+        PaymentService.create_payment(salon, make_appointment(), Decimal('10000'), 'MOBILE_MONEY', transaction_id='TX-1')
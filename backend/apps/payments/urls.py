@@ -0,0 +1,11 @@
+"""
+URLs for Payments app (notifications des opérateurs)
+"""
+from django.urls import path
+
+from . import views
+
+
+urlpatterns = [
+    path('mobile-money/<int:salon_id>/', views.mobile_money_callback, name='payment-callback-mobile-money'),
+]
@@ -1,6 +1,13 @@
 """
 Views for Payments app
 """
+import json
+
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -12,15 +19,47 @@ from .models import Payment
 from .serializers import (
     PaymentSerializer,
     PaymentCreateSerializer,
-    PaymentStatsSerializer
+    PaymentValuesSerializer,
+    PaymentStatsSerializer,
+    MobileMoneyCallbackSerializer
 )
-from .services import PaymentService
+from .services import IdempotencyService, MobileMoneyService, PaymentService
 from apps.core.permissions import IsSalonEmployee, IsSalonAdmin
+from apps.core.mixins import ReplicaReadMixin, SparseFieldsMixin, ValuesListMixin
+
+
+def idempotent_response(request, scope, handler):
+    """
+    Exécute handler() -> (statut HTTP, corps) et construit la réponse.
+    Avec un en-tête Idempotency-Key, une requête rejouée avec la même clé
+    reçoit la réponse d'origine (en-tête Idempotent-Replayed) sans nouvelle
+    écriture ; la portée distingue les points d'entrée partageant une clé.
+    """
+    key = request.headers.get('Idempotency-Key')
+    if key is None:
+        status_code, data = handler()
+        return Response(data, status=status_code)
+    
+    if not key or len(key) > 255:
+        return Response(
+            {'error': "En-tête Idempotency-Key invalide (1 à 255 caractères)"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    status_code, data, replayed = IdempotencyService.run(
+        request.salon, key, {'scope': scope, 'data': request.data}, handler
+    )
+    response = Response(data, status=status_code)
+    if replayed:
+        response['Idempotent-Replayed'] = 'true'
+    return response
 
 
-class PaymentViewSet(viewsets.ModelViewSet):
+class PaymentViewSet(ReplicaReadMixin, ValuesListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet pour la gestion des paiements"""
     permission_classes = [IsAuthenticated, IsSalonEmployee]
+    replica_actions = ('list', 'stats', 'daily_revenue', 'monthly_revenue')
+    values_serializer_class = PaymentValuesSerializer
     
     def get_queryset(self):
         """Filtre par salon"""
@@ -54,9 +93,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
         end_date = self.request.query_params.get('end_date', None)
         
         if start_date and end_date:
-            queryset = queryset.filter(
-                payment_date__date__range=[start_date, end_date]
-            )
+            start, end = PaymentService.period_bounds(start_date, end_date)
+            queryset = queryset.filter(payment_date__gte=start, payment_date__lt=end)
         
         return queryset.select_related(
             'client', 'appointment', 'appointment__service', 'salon'
@@ -68,6 +106,26 @@ class PaymentViewSet(viewsets.ModelViewSet):
             return PaymentCreateSerializer
         return PaymentSerializer
     
+    def create(self, request, *args, **kwargs):
+        """
+        Enregistre un paiement.
+        En-tête Idempotency-Key (optionnel) : voir idempotent_response.
+        Un numéro de transaction déjà enregistré renvoie le paiement
+        existant (200 au lieu de 201).
+        """
+        return idempotent_response(request, 'payments.create', lambda: self._create_payment(request))
+    
+    def _create_payment(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        status_code = status.HTTP_201_CREATED if serializer.created else status.HTTP_200_OK
+        return status_code, serializer.data
+    
+    def _include_archived(self):
+        """?include_archived=true ajoute l'historique archivé aux rapports"""
+        return self.request.query_params.get('include_archived', 'false').lower() == 'true'
+    
     @action(detail=False, methods=['get'])
     def stats(self, request):
         """Statistiques des paiements"""
@@ -81,7 +139,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
         stats = PaymentService.get_payment_stats(
             request.salon,
             start_date,
-            end_date
+            end_date,
+            include_archived=self._include_archived()
         )
         
         return Response({
@@ -99,7 +158,11 @@ class PaymentViewSet(viewsets.ModelViewSet):
         today = datetime.now().date()
         date = request.query_params.get('date', today)
         
-        revenue = PaymentService.get_daily_revenue(request.salon, date)
+        revenue = PaymentService.get_daily_revenue(
+            request.salon,
+            date,
+            include_archived=self._include_archived()
+        )
         
         return Response({
             'success': True,
@@ -117,7 +180,8 @@ class PaymentViewSet(viewsets.ModelViewSet):
         revenue = PaymentService.get_monthly_revenue(
             request.salon,
             year,
-            month
+            month,
+            include_archived=self._include_archived()
         )
         
         return Response({
@@ -125,3 +189,39 @@ class PaymentViewSet(viewsets.ModelViewSet):
             'period': f"{year}-{month:02d}",
             'revenue': revenue
         })
+
+
+@csrf_exempt
+@require_POST
+def mobile_money_callback(request, salon_id):
+    """
+    Notification d'un opérateur Mobile Money.
+    POST /api/v1/payments/callbacks/mobile-money/<salon_id>/
+    En-tête X-Callback-Signature : HMAC-SHA256 (hex) du corps, clé
+    MOBILE_MONEY_CALLBACK_SECRET. Réponse 202 dès l'enregistrement, y
+    compris pour une notification déjà reçue.
+    """
+    if not settings.MOBILE_MONEY_CALLBACK_SECRET:
+        return JsonResponse(
+            {'error': 'Notifications Mobile Money non configurées'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    
+    if not MobileMoneyService.verify_signature(request.body, request.headers.get('X-Callback-Signature')):
+        return JsonResponse({'error': 'Signature invalide'}, status=status.HTTP_401_UNAUTHORIZED)
+    
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Corps JSON invalide'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    serializer = MobileMoneyCallbackSerializer(data=payload)
+    if not serializer.is_valid():
+        return JsonResponse({'error': serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+    
+    try:
+        MobileMoneyService.receive(salon_id, serializer.validated_data, payload)
+    except IntegrityError:
+        return JsonResponse({'error': 'Salon introuvable'}, status=status.HTTP_404_NOT_FOUND)
+    
+    return JsonResponse({'success': True}, status=status.HTTP_202_ACCEPTED)
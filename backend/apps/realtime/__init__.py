@@ -0,0 +1,4 @@
+"""
+Realtime app - Événements du planning poussés aux écrans (SSE)
+"""
+default_app_config = 'apps.realtime.apps.RealtimeConfig'
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class RealtimeConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.realtime'
+    verbose_name = 'Temps réel'
+    
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .events import publish_on_write
+        
+        for sender in ('appointments.Appointment', 'payments.Payment'):
+            post_save.connect(publish_on_write, sender=sender)
+            post_delete.connect(publish_on_write, sender=sender)
@@ -0,0 +1,200 @@
+"""
+Événements temps réel par salon (rendez-vous et paiements)
+Chaque écriture publie, après commit, un événement court :
+    {"salon": 1, "type": "appointment.updated", "id": 42, "updated_at": "...", ...}
+Une modification groupée publie un seul événement '<ressource>.bulk_updated'
+(liste des ids, voir build_bulk_event). Un événement plus long que
+MAX_PAYLOAD (NOTIFY refuse au-delà de 8000 octets) est allégé, au pire
+remplacé par un 'resync'.
+
+Backends (EVENTS_BACKEND) :
+- 'local' : pub/sub en mémoire du processus ; suffit quand les écritures et
+  les flux SSE sont servis par le même processus ASGI
+- 'postgres' : NOTIFY sur le canal salon_events de la base du salon ;
+  chaque processus qui sert des flux écoute (LISTEN) toutes les bases
+  tenant dans un thread et relaie vers ses abonnés locaux
+- 'auto' (défaut) : 'postgres' si la base par défaut est PostgreSQL
+"""
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections, transaction
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'salon_events'
+QUEUE_SIZE = 100
+LISTEN_TIMEOUT = 5
+RECONNECT_DELAY = 2
+# Taille maximale d'un événement sérialisé (limite NOTIFY : 8000 octets)
+MAX_PAYLOAD = 7500
+
+RESOURCES = {
+    'appointments.Appointment': 'appointment',
+    'payments.Payment': 'payment',
+}
+
+
+def backend():
+    name = settings.EVENTS_BACKEND
+    if name == 'auto':
+        return 'postgres' if connections['default'].vendor == 'postgresql' else 'local'
+    return name
+
+
+class Broker:
+    """
+    Abonnés du processus, par salon. Chaque abonné est une asyncio.Queue
+    alimentée depuis n'importe quel thread (call_soon_threadsafe).
+    """
+    
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._listening = False
+    
+    def subscribe(self, salon_id):
+        """À appeler depuis la boucle asyncio du flux"""
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.setdefault(salon_id, set()).add(subscriber)
+        if backend() == 'postgres':
+            self.start_listening()
+        return queue
+    
+    def unsubscribe(self, salon_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(salon_id, set())
+            subscribers.difference_update({s for s in subscribers if s[1] is queue})
+            if not subscribers:
+                self._subscribers.pop(salon_id, None)
+    
+    def dispatch(self, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(event['salon'], ()))
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # Boucle fermée : l'abonné est parti
+                pass
+    
+    def start_listening(self):
+        """Démarre (une fois par processus) l'écoute NOTIFY de chaque base tenant"""
+        from apps.core import sharding
+        
+        with self._lock:
+            if self._listening:
+                return
+            self._listening = True
+        for alias in sharding.tenant_shards():
+            if connections[alias].vendor == 'postgresql':
+                threading.Thread(
+                    target=self._listen, args=(alias,), name=f'events-{alias}', daemon=True
+                ).start()
+    
+    def _listen(self, alias):
+        wrapper = connections[alias]
+        while True:
+            connection = None
+            try:
+                connection = wrapper.get_new_connection(wrapper.get_connection_params())
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN {CHANNEL}')
+                while True:
+                    if select.select([connection], [], [], LISTEN_TIMEOUT) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.dispatch(json.loads(connection.notifies.pop(0).payload))
+            except Exception:
+                logger.exception("Écoute des événements interrompue sur %s", alias)
+                time.sleep(RECONNECT_DELAY)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+
+def _offer(queue, event):
+    """Dépose l'événement ; file pleine (écran trop lent) : demande de resynchronisation"""
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait({'salon': event['salon'], 'type': 'resync'})
+
+
+broker = Broker()
+
+
+def _size(event):
+    return len(json.dumps(event).encode())
+
+
+def publish(event, using='default'):
+    if _size(event) > MAX_PAYLOAD:
+        event = {'salon': event['salon'], 'type': 'resync'}
+    if backend() == 'postgres':
+        with connections[using].cursor() as cursor:
+            cursor.execute('SELECT pg_notify(%s, %s)', [CHANNEL, json.dumps(event)])
+    else:
+        broker.dispatch(event)
+
+
+def build_event(resource, instance, action):
+    event = {
+        'salon': instance.salon_id,
+        'type': f'{resource}.{action}',
+        'id': instance.pk,
+        'updated_at': instance.updated_at.isoformat() if instance.updated_at else None,
+    }
+    if resource == 'appointment':
+        event.update(
+            date=instance.date.isoformat(),
+            employee=instance.employee_id,
+            status=instance.status
+        )
+    else:
+        event.update(appointment=instance.appointment_id, status=instance.status)
+    return event
+
+
+def build_bulk_event(resource, salon_id, instances, updated_at, **fields):
+    """
+    Événement unique d'une modification groupée ('<resource>.bulk_updated') :
+    ids et dates concernés, à la place d'un événement par ligne.
+    Trop long pour NOTIFY, il ne garde que les dates avec 'resync': true
+    (l'écran recharge ces journées via /api/v1/sync/).
+    """
+    event = {
+        'salon': salon_id,
+        'type': f'{resource}.bulk_updated',
+        'ids': [instance.pk for instance in instances],
+        'updated_at': updated_at.isoformat(),
+    }
+    if resource == 'appointment':
+        event['dates'] = sorted({instance.date.isoformat() for instance in instances})
+    event.update(fields)
+    if _size(event) > MAX_PAYLOAD:
+        del event['ids']
+        event['resync'] = True
+    return event
+
+
+def publish_on_write(sender, instance, using=None, created=None, **kwargs):
+    """Handler post_save/post_delete : publication après le commit"""
+    if created is None:
+        action = 'deleted'
+    else:
+        action = 'created' if created else 'updated'
+    event = build_event(RESOURCES[sender._meta.label], instance, action)
+    transaction.on_commit(lambda: publish(event, using), using=using)
@@ -0,0 +1,102 @@
+"""
+Views for Realtime app
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework import status
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .events import broker
+
+
+EMPLOYEE_ROLES = ['ADMIN', 'COIFFEUR', 'RECEPTIONNISTE']
+
+
+def _authenticate(request):
+    """
+    Jeton JWT de l'en-tête Authorization ou du paramètre ?token=
+    (EventSource ne permet pas d'envoyer d'en-tête)
+    """
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    token = header[7:] if header.startswith('Bearer ') else request.GET.get('token')
+    if not token:
+        return None
+    authentication = JWTAuthentication()
+    try:
+        return authentication.get_user(authentication.get_validated_token(token))
+    except (AuthenticationFailed, InvalidToken):
+        return None
+
+
+def _format(event):
+    lines = [f"event: {event['type']}"]
+    if event.get('updated_at'):
+        # Filigrane réutilisable par GET /api/v1/sync/?since= à la reconnexion
+        lines.insert(0, f"id: {event['updated_at']}")
+    lines.append(f"data: {json.dumps(event)}")
+    return '\n'.join(lines) + '\n\n'
+
+
+async def _stream(salon_id):
+    queue = broker.subscribe(salon_id)
+    try:
+        yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Maintient la connexion ouverte à travers les proxys
+                yield ": ping\n\n"
+                continue
+            yield _format(event)
+    finally:
+        broker.unsubscribe(salon_id, queue)
+
+
+async def event_stream(request):
+    """
+    Flux Server-Sent Events des changements du planning du salon
+    (rendez-vous et paiements créés, modifiés, supprimés).
+    
+    GET /api/v1/events/
+    
+    Servi uniquement par le point d'entrée ASGI (config.asgi) : un worker
+    WSGI resterait bloqué pendant toute la durée de la connexion.
+    Après un événement 'resync' ou une reconnexion, l'écran rattrape
+    les changements manqués via GET /api/v1/sync/?since=<dernier id>.
+    """
+    if request.method != 'GET':
+        return JsonResponse({
+            'error': 'Méthode non autorisée'
+        }, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+    
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({
+            'error': 'Flux disponible uniquement via le serveur ASGI'
+        }, status=status.HTTP_501_NOT_IMPLEMENTED)
+    
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return JsonResponse({
+            'error': 'Authentification requise'
+        }, status=status.HTTP_401_UNAUTHORIZED)
+    if user.role not in EMPLOYEE_ROLES:
+        return JsonResponse({
+            'error': "Vous devez être employé du salon pour accéder à cette ressource."
+        }, status=status.HTTP_403_FORBIDDEN)
+    if user.salon_id is None:
+        return JsonResponse({
+            'error': 'Aucun salon associé à cet utilisateur'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    
+    response = StreamingHttpResponse(_stream(user.salon_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Pas de mise en tampon par nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,19 @@
+from django.contrib import admin
+from .models import StatementImport, StatementLine
+
+
+@admin.register(StatementImport)
+class StatementImportAdmin(admin.ModelAdmin):
+    list_display = ['__str__', 'salon', 'status', 'processed_lines', 'total_lines', 'created_at', 'finished_at']
+    list_filter = ['status', 'salon']
+    readonly_fields = [
+        'status', 'total_lines', 'processed_lines', 'counts', 'period_start',
+        'period_end', 'error', 'started_at', 'finished_at'
+    ]
+
+
+@admin.register(StatementLine)
+class StatementLineAdmin(admin.ModelAdmin):
+    list_display = ['statement', 'line_number', 'transaction_id', 'amount', 'result', 'payment_id']
+    list_filter = ['result', 'salon']
+    search_fields = ['transaction_id']
@@ -0,0 +1,56 @@
+"""
+Rapproche un relevé d'opérateur (CSV) avec les paiements d'un salon
+Usage: python manage.py reconcile_statement releve.csv --salon 1 [--label "Airtel mars"]
+Le traitement a lieu dans la commande, avec l'avancement affiché par lot ;
+le relevé et ses lignes signalées restent consultables dans l'API.
+"""
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import sharding
+from apps.core.models import Salon
+from apps.reconciliation.models import StatementImport
+from apps.reconciliation.services import ReconciliationService
+
+
+class Command(BaseCommand):
+    help = "Rapproche un relevé CSV (banque, Mobile Money) avec les paiements"
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Fichier CSV du relevé')
+        parser.add_argument('--salon', type=int, required=True, help='Salon concerné')
+        parser.add_argument('--label', default='', help='Libellé du relevé')
+
+    def handle(self, *args, **options):
+        try:
+            salon = Salon.objects.get(pk=options['salon'])
+        except Salon.DoesNotExist:
+            raise CommandError(f"Salon {options['salon']} introuvable")
+        sharding.activate(salon)
+
+        with open(options['path'], 'rb') as source:
+            statement = StatementImport.objects.create(
+                salon=salon,
+                label=options['label'],
+                file=File(source, name=os.path.basename(options['path']))
+            )
+
+        ReconciliationService.run(statement, progress=self._progress)
+        statement.refresh_from_db()
+
+        if statement.status == 'FAILED':
+            raise CommandError(statement.error)
+        counts = statement.counts
+        self.stdout.write(self.style.SUCCESS(
+            f"Relevé #{statement.pk} : {statement.total_lines} ligne(s), "
+            f"{counts.get('MATCHED', 0)} rapprochée(s), {counts.get('UPDATED', 0)} paiement(s) confirmé(s)"
+        ))
+        for result in ('MISMATCHED', 'UNMATCHED', 'DUPLICATE', 'INVALID', 'MISSING'):
+            if counts.get(result):
+                self.stdout.write(f"  {result:<10} {counts[result]:>8}")
+
+    def _progress(self, processed, total, counts):
+        percent = processed * 100 // total if total else 100
+        self.stdout.write(f"{processed}/{total} lignes ({percent} %)")
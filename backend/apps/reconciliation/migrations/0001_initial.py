@@ -0,0 +1,250 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:14
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatementImport",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        upload_to="statements/%Y/%m/", verbose_name="Fichier"
+                    ),
+                ),
+                (
+                    "label",
+                    models.CharField(
+                        blank=True, max_length=200, verbose_name="Libellé"
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "En attente"),
+                            ("RUNNING", "En cours"),
+                            ("DONE", "Terminé"),
+                            ("FAILED", "Échoué"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                (
+                    "total_lines",
+                    models.PositiveIntegerField(default=0, verbose_name="Lignes"),
+                ),
+                (
+                    "processed_lines",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Lignes traitées"
+                    ),
+                ),
+                (
+                    "counts",
+                    models.JSONField(
+                        blank=True, default=dict, verbose_name="Résultats"
+                    ),
+                ),
+                (
+                    "period_start",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Début du relevé"
+                    ),
+                ),
+                (
+                    "period_end",
+                    models.DateField(
+                        blank=True, null=True, verbose_name="Fin du relevé"
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Erreur")),
+                (
+                    "started_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Démarré le"
+                    ),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Terminé le"
+                    ),
+                ),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Importé par",
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import de relevé",
+                "verbose_name_plural": "Imports de relevés",
+                "db_table": "statement_imports",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="StatementLine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                (
+                    "line_number",
+                    models.PositiveIntegerField(
+                        blank=True, null=True, verbose_name="Ligne"
+                    ),
+                ),
+                (
+                    "transaction_id",
+                    models.CharField(
+                        blank=True, max_length=100, verbose_name="ID Transaction"
+                    ),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        blank=True,
+                        decimal_places=2,
+                        max_digits=10,
+                        null=True,
+                        verbose_name="Montant",
+                    ),
+                ),
+                (
+                    "date",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Date"),
+                ),
+                (
+                    "operator_status",
+                    models.CharField(
+                        blank=True, max_length=20, verbose_name="Statut opérateur"
+                    ),
+                ),
+                (
+                    "result",
+                    models.CharField(
+                        choices=[
+                            ("MATCHED", "Rapprochée"),
+                            ("MISMATCHED", "Écart"),
+                            ("UNMATCHED", "Sans paiement"),
+                            ("DUPLICATE", "Doublon du relevé"),
+                            ("INVALID", "Illisible"),
+                            ("MISSING", "Paiement absent du relevé"),
+                        ],
+                        max_length=20,
+                        verbose_name="Résultat",
+                    ),
+                ),
+                (
+                    "payment_id",
+                    models.BigIntegerField(
+                        blank=True, null=True, verbose_name="Paiement"
+                    ),
+                ),
+                (
+                    "detail",
+                    models.CharField(blank=True, max_length=255, verbose_name="Détail"),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+                (
+                    "statement",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="lines",
+                        to="reconciliation.statementimport",
+                        verbose_name="Relevé",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ligne de relevé",
+                "verbose_name_plural": "Lignes de relevés",
+                "db_table": "statement_lines",
+                "ordering": ["statement", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["statement", "result", "id"],
+                        name="statement_l_stateme_a87252_idx",
+                    )
+                ],
+            },
+        ),
+    ]
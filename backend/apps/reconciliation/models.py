@@ -0,0 +1,111 @@
+"""
+Models for Reconciliation app
+"""
+from django.conf import settings
+from django.db import models
+from apps.core.models import TenantAwareModel
+from apps.core.managers import TenantManager
+
+
+RESULT_CHOICES = [
+    ('MATCHED', 'Rapprochée'),
+    ('MISMATCHED', 'Écart'),
+    ('UNMATCHED', 'Sans paiement'),
+    ('DUPLICATE', 'Doublon du relevé'),
+    ('INVALID', 'Illisible'),
+    ('MISSING', 'Paiement absent du relevé'),
+]
+
+
+class StatementImport(TenantAwareModel):
+    """
+    Relevé d'opérateur (banque, Mobile Money) importé pour rapprochement
+    avec les paiements du salon. Le traitement (worker apps.jobs ou commande
+    reconcile_statement) met à jour l'avancement par lot.
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'En attente'),
+        ('RUNNING', 'En cours'),
+        ('DONE', 'Terminé'),
+        ('FAILED', 'Échoué'),
+    ]
+    
+    file = models.FileField('Fichier', upload_to='statements/%Y/%m/')
+    label = models.CharField('Libellé', max_length=200, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Importé par'
+    )
+    status = models.CharField('Statut', max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    
+    # Avancement et résultat
+    total_lines = models.PositiveIntegerField('Lignes', default=0)
+    processed_lines = models.PositiveIntegerField('Lignes traitées', default=0)
+    counts = models.JSONField('Résultats', default=dict, blank=True)
+    period_start = models.DateField('Début du relevé', null=True, blank=True)
+    period_end = models.DateField('Fin du relevé', null=True, blank=True)
+    error = models.TextField('Erreur', blank=True)
+    started_at = models.DateTimeField('Démarré le', null=True, blank=True)
+    finished_at = models.DateTimeField('Terminé le', null=True, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'statement_imports'
+        verbose_name = 'Import de relevé'
+        verbose_name_plural = 'Imports de relevés'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.label or self.file.name
+    
+    @property
+    def progress(self):
+        """Avancement en pourcentage"""
+        if self.status == 'DONE':
+            return 100
+        if not self.total_lines:
+            return 0
+        return min(99, self.processed_lines * 100 // self.total_lines)
+
+
+class StatementLine(TenantAwareModel):
+    """
+    Ligne du relevé signalée au rapprochement (écart, sans paiement,
+    doublon, illisible) ou paiement de la période absent du relevé.
+    Les lignes rapprochées ne sont que comptées.
+    """
+    statement = models.ForeignKey(
+        StatementImport,
+        on_delete=models.CASCADE,
+        related_name='lines',
+        verbose_name='Relevé'
+    )
+    line_number = models.PositiveIntegerField('Ligne', null=True, blank=True)
+    transaction_id = models.CharField('ID Transaction', max_length=100, blank=True)
+    amount = models.DecimalField('Montant', max_digits=10, decimal_places=2, null=True, blank=True)
+    date = models.DateTimeField('Date', null=True, blank=True)
+    operator_status = models.CharField('Statut opérateur', max_length=20, blank=True)
+    result = models.CharField('Résultat', max_length=20, choices=RESULT_CHOICES)
+    # Pas de clé étrangère : la table payments est partitionnée
+    payment_id = models.BigIntegerField('Paiement', null=True, blank=True)
+    detail = models.CharField('Détail', max_length=255, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'statement_lines'
+        verbose_name = 'Ligne de relevé'
+        verbose_name_plural = 'Lignes de relevés'
+        ordering = ['statement', 'id']
+        indexes = [
+            models.Index(fields=['statement', 'result', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.transaction_id or '-'} ({self.result})"
@@ -0,0 +1,43 @@
+"""
+Serializers for Reconciliation app
+"""
+import os
+
+from rest_framework import serializers
+from .models import StatementImport, StatementLine
+
+
+class StatementImportSerializer(serializers.ModelSerializer):
+    """Relevé importé, avec l'avancement de son rapprochement"""
+    
+    progress = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = StatementImport
+        fields = [
+            'id', 'file', 'label', 'status', 'progress',
+            'total_lines', 'processed_lines', 'counts',
+            'period_start', 'period_end', 'error',
+            'started_at', 'finished_at', 'created_at'
+        ]
+        read_only_fields = [
+            'id', 'status', 'progress', 'total_lines', 'processed_lines', 'counts',
+            'period_start', 'period_end', 'error', 'started_at', 'finished_at', 'created_at'
+        ]
+    
+    def validate_file(self, value):
+        """Export CSV de l'opérateur"""
+        if os.path.splitext(value.name)[1].lower() not in ('.csv', '.txt'):
+            raise serializers.ValidationError("Fichier CSV attendu")
+        return value
+
+
+class StatementLineSerializer(serializers.ModelSerializer):
+    
+    class Meta:
+        model = StatementLine
+        fields = [
+            'id', 'line_number', 'transaction_id', 'amount', 'date',
+            'operator_status', 'result', 'payment_id', 'detail'
+        ]
+        read_only_fields = fields
@@ -0,0 +1,398 @@
+"""
+Business logic for Reconciliation app
+Rapprochement d'un relevé d'opérateur (CSV banque / Mobile Money) avec les
+paiements du salon :
+- le fichier est lu en flux, une ligne à la fois, en deux passes : la
+  première compte les lignes et borne les dates du relevé ;
+- les paiements de la période, élargie de RECONCILIATION_DATE_WINDOW_DAYS,
+  sont chargés en une requête dans un index en mémoire par numéro de
+  transaction ;
+- chaque ligne est rapprochée par numéro de transaction puis contrôlée
+  (montant, écart de date, statut) ;
+- par lot de RECONCILIATION_CHUNK_SIZE lignes, une transaction enregistre
+  les lignes signalées, les statuts de paiement confirmés (bulk_update) et
+  l'avancement.
+"""
+import csv
+import io
+import re
+from collections import Counter, namedtuple
+from datetime import datetime, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from apps.core import sharding
+from apps.core.sharding import tenant_atomic
+from apps.payments.models import Payment
+from apps.payments.services import OPERATOR_STATUSES, PaymentService
+from .models import StatementImport, StatementLine
+
+
+# En-têtes reconnus (minuscules, '_' remplacés par des espaces)
+COLUMNS = {
+    'transaction_id': ('transaction id', 'transaction', 'id transaction', 'reference', 'référence', 'txn id'),
+    'amount': ('amount', 'montant'),
+    'date': ('date', 'transaction date', 'date operation', 'date opération'),
+    'status': ('status', 'statut'),
+}
+
+# Statuts des relevés -> statuts opérateur (voir apps.payments.services)
+STATEMENT_STATUSES = {
+    'SUCCESS': 'SUCCESS',
+    'SUCCESSFUL': 'SUCCESS',
+    'SUCCES': 'SUCCESS',
+    'SUCCÈS': 'SUCCESS',
+    'COMPLETED': 'SUCCESS',
+    'OK': 'SUCCESS',
+    'FAILED': 'FAILED',
+    'FAILURE': 'FAILED',
+    'ECHEC': 'FAILED',
+    'ÉCHEC': 'FAILED',
+    'PENDING': 'PENDING',
+}
+
+# Virgules séparant des groupes de trois chiffres : '15,000', '-1,250,000'
+THOUSANDS_COMMA = re.compile(r'^[-+]?\d{1,3}(,\d{3})+$')
+
+DATE_FORMATS = ('%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y')
+
+StatementRow = namedtuple('StatementRow', 'number transaction_id amount date status error')
+
+
+class StatementError(ValueError):
+    """Relevé inexploitable (en-tête absent ou incomplet)"""
+
+
+def _normalize(header):
+    return header.strip().lower().replace('_', ' ')
+
+
+def parse_amount(value):
+    """
+    '15 000,00' / '15,000.00' / '15.000,00' / '15,000' / '15000.00'
+    -> Decimal('15000.00'), None si illisible. Avec les deux séparateurs,
+    le dernier est décimal ; une virgule seule suivie de trois chiffres
+    ('15,000', '1,250,000') sépare les milliers.
+    """
+    value = (value or '').strip()
+    for space in (' ', '\u00a0', '\u202f'):
+        value = value.replace(space, '')
+    if ',' in value and '.' in value:
+        if value.rindex(',') > value.rindex('.'):
+            value = value.replace('.', '').replace(',', '.')
+        else:
+            value = value.replace(',', '')
+    elif THOUSANDS_COMMA.match(value):
+        value = value.replace(',', '')
+    else:
+        value = value.replace(',', '.')
+    try:
+        return Decimal(value).quantize(Decimal('0.01'))
+    except InvalidOperation:
+        return None
+
+
+def parse_when(value):
+    """Date ou date-heure (ISO ou JJ/MM/AAAA), rendue aware ; None si illisible"""
+    value = (value or '').strip()
+    try:
+        when = parse_datetime(value)
+        if when is None:
+            day = parse_date(value)
+            when = datetime.combine(day, datetime.min.time()) if day else None
+    except ValueError:
+        when = None
+    for fmt in DATE_FORMATS:
+        if when is not None:
+            break
+        try:
+            when = datetime.strptime(value, fmt)
+        except ValueError:
+            pass
+    if when is not None and timezone.is_naive(when):
+        when = timezone.make_aware(when)
+    return when
+
+
+def read_statement(file):
+    """
+    Lignes du relevé (StatementRow), lues en flux. Séparateur déduit de
+    l'en-tête (',', ';' ou tabulation).
+    """
+    file.open('rb')
+    try:
+        stream = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+        header_line = stream.readline()
+        delimiter = max(',;\t', key=header_line.count)
+        header = [_normalize(name) for name in next(csv.reader([header_line], delimiter=delimiter), [])]
+        
+        positions = {}
+        for column, aliases in COLUMNS.items():
+            for alias in aliases:
+                if alias in header:
+                    positions[column] = header.index(alias)
+                    break
+        missing = {'transaction_id', 'amount', 'date'} - set(positions)
+        if missing:
+            raise StatementError(f"Colonnes absentes du relevé : {', '.join(sorted(missing))}")
+        
+        def cell(values, column):
+            position = positions.get(column)
+            return values[position].strip() if position is not None and position < len(values) else ''
+        
+        for number, values in enumerate(csv.reader(stream, delimiter=delimiter), start=2):
+            if not any(value.strip() for value in values):
+                continue
+            transaction_id = cell(values, 'transaction_id')
+            amount = parse_amount(cell(values, 'amount'))
+            date = parse_when(cell(values, 'date'))
+            raw_status = cell(values, 'status').upper()
+            status = STATEMENT_STATUSES.get(raw_status, raw_status)
+            
+            error = ''
+            if not transaction_id:
+                error = 'Numéro de transaction absent'
+            elif amount is None:
+                error = 'Montant illisible'
+            elif date is None:
+                error = 'Date illisible'
+            yield StatementRow(number, transaction_id[:100], amount, date, status[:20], error)
+        stream.detach()
+    finally:
+        file.close()
+
+
+class ReconciliationService:
+    """Service centralisant le rapprochement des relevés"""
+    
+    @staticmethod
+    def start(salon, file, label='', user=None):
+        """Enregistre le relevé et programme son traitement par le worker"""
+        from apps.jobs.services import enqueue
+        
+        with tenant_atomic(salon):
+            statement = StatementImport.objects.create(
+                salon=salon, file=file, label=label, created_by=user
+            )
+            enqueue('reconciliation.run', salon=salon, statement_id=statement.pk)
+        return statement
+    
+    @staticmethod
+    def scan(statement):
+        """Première passe : nombre de lignes et bornes de dates du relevé"""
+        total, first, last = 0, None, None
+        for row in read_statement(statement.file):
+            total += 1
+            if row.date is not None:
+                first = row.date if first is None else min(first, row.date)
+                last = row.date if last is None else max(last, row.date)
+        return total, first, last
+    
+    @staticmethod
+    def build_index(salon_id, first, last):
+        """
+        Paiements avec numéro de transaction de la période élargie, indexés
+        par numéro (une requête, élagage des partitions par payment_date).
+        """
+        window = timedelta(days=settings.RECONCILIATION_DATE_WINDOW_DAYS)
+        start, end = PaymentService.period_bounds(
+            timezone.localdate(first) - window,
+            timezone.localdate(last) + window
+        )
+        rows = Payment.objects.filter(
+            salon_id=salon_id,
+            payment_date__gte=start,
+            payment_date__lt=end
+        ).exclude(transaction_id='').order_by('id').values(
+            'id', 'appointment_id', 'client_id', 'amount', 'payment_method',
+            'status', 'payment_date', 'transaction_id'
+        )
+        index = {}
+        for row in rows.iterator(chunk_size=5000):
+            index.setdefault(row['transaction_id'], row)
+        return index
+    
+    @staticmethod
+    def match(row, index, seen):
+        """
+        Rapproche une ligne.
+        
+        Returns:
+            (résultat, paiement ou None, détail, statut de paiement à appliquer ou None)
+        """
+        if row.error:
+            return 'INVALID', None, row.error, None
+        if row.transaction_id in seen:
+            return 'DUPLICATE', None, f"Transaction déjà présente ligne {seen[row.transaction_id]}", None
+        seen[row.transaction_id] = row.number
+        
+        payment = index.get(row.transaction_id)
+        if payment is None:
+            return 'UNMATCHED', None, 'Aucun paiement pour cette transaction', None
+        
+        if payment['amount'] != row.amount:
+            return 'MISMATCHED', payment, f"Montant enregistré {payment['amount']}, relevé {row.amount}", None
+        window = timedelta(days=settings.RECONCILIATION_DATE_WINDOW_DAYS)
+        if abs(payment['payment_date'] - row.date) > window:
+            return 'MISMATCHED', payment, (
+                f"Paiement du {timezone.localtime(payment['payment_date']):%d/%m/%Y}, "
+                f"hors de la fenêtre de {window.days} jour(s)"
+            ), None
+        
+        target = OPERATOR_STATUSES.get(row.status)
+        if target in (None, 'PENDING', payment['status']):
+            return 'MATCHED', payment, '', None
+        if payment['status'] == 'PENDING':
+            return 'MATCHED', payment, '', target
+        return 'MISMATCHED', payment, f"Statut enregistré {payment['status']}, relevé {row.status}", None
+    
+    @staticmethod
+    def run(statement, progress=None):
+        """
+        Rapproche le relevé. Un nouveau passage repart de zéro (les statuts
+        déjà confirmés ne sont pas réappliqués).
+        
+        Args:
+            progress: callable(lignes traitées, total, compteurs), appelé à chaque lot
+        """
+        salon_id = statement.salon_id
+        chunk_size = settings.RECONCILIATION_CHUNK_SIZE
+        imports = StatementImport.objects.filter(pk=statement.pk)
+        
+        now = timezone.now()
+        statement.lines.all().delete()
+        imports.update(
+            status='RUNNING', started_at=now, finished_at=None, error='',
+            processed_lines=0, counts={}, updated_at=now
+        )
+        
+        try:
+            total, first, last = ReconciliationService.scan(statement)
+            imports.update(
+                total_lines=total,
+                period_start=first and timezone.localdate(first),
+                period_end=last and timezone.localdate(last),
+                updated_at=timezone.now()
+            )
+            index = ReconciliationService.build_index(salon_id, first, last) if first else {}
+            
+            counts = Counter()
+            seen = {}
+            present = set()
+            flagged, updates = [], []
+            processed = 0
+            
+            for row in read_statement(statement.file):
+                result, payment, detail, new_status = ReconciliationService.match(row, index, seen)
+                counts[result] += 1
+                processed += 1
+                if payment is not None:
+                    present.add(payment['id'])
+                if result != 'MATCHED':
+                    flagged.append(StatementLine(
+                        salon_id=salon_id,
+                        statement=statement,
+                        line_number=row.number,
+                        transaction_id=row.transaction_id,
+                        amount=row.amount,
+                        date=row.date,
+                        operator_status=row.status,
+                        result=result,
+                        payment_id=payment and payment['id'],
+                        detail=detail[:255]
+                    ))
+                if new_status:
+                    updates.append(Payment(**{**payment, 'status': new_status, 'salon_id': salon_id}))
+                    counts['UPDATED'] += 1
+                
+                if processed % chunk_size == 0:
+                    ReconciliationService._flush(statement, flagged, updates, processed, counts)
+                    if progress:
+                        progress(processed, total, counts)
+            
+            # Paiements de la période du relevé qui n'y figurent pas
+            for payment in index.values():
+                if payment['id'] in present:
+                    continue
+                if timezone.localdate(first) <= timezone.localdate(payment['payment_date']) <= timezone.localdate(last):
+                    counts['MISSING'] += 1
+                    flagged.append(StatementLine(
+                        salon_id=salon_id,
+                        statement=statement,
+                        transaction_id=payment['transaction_id'],
+                        amount=payment['amount'],
+                        date=payment['payment_date'],
+                        result='MISSING',
+                        payment_id=payment['id'],
+                        detail='Paiement enregistré absent du relevé'
+                    ))
+            ReconciliationService._flush(statement, flagged, updates, processed, counts)
+            if progress:
+                progress(processed, total, counts)
+        except StatementError as exc:
+            imports.update(status='FAILED', error=str(exc), finished_at=timezone.now(), updated_at=timezone.now())
+            return
+        except Exception as exc:
+            # Le worker retentera la tâche
+            imports.update(status='FAILED', error=str(exc)[:1000], updated_at=timezone.now())
+            raise
+        
+        now = timezone.now()
+        imports.update(status='DONE', finished_at=now, updated_at=now)
+    
+    @staticmethod
+    def _flush(statement, flagged, updates, processed, counts):
+        """Un lot : lignes signalées, statuts confirmés et avancement, dans une transaction"""
+        salon_id = statement.salon_id
+        using = sharding.db_for_salon(salon_id)
+        
+        with tenant_atomic(salon_id):
+            StatementLine.objects.bulk_create(flagged, batch_size=1000)
+            if updates:
+                ReconciliationService._apply_statuses(salon_id, updates, using)
+            StatementImport.objects.filter(pk=statement.pk).update(
+                processed_lines=processed,
+                counts=dict(counts),
+                updated_at=timezone.now()
+            )
+        flagged.clear()
+        updates.clear()
+    
+    @staticmethod
+    def _apply_statuses(salon_id, payments, using):
+        """
+        bulk_update des statuts : sans signaux, les effets des enregistrements
+        (updated_at, tableau de bord, webhooks, écrans, agrégats clients) sont
+        appliqués ici. Un paiement confirmé COMPLETED termine son rendez-vous,
+        comme une notification Mobile Money (PaymentService.complete_appointment).
+        """
+        from apps.appointments.models import Appointment
+        from apps.clients.services import ClientStatsService
+        from apps.dashboard.services import invalidate
+        from apps.realtime import events
+        from apps.webhooks.services import payment_payload, publish
+        
+        now = timezone.now()
+        for payment in payments:
+            payment.updated_at = now
+        Payment.objects.bulk_update(payments, ['status', 'updated_at'], batch_size=500)
+        
+        for payment in payments:
+            publish(salon_id, 'payment.updated', payment_payload(payment), using)
+        paid = Appointment.objects.using(using).filter(
+            salon_id=salon_id,
+            pk__in={payment.appointment_id for payment in payments if payment.status == 'COMPLETED'}
+        ).exclude(status='COMPLETED')
+        for appointment in paid:
+            PaymentService.complete_appointment(appointment)
+        ClientStatsService.schedule({payment.client_id for payment in payments}, using)
+        transaction.on_commit(lambda: invalidate(salon_id), using=using)
+        # Un seul événement pour le lot : les écrans rechargent leurs données
+        transaction.on_commit(
+            lambda: events.publish({'salon': salon_id, 'type': 'resync'}, using),
+            using=using
+        )
@@ -0,0 +1,14 @@
+"""
+Tasks for Reconciliation app
+"""
+from apps.jobs.registry import task
+from .models import StatementImport
+from .services import ReconciliationService
+
+
+@task('reconciliation.run', max_attempts=3)
+def run(statement_id):
+    statement = StatementImport.objects.filter(pk=statement_id).first()
+    if statement is None or statement.status == 'DONE':
+        return
+    ReconciliationService.run(statement)
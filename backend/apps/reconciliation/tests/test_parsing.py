@@ -0,0 +1,58 @@
+"""Lecture des montants et des dates d'un relevé d'opérateur"""
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+
+from apps.reconciliation.services import parse_amount, parse_when
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('15000', Decimal('15000.00')),
+    ('15000.5', Decimal('15000.50')),
+    ('15000,50', Decimal('15000.50')),
+    ('15 000,00', Decimal('15000.00')),
+    ('15\u00a0000,00', Decimal('15000.00')),
+    ('15\u202f000', Decimal('15000.00')),
+    ('15,000.00', Decimal('15000.00')),
+    ('15.000,00', Decimal('15000.00')),
+    ('1.250.000,75', Decimal('1250000.75')),
+    ('15,000', Decimal('15000.00')),
+    ('1,250,000', Decimal('1250000.00')),
+    ('-2,500', Decimal('-2500.00')),
+    ('12,5', Decimal('12.50')),
+    ('12,50', Decimal('12.50')),
+])
+def test_parse_amount(value, expected):
+    assert parse_amount(value) == expected
+
+
+@pytest.mark.parametrize('value', ['', None, 'abc', '15,000,00.0.0', '--5'])
+def test_parse_amount_unreadable(value):
+    assert parse_amount(value) is None
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('2026-03-14', datetime(2026, 3, 14)),
+    ('2026-03-14 09:30', datetime(2026, 3, 14, 9, 30)),
+    ('2026-03-14T09:30:15', datetime(2026, 3, 14, 9, 30, 15)),
+    ('14/03/2026', datetime(2026, 3, 14)),
+    ('14/03/2026 09:30', datetime(2026, 3, 14, 9, 30)),
+    ('14/03/2026 09:30:15', datetime(2026, 3, 14, 9, 30, 15)),
+    ('14-03-2026', datetime(2026, 3, 14)),
+])
+def test_parse_when(value, expected):
+    when = parse_when(value)
+    assert timezone.is_aware(when)
+    assert timezone.make_naive(when) == expected
+
+
+def test_parse_when_keeps_offset():
+    when = parse_when('2026-03-14T09:30:00+02:00')
+    assert when.utcoffset().total_seconds() == 7200
+
+
+@pytest.mark.parametrize('value', ['', None, 'hier', '2026-13-45', '31/02/2026'])
+def test_parse_when_unreadable(value):
+    assert parse_when(value) is None
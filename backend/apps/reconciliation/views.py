@@ -0,0 +1,61 @@
+"""
+Views for Reconciliation app
+"""
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.core.permissions import IsSalonAdmin
+from .models import StatementImport
+from .serializers import StatementImportSerializer, StatementLineSerializer
+from .services import ReconciliationService
+
+
+class StatementImportViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    Rapprochement des relevés d'opérateurs (administrateurs).
+    POST (multipart : file, label) programme le traitement ; GET sur le
+    relevé donne l'avancement.
+    """
+    permission_classes = [IsAuthenticated, IsSalonAdmin]
+    serializer_class = StatementImportSerializer
+    parser_classes = [MultiPartParser, FormParser]
+    
+    def get_queryset(self):
+        if self.request.salon:
+            return StatementImport.objects.filter(salon=self.request.salon)
+        return StatementImport.objects.none()
+    
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        statement = ReconciliationService.start(
+            request.salon,
+            serializer.validated_data['file'],
+            label=serializer.validated_data.get('label', ''),
+            user=request.user
+        )
+        return Response(
+            self.get_serializer(statement).data,
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=True, methods=['get'])
+    def lines(self, request, pk=None):
+        """Lignes signalées (?result=MISMATCHED, UNMATCHED, DUPLICATE, INVALID, MISSING)"""
+        statement = self.get_object()
+        lines = statement.lines.order_by('id')
+        result_filter = request.query_params.get('result')
+        if result_filter:
+            lines = lines.filter(result=result_filter.upper())
+        
+        page = self.paginate_queryset(lines)
+        serializer = StatementLineSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
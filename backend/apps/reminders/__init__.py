@@ -0,0 +1,4 @@
+"""
+Reminders app - Rappels de rendez-vous et notifications aux clients
+"""
+default_app_config = 'apps.reminders.apps.RemindersConfig'
@@ -0,0 +1,15 @@
+from django.contrib import admin
+from .models import ReminderLog
+
+
+@admin.register(ReminderLog)
+class ReminderLogAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'channel', 'recipient', 'appointment_id', 'status', 'sent_at', 'salon']
+    list_filter = ['kind', 'channel', 'status', 'salon']
+    search_fields = ['recipient']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
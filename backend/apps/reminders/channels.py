@@ -0,0 +1,130 @@
+"""
+Canaux d'envoi des rappels (REMINDER_CHANNELS)
+- console : sortie standard (développement)
+- file : une ligne JSON par message dans REMINDER_FILE_PATH
+- email : EMAIL_BACKEND et paramètres EMAIL_* (SMTP en production),
+  une seule connexion par lot
+- sms : bouchon qui journalise, à remplacer par le fournisseur retenu
+
+Un canal se désigne par son nom ou par le chemin d'une classe
+(ex. 'myproject.sms.OrangeSmsChannel').
+"""
+import json
+import logging
+import sys
+import threading
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+_write_lock = threading.Lock()
+
+
+class Message:
+    def __init__(self, recipient, subject, body, sender=None):
+        self.recipient = recipient
+        self.subject = subject
+        self.body = body
+        self.sender = sender
+
+
+class Channel:
+    """
+    Canal d'envoi. send_batch renvoie, pour chaque message, None (envoyé)
+    ou le message d'erreur.
+    """
+    name = None
+    
+    def address(self, client):
+        """Adresse du client pour ce canal ({'email', 'phone'}), ou None"""
+        return client['email'] or client['phone']
+    
+    def send_batch(self, messages):
+        raise NotImplementedError
+
+
+class ConsoleChannel(Channel):
+    name = 'console'
+    
+    def send_batch(self, messages):
+        with _write_lock:
+            for message in messages:
+                sys.stdout.write(f"[rappel] {message.recipient} | {message.subject}\n{message.body}\n")
+            sys.stdout.flush()
+        return [None] * len(messages)
+
+
+class FileChannel(Channel):
+    name = 'file'
+    
+    def send_batch(self, messages):
+        sent_at = timezone.now().isoformat()
+        lines = ''.join(
+            json.dumps({
+                'sent_at': sent_at,
+                'recipient': message.recipient,
+                'subject': message.subject,
+                'body': message.body,
+            }, ensure_ascii=False) + '\n'
+            for message in messages
+        )
+        with _write_lock, open(settings.REMINDER_FILE_PATH, 'a', encoding='utf-8') as output:
+            output.write(lines)
+        return [None] * len(messages)
+
+
+class EmailChannel(Channel):
+    name = 'email'
+    
+    def address(self, client):
+        return client['email']
+    
+    def send_batch(self, messages):
+        errors = []
+        with get_connection() as connection:
+            for message in messages:
+                email = EmailMessage(
+                    message.subject,
+                    message.body,
+                    message.sender or None,
+                    [message.recipient],
+                    connection=connection
+                )
+                try:
+                    email.send()
+                    errors.append(None)
+                except Exception as exc:
+                    errors.append(str(exc) or exc.__class__.__name__)
+        return errors
+
+
+class SmsStubChannel(Channel):
+    name = 'sms'
+    
+    def address(self, client):
+        return client['phone']
+    
+    def send_batch(self, messages):
+        for message in messages:
+            logger.info("SMS (bouchon) à %s : %s", message.recipient, message.subject)
+        return [None] * len(messages)
+
+
+CHANNELS = {
+    channel.name: channel
+    for channel in (ConsoleChannel, FileChannel, EmailChannel, SmsStubChannel)
+}
+
+
+def enabled_channels():
+    """Instances des canaux configurés, par nom"""
+    channels = {}
+    for name in settings.REMINDER_CHANNELS:
+        channel_class = CHANNELS.get(name) or import_string(name)
+        channels[channel_class.name or name] = channel_class()
+    return channels
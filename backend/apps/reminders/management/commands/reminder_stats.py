@@ -0,0 +1,44 @@
+"""
+Débit des rappels et notifications
+Usage: python manage.py reminder_stats [--minutes 60]
+Compte les envois de la période par canal et statut, tous shards confondus,
+avec le débit horaire et le délai moyen entre mise en file et envoi.
+"""
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.core import sharding
+from apps.reminders.services import ReminderService
+
+
+class Command(BaseCommand):
+    help = "Affiche le débit des rappels envoyés"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--minutes', type=int, default=60, help='Période observée (minutes)')
+
+    def handle(self, *args, **options):
+        minutes = options['minutes']
+        since = timezone.now() - timedelta(minutes=minutes)
+
+        totals = {}
+        for alias in sharding.tenant_shards():
+            with sharding.use_shard(alias):
+                for row in ReminderService.throughput(since):
+                    key = (row['channel'], row['status'])
+                    count, latency = totals.get(key, (0, timedelta()))
+                    totals[key] = (
+                        count + row['count'],
+                        latency + (row['latency'] or timedelta()) * row['count']
+                    )
+
+        if not totals:
+            self.stdout.write(f"Aucun envoi sur les {minutes} dernières minutes")
+            return
+        for (channel, status), (count, latency) in sorted(totals.items()):
+            line = f"{channel:<10} {status:<8} {count:>8}  {count * 60 / minutes:>10.0f}/h"
+            if status == 'SENT':
+                line += f"  délai moyen {(latency / count).total_seconds():.1f} s"
+            self.stdout.write(line)
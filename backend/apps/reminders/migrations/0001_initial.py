@@ -0,0 +1,101 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReminderLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                ("appointment_id", models.BigIntegerField(verbose_name="Rendez-vous")),
+                ("kind", models.CharField(max_length=30, verbose_name="Type")),
+                ("channel", models.CharField(max_length=30, verbose_name="Canal")),
+                (
+                    "recipient",
+                    models.CharField(max_length=254, verbose_name="Destinataire"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("QUEUED", "En file"),
+                            ("SENDING", "En cours"),
+                            ("SENT", "Envoyé"),
+                            ("FAILED", "Échec"),
+                            ("SKIPPED", "Ignoré"),
+                        ],
+                        default="QUEUED",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                ("error", models.TextField(blank=True, verbose_name="Erreur")),
+                (
+                    "sent_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Envoyé le"
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Envoi",
+                "verbose_name_plural": "Envois",
+                "db_table": "reminder_logs",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "appointment_id"],
+                        name="reminder_lo_kind_a42728_idx",
+                    ),
+                    models.Index(
+                        fields=["sent_at"], name="reminder_lo_sent_at_cf6725_idx"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("salon", "appointment_id", "kind", "channel"),
+                        name="reminder_log_unique_send",
+                    )
+                ],
+            },
+        ),
+    ]
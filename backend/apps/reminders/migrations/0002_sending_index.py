@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+        ("reminders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="reminderlog",
+            index=models.Index(
+                condition=models.Q(("status", "SENDING")),
+                fields=["updated_at"],
+                name="reminder_log_sending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+"""
+Models for Reminders app
+"""
+from django.db import models
+from apps.core.models import TenantAwareModel
+from apps.core.managers import TenantManager
+
+
+class ReminderLog(TenantAwareModel):
+    """
+    Journal des envois aux clients : une ligne par rendez-vous, type d'envoi
+    (REMINDER_24H, CANCELLATION...) et canal. Créée à la mise en file ;
+    la contrainte d'unicité empêche tout double envoi.
+    """
+    
+    STATUS_CHOICES = [
+        ('QUEUED', 'En file'),
+        ('SENDING', 'En cours'),
+        ('SENT', 'Envoyé'),
+        ('FAILED', 'Échec'),
+        ('SKIPPED', 'Ignoré'),
+    ]
+    
+    # Pas de clé étrangère : la table des rendez-vous est partitionnée
+    appointment_id = models.BigIntegerField('Rendez-vous')
+    kind = models.CharField('Type', max_length=30)
+    channel = models.CharField('Canal', max_length=30)
+    recipient = models.CharField('Destinataire', max_length=254)
+    status = models.CharField('Statut', max_length=20, choices=STATUS_CHOICES, default='QUEUED')
+    error = models.TextField('Erreur', blank=True)
+    sent_at = models.DateTimeField('Envoyé le', null=True, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'reminder_logs'
+        verbose_name = 'Envoi'
+        verbose_name_plural = 'Envois'
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['salon', 'appointment_id', 'kind', 'channel'],
+                name='reminder_log_unique_send',
+            ),
+        ]
+        indexes = [
+            # Mise en file : rendez-vous déjà servis pour un type d'envoi
+            models.Index(fields=['kind', 'appointment_id']),
+            # Statistiques de débit
+            models.Index(fields=['sent_at']),
+            # Reprise des envois interrompus (ReminderService.reclaim_stale)
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(status='SENDING'),
+                name='reminder_log_sending_idx',
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.kind} {self.channel} → {self.recipient} ({self.status})"
@@ -0,0 +1,276 @@
+"""
+Business logic for Reminders app
+Les rappels ne reposent pas sur un minuteur par rendez-vous : une tâche
+périodique parcourt, pour chaque délai (REMINDER_OFFSETS_HOURS), la tranche
+de rendez-vous qui vient d'entrer dans la fenêtre de rappel (index date/heure),
+inscrit les envois au journal et les confie par lots au worker (apps.jobs).
+"""
+import logging
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, F, Q
+from django.utils import timezone
+
+from apps.appointments.models import Appointment
+from apps.core import sharding
+from .channels import Message, enabled_channels
+from .models import ReminderLog
+
+
+logger = logging.getLogger(__name__)
+
+CANCELLATION = 'CANCELLATION'
+# Statuts encore à rappeler
+REMINDED_STATUSES = ['PENDING', 'CONFIRMED']
+
+MESSAGE_FIELDS = [
+    'id', 'salon_id', 'date', 'time', 'status',
+    'client__first_name', 'client__email', 'client__phone',
+    'service__name', 'salon__name', 'salon__email',
+]
+
+
+def reminder_kind(hours):
+    return f'REMINDER_{hours}H'
+
+
+def _between(start, end):
+    """Rendez-vous dont le début est dans ]start, end] (fenêtre de moins de 24 h)"""
+    if start.date() == end.date():
+        return Q(date=start.date(), time__gt=start.time(), time__lte=end.time())
+    return (
+        Q(date=start.date(), time__gt=start.time()) |
+        Q(date=end.date(), time__lte=end.time())
+    )
+
+
+def render(kind, row):
+    """Sujet et texte d'un envoi"""
+    when = f"le {row['date']:%d/%m/%Y} à {row['time']:%H:%M}"
+    if kind == CANCELLATION:
+        subject = f"{row['salon__name']} : rendez-vous annulé"
+        body = f"Votre rendez-vous « {row['service__name']} » {when} a été annulé."
+    else:
+        subject = f"{row['salon__name']} : rappel de votre rendez-vous"
+        body = f"Nous vous rappelons votre rendez-vous « {row['service__name']} » {when}."
+    return subject, f"Bonjour {row['client__first_name']},\n\n{body}\n"
+
+
+class ReminderService:
+    """Service des rappels et notifications"""
+    
+    @staticmethod
+    def due_appointments(hours, now):
+        """
+        Rendez-vous qui entrent dans la fenêtre de rappel de `hours` heures.
+        La tranche couvre REMINDER_LOOKBACK_MINUTES : une analyse manquée
+        (worker arrêté) est rattrapée, le journal évite les doublons.
+        """
+        end = now + timedelta(hours=hours)
+        start = end - timedelta(minutes=settings.REMINDER_LOOKBACK_MINUTES)
+        return Appointment.objects.filter(
+            _between(start, end), status__in=REMINDED_STATUSES
+        )
+    
+    @staticmethod
+    def queue(kind, appointments):
+        """
+        Inscrit au journal les envois de `kind` pour ces rendez-vous (un par
+        canal joignable) et met en file un lot de livraison par salon et par
+        REMINDER_BATCH_SIZE rendez-vous. Renvoie le nombre de rendez-vous.
+        """
+        from apps.jobs.services import enqueue
+        
+        channels = enabled_channels()
+        rows = appointments.exclude(
+            pk__in=ReminderLog.objects.filter(kind=kind).values('appointment_id')
+        ).values('id', 'salon_id', 'client__email', 'client__phone')
+        
+        batch_size = settings.REMINDER_BATCH_SIZE
+        by_salon = defaultdict(list)
+        logs = []
+        for row in rows.iterator(chunk_size=batch_size):
+            client = {'email': row['client__email'], 'phone': row['client__phone']}
+            for name, channel in channels.items():
+                recipient = channel.address(client)
+                if recipient:
+                    logs.append(ReminderLog(
+                        salon_id=row['salon_id'],
+                        appointment_id=row['id'],
+                        kind=kind,
+                        channel=name,
+                        recipient=recipient
+                    ))
+            by_salon[row['salon_id']].append(row['id'])
+        
+        ReminderLog.objects.bulk_create(logs, batch_size=batch_size, ignore_conflicts=True)
+        for salon_id, ids in by_salon.items():
+            for offset in range(0, len(ids), batch_size):
+                enqueue(
+                    'reminders.deliver',
+                    salon=salon_id,
+                    kind=kind,
+                    appointment_ids=ids[offset:offset + batch_size]
+                )
+        return sum(len(ids) for ids in by_salon.values())
+    
+    @staticmethod
+    def reclaim_stale():
+        """
+        Remet en file (shard courant) les envois restés SENDING plus de
+        REMINDER_SENDING_TIMEOUT_SECONDS : worker arrêté pendant la livraison.
+        Un envoi interrompu après sa remise au canal peut ainsi partir deux fois.
+        """
+        from apps.jobs.services import enqueue
+        
+        now = timezone.now()
+        cutoff = now - timedelta(seconds=settings.REMINDER_SENDING_TIMEOUT_SECONDS)
+        with transaction.atomic(using=sharding.db_for_salon()):
+            stale = list(
+                ReminderLog.objects.select_for_update(skip_locked=True)
+                .filter(status='SENDING', updated_at__lt=cutoff)
+                .values_list('pk', 'salon_id', 'kind', 'appointment_id')
+            )
+            ReminderLog.objects.filter(pk__in=[row[0] for row in stale]).update(
+                status='QUEUED', updated_at=now
+            )
+            batches = defaultdict(set)
+            for _, salon_id, kind, appointment_id in stale:
+                batches[(salon_id, kind)].add(appointment_id)
+            
+            batch_size = settings.REMINDER_BATCH_SIZE
+            for (salon_id, kind), ids in batches.items():
+                ids = sorted(ids)
+                for offset in range(0, len(ids), batch_size):
+                    enqueue(
+                        'reminders.deliver',
+                        salon=salon_id,
+                        kind=kind,
+                        appointment_ids=ids[offset:offset + batch_size]
+                    )
+        if stale:
+            logger.warning("%s envoi(s) interrompu(s) remis en file", len(stale))
+        return len(stale)
+    
+    @staticmethod
+    def scan(now=None):
+        """Analyse périodique : tous les shards, tous les délais de rappel"""
+        # date/heure des rendez-vous : heure locale du salon (TIME_ZONE)
+        now = timezone.localtime(now).replace(tzinfo=None)
+        queued = 0
+        for alias in sharding.tenant_shards():
+            with sharding.use_shard(alias):
+                ReminderService.reclaim_stale()
+                for hours in settings.REMINDER_OFFSETS_HOURS:
+                    queued += ReminderService.queue(
+                        reminder_kind(hours),
+                        ReminderService.due_appointments(hours, now)
+                    )
+        return queued
+    
+    @staticmethod
+    def deliver(kind, appointment_ids):
+        """
+        Envoie un lot. Les lignes du journal sont réservées (QUEUED → SENDING)
+        avant l'envoi : un lot rejoué ou concurrent ne renvoie rien
+        (au plus un envoi par rendez-vous, type et canal).
+        """
+        started = time.monotonic()
+        with transaction.atomic(using=sharding.db_for_salon()):
+            logs = list(
+                ReminderLog.objects.select_for_update(skip_locked=True)
+                .filter(kind=kind, appointment_id__in=appointment_ids, status='QUEUED')
+            )
+            ReminderLog.objects.filter(pk__in=[log.pk for log in logs]).update(
+                status='SENDING', updated_at=timezone.now()
+            )
+        if not logs:
+            return {}
+        
+        appointments = {
+            row['id']: row
+            for row in Appointment.objects.filter(
+                pk__in={log.appointment_id for log in logs}
+            ).values(*MESSAGE_FIELDS)
+        }
+        channels = enabled_channels()
+        
+        by_channel = defaultdict(list)
+        skipped = []
+        for log in logs:
+            row = appointments.get(log.appointment_id)
+            if (
+                row is None or log.channel not in channels or
+                (kind != CANCELLATION and row['status'] not in REMINDED_STATUSES)
+            ):
+                # Rendez-vous supprimé/annulé depuis, ou canal désactivé
+                skipped.append(log.pk)
+                continue
+            subject, body = render(kind, row)
+            by_channel[log.channel].append(
+                (log, Message(log.recipient, subject, body, row['salon__email']))
+            )
+        
+        ReminderLog.objects.filter(pk__in=skipped).update(status='SKIPPED', updated_at=timezone.now())
+        counts = {'sent': 0, 'failed': 0, 'skipped': len(skipped)}
+        for name, items in by_channel.items():
+            try:
+                errors = channels[name].send_batch([message for _, message in items])
+            except Exception as exc:
+                errors = [str(exc) or exc.__class__.__name__] * len(items)
+            
+            now = timezone.now()
+            sent = [log.pk for (log, _), error in zip(items, errors) if error is None]
+            ReminderLog.objects.filter(pk__in=sent).update(status='SENT', sent_at=now, updated_at=now)
+            for (log, _), error in zip(items, errors):
+                if error is not None:
+                    ReminderLog.objects.filter(pk=log.pk).update(
+                        status='FAILED', error=error, updated_at=now
+                    )
+            counts['sent'] += len(sent)
+            counts['failed'] += len(items) - len(sent)
+        
+        elapsed = time.monotonic() - started
+        logger.info(
+            "%s : %s envoyé(s), %s échec(s), %s ignoré(s) en %.2f s",
+            kind, counts['sent'], counts['failed'], counts['skipped'], elapsed
+        )
+        return counts
+    
+    @staticmethod
+    def notify(appointment_id, kind):
+        """Envoi immédiat à un client (ex. annulation), dédoublonné par le journal"""
+        row = Appointment.objects.filter(pk=appointment_id).values(
+            'id', 'salon_id', 'client__email', 'client__phone'
+        ).first()
+        if row is None:
+            return {}
+        channels = enabled_channels()
+        client = {'email': row['client__email'], 'phone': row['client__phone']}
+        ReminderLog.objects.bulk_create([
+            ReminderLog(
+                salon_id=row['salon_id'],
+                appointment_id=row['id'],
+                kind=kind,
+                channel=name,
+                recipient=channel.address(client)
+            )
+            for name, channel in channels.items() if channel.address(client)
+        ], ignore_conflicts=True)
+        return ReminderService.deliver(kind, [row['id']])
+    
+    @staticmethod
+    def throughput(since):
+        """Envois depuis `since`, par canal et statut (shard courant)"""
+        return list(
+            ReminderLog.objects.filter(
+                Q(sent_at__gte=since) | Q(status__in=['FAILED', 'SKIPPED'], updated_at__gte=since)
+            ).values('channel', 'status').annotate(
+                count=Count('id'),
+                latency=Avg(F('sent_at') - F('created_at'))
+            ).order_by('channel', 'status')
+        )
@@ -0,0 +1,20 @@
+"""
+Tasks for Reminders app
+"""
+from datetime import timedelta
+
+from django.conf import settings
+
+from apps.jobs.registry import task
+from .services import ReminderService
+
+
+@task('reminders.scan', every=timedelta(seconds=settings.REMINDER_SCAN_SECONDS))
+def scan():
+    """Met en file les rappels des rendez-vous entrés dans leur fenêtre"""
+    ReminderService.scan()
+
+
+@task('reminders.deliver')
+def deliver(kind, appointment_ids):
+    ReminderService.deliver(kind, appointment_ids)
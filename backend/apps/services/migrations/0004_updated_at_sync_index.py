@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+        ("services", "0003_service_target"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="service",
+            index=models.Index(
+                fields=["salon", "updated_at", "id"], name="services_salon_i_d715df_idx"
+            ),
+        ),
+    ]
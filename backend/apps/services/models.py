@@ -104,6 +104,8 @@ class Service(TenantAwareModel):
         ordering = ['category', 'name']
         indexes = [
             models.Index(fields=['salon', 'is_active']),
+            # Flux de modifications (apps.sync) : parcours par updated_at
+            models.Index(fields=['salon', 'updated_at', 'id']),
         ]
     
     def __str__(self):
@@ -111,8 +113,13 @@ class Service(TenantAwareModel):
     
     def get_duration_display(self):
         """Affichage formaté de la durée"""
-        hours = self.duration // 60
-        minutes = self.duration % 60
+        return Service.format_duration(self.duration)
+    
+    @staticmethod
+    def format_duration(duration):
+        """Durée en minutes -> 1h30, 2h, 45 min"""
+        hours = duration // 60
+        minutes = duration % 60
         
         if hours > 0:
             return f"{hours}h{minutes:02d}" if minutes > 0 else f"{hours}h"
@@ -2,10 +2,12 @@
 Serializers for Services app
 """
 from rest_framework import serializers
+from apps.core.fieldsets import DynamicFieldsMixin
+from apps.core.projections import ValuesSerializer, Column, as_datetime, as_decimal, display
 from .models import Service, ServiceCategory
 
 
-class ServiceCategorySerializer(serializers.ModelSerializer):
+class ServiceCategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les catégories de services"""
     
     services_count = serializers.SerializerMethodField()
@@ -14,12 +16,13 @@ class ServiceCategorySerializer(serializers.ModelSerializer):
         model = ServiceCategory
         fields = ['id', 'name', 'description', 'services_count', 'created_at']
         read_only_fields = ['id', 'created_at']
+        field_sources = {'services_count': ()}
     
     def get_services_count(self, obj):
         return obj.services.filter(is_active=True).count()
 
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     """Serializer pour les services"""
     
     category_name = serializers.CharField(source='category.name', read_only=True)
@@ -34,11 +37,42 @@ class ServiceSerializer(serializers.ModelSerializer):
             'image', 'is_active', 'is_published', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        field_sources = {'duration_display': ('duration',)}
     
     def get_duration_display(self, obj):
         return obj.get_duration_display()
 
 
+class ServiceValuesSerializer(ValuesSerializer):
+    """Équivalent values() de ServiceSerializer pour les listes"""
+    
+    columns = (
+        Column('id'),
+        Column('name'),
+        Column('description'),
+        Column('category'),
+        Column('category_name', 'category__name', omit_if_null=True),
+        Column('price', format=as_decimal(2, 10)),
+        Column('duration'),
+        Column('duration_display', 'duration', format=Service.format_duration),
+        Column('target'),
+        Column('target_display', 'target', format=display(Service.TARGET_CHOICES)),
+        Column('image'),
+        Column('is_active'),
+        Column('is_published'),
+        Column('created_at', format=as_datetime),
+        Column('updated_at', format=as_datetime),
+    )
+    
+    def format_image(self, name):
+        """URL absolue de l'image, comme ImageField de DRF"""
+        if not name:
+            return None
+        url = Service._meta.get_field('image').storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request is not None else url
+
+
 class ServiceCreateSerializer(serializers.ModelSerializer):
     """Serializer pour la création de services"""
     
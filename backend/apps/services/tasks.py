@@ -0,0 +1,51 @@
+"""
+Tasks for Services app
+"""
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from apps.jobs.registry import task
+from .models import Service
+
+
+@task('services.optimize_image')
+def optimize_image(service_id):
+    """
+    Redresse (EXIF) et réduit l'image d'un service à SERVICE_IMAGE_MAX_SIZE,
+    après l'upload : la requête ne paie que l'écriture du fichier reçu.
+    """
+    service = Service.objects.filter(pk=service_id).first()
+    if service is None or not service.image:
+        return
+    
+    with service.image.open('rb') as source:
+        image = Image.open(source)
+        image_format = image.format
+        image.load()
+    
+    max_size = settings.SERVICE_IMAGE_MAX_SIZE
+    oriented = ImageOps.exif_transpose(image)
+    if oriented is image and max(image.size) <= max_size:
+        return
+    oriented.thumbnail((max_size, max_size))
+    
+    buffer = BytesIO()
+    if image_format == 'JPEG':
+        oriented.convert('RGB').save(buffer, format='JPEG', quality=85, optimize=True)
+    else:
+        oriented.save(buffer, format=image_format, optimize=True)
+    
+    # Nouveau fichier d'abord (nom libre choisi par le stockage), puis la
+    # ligne, puis l'ancien fichier : aucun échec ne laisse l'image perdue
+    name = service.image.name
+    storage = service.image.storage
+    saved_name = storage.save(name, ContentFile(buffer.getvalue()))
+    updated = Service.objects.filter(pk=service.pk, image=name).update(
+        image=saved_name, updated_at=timezone.now()
+    )
+    # Image remplacée entre-temps : la version réduite est obsolète
+    storage.delete(name if updated else saved_name)
@@ -13,12 +13,14 @@ from .models import Service, ServiceCategory
 from .serializers import (
     ServiceSerializer,
     ServiceCreateSerializer,
+    ServiceValuesSerializer,
     ServiceCategorySerializer
 )
 from apps.core.permissions import IsSalonAdmin, IsSalonEmployee
+from apps.core.mixins import ReplicaReadMixin, SparseFieldsMixin, ValuesListMixin
 
 
-class ServiceCategoryViewSet(viewsets.ModelViewSet):
+class ServiceCategoryViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet pour les catégories de services"""
     serializer_class = ServiceCategorySerializer
     permission_classes = [IsAuthenticated, IsSalonEmployee]
@@ -49,10 +51,11 @@ class ServiceCategoryViewSet(viewsets.ModelViewSet):
         serializer.save(salon=self.request.salon)
 
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ReplicaReadMixin, ValuesListMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """ViewSet pour les services"""
     permission_classes = [IsAuthenticated]
     parser_classes = (MultiPartParser, FormParser)
+    values_serializer_class = ServiceValuesSerializer
     
     def get_queryset(self):
         """Filtre par salon"""
@@ -115,6 +118,10 @@ class ServiceViewSet(viewsets.ModelViewSet):
         serializer = ServiceSerializer(service, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            if service.image:
+                # Redimensionnement hors de la requête
+                from apps.jobs.services import enqueue
+                enqueue('services.optimize_image', salon=service.salon_id, service_id=service.pk)
             return Response(serializer.data, status=status.HTTP_200_OK)
         else:
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
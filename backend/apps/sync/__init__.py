@@ -0,0 +1,4 @@
+"""
+Sync app - Flux de modifications pour les clients hors ligne
+"""
+default_app_config = 'apps.sync.apps.SyncConfig'
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from .models import DeletedRecord
+
+
+@admin.register(DeletedRecord)
+class DeletedRecordAdmin(admin.ModelAdmin):
+    list_display = ['resource', 'object_id', 'salon', 'created_at']
+    list_filter = ['resource', 'salon']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
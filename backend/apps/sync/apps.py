@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.sync'
+    verbose_name = 'Synchronisation'
+    
+    def ready(self):
+        from django.db.models.signals import post_delete
+        from .services import SYNC_MODELS, record_deletion
+        
+        # Trace (tombstone) de chaque suppression d'un objet synchronisé
+        for label in SYNC_MODELS.values():
+            post_delete.connect(record_deletion, sender=label)
@@ -0,0 +1,24 @@
+"""
+Purge les traces de suppression (tombstones) au-delà de la rétention
+Usage: python manage.py prune_sync_tombstones [--days 30]
+Chaque shard est traité à tour de rôle.
+"""
+from django.core.management.base import BaseCommand
+
+from apps.core import sharding
+from apps.sync.services import SyncService
+
+
+class Command(BaseCommand):
+    help = "Supprime les traces de suppression plus anciennes que la rétention"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, help='Rétention (jours), défaut : SYNC_TOMBSTONE_RETENTION_DAYS'
+        )
+
+    def handle(self, *args, **options):
+        for alias in sharding.tenant_shards():
+            with sharding.use_shard(alias):
+                deleted = SyncService.prune_tombstones(options['days'])
+            self.stdout.write(self.style.SUCCESS(f"[{alias}] {deleted} trace(s) supprimée(s)"))
@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-19 13:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeletedRecord",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                ("resource", models.CharField(max_length=30, verbose_name="Type")),
+                ("object_id", models.BigIntegerField(verbose_name="ID supprimé")),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Suppression",
+                "verbose_name_plural": "Suppressions",
+                "db_table": "sync_deleted_records",
+                "ordering": ["updated_at", "id"],
+                "indexes": [
+                    models.Index(
+                        fields=["salon", "updated_at", "id"],
+                        name="sync_delete_salon_i_34ac39_idx",
+                    )
+                ],
+            },
+        ),
+    ]
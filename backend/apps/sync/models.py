@@ -0,0 +1,30 @@
+"""
+Models for Sync app
+"""
+from django.db import models
+from apps.core.models import TenantAwareModel
+from apps.core.managers import TenantManager
+
+
+class DeletedRecord(TenantAwareModel):
+    """
+    Trace d'une suppression (tombstone).
+    Permet aux clients hors ligne de retirer les objets supprimés lors de la
+    synchronisation incrémentale ; purgée après SYNC_TOMBSTONE_RETENTION_DAYS.
+    """
+    resource = models.CharField('Type', max_length=30)
+    object_id = models.BigIntegerField('ID supprimé')
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'sync_deleted_records'
+        verbose_name = 'Suppression'
+        verbose_name_plural = 'Suppressions'
+        ordering = ['updated_at', 'id']
+        indexes = [
+            models.Index(fields=['salon', 'updated_at', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"{self.resource} #{self.object_id}"
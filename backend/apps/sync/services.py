@@ -0,0 +1,195 @@
+"""
+Business logic for Sync app
+Flux de modifications « depuis le filigrane W » d'un salon : pour chaque type
+synchronisé, les lignes dont updated_at est dans ]W, fin], parcourues dans
+l'ordre (updated_at, id) grâce à l'index (salon, updated_at, id), ainsi que
+les suppressions (DeletedRecord) de la même fenêtre.
+
+La fin de fenêtre est décalée de SYNC_WATERMARK_LAG_SECONDS : une écriture
+encore non validée au moment du parcours, mais horodatée avant cette fin, ne
+serait jamais renvoyée. Les clients appliquent les modifications puis les
+suppressions, et reprennent avec le filigrane renvoyé.
+"""
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.exceptions import FullSyncRequired
+from apps.core.models import Salon
+from apps.core.projections import ValuesSerializer
+from .models import DeletedRecord
+
+
+# Type synchronisé -> modèle
+SYNC_MODELS = {
+    'clients': 'clients.Client',
+    'employees': 'employees.Employee',
+    'services': 'services.Service',
+    'appointments': 'appointments.Appointment',
+    'payments': 'payments.Payment',
+}
+
+
+def record_deletion(sender, instance, using=None, origin=None, **kwargs):
+    """
+    Handler post_delete : enregistre la suppression.
+    Rien n'est tracé quand c'est le salon lui-même qui est supprimé.
+    """
+    if isinstance(origin, Salon) or getattr(origin, 'model', None) is Salon:
+        return
+    resource = next(
+        key for key, label in SYNC_MODELS.items() if label == sender._meta.label
+    )
+    DeletedRecord.objects.using(using).create(
+        salon_id=instance.salon_id,
+        resource=resource,
+        object_id=instance.pk
+    )
+
+
+def _serializers():
+    """Serializer de lecture de chaque type (ValuesSerializer si disponible)"""
+    from apps.appointments.serializers import AppointmentValuesSerializer
+    from apps.clients.serializers import ClientValuesSerializer
+    from apps.employees.serializers import EmployeeSerializer
+    from apps.payments.serializers import PaymentValuesSerializer
+    from apps.services.serializers import ServiceValuesSerializer
+    
+    return {
+        'clients': ClientValuesSerializer,
+        'employees': EmployeeSerializer,
+        'services': ServiceValuesSerializer,
+        'appointments': AppointmentValuesSerializer,
+        'payments': PaymentValuesSerializer,
+    }
+
+
+def _updated_at(item):
+    return item['updated_at'] if isinstance(item, dict) else item.updated_at
+
+
+def _cut(items, limit):
+    """
+    Coupe une page de limit + 1 éléments triés par updated_at.
+    Retourne (éléments conservés, borne) : tous les éléments de la source
+    jusqu'à la borne incluse sont conservés ; borne None si la page est
+    complète. Un groupe d'horodatages identiques n'est jamais coupé.
+    """
+    if len(items) <= limit:
+        return items, None
+    next_timestamp = _updated_at(items[limit])
+    kept = [item for item in items[:limit] if _updated_at(item) < next_timestamp]
+    if not kept:
+        return None, next_timestamp
+    return kept, _updated_at(kept[-1])
+
+
+class SyncService:
+    """Service centralisant la synchronisation incrémentale"""
+    
+    @staticmethod
+    def window_end():
+        return timezone.now() - timedelta(seconds=settings.SYNC_WATERMARK_LAG_SECONDS)
+    
+    @staticmethod
+    def retention_start():
+        return timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    
+    @staticmethod
+    def _window(queryset, since, until):
+        if since is not None:
+            queryset = queryset.filter(updated_at__gt=since)
+        return queryset.filter(updated_at__lte=until).order_by('updated_at', 'id')
+    
+    @staticmethod
+    def changes(salon, since=None, limit=None, context=None):
+        """
+        Modifications et suppressions du salon depuis since (None : tout).
+        Retourne {watermark, has_more, changes, deleted} ; si has_more, il
+        faut rappeler immédiatement avec le nouveau filigrane.
+        """
+        if since is not None and since < SyncService.retention_start():
+            raise FullSyncRequired()
+        
+        limit = limit or settings.SYNC_PAGE_SIZE
+        until = SyncService.window_end()
+        if since is not None and since >= until:
+            until = since
+        
+        pages = {}
+        watermark = until
+        has_more = False
+        
+        sources = {
+            key: apps.get_model(label).objects.filter(salon=salon)
+            for key, label in SYNC_MODELS.items()
+        }
+        serializers = _serializers()
+        for key, queryset in sources.items():
+            queryset = SyncService._window(queryset, since, until)
+            serializer_class = serializers[key]
+            if issubclass(serializer_class, ValuesSerializer):
+                queryset = serializer_class.project(queryset)
+            else:
+                queryset = queryset.select_related('user')
+            pages[key] = list(queryset[:limit + 1])
+        
+        tombstones = list(
+            SyncService._window(DeletedRecord.objects.filter(salon=salon), since, until)
+            .values('resource', 'object_id', 'updated_at')[:limit + 1]
+        )
+        pages['deleted'] = tombstones
+        
+        # Filigrane : la plus petite borne des sources tronquées
+        for key, items in pages.items():
+            kept, bound = _cut(items, limit)
+            if bound is not None:
+                has_more = True
+                if kept is None:
+                    # Page entière sur un même horodatage : on le lit en entier
+                    kept = SyncService._same_timestamp(key, sources, salon, bound, serializers)
+                watermark = min(watermark, bound)
+            pages[key] = kept
+        
+        changes = {}
+        for key in SYNC_MODELS:
+            items = [item for item in pages[key] if _updated_at(item) <= watermark]
+            serializer_class = serializers[key]
+            changes[key] = serializer_class(items, many=True, context=context).data
+        
+        deleted = {key: [] for key in SYNC_MODELS}
+        for row in pages['deleted']:
+            if row['updated_at'] <= watermark:
+                deleted[row['resource']].append(row['object_id'])
+        
+        return {
+            'watermark': watermark.isoformat(),
+            'has_more': has_more,
+            'changes': changes,
+            'deleted': deleted,
+        }
+    
+    @staticmethod
+    def _same_timestamp(key, sources, salon, timestamp, serializers):
+        if key == 'deleted':
+            return list(
+                DeletedRecord.objects.filter(salon=salon, updated_at=timestamp)
+                .values('resource', 'object_id', 'updated_at')
+            )
+        queryset = sources[key].filter(updated_at=timestamp).order_by('id')
+        serializer_class = serializers[key]
+        if issubclass(serializer_class, ValuesSerializer):
+            return list(serializer_class.project(queryset))
+        return list(queryset.select_related('user'))
+    
+    @staticmethod
+    def prune_tombstones(older_than_days=None):
+        """Supprime les traces de suppression au-delà de la rétention"""
+        if older_than_days is None:
+            cutoff = SyncService.retention_start()
+        else:
+            cutoff = timezone.now() - timedelta(days=older_than_days)
+        deleted, _ = DeletedRecord.objects.filter(updated_at__lt=cutoff).delete()
+        return deleted
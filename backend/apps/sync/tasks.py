@@ -0,0 +1,16 @@
+"""
+Tasks for Sync app
+"""
+from datetime import timedelta
+
+from apps.core import sharding
+from apps.jobs.registry import task
+from .services import SyncService
+
+
+@task('sync.prune_tombstones', every=timedelta(days=1))
+def prune_tombstones():
+    """Purge quotidienne des traces de suppression, shard par shard"""
+    for alias in sharding.tenant_shards():
+        with sharding.use_shard(alias):
+            SyncService.prune_tombstones()
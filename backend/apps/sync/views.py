@@ -0,0 +1,55 @@
+"""
+Views for Sync app
+"""
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core.permissions import IsSalonEmployee
+from .services import SyncService
+
+
+class SyncView(APIView):
+    """
+    Synchronisation incrémentale des tablettes (clients hors ligne).
+    
+    GET /api/v1/sync/?since=<filigrane>   (sans since : tout le salon)
+    
+    Renvoie les clients, employés, services, rendez-vous et paiements
+    modifiés depuis le filigrane, les ids supprimés, et le nouveau filigrane.
+    Tant que has_more est vrai, rappeler avec le filigrane renvoyé.
+    410 si le filigrane précède la rétention des suppressions.
+    """
+    permission_classes = [IsAuthenticated, IsSalonEmployee]
+    
+    def get(self, request):
+        if request.salon is None:
+            return Response({
+                'error': 'Aucun salon associé à cet utilisateur'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        
+        since = request.query_params.get('since')
+        if since:
+            try:
+                since = parse_datetime(since)
+            except ValueError:
+                since = None
+            if since is None or since.tzinfo is None:
+                return Response({
+                    'error': 'Filigrane invalide (datetime ISO 8601 avec fuseau attendu)'
+                }, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            since = None
+        
+        data = SyncService.changes(
+            request.salon,
+            since=since,
+            context={'request': request}
+        )
+        
+        return Response({
+            'success': True,
+            **data
+        })
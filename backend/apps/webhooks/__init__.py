@@ -0,0 +1,4 @@
+"""
+Webhooks app - Notifications sortantes vers les partenaires des salons
+"""
+default_app_config = 'apps.webhooks.apps.WebhooksConfig'
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from .models import WebhookEvent, WebhookSubscription
+
+
+@admin.register(WebhookSubscription)
+class WebhookSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ['url', 'salon', 'is_active', 'consecutive_failures', 'retry_at']
+    list_filter = ['is_active', 'salon']
+    search_fields = ['url', 'description']
+
+
+@admin.register(WebhookEvent)
+class WebhookEventAdmin(admin.ModelAdmin):
+    list_display = ['type', 'subscription', 'status', 'attempts', 'next_attempt_at', 'delivered_at']
+    list_filter = ['status', 'type', 'salon']
+    readonly_fields = ['event_id', 'payload', 'last_error']
@@ -0,0 +1,17 @@
+from django.apps import AppConfig
+
+
+class WebhooksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.webhooks'
+    verbose_name = 'Webhooks'
+    
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from .services import invalidate_subscriptions, publish_on_save
+        
+        for sender in ('appointments.Appointment', 'payments.Payment'):
+            post_save.connect(publish_on_save, sender=sender)
+        
+        post_save.connect(invalidate_subscriptions, sender='webhooks.WebhookSubscription')
+        post_delete.connect(invalidate_subscriptions, sender='webhooks.WebhookSubscription')
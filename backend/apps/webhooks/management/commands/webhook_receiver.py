@@ -0,0 +1,65 @@
+"""
+Récepteur HTTP local, en remplacement d'un partenaire pendant les tests
+Usage: python manage.py webhook_receiver [--port 8765] [--secret <secret>] [--fail-first 2]
+Affiche chaque lot reçu et vérifie sa signature quand le secret est fourni.
+--fail-first N répond 500 aux N premiers lots (test des nouvelles tentatives).
+"""
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from apps.webhooks.services import verify_signature
+
+
+class Command(BaseCommand):
+    help = "Lance un récepteur de webhooks local"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--secret', help='Secret de l\'abonnement, pour vérifier les signatures')
+        parser.add_argument('--fail-first', type=int, default=0, help='Lots refusés (HTTP 500) au démarrage')
+
+    def handle(self, *args, **options):
+        command = self
+        state = {'received': 0, 'events': 0}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                state['received'] += 1
+                if state['received'] <= options['fail_first']:
+                    command.stdout.write(f"lot #{state['received']} refusé (simulation)")
+                    self._reply(500)
+                    return
+                if options['secret'] and not verify_signature(
+                    options['secret'], self.headers.get('X-Webhook-Signature', ''), body
+                ):
+                    command.stderr.write(f"lot #{state['received']} : signature invalide")
+                    self._reply(401)
+                    return
+
+                events = json.loads(body)['events']
+                state['events'] += len(events)
+                command.stdout.write(
+                    f"lot #{state['received']} : {len(events)} événement(s), total {state['events']}"
+                )
+                for event in events:
+                    command.stdout.write(f"  {event['type']} {event['data'].get('id')}")
+                self._reply(200)
+
+            def _reply(self, status_code):
+                self.send_response(status_code)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', options['port']), Handler)
+        self.stdout.write(f"Récepteur sur http://127.0.0.1:{options['port']}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
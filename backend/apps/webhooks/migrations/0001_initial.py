@@ -0,0 +1,218 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:07
+
+import apps.webhooks.models
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("core", "0002_salon_shard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebhookSubscription",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                (
+                    "url",
+                    models.URLField(max_length=500, verbose_name="URL de réception"),
+                ),
+                (
+                    "events",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Types d'événements reçus ; vide = tous",
+                        verbose_name="Événements",
+                    ),
+                ),
+                (
+                    "secret",
+                    models.CharField(
+                        default=apps.webhooks.models.generate_secret,
+                        editable=False,
+                        max_length=64,
+                        verbose_name="Secret de signature",
+                    ),
+                ),
+                (
+                    "description",
+                    models.CharField(
+                        blank=True, max_length=200, verbose_name="Description"
+                    ),
+                ),
+                ("is_active", models.BooleanField(default=True, verbose_name="Actif")),
+                (
+                    "consecutive_failures",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Échecs consécutifs"
+                    ),
+                ),
+                (
+                    "retry_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Prochaine tentative"
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Abonnement webhook",
+                "verbose_name_plural": "Abonnements webhook",
+                "db_table": "webhook_subscriptions",
+                "ordering": ["-created_at"],
+            },
+        ),
+        migrations.CreateModel(
+            name="WebhookEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Date de création"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Dernière modification"
+                    ),
+                ),
+                (
+                    "event_id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, verbose_name="Identifiant"
+                    ),
+                ),
+                (
+                    "type",
+                    models.CharField(
+                        choices=[
+                            ("appointment.created", "Rendez-vous créé"),
+                            (
+                                "appointment.status_changed",
+                                "Statut de rendez-vous modifié",
+                            ),
+                            ("payment.created", "Paiement enregistré"),
+                            ("payment.updated", "Paiement modifié"),
+                        ],
+                        max_length=50,
+                        verbose_name="Type",
+                    ),
+                ),
+                ("payload", models.JSONField(verbose_name="Données")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "En attente"),
+                            ("DELIVERED", "Livré"),
+                            ("DEAD", "Abandonné"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                        verbose_name="Statut",
+                    ),
+                ),
+                (
+                    "attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="Tentatives"),
+                ),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        verbose_name="Prochaine tentative",
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="Dernière erreur"),
+                ),
+                (
+                    "delivered_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Livré le"
+                    ),
+                ),
+                (
+                    "salon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="%(class)s_set",
+                        to="core.salon",
+                        verbose_name="Salon",
+                    ),
+                ),
+                (
+                    "subscription",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="webhooks.webhooksubscription",
+                        verbose_name="Abonnement",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Événement webhook",
+                "verbose_name_plural": "Événements webhook",
+                "db_table": "webhook_events",
+                "ordering": ["id"],
+                "indexes": [
+                    models.Index(
+                        fields=["subscription", "status", "id"],
+                        name="webhook_eve_subscri_06b953_idx",
+                    ),
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="webhook_eve_status_8017be_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
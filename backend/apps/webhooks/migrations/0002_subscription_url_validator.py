@@ -0,0 +1,23 @@
+# Generated by Django 6.0.2 on 2026-10-19 14:37
+
+import apps.webhooks.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhooks", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="webhooksubscription",
+            name="url",
+            field=models.URLField(
+                max_length=500,
+                validators=[apps.webhooks.validators.validate_webhook_url],
+                verbose_name="URL de réception",
+            ),
+        ),
+    ]
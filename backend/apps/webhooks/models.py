@@ -0,0 +1,105 @@
+"""
+Models for Webhooks app
+"""
+import secrets
+import uuid
+
+from django.db import models
+from django.utils import timezone
+from apps.core.models import TenantAwareModel
+from apps.core.managers import TenantManager
+from .validators import validate_webhook_url
+
+
+EVENT_TYPES = [
+    ('appointment.created', 'Rendez-vous créé'),
+    ('appointment.status_changed', 'Statut de rendez-vous modifié'),
+    ('payment.created', 'Paiement enregistré'),
+    ('payment.updated', 'Paiement modifié'),
+]
+
+
+def generate_secret():
+    return secrets.token_hex(32)
+
+
+class WebhookSubscription(TenantAwareModel):
+    """
+    Abonnement d'un partenaire (comptabilité, marketing...) aux événements
+    du salon. Les envois sont signés avec le secret (HMAC-SHA256).
+    """
+    url = models.URLField('URL de réception', max_length=500, validators=[validate_webhook_url])
+    events = models.JSONField(
+        'Événements',
+        default=list,
+        blank=True,
+        help_text='Types d\'événements reçus ; vide = tous'
+    )
+    secret = models.CharField('Secret de signature', max_length=64, default=generate_secret, editable=False)
+    description = models.CharField('Description', max_length=200, blank=True)
+    is_active = models.BooleanField('Actif', default=True)
+    
+    # Pause de l'abonnement après un échec (attente exponentielle)
+    consecutive_failures = models.PositiveIntegerField('Échecs consécutifs', default=0)
+    retry_at = models.DateTimeField('Prochaine tentative', null=True, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'webhook_subscriptions'
+        verbose_name = 'Abonnement webhook'
+        verbose_name_plural = 'Abonnements webhook'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return self.url
+    
+    def accepts(self, event_type):
+        return not self.events or event_type in self.events
+
+
+class WebhookEvent(TenantAwareModel):
+    """
+    Événement à livrer à un abonnement (boîte d'envoi).
+    Inséré dans la transaction de l'écriture qui le déclenche ; DEAD après
+    WEBHOOK_MAX_ATTEMPTS échecs (file des lettres mortes, rejouable).
+    """
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'En attente'),
+        ('DELIVERED', 'Livré'),
+        ('DEAD', 'Abandonné'),
+    ]
+    
+    subscription = models.ForeignKey(
+        WebhookSubscription,
+        on_delete=models.CASCADE,
+        related_name='deliveries',
+        verbose_name='Abonnement'
+    )
+    # Identifiant stable, pour le dédoublonnage côté partenaire
+    event_id = models.UUIDField('Identifiant', default=uuid.uuid4, editable=False)
+    type = models.CharField('Type', max_length=50, choices=EVENT_TYPES)
+    payload = models.JSONField('Données')
+    
+    status = models.CharField('Statut', max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField('Tentatives', default=0)
+    next_attempt_at = models.DateTimeField('Prochaine tentative', default=timezone.now)
+    last_error = models.TextField('Dernière erreur', blank=True)
+    delivered_at = models.DateTimeField('Livré le', null=True, blank=True)
+    
+    objects = TenantManager()
+    
+    class Meta:
+        db_table = 'webhook_events'
+        verbose_name = 'Événement webhook'
+        verbose_name_plural = 'Événements webhook'
+        ordering = ['id']
+        indexes = [
+            # Livraison : événements en attente d'un abonnement, dans l'ordre
+            models.Index(fields=['subscription', 'status', 'id']),
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.type} → {self.subscription_id} ({self.status})"
@@ -0,0 +1,38 @@
+"""
+Serializers for Webhooks app
+"""
+from rest_framework import serializers
+from .models import EVENT_TYPES, WebhookEvent, WebhookSubscription
+
+
+class WebhookSubscriptionSerializer(serializers.ModelSerializer):
+    """Abonnement ; le secret n'est lisible que par les administrateurs du salon"""
+    
+    class Meta:
+        model = WebhookSubscription
+        fields = [
+            'id', 'url', 'events', 'description', 'is_active', 'secret',
+            'consecutive_failures', 'retry_at', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'secret', 'consecutive_failures', 'retry_at', 'created_at', 'updated_at'
+        ]
+    
+    def validate_events(self, value):
+        known = {event_type for event_type, _ in EVENT_TYPES}
+        if not isinstance(value, list) or any(event not in known for event in value):
+            raise serializers.ValidationError(
+                f"Liste d'événements attendue parmi : {', '.join(sorted(known))}"
+            )
+        return value
+
+
+class WebhookEventSerializer(serializers.ModelSerializer):
+    
+    class Meta:
+        model = WebhookEvent
+        fields = [
+            'id', 'event_id', 'type', 'payload', 'status', 'attempts',
+            'next_attempt_at', 'last_error', 'delivered_at', 'created_at'
+        ]
+        read_only_fields = fields
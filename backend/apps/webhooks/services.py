@@ -0,0 +1,351 @@
+"""
+Business logic for Webhooks app
+Publication : les événements sont insérés dans webhook_events au sein de la
+transaction de l'écriture (rien n'est envoyé si elle est annulée), puis une
+livraison par abonnement est mise en file après le commit. La requête
+d'origine ne fait aucun appel HTTP.
+
+Livraison (worker apps.jobs) : les événements en attente d'un abonnement sont
+regroupés dans un seul POST signé (WEBHOOK_BATCH_SIZE au plus). En cas
+d'échec, l'abonnement est mis en pause avec une attente exponentielle ; au
+bout de WEBHOOK_MAX_ATTEMPTS tentatives, un événement passe en DEAD. Aucun
+verrou n'est tenu pendant l'appel HTTP ; la destination est contrôlée avant
+chaque envoi (apps.webhooks.validators) et les redirections ne sont pas suivies.
+
+Signature : en-tête X-Webhook-Signature "t=<timestamp>,v1=<hex>", où hex est
+le HMAC-SHA256 de "<timestamp>.<corps>" avec le secret de l'abonnement.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import time
+import urllib.error
+import urllib.request
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.core import sharding
+from .models import WebhookEvent, WebhookSubscription
+from .validators import check_destination
+
+
+logger = logging.getLogger(__name__)
+
+SUBSCRIPTIONS_CACHE_KEY = 'webhooks:subscriptions:{salon_id}'
+SUBSCRIPTIONS_CACHE_SECONDS = 300
+USER_AGENT = 'SaaSCoiffure-Webhooks/1.0'
+
+
+# ---------------------------------------------------------------------------
+# Publication
+# ---------------------------------------------------------------------------
+
+def active_subscriptions(salon_id):
+    """[(id, events), ...] des abonnements actifs du salon (mis en cache)"""
+    key = SUBSCRIPTIONS_CACHE_KEY.format(salon_id=salon_id)
+    subscriptions = cache.get(key)
+    if subscriptions is None:
+        subscriptions = list(
+            WebhookSubscription.objects.filter(salon_id=salon_id, is_active=True)
+            .values_list('id', 'events')
+        )
+        cache.set(key, subscriptions, timeout=SUBSCRIPTIONS_CACHE_SECONDS)
+    return subscriptions
+
+
+def invalidate_subscriptions(sender, instance, **kwargs):
+    cache.delete(SUBSCRIPTIONS_CACHE_KEY.format(salon_id=instance.salon_id))
+
+
+def appointment_payload(appointment):
+    return {
+        'id': appointment.pk,
+        'date': appointment.date,
+        'time': appointment.time,
+        'duration': appointment.duration,
+        'status': appointment.status,
+        'client': appointment.client_id,
+        'employee': appointment.employee_id,
+        'service': appointment.service_id,
+    }
+
+
+def payment_payload(payment):
+    return {
+        'id': payment.pk,
+        'appointment': payment.appointment_id,
+        'client': payment.client_id,
+        'amount': payment.amount,
+        'payment_method': payment.payment_method,
+        'status': payment.status,
+        'payment_date': payment.payment_date,
+        'transaction_id': payment.transaction_id,
+    }
+
+
+def publish(salon_id, event_type, data, using=None):
+    """
+    Enregistre un événement pour chaque abonnement concerné, dans la
+    transaction courante, et programme leur livraison après le commit.
+    """
+    publish_many(salon_id, event_type, [data], using)
+
+
+def publish_many(salon_id, event_type, items, using=None):
+    """publish() pour plusieurs événements de même type : une seule insertion"""
+    from apps.jobs.services import enqueue
+    
+    subscription_ids = [
+        subscription_id
+        for subscription_id, events in active_subscriptions(salon_id)
+        if not events or event_type in events
+    ]
+    if not subscription_ids or not items:
+        return
+    
+    payloads = json.loads(json.dumps(items, cls=DjangoJSONEncoder))
+    WebhookEvent.objects.using(using or sharding.db_for_salon(salon_id)).bulk_create([
+        WebhookEvent(salon_id=salon_id, subscription_id=subscription_id, type=event_type, payload=payload)
+        for payload in payloads
+        for subscription_id in subscription_ids
+    ], batch_size=500)
+    for subscription_id in subscription_ids:
+        # Une livraison en attente par abonnement : les événements suivants la rejoignent
+        enqueue(
+            'webhooks.deliver',
+            salon=salon_id,
+            key=f'webhooks.deliver:{subscription_id}',
+            delay=timedelta(seconds=settings.WEBHOOK_COALESCE_SECONDS),
+            subscription_id=subscription_id
+        )
+
+
+def publish_on_save(sender, instance, created, using=None, raw=False, **kwargs):
+    """Handler post_save : rendez-vous créés, paiements créés ou modifiés"""
+    if raw:
+        return
+    if sender._meta.label == 'appointments.Appointment':
+        if created:
+            publish(instance.salon_id, 'appointment.created', appointment_payload(instance), using)
+    else:
+        event_type = 'payment.created' if created else 'payment.updated'
+        publish(instance.salon_id, event_type, payment_payload(instance), using)
+
+
+def publish_status_change(appointment, previous_status):
+    """Changement de statut d'un rendez-vous (à appeler après son enregistrement)"""
+    if appointment.status == previous_status:
+        return
+    data = appointment_payload(appointment)
+    data['previous_status'] = previous_status
+    publish(appointment.salon_id, 'appointment.status_changed', data)
+
+
+# ---------------------------------------------------------------------------
+# Livraison
+# ---------------------------------------------------------------------------
+
+def sign(secret, timestamp, body):
+    digest = hmac.new(secret.encode(), f"{timestamp}.".encode() + body, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={digest}"
+
+
+def verify_signature(secret, header, body, tolerance=300):
+    """Vérification côté récepteur (voir la commande webhook_receiver)"""
+    try:
+        parts = dict(item.split('=', 1) for item in header.split(','))
+        timestamp = int(parts['t'])
+    except (KeyError, ValueError):
+        return False
+    if abs(time.time() - timestamp) > tolerance:
+        return False
+    return hmac.compare_digest(sign(secret, timestamp, body), header)
+
+
+def _backoff(failures):
+    return timedelta(seconds=min(
+        settings.WEBHOOK_RETRY_BASE_SECONDS * 2 ** (failures - 1),
+        settings.WEBHOOK_RETRY_MAX_SECONDS
+    ))
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Les redirections ne sont pas suivies (elles contourneraient le contrôle de destination)"""
+    
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+def _post(subscription, events):
+    """POST d'un lot ; renvoie None ou le message d'erreur"""
+    try:
+        check_destination(subscription.url)
+    except ValidationError as exc:
+        return exc.messages[0]
+    
+    body = json.dumps({
+        'salon': subscription.salon_id,
+        'events': [
+            {
+                'id': str(event.event_id),
+                'type': event.type,
+                'created_at': event.created_at.isoformat(),
+                'data': event.payload,
+            }
+            for event in events
+        ],
+    }).encode()
+    request = urllib.request.Request(
+        subscription.url,
+        data=body,
+        method='POST',
+        headers={
+            'Content-Type': 'application/json',
+            'User-Agent': USER_AGENT,
+            'X-Webhook-Signature': sign(subscription.secret, int(time.time()), body),
+        }
+    )
+    try:
+        with _opener.open(request, timeout=settings.WEBHOOK_TIMEOUT_SECONDS) as response:
+            response.read()
+    except urllib.error.HTTPError as exc:
+        return f"HTTP {exc.code}"
+    except (urllib.error.URLError, OSError) as exc:
+        return str(getattr(exc, 'reason', exc))
+    return None
+
+
+class WebhookService:
+    """Service de livraison des webhooks"""
+    
+    @staticmethod
+    def deliver(subscription_id):
+        """
+        Livre les événements en attente d'un abonnement, par lots, en trois
+        temps pour ne garder ni verrou ni transaction pendant l'appel HTTP :
+        1. réservation du lot (next_attempt_at repoussé d'un bail), commit ;
+        2. POST ;
+        3. enregistrement du résultat.
+        Un worker arrêté en cours d'envoi laisse le lot repartir à la fin
+        du bail (livraison « au moins une fois », dédoublonnage par id).
+        Renvoie le nombre d'événements livrés.
+        """
+        using = sharding.db_for_salon()
+        delivered = 0
+        while True:
+            with transaction.atomic(using=using):
+                subscription = WebhookSubscription.objects.select_for_update(
+                    skip_locked=True
+                ).filter(pk=subscription_id, is_active=True).first()
+                now = timezone.now()
+                if subscription is None or (subscription.retry_at and subscription.retry_at > now):
+                    return delivered
+                
+                events = list(
+                    WebhookEvent.objects.select_for_update(skip_locked=True).filter(
+                        subscription=subscription, status='PENDING', next_attempt_at__lte=now
+                    ).order_by('id')[:settings.WEBHOOK_BATCH_SIZE]
+                )
+                if not events:
+                    return delivered
+                ids = [event.pk for event in events]
+                lease = now + timedelta(seconds=2 * settings.WEBHOOK_TIMEOUT_SECONDS + 30)
+                WebhookEvent.objects.filter(pk__in=ids).update(next_attempt_at=lease)
+            
+            error = _post(subscription, events)
+            
+            now = timezone.now()
+            with transaction.atomic(using=using):
+                if error is None:
+                    WebhookEvent.objects.filter(pk__in=ids).update(
+                        status='DELIVERED', delivered_at=now, attempts=F('attempts') + 1, last_error=''
+                    )
+                    WebhookSubscription.objects.filter(pk=subscription_id, consecutive_failures__gt=0).update(
+                        consecutive_failures=0, retry_at=None, updated_at=now
+                    )
+                    delivered += len(events)
+                else:
+                    WebhookService._record_failure(subscription_id, ids, error, now)
+                    logger.warning("Échec du webhook %s : %s", subscription.url, error)
+                    return delivered
+            
+            if len(events) < settings.WEBHOOK_BATCH_SIZE:
+                return delivered
+    
+    @staticmethod
+    def _record_failure(subscription_id, ids, error, now):
+        subscription = WebhookSubscription.objects.select_for_update().get(pk=subscription_id)
+        subscription.consecutive_failures += 1
+        subscription.retry_at = now + _backoff(subscription.consecutive_failures)
+        subscription.save(update_fields=['consecutive_failures', 'retry_at', 'updated_at'])
+        
+        # Nouvelle tentative à la reprise de l'abonnement
+        WebhookEvent.objects.filter(pk__in=ids).update(
+            attempts=F('attempts') + 1, last_error=error, next_attempt_at=subscription.retry_at
+        )
+        # Lettres mortes : tentatives épuisées
+        WebhookEvent.objects.filter(
+            pk__in=ids, attempts__gte=settings.WEBHOOK_MAX_ATTEMPTS
+        ).update(status='DEAD')
+    
+    @staticmethod
+    def dispatch():
+        """
+        Tâche périodique : reprend les abonnements dont des événements
+        attendent (après une pause ou une livraison interrompue).
+        """
+        from apps.jobs.services import enqueue
+        
+        now = timezone.now()
+        for alias in sharding.tenant_shards():
+            with sharding.use_shard(alias):
+                pending = WebhookEvent.objects.filter(
+                    status='PENDING', next_attempt_at__lte=now
+                ).values_list('subscription_id', 'salon_id').distinct()
+                for subscription_id, salon_id in pending:
+                    enqueue(
+                        'webhooks.deliver',
+                        salon=salon_id,
+                        key=f'webhooks.deliver:{subscription_id}',
+                        subscription_id=subscription_id
+                    )
+    
+    @staticmethod
+    def replay(subscription):
+        """Remet en file les lettres mortes d'un abonnement"""
+        from apps.jobs.services import enqueue
+        
+        with transaction.atomic(using=sharding.db_for_salon(subscription.salon_id)):
+            count = subscription.deliveries.filter(status='DEAD').update(
+                status='PENDING', attempts=0, next_attempt_at=timezone.now()
+            )
+            subscription.consecutive_failures = 0
+            subscription.retry_at = None
+            subscription.save(update_fields=['consecutive_failures', 'retry_at', 'updated_at'])
+            enqueue(
+                'webhooks.deliver',
+                salon=subscription.salon_id,
+                key=f'webhooks.deliver:{subscription.pk}',
+                subscription_id=subscription.pk
+            )
+        return count
+    
+    @staticmethod
+    def prune(older_than_days=None):
+        """Supprime les événements livrés au-delà de la rétention (shard courant)"""
+        days = settings.WEBHOOK_RETENTION_DAYS if older_than_days is None else older_than_days
+        deleted, _ = WebhookEvent.objects.filter(
+            status='DELIVERED', delivered_at__lt=timezone.now() - timedelta(days=days)
+        ).delete()
+        return deleted
@@ -0,0 +1,27 @@
+"""
+Tasks for Webhooks app
+"""
+from datetime import timedelta
+
+from apps.core import sharding
+from apps.jobs.registry import task
+from .services import WebhookService
+
+
+@task('webhooks.deliver')
+def deliver(subscription_id):
+    WebhookService.deliver(subscription_id)
+
+
+@task('webhooks.dispatch', every=timedelta(seconds=30))
+def dispatch():
+    """Relance les abonnements en attente (pauses expirées, livraisons interrompues)"""
+    WebhookService.dispatch()
+
+
+@task('webhooks.prune', every=timedelta(days=1))
+def prune():
+    """Purge quotidienne des événements livrés, shard par shard"""
+    for alias in sharding.tenant_shards():
+        with sharding.use_shard(alias):
+            WebhookService.prune()
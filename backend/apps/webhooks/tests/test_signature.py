@@ -0,0 +1,47 @@
+"""Signature des livraisons de webhooks (en-tête t=...,v1=...)"""
+import hashlib
+import hmac
+import time
+
+import pytest
+
+from apps.webhooks.services import sign, verify_signature
+
+
+SECRET = 'whsec_test'
+BODY = b'{"events": [{"type": "appointment.created"}]}'
+
+
+def test_sign_format():
+    header = sign(SECRET, 1700000000, BODY)
+    digest = hmac.new(SECRET.encode(), b'1700000000.' + BODY, hashlib.sha256).hexdigest()
+    assert header == f't=1700000000,v1={digest}'
+
+
+def test_verify_signature():
+    assert verify_signature(SECRET, sign(SECRET, int(time.time()), BODY), BODY)
+
+
+@pytest.mark.parametrize('secret, body', [
+    ('autre_secret', BODY),
+    (SECRET, BODY + b' '),
+])
+def test_verify_signature_rejects_other_secret_or_body(secret, body):
+    assert not verify_signature(secret, sign(SECRET, int(time.time()), BODY), body)
+
+
+def test_verify_signature_rejects_old_timestamp():
+    header = sign(SECRET, int(time.time()) - 301, BODY)
+    assert not verify_signature(SECRET, header, BODY)
+    assert verify_signature(SECRET, header, BODY, tolerance=600)
+
+
+def test_verify_signature_rejects_rewritten_timestamp():
+    timestamp = int(time.time())
+    digest = sign(SECRET, timestamp - 10, BODY).split('v1=')[1]
+    assert not verify_signature(SECRET, f't={timestamp},v1={digest}', BODY)
+
+
+@pytest.mark.parametrize('header', ['', 'v1=abc', 't=abc,v1=abc', 'garbage'])
+def test_verify_signature_rejects_malformed_header(header):
+    assert not verify_signature(SECRET, header, BODY)
@@ -0,0 +1,46 @@
+"""
+Destinations autorisées des webhooks
+Un abonnement ne doit pas permettre d'atteindre le réseau interne (SSRF) :
+https obligatoire, et toutes les adresses de l'hôte doivent être publiques
+(ni boucle locale, ni réseau privé, ni lien local, ni plage réservée, ni
+métadonnées cloud). Contrôle à l'enregistrement et avant chaque envoi, le
+DNS pouvant changer entre-temps.
+WEBHOOK_ALLOW_PRIVATE_URLS=True lève ces contrôles (développement local,
+commande webhook_receiver).
+"""
+import ipaddress
+import socket
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+
+def check_destination(url):
+    """Lève ValidationError si l'URL ne désigne pas un hôte public en https"""
+    if settings.WEBHOOK_ALLOW_PRIVATE_URLS:
+        return
+    
+    parts = urlsplit(url)
+    if parts.scheme != 'https':
+        raise ValidationError("L'URL doit utiliser https.")
+    if not parts.hostname:
+        raise ValidationError("URL sans nom d'hôte.")
+    
+    try:
+        port = parts.port or 443
+        addresses = {info[4][0] for info in socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, ValueError, UnicodeError):
+        raise ValidationError("Nom d'hôte introuvable.")
+    
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+        if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise ValidationError("Destination non autorisée (adresse interne ou réservée).")
+
+
+def validate_webhook_url(value):
+    """Validateur du champ WebhookSubscription.url"""
+    check_destination(value)
@@ -0,0 +1,49 @@
+"""
+Views for Webhooks app
+"""
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.core.permissions import IsSalonAdmin
+from .models import WebhookSubscription
+from .serializers import WebhookEventSerializer, WebhookSubscriptionSerializer
+from .services import WebhookService
+
+
+class WebhookSubscriptionViewSet(viewsets.ModelViewSet):
+    """Abonnements webhook du salon (administrateurs)"""
+    permission_classes = [IsAuthenticated, IsSalonAdmin]
+    serializer_class = WebhookSubscriptionSerializer
+    
+    def get_queryset(self):
+        if self.request.salon:
+            return WebhookSubscription.objects.filter(salon=self.request.salon)
+        return WebhookSubscription.objects.none()
+    
+    def perform_create(self, serializer):
+        serializer.save(salon=self.request.salon)
+    
+    @action(detail=True, methods=['get'])
+    def events(self, request, pk=None):
+        """Derniers événements de l'abonnement (?status=DEAD pour les lettres mortes)"""
+        subscription = self.get_object()
+        events = subscription.deliveries.order_by('-id')
+        status_filter = request.query_params.get('status')
+        if status_filter:
+            events = events.filter(status=status_filter.upper())
+        
+        page = self.paginate_queryset(events)
+        serializer = WebhookEventSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=True, methods=['post'])
+    def replay(self, request, pk=None):
+        """Remet en file les événements abandonnés"""
+        count = WebhookService.replay(self.get_object())
+        return Response({
+            'success': True,
+            'message': f"{count} événement(s) remis en file",
+            'replayed': count
+        })
@@ -4,7 +4,7 @@ Django settings for SaaS Coiffure project.
 
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
+from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -40,6 +40,15 @@ INSTALLED_APPS = [
     'apps.services',
     'apps.appointments',
     'apps.payments',
+    'apps.archive',
+    'apps.dashboard',
+    'apps.sync',
+    'apps.realtime',
+    'apps.booking',
+    'apps.jobs',
+    'apps.reminders',
+    'apps.webhooks',
+    'apps.reconciliation',
 ]
 
 MIDDLEWARE = [
@@ -73,6 +82,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
@@ -87,6 +97,55 @@ DATABASES = {
     }
 }
 
+# Réplique en lecture (optionnelle) : rapports et listes via ReplicaReadMixin
+# En local, deux fichiers SQLite peuvent tenir lieu de primaire et de réplique
+# (python manage.py migrate --database replica).
+DB_REPLICA_NAME = config('DB_REPLICA_NAME', default='')
+if DB_REPLICA_NAME:
+    DATABASES['replica'] = {
+        'ENGINE': config('DB_REPLICA_ENGINE', default=DATABASES['default']['ENGINE']),
+        'NAME': DB_REPLICA_NAME,
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': config('DB_REPLICA_HOST', default=DATABASES['default']['HOST']),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+# Shards tenant supplémentaires : SHARD_DATABASES=shard1,shard2 puis, pour
+# chaque alias, DB_SHARD1_NAME, DB_SHARD1_HOST... (défaut : valeurs de 'default')
+SHARD_DATABASES = config('SHARD_DATABASES', default='', cast=Csv())
+for _alias in SHARD_DATABASES:
+    _prefix = f'DB_{_alias.upper()}_'
+    DATABASES[_alias] = {
+        key: config(_prefix + key, default=DATABASES['default'][key])
+        for key in ('ENGINE', 'NAME', 'USER', 'PASSWORD', 'HOST', 'PORT')
+    }
+TENANT_SHARDS = ['default', *SHARD_DATABASES]
+# Shard imposé aux nouveaux salons (sinon : le moins chargé)
+NEW_SALON_SHARD = config('NEW_SALON_SHARD', default='')
+SHARD_MAP_CACHE_SECONDS = config('SHARD_MAP_CACHE_SECONDS', default=300, cast=int)
+# Pas des séquences d'id (ids distincts entre shards, voir manage_shards)
+SHARD_ID_STRIDE = config('SHARD_ID_STRIDE', default=64, cast=int)
+
+DATABASE_ROUTERS = ['apps.core.routers.ShardRouter', 'apps.core.routers.ReplicaRouter']
+REPLICA_DATABASE_ALIAS = 'replica'
+# Fenêtre (s) pendant laquelle un utilisateur lit sur la primaire après une écriture
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+# Au-delà de ce retard de réplication (s), les lectures restent sur la primaire
+REPLICA_MAX_LAG_SECONDS = config('REPLICA_MAX_LAG_SECONDS', default=10, cast=int)
+
+# Cache partagé (Redis) : indispensable dès que plusieurs processus servent
+# l'API (carte des shards, gel des salons en migration, fenêtre sticky)
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -134,11 +193,21 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.core.authentication.TenantJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # JSON via orjson si installé (repli automatique sur json de la stdlib)
+    'DEFAULT_RENDERER_CLASSES': (
+        'apps.core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'apps.core.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_FILTER_BACKENDS': [
@@ -147,6 +216,101 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'apps.core.exceptions.custom_exception_handler',
 }
 
+# Listes servies par les ValuesSerializer (apps.core.projections) ; False pour
+# revenir aux ModelSerializer sur toutes les vues
+VALUES_LIST_SERIALIZERS = config('VALUES_LIST_SERIALIZERS', default=True, cast=bool)
+
+# Durée de vie (s) d'un instantané du tableau de bord ; il est de toute façon
+# invalidé par chaque écriture d'un rendez-vous ou d'un paiement du salon
+DASHBOARD_CACHE_SECONDS = config('DASHBOARD_CACHE_SECONDS', default=60, cast=int)
+
+# Synchronisation incrémentale (GET /api/v1/sync/)
+# - décalage (s) de la fin de fenêtre, pour ne pas manquer les écritures en cours
+# - lignes maximales par type et par appel
+# - rétention (jours) des traces de suppression ; au-delà, resynchronisation complète
+SYNC_WATERMARK_LAG_SECONDS = config('SYNC_WATERMARK_LAG_SECONDS', default=5, cast=int)
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=500, cast=int)
+SYNC_TOMBSTONE_RETENTION_DAYS = config('SYNC_TOMBSTONE_RETENTION_DAYS', default=30, cast=int)
+
+# Événements temps réel (GET /api/v1/events/, servi en ASGI)
+# - backend : auto (postgres si la base est PostgreSQL), postgres ou local
+# - délai de reconnexion suggéré aux navigateurs (ms) et battement de cœur (s)
+EVENTS_BACKEND = config('EVENTS_BACKEND', default='auto')
+EVENTS_RETRY_MS = config('EVENTS_RETRY_MS', default=3000, cast=int)
+EVENTS_HEARTBEAT_SECONDS = config('EVENTS_HEARTBEAT_SECONDS', default=15, cast=int)
+
+# File de tâches différées (python manage.py run_jobs)
+# - threads par worker, attente (s) quand la file est vide
+# - tentatives, attente avant nouvelle tentative (base doublée à chaque échec, plafond)
+# - délai (s) après lequel une tâche d'un worker arrêté est remise en file
+# - tâches les plus anciennes parmi lesquelles les salons sont alternés
+# - rétention (jours) des tâches terminées
+JOBS_WORKERS = config('JOBS_WORKERS', default=4, cast=int)
+JOBS_POLL_SECONDS = config('JOBS_POLL_SECONDS', default=1.0, cast=float)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_RETRY_BASE_SECONDS = config('JOBS_RETRY_BASE_SECONDS', default=10, cast=int)
+JOBS_RETRY_MAX_SECONDS = config('JOBS_RETRY_MAX_SECONDS', default=3600, cast=int)
+JOBS_LOCK_TIMEOUT_SECONDS = config('JOBS_LOCK_TIMEOUT_SECONDS', default=900, cast=int)
+JOBS_FAIRNESS_WINDOW = config('JOBS_FAIRNESS_WINDOW', default=500, cast=int)
+JOBS_RETENTION_DAYS = config('JOBS_RETENTION_DAYS', default=7, cast=int)
+
+# Rappels de rendez-vous (tâche périodique reminders.scan)
+# - canaux : console, file, email (EMAIL_*), sms (bouchon) ou chemin de classe
+# - délais (heures avant le rendez-vous), période d'analyse (s), rattrapage (min)
+# - rendez-vous par lot de livraison, reprise des envois SENDING (s), fichier du canal file
+REMINDER_CHANNELS = config('REMINDER_CHANNELS', default='email', cast=Csv())
+REMINDER_OFFSETS_HOURS = config('REMINDER_OFFSETS_HOURS', default='24,2', cast=Csv(int))
+REMINDER_SCAN_SECONDS = config('REMINDER_SCAN_SECONDS', default=60, cast=int)
+REMINDER_LOOKBACK_MINUTES = config('REMINDER_LOOKBACK_MINUTES', default=60, cast=int)
+REMINDER_BATCH_SIZE = config('REMINDER_BATCH_SIZE', default=200, cast=int)
+REMINDER_SENDING_TIMEOUT_SECONDS = config('REMINDER_SENDING_TIMEOUT_SECONDS', default=900, cast=int)
+REMINDER_FILE_PATH = config('REMINDER_FILE_PATH', default=str(BASE_DIR / 'reminders.log'))
+
+# Webhooks sortants
+# - événements par POST, délai (s) de regroupement avant la première livraison
+# - tentatives avant abandon (DEAD), pause après échec (base doublée, plafond)
+# - délai d'attente HTTP (s), rétention (jours) des événements livrés
+# - destinations internes/http autorisées (développement local uniquement)
+WEBHOOK_BATCH_SIZE = config('WEBHOOK_BATCH_SIZE', default=100, cast=int)
+WEBHOOK_COALESCE_SECONDS = config('WEBHOOK_COALESCE_SECONDS', default=2, cast=int)
+WEBHOOK_MAX_ATTEMPTS = config('WEBHOOK_MAX_ATTEMPTS', default=10, cast=int)
+WEBHOOK_RETRY_BASE_SECONDS = config('WEBHOOK_RETRY_BASE_SECONDS', default=30, cast=int)
+WEBHOOK_RETRY_MAX_SECONDS = config('WEBHOOK_RETRY_MAX_SECONDS', default=3600, cast=int)
+WEBHOOK_TIMEOUT_SECONDS = config('WEBHOOK_TIMEOUT_SECONDS', default=10, cast=int)
+WEBHOOK_RETENTION_DAYS = config('WEBHOOK_RETENTION_DAYS', default=30, cast=int)
+WEBHOOK_ALLOW_PRIVATE_URLS = config('WEBHOOK_ALLOW_PRIVATE_URLS', default=False, cast=bool)
+
+# Nombre maximal de rendez-vous par changement de statut groupé
+APPOINTMENT_BULK_MAX = config('APPOINTMENT_BULK_MAX', default=500, cast=int)
+
+# Indicateurs de rendez-vous (journal des statuts)
+# - période (min) du recalcul des indicateurs journaliers
+# - délai (min) sous lequel une confirmation compte comme rapide
+METRICS_ROLLUP_MINUTES = config('METRICS_ROLLUP_MINUTES', default=5, cast=int)
+METRICS_CONFIRMATION_MINUTES = config('METRICS_CONFIRMATION_MINUTES', default=60, cast=int)
+
+# Paiements
+# - durée de conservation (h) des clés Idempotency-Key
+# - secret HMAC des notifications Mobile Money (vide = point d'entrée désactivé)
+# - notifications traitées par lot, rétention (jours) des notifications traitées
+PAYMENT_IDEMPOTENCY_TTL_HOURS = config('PAYMENT_IDEMPOTENCY_TTL_HOURS', default=24, cast=int)
+MOBILE_MONEY_CALLBACK_SECRET = config('MOBILE_MONEY_CALLBACK_SECRET', default='')
+PAYMENT_CALLBACK_BATCH_SIZE = config('PAYMENT_CALLBACK_BATCH_SIZE', default=200, cast=int)
+PAYMENT_CALLBACK_RETENTION_DAYS = config('PAYMENT_CALLBACK_RETENTION_DAYS', default=30, cast=int)
+
+# Rapprochement des relevés : écart toléré (jours) entre la date du relevé
+# et celle du paiement, lignes par lot (transaction et avancement)
+RECONCILIATION_DATE_WINDOW_DAYS = config('RECONCILIATION_DATE_WINDOW_DAYS', default=2, cast=int)
+RECONCILIATION_CHUNK_SIZE = config('RECONCILIATION_CHUNK_SIZE', default=1000, cast=int)
+
+# Taille maximale (px, plus grand côté) des images de services, réduites en tâche de fond
+SERVICE_IMAGE_MAX_SIZE = config('SERVICE_IMAGE_MAX_SIZE', default=1200, cast=int)
+
+# Requêtes groupées (POST /api/v1/batch/) : nombre de sous-requêtes et de
+# lectures exécutées en parallèle
+BATCH_MAX_REQUESTS = config('BATCH_MAX_REQUESTS', default=20, cast=int)
+BATCH_MAX_WORKERS = config('BATCH_MAX_WORKERS', default=4, cast=int)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=config('JWT_ACCESS_TOKEN_LIFETIME', default=60, cast=int)),
@@ -179,3 +343,7 @@ EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+
+# Archivage de l'historique (rendez-vous terminés/annulés/absents)
+ARCHIVE_AFTER_DAYS = config('ARCHIVE_AFTER_DAYS', default=365, cast=int)
+ARCHIVE_BATCH_SIZE = config('ARCHIVE_BATCH_SIZE', default=500, cast=int)
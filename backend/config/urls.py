@@ -16,7 +16,12 @@ from apps.employees.views import EmployeeViewSet
 from apps.services.views import ServiceViewSet, ServiceCategoryViewSet
 from apps.appointments.views import AppointmentViewSet
 from apps.payments.views import PaymentViewSet
-from apps.core.views import SalonViewSet
+from apps.core.views import BatchView, SalonViewSet
+from apps.dashboard.views import DashboardView
+from apps.sync.views import SyncView
+from apps.webhooks.views import WebhookSubscriptionViewSet
+from apps.reconciliation.views import StatementImportViewSet
+from apps.realtime.views import event_stream
 
 # API Documentation
 schema_view = get_schema_view(
@@ -40,6 +45,8 @@ router.register(r'services', ServiceViewSet, basename='service')
 router.register(r'appointments', AppointmentViewSet, basename='appointment')
 router.register(r'payments', PaymentViewSet, basename='payment')
 router.register(r'salons', SalonViewSet, basename='salon')
+router.register(r'webhooks', WebhookSubscriptionViewSet, basename='webhook')
+router.register(r'reconciliation/statements', StatementImportViewSet, basename='statement-import')
 
 urlpatterns = [
     # Admin
@@ -52,6 +59,24 @@ urlpatterns = [
     # API v1 - Auth (separate because it uses different views)
     path('api/v1/auth/', include('apps.accounts.urls')),
     
+    # API v1 - Réservation en ligne publique (vues asynchrones)
+    path('api/v1/public/', include('apps.booking.urls')),
+    
+    # API v1 - Tableau de bord de la réception
+    path('api/v1/dashboard/', DashboardView.as_view(), name='dashboard'),
+    
+    # API v1 - Synchronisation incrémentale (tablettes hors ligne)
+    path('api/v1/sync/', SyncView.as_view(), name='sync'),
+    
+    # API v1 - Événements temps réel (SSE, via ASGI)
+    path('api/v1/events/', event_stream, name='events'),
+    
+    # API v1 - Notifications des opérateurs de paiement (sans JWT, signées)
+    path('api/v1/payments/callbacks/', include('apps.payments.urls')),
+    
+    # API v1 - Requêtes groupées
+    path('api/v1/batch/', BatchView.as_view(), name='batch'),
+    
     # API v1 - All other endpoints via main router
     path('api/v1/', include(router.urls)),
 ]
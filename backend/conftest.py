@@ -0,0 +1,54 @@
+"""
+Données minimales partagées par les tests des applications : un salon, son
+personnel, un client, un service et une fabrique de rendez-vous.
+"""
+import datetime
+from decimal import Decimal
+
+import pytest
+
+
+@pytest.fixture
+def salon(db):
+    from apps.core.models import Salon
+    return Salon.objects.create(
+        name='Salon Test', address='1 rue du Test', phone='+241000000', email='salon@example.com'
+    )
+
+
+@pytest.fixture
+def employee(salon):
+    from apps.accounts.models import User
+    from apps.employees.models import Employee
+    user = User.objects.create_user(
+        'coiffeur@example.com', 'secret', first_name='Awa', last_name='Test', salon=salon, role='COIFFEUR'
+    )
+    return Employee.objects.create(salon=salon, user=user)
+
+
+@pytest.fixture
+def client_record(salon):
+    from apps.clients.models import Client
+    return Client.objects.create(salon=salon, first_name='Marie', last_name='Test', phone='+241000001')
+
+
+@pytest.fixture
+def service(salon):
+    from apps.services.models import Service
+    return Service.objects.create(salon=salon, name='Coupe', price=Decimal('10000.00'), duration=30)
+
+
+@pytest.fixture
+def make_appointment(salon, employee, client_record, service):
+    """Fabrique de rendez-vous du salon (statut PENDING par défaut), créneaux successifs"""
+    from apps.appointments.models import Appointment
+    slots = iter(range(8, 20))
+
+    def make(status='PENDING', **fields):
+        fields.setdefault('client', client_record)
+        fields.setdefault('date', datetime.date.today() + datetime.timedelta(days=1))
+        fields.setdefault('time', datetime.time(next(slots)))
+        return Appointment.objects.create(
+            salon=salon, employee=employee, service=service, status=status, **fields
+        )
+    return make
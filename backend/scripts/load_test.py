@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+"""
+Générateur de charge HTTP pour les parcours réservation et réception.
+
+Rejoue des scénarios réalistes contre un serveur local (``manage.py runserver``,
+gunicorn, uvicorn...) et affiche le débit ainsi que les latences p50/p95/p99
+par endpoint.
+
+Scénarios disponibles :
+- catalogue    : consultation du catalogue public (services, employés)
+- availability : vérification de disponibilité d'un créneau
+- booking      : réservation via AppointmentViewSet.create
+- reception    : polling réceptionniste (today / upcoming)
+- payment      : enregistrement d'un paiement
+
+Usage :
+    python scripts/load_test.py --email reception@salon.ga --password secret \\
+        --concurrency 50 --duration 60 \\
+        --mix catalogue=40,availability=25,booking=10,reception=20,payment=5
+
+Dépendance : httpx (pip install httpx)
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    sys.exit("httpx est requis pour le test de charge : pip install httpx")
+
+
+DEFAULT_MIX = {
+    'catalogue': 40,
+    'availability': 25,
+    'booking': 10,
+    'reception': 20,
+    'payment': 5,
+}
+
+SLOT_TIMES = [f"{hour:02d}:{minute:02d}" for hour in range(8, 18) for minute in (0, 30)]
+
+
+def parse_mix(value):
+    """Parse une chaîne 'scenario=poids,...' en dictionnaire"""
+    mix = {}
+    for item in value.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Scénario inconnu : {name}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def percentile(sorted_values, pct):
+    """Percentile au rang le plus proche sur une liste déjà triée"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Stats:
+    """Collecte des latences et codes de réponse par endpoint"""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.rejected = defaultdict(int)
+
+    def record(self, endpoint, elapsed, status_code):
+        self.latencies[endpoint].append(elapsed)
+        if status_code is None or status_code >= 500:
+            self.errors[endpoint] += 1
+        elif status_code >= 400:
+            self.rejected[endpoint] += 1
+
+    def report(self, wall_time):
+        rows = []
+        for endpoint in sorted(self.latencies):
+            values = sorted(self.latencies[endpoint])
+            rows.append({
+                'endpoint': endpoint,
+                'requests': len(values),
+                'rps': len(values) / wall_time if wall_time else 0.0,
+                'errors': self.errors[endpoint],
+                'rejected': self.rejected[endpoint],
+                'p50_ms': percentile(values, 50) * 1000,
+                'p95_ms': percentile(values, 95) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+                'max_ms': values[-1] * 1000,
+            })
+        total = sum(row['requests'] for row in rows)
+        return {
+            'duration_s': wall_time,
+            'total_requests': total,
+            'throughput_rps': total / wall_time if wall_time else 0.0,
+            'endpoints': rows,
+        }
+
+
+class LoadTest:
+    """Orchestration des utilisateurs virtuels"""
+
+    def __init__(self, args):
+        self.args = args
+        self.stats = Stats()
+        self.api = args.base_url.rstrip('/') + '/api/v1'
+        self.headers = {}
+        self.employees = []
+        self.services = []
+        self.clients = []
+
+    async def call(self, client, endpoint, method, path, **kwargs):
+        """Exécute une requête et enregistre sa latence"""
+        start = time.perf_counter()
+        status_code = None
+        response = None
+        try:
+            response = await client.request(method, self.api + path, headers=self.headers, **kwargs)
+            status_code = response.status_code
+        except httpx.HTTPError:
+            pass
+        self.stats.record(endpoint, time.perf_counter() - start, status_code)
+        return response
+
+    async def setup(self, client):
+        """Authentification et chargement des identifiants de référence"""
+        response = await client.post(self.api + '/auth/login/', json={
+            'email': self.args.email,
+            'password': self.args.password,
+        })
+        response.raise_for_status()
+        self.headers = {'Authorization': f"Bearer {response.json()['access']}"}
+
+        for attr, path in (('employees', '/employees/'), ('services', '/services/'), ('clients', '/clients/')):
+            response = await client.get(self.api + path, headers=self.headers)
+            response.raise_for_status()
+            payload = response.json()
+            results = payload['results'] if isinstance(payload, dict) else payload
+            setattr(self, attr, results)
+
+        if not (self.employees and self.services and self.clients):
+            raise SystemExit("Le salon doit avoir au moins un employé, un service et un client")
+
+    # Scénarios
+
+    async def scenario_catalogue(self, client):
+        await self.call(client, 'GET /services/', 'GET', '/services/')
+        await self.call(client, 'GET /employees/', 'GET', '/employees/')
+        service = random.choice(self.services)
+        await self.call(client, 'GET /services/{id}/', 'GET', f"/services/{service['id']}/")
+
+    async def scenario_availability(self, client):
+        for _ in range(3):
+            await self.call(client, 'POST /appointments/check_availability/', 'POST',
+                            '/appointments/check_availability/', json={
+                                'employee_id': random.choice(self.employees)['id'],
+                                'date': self.random_date(),
+                                'time': random.choice(SLOT_TIMES),
+                                'duration': random.choice(self.services)['duration'],
+                            })
+
+    async def scenario_booking(self, client):
+        await self.scenario_availability(client)
+        service = random.choice(self.services)
+        await self.call(client, 'POST /appointments/', 'POST', '/appointments/', json={
+            'client': random.choice(self.clients)['id'],
+            'employee': random.choice(self.employees)['id'],
+            'service': service['id'],
+            'date': self.random_date(),
+            'time': random.choice(SLOT_TIMES),
+            'duration': service['duration'],
+            'notes': 'load-test',
+        })
+
+    async def scenario_reception(self, client):
+        await self.call(client, 'GET /appointments/today/', 'GET', '/appointments/today/')
+        await self.call(client, 'GET /appointments/upcoming/', 'GET', '/appointments/upcoming/')
+
+    async def scenario_payment(self, client):
+        response = await self.call(client, 'GET /appointments/?status=PENDING', 'GET',
+                                   '/appointments/', params={'status': 'PENDING'})
+        if response is None or response.status_code != 200 or not response.json()['results']:
+            return
+        appointment = random.choice(response.json()['results'])
+        await self.call(client, 'POST /payments/', 'POST', '/payments/', json={
+            'appointment': appointment['id'],
+            'client': appointment['client'],
+            'amount': str(random.choice(self.services)['price']),
+            'payment_method': random.choice(['CASH', 'MOBILE_MONEY']),
+            'notes': 'load-test',
+        })
+
+    def random_date(self):
+        return (date.today() + timedelta(days=random.randint(1, self.args.horizon_days))).isoformat()
+
+    async def virtual_user(self, client, deadline):
+        names = list(self.args.mix)
+        weights = [self.args.mix[name] for name in names]
+        while time.perf_counter() < deadline:
+            scenario = random.choices(names, weights)[0]
+            await getattr(self, f"scenario_{scenario}")(client)
+            if self.args.think_time:
+                await asyncio.sleep(random.uniform(0, self.args.think_time))
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=self.args.concurrency)
+        timeout = httpx.Timeout(self.args.timeout)
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            await self.setup(client)
+            start = time.perf_counter()
+            deadline = start + self.args.duration
+            await asyncio.gather(*(
+                self.virtual_user(client, deadline) for _ in range(self.args.concurrency)
+            ))
+            return self.stats.report(time.perf_counter() - start)
+
+
+def print_report(report):
+    print(f"\nDurée : {report['duration_s']:.1f}s - "
+          f"{report['total_requests']} requêtes - "
+          f"{report['throughput_rps']:.1f} req/s\n")
+    header = f"{'Endpoint':<42}{'req':>8}{'req/s':>9}{'5xx':>6}{'4xx':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    print(header)
+    print('-' * len(header))
+    for row in report['endpoints']:
+        print(f"{row['endpoint']:<42}{row['requests']:>8}{row['rps']:>9.1f}"
+              f"{row['errors']:>6}{row['rejected']:>6}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['max_ms']:>9.1f}")
+    print("\nLatences en millisecondes.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Test de charge des parcours réservation/réception")
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--email', required=True, help="Compte employé du salon testé")
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--concurrency', type=int, default=20, help="Nombre d'utilisateurs virtuels")
+    parser.add_argument('--duration', type=float, default=30, help="Durée du test en secondes")
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help="Pondération des scénarios, ex: catalogue=40,booking=10")
+    parser.add_argument('--think-time', type=float, default=0.0,
+                        help="Pause aléatoire max (s) entre deux scénarios")
+    parser.add_argument('--horizon-days', type=int, default=30,
+                        help="Fenêtre de dates utilisée pour les réservations")
+    parser.add_argument('--timeout', type=float, default=30.0)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--json', dest='json_output', help="Écrit le rapport JSON dans ce fichier")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    report = asyncio.run(LoadTest(args).run())
+    print_report(report)
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == '__main__':
+    main()